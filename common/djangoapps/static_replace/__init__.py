@@ -1,5 +1,6 @@
 # lint-amnesty, pylint: disable=missing-module-docstring
 
+import functools
 import logging
 import re
 
@@ -8,10 +9,13 @@ from django.contrib.staticfiles import finders
 from django.contrib.staticfiles.storage import staticfiles_storage
 from opaque_keys.edx.locator import AssetLocator
 
+from openedx.core.lib.cache_utils import ProcessLRUCache, process_cached
 from xmodule.contentstore.content import StaticContent
 
 log = logging.getLogger(__name__)
 XBLOCK_STATIC_RESOURCE_PREFIX = '/static/xblock/'
+COURSE_URL_PREFIX = '/course/'
+JUMP_TO_ID_URL_PREFIX = '/jump_to_id/'
 
 
 def _url_replace_regex(prefix):
@@ -29,6 +33,35 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)
 
 
+@functools.lru_cache(maxsize=256)
+def _url_replace_pattern(prefix):
+    """
+    Returns the compiled _url_replace_regex for the given prefix.
+    """
+    return re.compile(_url_replace_regex(prefix))
+
+
+def _static_url_prefix(data_dir):
+    """
+    Returns the prefix regex of static urls that are not already within the given data directory.
+    """
+    return '(?:{static_url}|/static/)(?!{data_dir})'.format(
+        static_url=settings.STATIC_URL,
+        data_dir=data_dir
+    )
+
+
+@process_cached
+def _asset_url_cache():
+    """
+    Returns the process-local cache of the urls of course assets.
+    """
+    return ProcessLRUCache(
+        'static_replace.asset_url_cache',
+        settings.STATIC_REPLACE_ASSET_URL_CACHE_SIZE_IN_BYTES,
+    )
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
@@ -44,6 +77,32 @@ def try_staticfiles_lookup(path):
     return url
 
 
+def _jump_to_id_url_replacer(jump_to_id_base_url):
+    """
+    Returns a function that replaces a single matched jump_to_id url.
+    """
+    def replace_jump_to_id_url(match):
+        quote = match.group('quote')
+        rest = match.group('rest')
+        return "".join([quote, jump_to_id_base_url + rest, quote])
+
+    return replace_jump_to_id_url
+
+
+def _course_url_replacer(course_key):
+    """
+    Returns a function that replaces a single matched course url.
+    """
+    course_id = str(course_key)
+
+    def replace_course_url(match):
+        quote = match.group('quote')
+        rest = match.group('rest')
+        return "".join([quote, '/courses/' + course_id + '/', rest, quote])
+
+    return replace_course_url
+
+
 def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):  # lint-amnesty, pylint: disable=unused-argument
     """
     This will replace a link to another piece of courseware to a 'jump_to'
@@ -64,13 +123,7 @@ def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):  # lint-amnes
 
     output: <text> after the link rewriting rules are applied
     """
-
-    def replace_jump_to_id_url(match):
-        quote = match.group('quote')
-        rest = match.group('rest')
-        return "".join([quote, jump_to_id_base_url + rest, quote])
-
-    return re.sub(_url_replace_regex('/jump_to_id/'), replace_jump_to_id_url, text)
+    return _url_replace_pattern(JUMP_TO_ID_URL_PREFIX).sub(_jump_to_id_url_replacer(jump_to_id_base_url), text)
 
 
 def replace_course_urls(text, course_key):
@@ -82,21 +135,13 @@ def replace_course_urls(text, course_key):
 
     returns: text with the links replaced
     """
-
-    course_id = str(course_key)
-
-    def replace_course_url(match):
-        quote = match.group('quote')
-        rest = match.group('rest')
-        return "".join([quote, '/courses/' + course_id + '/', rest, quote])
-
-    return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
+    return _url_replace_pattern(COURSE_URL_PREFIX).sub(_course_url_replacer(course_key), text)
 
 
-def process_static_urls(text, replacement_function, data_dir=None):
+def _static_url_replacer(replacement_function):
     """
-    Run an arbitrary replacement function on any urls matching the static file
-    directory
+    Returns a function that runs the given replacement function on a single
+    matched static url, unless it is an XBlock resource url.
     """
     def wrap_part_extraction(match):
         """
@@ -120,12 +165,16 @@ def process_static_urls(text, replacement_function, data_dir=None):
 
         return replacement_function(original, prefix, quote, rest)
 
-    return re.sub(
-        _url_replace_regex('(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
+    return wrap_part_extraction
+
+
+def process_static_urls(text, replacement_function, data_dir=None):
+    """
+    Run an arbitrary replacement function on any urls matching the static file
+    directory
+    """
+    return _url_replace_pattern(_static_url_prefix(data_dir)).sub(
+        _static_url_replacer(replacement_function),
         text
     )
 
@@ -147,8 +196,72 @@ def make_static_urls_absolute(request, html):
     )
 
 
-def replace_static_urls(
-    text,
+def _lookup_course_asset_url(course_id, path):
+    """
+    Returns the url of a path referenced by the content of the given course: the url of the
+    static file if it is in the static file pipeline, otherwise the canonicalized url of the
+    course asset in the contentstore.
+    """
+    # first look in the static file pipeline and see if we are trying to reference
+    # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
+
+    exists_in_staticfiles_storage = False
+    try:
+        exists_in_staticfiles_storage = staticfiles_storage.exists(path)
+    except Exception as err:  # lint-amnesty, pylint: disable=broad-except
+        log.warning("staticfiles_storage couldn't find path {}: {}".format(
+            path, str(err)))
+
+    if exists_in_staticfiles_storage:
+        return staticfiles_storage.url(path)
+
+    # if not, then assume it's courseware specific content and then look in the
+    # Mongo-backed database
+    # Import is placed here to avoid model import at project startup.
+    from common.djangoapps.static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
+    base_url = AssetBaseUrlConfig.get_base_url()
+    excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
+    url = StaticContent.get_canonicalized_asset_path(course_id, path, base_url, excluded_exts)
+
+    if AssetLocator.CANONICAL_NAMESPACE in url:
+        url = url.replace('block@', 'block/', 1)
+    return url
+
+
+def _course_asset_url(course_id, path):
+    """
+    Returns the _lookup_course_asset_url of the given course and path, from the
+    process-local cache of asset urls when it is enabled.
+    """
+    cache = _asset_url_cache()
+    if not cache.max_size_in_bytes:
+        return _lookup_course_asset_url(course_id, path)
+
+    # Imports are placed here to avoid model import and cache configuration access at project startup.
+    from common.djangoapps.static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
+    from openedx.core.djangoapps.contentserver.caching import get_course_assets_version
+    assets_version = get_course_assets_version(course_id)
+    if assets_version is None:
+        # The course_assets cache is a dummy cache, so the version can't be tracked.
+        return _lookup_course_asset_url(course_id, path)
+
+    # The urls also depend on the asset url configuration, which can change at any time.
+    cache_key = (
+        str(course_id),
+        assets_version,
+        str(settings.STATIC_URL),
+        AssetBaseUrlConfig.get_base_url(),
+        tuple(AssetExcludedExtensionsConfig.get_excluded_extensions()),
+        path,
+    )
+    url = cache.get(cache_key)
+    if url is None:
+        url = _lookup_course_asset_url(course_id, path)
+        cache.set(cache_key, url, len(path) + len(url))
+    return url
+
+
+def _static_url_replacement_function(
     data_directory=None,
     course_id=None,
     static_asset_path='',
@@ -157,22 +270,9 @@ def replace_static_urls(
     lookup_asset_url=None
 ):
     """
-    Replace /static/$stuff urls either with their correct url as generated by collectstatic,
-    (/static/$md5_hashed_stuff) or by the course-specific content static url
-    /static/$course_data_dir/$stuff, or, if course_namespace is not None, by the
-    correct url in the contentstore (/c4x/.. or /asset-loc:..) or by lookup_asset_url
-
-    text: The source text to do the substitution in
-    data_directory: The directory in which course data is stored
-    course_id: The course identifier used to distinguish static content for this course in studio
-    static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
-    static_paths_out: (optional) pass an array to collect tuples for each static URI found:
-      * the original unmodified static URI
-      * the updated static URI (will match the original if unchanged)
-    xblock: xblock where the static assets are stored
-    lookup_url_func: Lookup function which returns the correct path of the asset
+    Returns the replacement function that replace_static_urls runs on each matched url.
+    See replace_static_urls for the arguments.
     """
-
     if static_paths_out is None:
         static_paths_out = []
 
@@ -197,29 +297,7 @@ def replace_static_urls(
 
         # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
         elif (not static_asset_path) and course_id:
-            # first look in the static file pipeline and see if we are trying to reference
-            # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
-
-            exists_in_staticfiles_storage = False
-            try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
-            except Exception as err:  # lint-amnesty, pylint: disable=broad-except
-                log.warning("staticfiles_storage couldn't find path {}: {}".format(
-                    rest, str(err)))
-
-            if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
-            else:
-                # if not, then assume it's courseware specific content and then look in the
-                # Mongo-backed database
-                # Import is placed here to avoid model import at project startup.
-                from common.djangoapps.static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
-                base_url = AssetBaseUrlConfig.get_base_url()
-                excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
-
-                if AssetLocator.CANONICAL_NAMESPACE in url:
-                    url = url.replace('block@', 'block/', 1)
+            url = _course_asset_url(course_id, rest)
 
         # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
         else:
@@ -239,4 +317,74 @@ def replace_static_urls(
         static_paths_out.append((original_uri, url))
         return "".join([quote, url, quote])
 
+    return replace_static_url
+
+
+def replace_static_urls(
+    text,
+    data_directory=None,
+    course_id=None,
+    static_asset_path='',
+    static_paths_out=None,
+    xblock=None,
+    lookup_asset_url=None
+):
+    """
+    Replace /static/$stuff urls either with their correct url as generated by collectstatic,
+    (/static/$md5_hashed_stuff) or by the course-specific content static url
+    /static/$course_data_dir/$stuff, or, if course_namespace is not None, by the
+    correct url in the contentstore (/c4x/.. or /asset-loc:..) or by lookup_asset_url
+
+    text: The source text to do the substitution in
+    data_directory: The directory in which course data is stored
+    course_id: The course identifier used to distinguish static content for this course in studio
+    static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
+    static_paths_out: (optional) pass an array to collect tuples for each static URI found:
+      * the original unmodified static URI
+      * the updated static URI (will match the original if unchanged)
+    xblock: xblock where the static assets are stored
+    lookup_url_func: Lookup function which returns the correct path of the asset
+    """
+    replace_static_url = _static_url_replacement_function(
+        data_directory, course_id, static_asset_path, static_paths_out, xblock, lookup_asset_url
+    )
     return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+
+
+def replace_urls(
+    text,
+    course_id,
+    data_directory=None,
+    static_asset_path='',
+    static_paths_out=None,
+    jump_to_id_base_url=None
+):
+    """
+    Replace /static/, /course/ and, if jump_to_id_base_url is given, /jump_to_id/ urls
+    in a single pass over the text, with the same result as running replace_static_urls,
+    replace_course_urls and replace_jump_to_id_urls one after the other.
+
+    See those functions for the arguments.
+    """
+    prefixes = [_static_url_prefix(static_asset_path or data_directory), COURSE_URL_PREFIX]
+    if jump_to_id_base_url:
+        prefixes.append(JUMP_TO_ID_URL_PREFIX)
+
+    replace_static_url = _static_url_replacer(_static_url_replacement_function(
+        data_directory, course_id, static_asset_path, static_paths_out
+    ))
+    replace_course_url = _course_url_replacer(course_id)
+    replace_jump_to_id_url = _jump_to_id_url_replacer(jump_to_id_base_url)
+
+    def replace_url(match):
+        """
+        Replace a single matched url according to its prefix.
+        """
+        prefix = match.group('prefix')
+        if prefix == COURSE_URL_PREFIX:
+            return replace_course_url(match)
+        if prefix == JUMP_TO_ID_URL_PREFIX:
+            return replace_jump_to_id_url(match)
+        return replace_static_url(match)
+
+    return _url_replace_pattern('|'.join(prefixes)).sub(replace_url, text)
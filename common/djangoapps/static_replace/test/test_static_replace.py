@@ -8,7 +8,9 @@ from urllib.parse import parse_qsl, quote, urlparse, urlunparse, urlencode
 
 import ddt
 import pytest
+from django.core.cache.backends.locmem import LocMemCache
 from django.test import override_settings
+from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.keys import CourseKey
 from PIL import Image
 from web_fragments.fragment import Fragment
@@ -20,9 +22,13 @@ from common.djangoapps.static_replace import (
     replace_course_urls,
     replace_static_urls,
     replace_jump_to_id_urls,
+    replace_urls,
 )
+from common.djangoapps.static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
 from common.djangoapps.static_replace.services import ReplaceURLService
 from common.djangoapps.static_replace.wrapper import replace_urls_wrapper
+from openedx.core.djangoapps.contentserver.caching import del_cached_content
+from openedx.core.lib.cache_utils import ProcessLRUCache
 from xmodule.assetstore.assetmgr import AssetManager  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.contentstore.content import StaticContent  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.contentstore.django import contentstore  # lint-amnesty, pylint: disable=wrong-import-order
@@ -144,6 +150,64 @@ def test_mongo_filestore(mock_get_excluded_extensions, mock_get_base_url, mock_m
     mock_static_content.get_canonicalized_asset_path.assert_called_once_with(COURSE_KEY, 'file.png', '', ['foobar'])
 
 
+@patch('common.djangoapps.static_replace._lookup_course_asset_url', lambda course_id, path: '/asset/' + path)
+@patch('common.djangoapps.static_replace.staticfiles_storage', autospec=True)
+def test_replace_urls_single_pass(mock_storage):
+    """
+    Make sure replace_urls gives the same result as replacing each kind of url in turn.
+    """
+    mock_storage.url.side_effect = lambda path: '/static/' + path
+    text = (
+        '<img src="/static/file.png"/><a href="/course/info">x</a><a href=\'/jump_to_id/id\'>y</a>'
+        '<img src="/static/data_dir/file.png"/><script src="/static/xblock/resources/x.js"/>"/static/file.png?raw"'
+    )
+    expected_paths, paths = [], []
+    expected = replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY, static_paths_out=expected_paths)
+    expected = replace_course_urls(expected, COURSE_KEY)
+    assert replace_urls(text, COURSE_KEY, DATA_DIRECTORY, static_paths_out=paths) == expected
+    assert paths == expected_paths
+
+    expected = replace_jump_to_id_urls(expected, COURSE_KEY, '/jump_to/')
+    assert replace_urls(text, COURSE_KEY, DATA_DIRECTORY, jump_to_id_base_url='/jump_to/') == expected
+    assert '"/asset/file.png"' in expected
+    assert '"/courses/org/course/run/info"' in expected
+    assert "'/jump_to/id'" in expected
+
+
+@pytest.mark.django_db
+@patch('openedx.core.djangoapps.contentserver.caching.CONTENT_CACHE', LocMemCache('course_assets', {}))
+@patch('common.djangoapps.static_replace._asset_url_cache', Mock(return_value=ProcessLRUCache('test', 1000)))
+@patch('common.djangoapps.static_replace._lookup_course_asset_url')
+def test_course_asset_url_cache(mock_lookup):
+    """
+    Make sure course asset urls are looked up once per version of the course's assets.
+    """
+    mock_lookup.side_effect = lambda course_id, path: '/asset/' + path
+    text = '"/static/file.png" "/static/file.png"'
+
+    for _ in range(2):
+        RequestCache.clear_all_namespaces()
+        assert replace_static_urls(text, course_id=COURSE_KEY) == '"/asset/file.png" "/asset/file.png"'
+    assert mock_lookup.call_count == 1
+
+    # Changing any asset of the course changes the version of its assets.
+    del_cached_content(COURSE_KEY.make_asset_key('asset', 'other.png'))
+    RequestCache.clear_all_namespaces()
+    replace_static_urls(text, course_id=COURSE_KEY)
+    assert mock_lookup.call_count == 2
+
+    # Changing the asset url configuration changes the urls.
+    AssetBaseUrlConfig.objects.create(enabled=True, base_url='cdn.example.com')
+    RequestCache.clear_all_namespaces()
+    replace_static_urls(text, course_id=COURSE_KEY)
+    assert mock_lookup.call_count == 3
+
+    AssetExcludedExtensionsConfig.objects.create(enabled=True, excluded_extensions='png')
+    RequestCache.clear_all_namespaces()
+    replace_static_urls(text, course_id=COURSE_KEY)
+    assert mock_lookup.call_count == 4
+
+
 @patch('common.djangoapps.static_replace.settings', autospec=True)
 @patch('xmodule.modulestore.django.modulestore', autospec=True)
 @patch('common.djangoapps.static_replace.staticfiles_storage', autospec=True)
@@ -617,11 +681,8 @@ class ReplaceURLServiceTest(SharedModuleStoreTestCase):
         self.mock_replace_static_urls = self.create_patch(
             'common.djangoapps.static_replace.services.replace_static_urls'
         )
-        self.mock_replace_course_urls = self.create_patch(
-            'common.djangoapps.static_replace.services.replace_course_urls'
-        )
-        self.mock_replace_jump_to_id_urls = self.create_patch(
-            'common.djangoapps.static_replace.services.replace_jump_to_id_urls'
+        self.mock_replace_urls = self.create_patch(
+            'common.djangoapps.static_replace.services.replace_urls'
         )
 
     def create_patch(self, name):
@@ -637,40 +698,40 @@ class ReplaceURLServiceTest(SharedModuleStoreTestCase):
         replace_url_service = ReplaceURLService(xblock=self.course)
         replace_url_service.replace_urls("text", static_replace_only=True)
         assert self.mock_replace_static_urls.called
-        assert not self.mock_replace_course_urls.called
-        assert not self.mock_replace_jump_to_id_urls.called
+        assert not self.mock_replace_urls.called
 
     def test_service_block_argument(self):
         """This service accepts either `block` or `xblock` keyword argument."""
         replace_url_service = ReplaceURLService(block=self.course)
         replace_url_service.replace_urls("text", static_replace_only=True)
         assert self.mock_replace_static_urls.called
-        assert not self.mock_replace_course_urls.called
-        assert not self.mock_replace_jump_to_id_urls.called
+        assert not self.mock_replace_urls.called
 
     def test_replace_course_urls_called(self):
         """
-        Test replace_course_urls method called static_replace_only is passed as False.
+        Test all URLs are replaced in a single pass when static_replace_only is passed as False.
         """
         replace_url_service = ReplaceURLService(xblock=self.course)
         replace_url_service.replace_urls("text")
-        assert self.mock_replace_course_urls.called
+        assert not self.mock_replace_static_urls.called
+        self.mock_replace_urls.assert_called_once()
+        assert self.mock_replace_urls.call_args[0][1] == self.course.id
 
     def test_replace_jump_to_id_urls_called(self):
         """
-        Test replace_jump_to_id_urls method called jump_to_id_base_url is provided.
+        Test jump-to-id URLs are replaced when jump_to_id_base_url is provided.
         """
         replace_url_service = ReplaceURLService(xblock=self.course, jump_to_id_base_url="/course/course_id")
         replace_url_service.replace_urls("text")
-        assert self.mock_replace_jump_to_id_urls.called
+        assert self.mock_replace_urls.call_args[1]['jump_to_id_base_url'] == "/course/course_id"
 
     def test_replace_jump_to_id_urls_not_called(self):
         """
-        Test replace_jump_to_id_urls method called jump_to_id_base_url is not provided.
+        Test jump-to-id URLs are not replaced when jump_to_id_base_url is not provided.
         """
         replace_url_service = ReplaceURLService(xblock=self.course)
         replace_url_service.replace_urls("text")
-        assert not self.mock_replace_jump_to_id_urls.called
+        assert self.mock_replace_urls.call_args[1]['jump_to_id_base_url'] is None
 
 
 @ddt.ddt
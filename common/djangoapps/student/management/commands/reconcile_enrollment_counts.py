@@ -0,0 +1,59 @@
+"""
+Recount the active enrollments in each mode of courses into the CourseEnrollmentCount table.
+
+Run this after enabling the MAINTAIN_COURSE_ENROLLMENT_COUNTS setting to initialize the counts, and
+periodically afterwards to correct the counts of enrollments changed without saving the model.
+"""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from common.djangoapps.student.models import CourseEnrollment, CourseEnrollmentCount
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Management command to reconcile the precomputed enrollment counts of courses.
+    """
+    help = """
+    Recounts the active enrollments in each mode of the given courses, or of every course with
+    enrollments or enrollment counts, and corrects the stored counts that differ.
+
+    Example:
+            $ ... reconcile_enrollment_counts
+            $ ... reconcile_enrollment_counts course-v1:org+course+run
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'course_ids',
+            nargs='*',
+            metavar='course_id',
+            help='Courses to reconcile, all courses if omitted.')
+
+    def handle(self, *args, **options):
+        if options['course_ids']:
+            try:
+                course_keys = [CourseKey.from_string(course_id) for course_id in options['course_ids']]
+            except InvalidKeyError as error:
+                raise CommandError(f'Invalid course id: {error}') from error
+        else:
+            course_keys = set(
+                CourseEnrollment.objects.order_by().values_list('course_id', flat=True).distinct()
+            ) | set(
+                CourseEnrollmentCount.objects.order_by().values_list('course_id', flat=True).distinct()
+            )
+
+        num_corrected = 0
+        for course_key in sorted(course_keys, key=str):
+            corrections = CourseEnrollmentCount.reconcile(course_key)
+            for mode, (previous, count) in sorted(corrections.items()):
+                logger.info('Corrected the %s enrollment count of %s from %d to %d', mode, course_key, previous, count)
+            num_corrected += bool(corrections)
+
+        logger.info('Reconciled the enrollment counts of %d courses, %d corrected', len(course_keys), num_corrected)
@@ -0,0 +1,46 @@
+"""
+Tests for the reconcile_enrollment_counts management command.
+"""
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from common.djangoapps.course_modes.models import CourseMode
+from common.djangoapps.student.models import CourseEnrollment, CourseEnrollmentCount
+from common.djangoapps.student.tests.factories import CourseEnrollmentFactory
+from openedx.core.djangoapps.content.course_overviews.tests.factories import CourseOverviewFactory
+
+
+@override_settings(MAINTAIN_COURSE_ENROLLMENT_COUNTS=False)
+class ReconcileEnrollmentCountsTests(TestCase):
+    """
+    Tests for the reconcile_enrollment_counts management command.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.courses = [CourseOverviewFactory() for __ in range(2)]
+        for course in self.courses:
+            CourseEnrollmentFactory(course=course, mode=CourseMode.AUDIT)
+            CourseEnrollmentFactory(course=course, mode=CourseMode.VERIFIED)
+        CourseEnrollmentCount.objects.create(course_id=self.courses[0].id, mode=CourseMode.HONOR, count=5)
+
+    def counts(self, course):
+        return CourseEnrollmentCount.counts_for_course(course.id)
+
+    def test_reconcile_all_courses(self):
+        call_command('reconcile_enrollment_counts')
+        for course in self.courses:
+            assert self.counts(course) == {CourseMode.AUDIT: 1, CourseMode.VERIFIED: 1}
+
+    def test_reconcile_given_courses(self):
+        CourseEnrollment.objects.filter(course_id=self.courses[1].id, mode=CourseMode.AUDIT).update(is_active=False)
+
+        call_command('reconcile_enrollment_counts', str(self.courses[1].id))
+        assert self.counts(self.courses[0]) == {CourseMode.HONOR: 5}
+        assert self.counts(self.courses[1]) == {CourseMode.VERIFIED: 1}
+
+    def test_invalid_course_id(self):
+        with pytest.raises(CommandError):
+            call_command('reconcile_enrollment_counts', 'not-a-course-id')
@@ -12,8 +12,8 @@ from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imp
 from django.core.cache import cache
 from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
 from django.core.validators import FileExtensionValidator
-from django.db import models
-from django.db.models import Count, Index, Q
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Index, Q
 from django.dispatch import receiver
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
@@ -32,9 +32,15 @@ from openedx_filters.learning.filters import CourseEnrollmentStarted, CourseUnen
 from pytz import UTC
 from requests.exceptions import HTTPError, RequestException
 from simple_history.models import HistoricalRecords
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
 
 from common.djangoapps.course_modes.models import CourseMode, get_cosmetic_verified_display_price
-from common.djangoapps.student.signals import ENROLL_STATUS_CHANGE, ENROLLMENT_TRACK_UPDATED, UNENROLL_DONE
+from common.djangoapps.student.signals import (
+    COURSE_ENROLLMENTS_BULK_SAVED,
+    ENROLL_STATUS_CHANGE,
+    ENROLLMENT_TRACK_UPDATED,
+    UNENROLL_DONE,
+)
 from common.djangoapps.track import contexts, segment
 from common.djangoapps.util.query import use_read_replica_if_available
 from lms.djangoapps.certificates.data import CertificateStatuses
@@ -84,6 +90,8 @@ ALLOWEDTOENROLL_TO_UNENROLLED = 'from allowed to enroll to enrolled'
 UNENROLLED_TO_UNENROLLED = 'from unenrolled to unenrolled'
 DEFAULT_TRANSITION_STATE = 'N/A'
 SCORE_RECALCULATION_DELAY_ON_ENROLLMENT_UPDATE = 30
+# The number of enrollments written by each query of CourseEnrollment.bulk_enroll and bulk_unenroll.
+BULK_ENROLLMENT_BATCH_SIZE = 1000
 
 TRANSITION_STATES = (
     (UNENROLLED_TO_ALLOWEDTOENROLL, UNENROLLED_TO_ALLOWEDTOENROLL),
@@ -224,6 +232,7 @@ class CourseEnrollmentManager(models.Manager):
         """
         # To avoid circular imports.
         from common.djangoapps.student.roles import CourseCcxCoachRole, CourseInstructorRole, CourseStaffRole
+        from common.djangoapps.student.toggles import should_use_precomputed_course_enrollment_counts
         course_locator = course_id
 
         if getattr(course_id, 'ccx', None):
@@ -233,6 +242,16 @@ class CourseEnrollmentManager(models.Manager):
         admins = CourseInstructorRole(course_locator).users_with_role()
         coaches = CourseCcxCoachRole(course_locator).users_with_role()
 
+        if should_use_precomputed_course_enrollment_counts():
+            # Only count the few enrollments of the course team, and subtract them from the precomputed total.
+            num_enrolled = sum(CourseEnrollmentCount.counts_for_course(course_id).values())
+            num_enrolled_admins = super().get_queryset().filter(
+                Q(user__in=staff) | Q(user__in=admins) | Q(user__in=coaches),
+                course_id=course_id,
+                is_active=1,
+            ).count()
+            return max(num_enrolled - num_enrolled_admins, 0)
+
         return super().get_queryset().filter(
             course_id=course_id,
             is_active=1,
@@ -275,6 +294,13 @@ class CourseEnrollmentManager(models.Manager):
         Returns a dictionary that stores the total enrollment count for a course, as well as the
         enrollment count for each individual mode.
         """
+        # To avoid circular imports.
+        from common.djangoapps.student.toggles import should_use_precomputed_course_enrollment_counts
+        if should_use_precomputed_course_enrollment_counts():
+            enroll_dict = defaultdict(int, CourseEnrollmentCount.counts_for_course(course_id))
+            enroll_dict['total'] = sum(enroll_dict.values())
+            return enroll_dict
+
         # Unfortunately, Django's "group by"-style queries look super-awkward
         query = use_read_replica_if_available(
             super().get_queryset().filter(course_id=course_id, is_active=True).values(
@@ -288,6 +314,10 @@ class CourseEnrollmentManager(models.Manager):
         return enroll_dict
 
 
+# Placeholder for the counted mode of an enrollment loaded without its mode or active status.
+_UNKNOWN_COUNTED_MODE = object()
+
+
 # Named tuple for fields pertaining to the state of
 # CourseEnrollment for a user in a course.  This type
 # is used to cache the state in the request cache.
@@ -359,6 +389,33 @@ class CourseEnrollment(models.Model):
         # When the property .course_overview is accessed for the first time, this variable will be set.
         self._course_overview = None
 
+        # The mode this enrollment is counted in by CourseEnrollmentCount, i.e. its mode if it was active when it
+        # was last loaded from or saved to the database, else None.
+        self._counted_mode = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._counted_mode = instance._mode_to_count()  # pylint: disable=protected-access
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None or {'mode', 'is_active'} <= set(fields):
+            self._counted_mode = self._mode_to_count()
+        elif {'mode', 'is_active'} & set(fields):
+            # Only one of them was loaded, the other may have been changed since.
+            self._counted_mode = _UNKNOWN_COUNTED_MODE
+
+    def _mode_to_count(self):
+        """
+        Returns the mode this enrollment should be counted in by CourseEnrollmentCount, or
+        _UNKNOWN_COUNTED_MODE if its mode or active status have not been loaded.
+        """
+        if {'mode', 'is_active'} & self.get_deferred_fields():
+            return _UNKNOWN_COUNTED_MODE
+        return self.mode if self.is_active else None
+
     def __str__(self):
         return (
             "[CourseEnrollment] {}: {} ({}); active: ({})"
@@ -477,19 +534,7 @@ class CourseEnrollment(models.Model):
         """
         RequestCache('get_enrollment').clear()
 
-        activation_changed = False
-        # if is_active is None, then the call to update_enrollment didn't specify
-        # any value, so just leave is_active as it is
-        if self.is_active != is_active and is_active is not None:
-            self.is_active = is_active
-            activation_changed = True
-
-        mode_changed = False
-        # if mode is None, the call to update_enrollment didn't specify a new
-        # mode, so leave as-is
-        if self.mode != mode and mode is not None:
-            self.mode = mode
-            mode_changed = True
+        activation_changed, mode_changed = self._set_mode_and_activation(mode, is_active)
 
         try:
             course_data = CourseData(
@@ -509,6 +554,40 @@ class CourseEnrollment(models.Model):
                 CourseEnrollmentState(self.mode, self.is_active),
             )
 
+        self._send_enrollment_updated(
+            course_data, activation_changed, mode_changed, skip_refund=skip_refund, enterprise_uuid=enterprise_uuid,
+        )
+
+    def _set_mode_and_activation(self, mode, is_active):
+        """
+        Sets the mode and active status of the enrollment, without saving it.
+
+        Returns whether the active status and the mode changed.
+        """
+        activation_changed = False
+        # if is_active is None, then the call to update_enrollment didn't specify
+        # any value, so just leave is_active as it is
+        if self.is_active != is_active and is_active is not None:
+            self.is_active = is_active
+            activation_changed = True
+
+        mode_changed = False
+        # if mode is None, the call to update_enrollment didn't specify a new
+        # mode, so leave as-is
+        if self.mode != mode and mode is not None:
+            self.mode = mode
+            mode_changed = True
+
+        return activation_changed, mode_changed
+
+    def _send_enrollment_updated(
+        self, course_data, activation_changed, mode_changed, skip_refund=False, enterprise_uuid=None
+    ):
+        """
+        Sends the signals and emits the events of an enrollment whose mode or active status were
+        changed and saved.
+        """
+        if activation_changed or mode_changed:
             # .. event_implemented_name: COURSE_ENROLLMENT_CHANGED
             # .. event_type: org.openedx.learning.course.enrollment.changed.v1
             COURSE_ENROLLMENT_CHANGED.send_event(
@@ -775,28 +854,236 @@ class CourseEnrollment(models.Model):
         enrollment = cls.get_or_create_enrollment(user, course_key)
         enrollment.update_enrollment(is_active=True, mode=mode, enterprise_uuid=enterprise_uuid)
         enrollment.send_signal(EnrollStatusChange.enroll)
+        enrollment._send_enrollment_created(course_data)
 
+        return enrollment
+
+    def _send_enrollment_created(self, course_data):
+        """
+        Sends the COURSE_ENROLLMENT_CREATED event of an enrollment made by enroll.
+        """
         # .. event_implemented_name: COURSE_ENROLLMENT_CREATED
         # .. event_type: org.openedx.learning.course.enrollment.created.v1
         COURSE_ENROLLMENT_CREATED.send_event(
             enrollment=CourseEnrollmentData(
                 user=UserData(
                     pii=UserPersonalData(
-                        username=user.username,
-                        email=user.email,
-                        name=user.profile.name,
+                        username=self.user.username,
+                        email=self.user.email,
+                        name=self.user.profile.name,
                     ),
-                    id=user.id,
-                    is_active=user.is_active,
+                    id=self.user.id,
+                    is_active=self.user.is_active,
                 ),
                 course=course_data,
-                mode=enrollment.mode,
-                is_active=enrollment.is_active,
-                creation_date=enrollment.created,
+                mode=self.mode,
+                is_active=self.is_active,
+                creation_date=self.created,
             )
         )
 
-        return enrollment
+    @classmethod
+    def bulk_enroll(cls, users, course_key, mode=None):
+        """
+        Enroll users in a course, like enroll without check_access, but reading and writing the enrollments
+        of all the users with a few queries for each BULK_ENROLLMENT_BATCH_SIZE users.
+
+        The enrollments are written with bulk_create and bulk_update, which don't send post_save, so
+        COURSE_ENROLLMENTS_BULK_SAVED is sent with them instead. The other signals and events are sent for
+        each enrollment as enroll sends them. Select the profiles of the users with them to avoid a query for
+        each user.
+
+        Returns a dict of the CourseEnrollment of each user by user id. The users whose enrollment is
+        prevented by the CourseEnrollmentStarted filter are left out.
+        """
+        RequestCache('get_enrollment').clear()
+
+        default_mode = _default_course_mode(str(course_key)) if mode is None else mode
+        user_modes = {}
+        enrollments = {}
+        for user in users:
+            try:
+                # .. filter_implemented_name: CourseEnrollmentStarted
+                # .. filter_type: org.openedx.learning.course.enrollment.started.v1
+                user, filtered_course_key, user_mode = CourseEnrollmentStarted.run_filter(
+                    user=user, course_key=course_key, mode=mode,
+                )
+            except CourseEnrollmentStarted.PreventEnrollment as exc:
+                log.warning("User %s was not enrolled in %s: %s", user.username, str(course_key), str(exc))
+                continue
+            if user.id is None:
+                user.save()
+            if filtered_course_key != course_key:
+                enrollments[user.id] = cls.enroll(user, filtered_course_key, user_mode)
+            else:
+                user_modes[user.id] = (user, user_mode or default_mode)
+
+        course = cls._get_course_for_bulk_update(course_key)
+        created = []
+        updated = []
+        changes = {}
+        for user_ids in cls._batches(list(user_modes)):
+            existing = {
+                enrollment.user_id: enrollment
+                for enrollment in cls.objects.filter(course_id=course_key, user_id__in=user_ids)
+            }
+            for user_id in user_ids:
+                user, user_mode = user_modes[user_id]
+                enrollment = existing.get(user_id)
+                if enrollment is None:
+                    enrollment = cls(user=user, course_id=course_key, mode=user_mode, is_active=True)
+                    created.append(enrollment)
+                    # Like an enrollment created by get_or_create_enrollment and then activated.
+                    changes[user_id] = (True, user_mode != CourseMode.DEFAULT_MODE_SLUG)
+                else:
+                    enrollment.user = user
+                    changes[user_id] = enrollment._set_mode_and_activation(user_mode, True)
+                    if any(changes[user_id]):
+                        updated.append(enrollment)
+                enrollments[user_id] = enrollment
+
+        try:
+            created = cls._bulk_save(course, created, updated)
+        except IntegrityError:
+            # Some of the users were enrolled meanwhile, so enroll them one by one.
+            log.warning("Enrolling %d users in %s one by one after a conflict", len(user_modes), str(course_key))
+            for user, user_mode in user_modes.values():
+                enrollments[user.id] = cls.enroll(user, course_key, user_mode)
+            return enrollments
+
+        for enrollment in created:
+            enrollments[enrollment.user_id] = enrollment
+
+        # Link the unlinked CourseEnrollmentAlloweds of the users, as get_or_create_enrollment does.
+        users_by_email = {user.email: user for user, __ in user_modes.values()}
+        allowed_enrollments = []
+        for emails in cls._batches(list(users_by_email)):
+            for allowed_enrollment in CourseEnrollmentAllowed.objects.filter(
+                email__in=emails, course_id=course_key, user__isnull=True,
+            ):
+                allowed_enrollment.user = users_by_email[allowed_enrollment.email]
+                allowed_enrollments.append(allowed_enrollment)
+        CourseEnrollmentAllowed.objects.bulk_update(
+            allowed_enrollments, ['user'], batch_size=BULK_ENROLLMENT_BATCH_SIZE,
+        )
+
+        course_data = cls._get_course_data(course_key, course)
+        for user_id in user_modes:
+            enrollment = enrollments[user_id]
+            activation_changed, mode_changed = changes[user_id]
+            enrollment._send_enrollment_updated(course_data, activation_changed, mode_changed)
+            enrollment.send_signal(EnrollStatusChange.enroll)
+            enrollment._send_enrollment_created(course_data)
+
+        return enrollments
+
+    @classmethod
+    def bulk_unenroll(cls, users, course_key, skip_refund=False):
+        """
+        Remove users from a course, like unenroll, but reading and writing the enrollments of all the users
+        with a few queries for each BULK_ENROLLMENT_BATCH_SIZE users.
+
+        See bulk_enroll for the signals and events that are sent. The users who aren't enrolled and the users
+        whose unenrollment is prevented by the CourseUnenrollmentStarted filter are logged and left out.
+
+        Returns a dict of the CourseEnrollment of each unenrolled user by user id.
+        """
+        RequestCache('get_enrollment').clear()
+
+        users = {user.id: user for user in users}
+        course = cls._get_course_for_bulk_update(course_key)
+        enrollments = {}
+        updated = []
+        for user_ids in cls._batches(list(users)):
+            for enrollment in cls.objects.filter(course_id=course_key, user_id__in=user_ids):
+                enrollment.user = users[enrollment.user_id]
+                try:
+                    # .. filter_implemented_name: CourseUnenrollmentStarted
+                    # .. filter_type: org.openedx.learning.course.unenrollment.started.v1
+                    enrollment = CourseUnenrollmentStarted.run_filter(enrollment=enrollment)
+                except CourseUnenrollmentStarted.PreventUnenrollment as exc:
+                    log.warning(
+                        "User %s was not unenrolled from %s: %s", enrollment.user.username, str(course_key), str(exc)
+                    )
+                    continue
+                if enrollment._set_mode_and_activation(None, False)[0]:
+                    updated.append(enrollment)
+                enrollments[enrollment.user_id] = enrollment
+
+        for user_id in users.keys() - enrollments.keys():
+            log.error(
+                "Tried to unenroll student %s from %s but they were not enrolled",
+                users[user_id],
+                course_key
+            )
+
+        cls._bulk_save(course, [], updated)
+
+        course_data = cls._get_course_data(course_key, course)
+        for enrollment in updated:
+            enrollment._send_enrollment_updated(
+                course_data, True, False, skip_refund=skip_refund,
+            )
+
+        return enrollments
+
+    @classmethod
+    def _batches(cls, items):
+        """
+        Yields the items in lists of BULK_ENROLLMENT_BATCH_SIZE items.
+        """
+        for start in range(0, len(items), BULK_ENROLLMENT_BATCH_SIZE):
+            yield items[start:start + BULK_ENROLLMENT_BATCH_SIZE]
+
+    @classmethod
+    def _get_course_for_bulk_update(cls, course_key):
+        """
+        Returns the CourseOverview of the course, or None if it doesn't exist.
+        """
+        try:
+            return CourseOverview.get_from_id(course_key)
+        except CourseOverview.DoesNotExist:
+            return None
+
+    @classmethod
+    def _get_course_data(cls, course_key, course):
+        """
+        Returns the CourseData of the course for the enrollment events.
+        """
+        if course is None:
+            return CourseData(course_key=course_key)
+        return CourseData(course_key=course_key, display_name=course.display_name)
+
+    @classmethod
+    def _bulk_save(cls, course, created, updated):
+        """
+        Writes the created and updated enrollments with bulk_create and bulk_update, with their history,
+        then updates the caches and sends COURSE_ENROLLMENTS_BULK_SAVED.
+
+        Returns the created enrollments with their ids.
+        """
+        users = [enrollment.user for enrollment in created]
+        with transaction.atomic():
+            # The enrollments are read back when the database doesn't return the ids of the created rows.
+            created = bulk_create_with_history(created, cls, batch_size=BULK_ENROLLMENT_BATCH_SIZE)
+            _move_counted_modes_in_bulk(created, updated)
+            bulk_update_with_history(updated, cls, ['mode', 'is_active'], batch_size=BULK_ENROLLMENT_BATCH_SIZE)
+
+        request_cache = cls._get_mode_active_request_cache()
+        for enrollment, user in zip(created, users):
+            enrollment.user = user
+        for enrollment in created + updated:
+            if course is not None:
+                cls.course.field.set_cached_value(enrollment, course)
+                enrollment._course_overview = course
+            cls._update_enrollment_state_in_cache(
+                request_cache, enrollment.user_id, enrollment.course_id,
+                CourseEnrollmentState(enrollment.mode, enrollment.is_active),
+            )
+        cache.delete_many([cls.enrollment_status_hash_cache_key(enrollment.user) for enrollment in created + updated])
+
+        COURSE_ENROLLMENTS_BULK_SAVED.send(sender=cls, created=created, updated=updated)
+        return created
 
     @classmethod
     def enroll_by_email(cls, email, course_id, mode=None, ignore_errors=True):
@@ -971,13 +1258,51 @@ class CourseEnrollment(models.Model):
 
         The name of this method is long, but was the end result of hashing out a
         number of alternatives, so pylint can stuff it (disable=invalid-name)
+
+        When the student.dashboard_course_overview_projection switch is enabled,
+        the CourseOverviews are instead loaded with preload_dashboard_course_overviews,
+        and a list of the enrollments whose CourseOverview was found is returned.
         """
-        enrollments = cls.enrollments_for_user(user).select_related('schedule', 'course', 'course__image_set')
+        from common.djangoapps.student.toggles import should_use_dashboard_course_overview_projection
 
-        if courses_limit:
-            return enrollments.order_by('-created')[:courses_limit]
+        if should_use_dashboard_course_overview_projection():
+            enrollments = cls.enrollments_for_user(user).select_related('schedule')
         else:
-            return enrollments
+            enrollments = cls.enrollments_for_user(user).select_related('schedule', 'course', 'course__image_set')
+
+        if courses_limit:
+            enrollments = enrollments.order_by('-created')[:courses_limit]
+
+        if should_use_dashboard_course_overview_projection():
+            return cls.preload_dashboard_course_overviews(enrollments)
+        return enrollments
+
+    @classmethod
+    def preload_dashboard_course_overviews(cls, enrollments):
+        """
+        Sets the CourseOverviews of the given CourseEnrollments to those loaded for them
+        with CourseOverview.get_dashboard_overviews, and returns them as a list.
+
+        The enrollments in courses whose overview is missing are left out, rather than
+        loading their course from the modulestore.
+        """
+        enrollments = list(enrollments)
+        course_overviews = CourseOverview.get_dashboard_overviews({
+            enrollment.course_id for enrollment in enrollments
+        })
+        preloaded_enrollments = []
+        for enrollment in enrollments:
+            course_overview = course_overviews[enrollment.course_id]
+            if course_overview is None:
+                log.info(
+                    'Course Overviews: leaving out enrollment of user %s in course %s until its overview is generated.',
+                    enrollment.user_id,
+                    enrollment.course_id,
+                )
+                continue
+            cls.course.field.set_cached_value(enrollment, course_overview)
+            preloaded_enrollments.append(enrollment)
+        return preloaded_enrollments
 
     @classmethod
     def enrollment_status_hash_cache_key(cls, user):
@@ -1485,6 +1810,224 @@ class FBEEnrollmentExclusion(models.Model):
         return f"[FBEEnrollmentExclusion] {self.enrollment}"
 
 
+class CourseEnrollmentCount(models.Model):
+    """
+    The number of active enrollments in each mode of a course.
+
+    The counts are kept up to date from the saves and deletes of CourseEnrollment while the
+    MAINTAIN_COURSE_ENROLLMENT_COUNTS setting is enabled, so that reading the enrollment counts of a
+    course doesn't have to count the rows of the enrollment table. They are updated once the transaction
+    that saves the enrollment is committed. Enrollments changed in any other way, or whose transaction
+    committed without the count being updated, are corrected by the reconcile_enrollment_counts management
+    command, which has to run periodically.
+
+    .. no_pii:
+    """
+    course_id = CourseKeyField(max_length=255)
+    mode = models.CharField(max_length=100)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = (('course_id', 'mode'),)
+
+    def __str__(self):
+        return f"[CourseEnrollmentCount] {self.course_id} ({self.mode}): {self.count}"
+
+    @classmethod
+    def counts_for_course(cls, course_id):
+        """
+        Returns a dict of the number of active enrollments in the course by mode.
+        """
+        return dict(cls.objects.filter(course_id=course_id, count__gt=0).values_list('mode', 'count'))
+
+    @classmethod
+    def adjust(cls, course_id, mode, delta):
+        """
+        Atomically adds delta to the number of active enrollments in the mode of the course.
+        """
+        if not cls.objects.filter(course_id=course_id, mode=mode).update(count=F('count') + delta):
+            cls.objects.get_or_create(course_id=course_id, mode=mode)
+            cls.objects.filter(course_id=course_id, mode=mode).update(count=F('count') + delta)
+
+    @classmethod
+    def reconcile(cls, course_id):
+        """
+        Recounts the active enrollments in each mode of the course from the enrollment table, and corrects
+        the stored counts that differ.
+
+        Returns:
+            dict: the corrected counts by mode, with their previous value.
+        """
+        with transaction.atomic():
+            stored = {
+                count.mode: count
+                for count in cls.objects.select_for_update().filter(course_id=course_id)
+            }
+            actual = dict(
+                CourseEnrollment.objects.filter(course_id=course_id, is_active=True).values(
+                    'mode').order_by().annotate(mode_count=Count('id')).values_list('mode', 'mode_count')
+            )
+            corrections = {}
+            for mode in set(stored) | set(actual):
+                previous = stored[mode].count if mode in stored else 0
+                if previous != actual.get(mode, 0):
+                    cls.objects.update_or_create(
+                        course_id=course_id, mode=mode, defaults={'count': actual.get(mode, 0)}
+                    )
+                    corrections[mode] = (previous, actual.get(mode, 0))
+        return corrections
+
+
+def _counted_state(counted_mode):
+    """
+    Returns the values of the mode and active status of an enrollment counted in the given mode, or in
+    no mode if None.
+    """
+    return {'is_active': False} if counted_mode is None else {'is_active': True, 'mode': counted_mode}
+
+
+def _move_counted_mode(enrollment, new_mode):
+    """
+    Changes the mode and active status of the enrollment in the database to the ones counted in new_mode,
+    with an UPDATE conditioned on the ones it is counted in, and returns the mode it was counted in.
+
+    Of concurrent saves of the same change, only the one whose UPDATE matched the previous state moves
+    the enrollment between the counts; the others find it already counted in new_mode.
+
+    Returns _UNKNOWN_COUNTED_MODE if the enrollment isn't in the database.
+    """
+    old_mode = enrollment._counted_mode  # pylint: disable=protected-access
+    while True:
+        if old_mode is not _UNKNOWN_COUNTED_MODE and CourseEnrollment.objects.filter(
+            pk=enrollment.pk, **_counted_state(old_mode)
+        ).update(**_counted_state(new_mode)):
+            return old_mode
+        # The enrollment was changed since it was loaded, so retry from its current state.
+        state = CourseEnrollment.objects.filter(pk=enrollment.pk).values_list('mode', 'is_active').first()
+        if state is None:
+            return _UNKNOWN_COUNTED_MODE
+        old_mode = state[0] if state[1] else None
+
+
+def _adjust_counts_on_commit(deltas, courses_to_reconcile=()):
+    """
+    Adds the deltas, by course and mode, to the CourseEnrollmentCounts once the current transaction is
+    committed, so that the counter rows, which every enrollment in a course changes, are only locked
+    for the duration of their own UPDATE.
+
+    A process that stops between the commit and the update leaves the counts too low or too high, which is
+    why the reconcile_enrollment_counts management command has to run periodically.
+    """
+    deltas = {(course_id, mode): delta for (course_id, mode), delta in deltas.items() if delta}
+    if not deltas and not courses_to_reconcile:
+        return
+
+    def adjust():
+        for (course_id, mode), delta in deltas.items():
+            if course_id not in courses_to_reconcile:
+                CourseEnrollmentCount.adjust(course_id, mode, delta)
+        for course_id in courses_to_reconcile:
+            CourseEnrollmentCount.reconcile(course_id)
+
+    transaction.on_commit(adjust)
+
+
+@receiver(models.signals.pre_save, sender=CourseEnrollment)
+@receiver(models.signals.post_save, sender=CourseEnrollment)
+@receiver(models.signals.pre_delete, sender=CourseEnrollment)
+def update_course_enrollment_counts(
+    sender, instance, signal, created=False, update_fields=None, **kwargs
+):  # pylint: disable=unused-argument
+    """
+    Move the enrollment between the counts of CourseEnrollmentCount when its mode or active status changes.
+
+    Changed enrollments are moved before they are saved or deleted, see _move_counted_mode, and created
+    enrollments are counted once they are saved.
+    """
+    # To avoid circular imports.
+    from common.djangoapps.student.toggles import should_maintain_course_enrollment_counts
+    if not should_maintain_course_enrollment_counts():
+        return
+
+    # pylint: disable=protected-access
+    if signal is models.signals.post_save:
+        if created:
+            instance._counted_mode = instance._mode_to_count()
+            if instance._counted_mode is not None:
+                _adjust_counts_on_commit({(instance.course_id, instance._counted_mode): 1})
+        return
+
+    if instance.pk is None:
+        return
+
+    if signal is models.signals.pre_delete:
+        new_mode = None
+    else:
+        saved_fields = {'mode', 'is_active'} - instance.get_deferred_fields()
+        if update_fields is not None:
+            saved_fields &= set(update_fields)
+        if not saved_fields:
+            # Neither the mode nor the active status are saved, so they don't change.
+            return
+        if saved_fields != {'mode', 'is_active'}:
+            # Only one of them is saved, so the mode the enrollment is counted in depends on the other one
+            # in the database; recount the course.
+            _adjust_counts_on_commit({}, courses_to_reconcile={instance.course_id})
+            instance._counted_mode = _UNKNOWN_COUNTED_MODE
+            return
+        new_mode = instance._mode_to_count()
+
+    old_mode = _move_counted_mode(instance, new_mode)
+    if old_mode is not _UNKNOWN_COUNTED_MODE and old_mode != new_mode:
+        deltas = defaultdict(int)
+        if old_mode is not None:
+            deltas[(instance.course_id, old_mode)] -= 1
+        if new_mode is not None:
+            deltas[(instance.course_id, new_mode)] += 1
+        _adjust_counts_on_commit(deltas)
+    instance._counted_mode = new_mode
+
+
+def _move_counted_modes_in_bulk(created, updated):
+    """
+    Like update_course_enrollment_counts, for the enrollments that are saved with bulk_create and
+    bulk_update, which don't send pre_save and post_save.
+
+    It must be called in the transaction that saves the enrollments, before they are updated, since
+    the mode they were counted in is read from the database with their rows locked until it commits.
+    """
+    # To avoid circular imports.
+    from common.djangoapps.student.toggles import should_maintain_course_enrollment_counts
+    if not should_maintain_course_enrollment_counts():
+        return
+
+    deltas = defaultdict(int)
+    # pylint: disable=protected-access
+    for enrollment in created:
+        enrollment._counted_mode = enrollment._mode_to_count()
+        if enrollment._counted_mode is not None:
+            deltas[(enrollment.course_id, enrollment._counted_mode)] += 1
+
+    for enrollments in CourseEnrollment._batches(updated):
+        states = {
+            pk: mode if is_active else None
+            for pk, mode, is_active in CourseEnrollment.objects.select_for_update().filter(
+                pk__in=[enrollment.pk for enrollment in enrollments]
+            ).values_list('pk', 'mode', 'is_active')
+        }
+        for enrollment in enrollments:
+            new_mode = enrollment._mode_to_count()
+            old_mode = states.get(enrollment.pk, new_mode)
+            if old_mode != new_mode:
+                if old_mode is not None:
+                    deltas[(enrollment.course_id, old_mode)] -= 1
+                if new_mode is not None:
+                    deltas[(enrollment.course_id, new_mode)] += 1
+            enrollment._counted_mode = new_mode
+
+    _adjust_counts_on_commit(deltas)
+
+
 @receiver(models.signals.post_save, sender=CourseEnrollment)
 @receiver(models.signals.post_delete, sender=CourseEnrollment)
 def invalidate_enrollment_mode_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
@@ -1499,6 +2042,17 @@ def invalidate_enrollment_mode_cache(sender, instance, **kwargs):  # pylint: dis
     cache.delete(cache_key)
 
 
+@receiver(COURSE_ENROLLMENTS_BULK_SAVED, sender=CourseEnrollment)
+def invalidate_enrollment_mode_cache_in_bulk(sender, created, updated, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the cache of the CourseEnrollments saved in bulk.
+    """
+    cache.delete_many([
+        CourseEnrollment.cache_key_name(enrollment.user_id, str(enrollment.course_id))
+        for enrollment in created + updated
+    ])
+
+
 @receiver(models.signals.post_save, sender=CourseEnrollment)
 def update_expiry_email_date(sender, instance, **kwargs):  # pylint: disable=unused-argument
     """
@@ -1512,6 +2066,15 @@ def update_expiry_email_date(sender, instance, **kwargs):  # pylint: disable=unu
         SoftwareSecurePhotoVerification.update_expiry_email_date_for_user(instance.user, email_config)
 
 
+@receiver(COURSE_ENROLLMENTS_BULK_SAVED, sender=CourseEnrollment)
+def update_expiry_email_date_in_bulk(sender, created, updated, **kwargs):  # pylint: disable=unused-argument
+    """
+    Like update_expiry_email_date, for the CourseEnrollments saved in bulk.
+    """
+    for enrollment in created + updated:
+        update_expiry_email_date(sender, enrollment)
+
+
 class ManualEnrollmentAudit(models.Model):
     """
     Table for tracking which enrollments were performed through manual enrollment.
@@ -1543,6 +2106,13 @@ class ManualEnrollmentAudit(models.Model):
             role=role,
         )
 
+    @classmethod
+    def create_manual_enrollment_audits(cls, audits):
+        """
+        saves the given unsaved ManualEnrollmentAudits, with their history, with a few queries
+        """
+        return bulk_create_with_history(audits, cls, batch_size=BULK_ENROLLMENT_BATCH_SIZE)
+
     @classmethod
     def get_manual_enrollment_by_email(cls, email):
         """
@@ -5,15 +5,23 @@ adding users, removing users, and listing members
 
 
 from collections import defaultdict
+import hashlib
 import logging
 from abc import ABCMeta, abstractmethod
+from array import array
+from bisect import bisect_left
 from contextlib import contextmanager
+from uuid import uuid4
 
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
+from django.core.cache import cache
+from django.db.models import Q
+from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.django.models import CourseKeyField
 
-from openedx.core.lib.cache_utils import get_cache
+from openedx.core.lib.cache_utils import get_cache, request_cached
 from common.djangoapps.student.models import CourseAccessRole
+from common.djangoapps.student.toggles import should_cache_course_role_index
 
 log = logging.getLogger(__name__)
 
@@ -172,6 +180,147 @@ class RoleCache:
         )
 
 
+class CourseRoleIndex:
+    """
+    A compact index of the CourseAccessRoles that apply to a course: the roles held in the course itself, and
+    the org-wide roles held in the organization of the course, whatever the case of its name.
+
+    The users with each role are kept as a sorted array of user ids, and the roles of each user as a bitset
+    over `roles`, so that the users with some roles, or the ones among a group of users that have some roles,
+    are found without a query per user or per role. Like RoleCache.has_role, roles only match exactly here,
+    callers that want the roles inheriting from a role should pass RoleCache.get_roles(role).
+
+    When the CACHE_COURSE_ROLE_INDEX setting is enabled, the index is kept in the django cache, under a key
+    that includes a version of the organization of the course. The version changes whenever a CourseAccessRole
+    of the organization is saved or deleted, which drops the cached indexes of all of its courses.
+    """
+
+    CACHE_NAMESPACE = 'student.roles.CourseRoleIndex'
+    CACHE_KEY_PREFIX = CACHE_NAMESPACE
+    CACHE_TIMEOUT = 60 * 60 * 24
+
+    def __init__(self, course_key, roles, user_ids_by_role, role_bits_by_user_id):
+        """
+        Arguments:
+            course_key (CourseKey): the course of the index.
+            roles (list): the (role, org_wide) pairs held by any user, the position of each one being its bit.
+            user_ids_by_role (dict): the sorted array of the ids of the users with each (role, org_wide) pair.
+            role_bits_by_user_id (dict): the bitset of the roles of each user id.
+        """
+        self.course_key = course_key
+        self.roles = roles
+        self._user_ids_by_role = user_ids_by_role
+        self._role_bits_by_user_id = role_bits_by_user_id
+
+    @classmethod
+    def _org_version_cache_key(cls, org):
+        """
+        Returns the cache key of the version of the given organization.
+        """
+        # Org-wide roles can be given to any string, which isn't always a valid cache key.
+        org_hash = hashlib.md5(org.lower().encode("utf-8")).hexdigest()
+        return f'{cls.CACHE_KEY_PREFIX}.org_version.{org_hash}'
+
+    @classmethod
+    def _cache_key(cls, course_key):
+        """
+        Returns the cache key of the index of the given course, for the current version of its organization.
+        """
+        version_key = cls._org_version_cache_key(course_key.org)
+        cache.add(version_key, uuid4().hex, None)
+        return f'{cls.CACHE_KEY_PREFIX}.{course_key}.{cache.get(version_key)}'
+
+    @classmethod
+    def invalidate(cls, org):
+        """
+        Drops the cached indexes of the courses of the given organization.
+        """
+        cache.set(cls._org_version_cache_key(org), uuid4().hex, None)
+        RequestCache(namespace=cls.CACHE_NAMESPACE).clear()
+
+    @classmethod
+    @request_cached(namespace=CACHE_NAMESPACE)
+    def for_course(cls, course_key):
+        """
+        Returns the index of the given course, from the cache when CACHE_COURSE_ROLE_INDEX is enabled.
+        """
+        if not should_cache_course_role_index():
+            return cls.build(course_key)
+
+        cache_key = cls._cache_key(course_key)
+        index = cache.get(cache_key)
+        if index is None:
+            index = cls.build(course_key)
+            cache.set(cache_key, index, cls.CACHE_TIMEOUT)
+        return index
+
+    @classmethod
+    def build(cls, course_key):
+        """
+        Builds the index of the given course from the database, in a single query.
+        """
+        roles = []
+        user_ids_by_role = defaultdict(set)
+        role_bits_by_user_id = defaultdict(int)
+        access_roles = CourseAccessRole.objects.filter(
+            Q(course_id=course_key) | Q(course_id=CourseKeyField.Empty, org__iexact=course_key.org)
+        ).values_list('user_id', 'role', 'org', 'course_id')
+        for user_id, role, org, course_id in access_roles:
+            # Organizations are matched case-insensitively, whatever the database collation.
+            if org.lower() != course_key.org.lower():
+                continue
+            role_key = (role, not course_id)
+            if role_key not in user_ids_by_role:
+                roles.append(role_key)
+            user_ids_by_role[role_key].add(user_id)
+            role_bits_by_user_id[user_id] |= 1 << roles.index(role_key)
+
+        return cls(
+            course_key,
+            roles,
+            {role_key: array('q', sorted(user_ids)) for role_key, user_ids in user_ids_by_role.items()},
+            dict(role_bits_by_user_id),
+        )
+
+    def _roles_mask(self, roles, org_wide):
+        """
+        Returns the bitset of the given roles, or of all the roles of the index for None.
+        """
+        mask = 0
+        for bit, (role, role_is_org_wide) in enumerate(self.roles):
+            if role_is_org_wide == org_wide and (roles is None or role in roles):
+                mask |= 1 << bit
+        return mask
+
+    def users_with_role(self, role, org_wide=False):
+        """
+        Returns the sorted array of the ids of the users with the given role in the course, or with the given
+        org-wide role in its organization when `org_wide` is True.
+        """
+        return self._user_ids_by_role.get((role, org_wide), array('q'))
+
+    def has_role(self, user_id, role, org_wide=False):
+        """
+        Returns whether the user with the given id has the given role, see users_with_role.
+        """
+        user_ids = self.users_with_role(role, org_wide)
+        position = bisect_left(user_ids, user_id)
+        return position < len(user_ids) and user_ids[position] == user_id
+
+    def filter_users_with_roles(self, user_ids, roles=None, org_wide=False):
+        """
+        Returns the set of the given user ids whose users have any of the given roles, or any role at all when
+        `roles` is None, in the course, or in its organization when `org_wide` is True.
+        """
+        mask = self._roles_mask(roles, org_wide)
+        if not mask:
+            return set()
+        return {
+            user_id for user_id in user_ids
+            if self._role_bits_by_user_id.get(user_id, 0) & mask
+        }
+
+
 class AccessRole(metaclass=ABCMeta):
     """
     Object representing a role with particular access to a resource
@@ -3,6 +3,7 @@
 from common.djangoapps.student.signals.signals import (
     emit_course_access_role_added,
     emit_course_access_role_removed,
+    COURSE_ENROLLMENTS_BULK_SAVED,
     ENROLL_STATUS_CHANGE,
     ENROLLMENT_TRACK_UPDATED,
     REFUND_ORDER,
@@ -23,7 +23,9 @@ from common.djangoapps.student.models import (
     is_username_retired
 )
 from common.djangoapps.student.models_api import confirm_name_change
+from common.djangoapps.student.roles import CourseRoleIndex
 from common.djangoapps.student.signals import (
+    COURSE_ENROLLMENTS_BULK_SAVED,
     emit_course_access_role_added,
     emit_course_access_role_removed,
     USER_EMAIL_CHANGED,
@@ -92,6 +94,27 @@ def create_course_enrollment_celebration(sender, instance, created, **kwargs):
         pass
 
 
+@receiver(COURSE_ENROLLMENTS_BULK_SAVED, sender=CourseEnrollment)
+def create_course_enrollment_celebrations_in_bulk(sender, created, **kwargs):
+    """
+    Like create_course_enrollment_celebration, for the enrollments created in bulk.
+    """
+    course_ids = {enrollment.course_id for enrollment in created}
+    course_ids = {course_id for course_id in course_ids if courseware_mfe_progress_milestones_are_active(course_id)}
+    CourseEnrollmentCelebration.objects.bulk_create(
+        [
+            CourseEnrollmentCelebration(
+                enrollment=enrollment,
+                celebrate_first_section=True,
+                celebrate_weekly_goal=True,
+            )
+            for enrollment in created
+            if enrollment.course_id in course_ids
+        ],
+        ignore_conflicts=True,
+    )
+
+
 @receiver(post_save, sender=CourseAccessRole)
 def on_course_access_role_created(sender, instance, created, **kwargs):
     """
@@ -115,6 +138,15 @@ def listen_for_course_access_role_removed(sender, instance, **kwargs):
     emit_course_access_role_removed(user, instance.course_id, instance.org, instance.role)
 
 
+@receiver(post_save, sender=CourseAccessRole)
+@receiver(post_delete, sender=CourseAccessRole)
+def invalidate_course_role_index(sender, instance, **kwargs):
+    """
+    Drop the cached CourseRoleIndex of the courses of the organization of a saved or deleted CourseAccessRole.
+    """
+    CourseRoleIndex.invalidate(instance.org)
+
+
 def listen_for_verified_name_approved(sender, user_id, profile_name, **kwargs):
     """
     If the user has a pending name change that corresponds to an approved verified name, confirm it.
@@ -21,6 +21,11 @@ UNENROLL_DONE = Signal()
 # providing_args=["event", "user", "course_id", "mode", "cost", "currency"]
 ENROLL_STATUS_CHANGE = Signal()
 
+# Sent with the CourseEnrollment instances that were created and updated together with bulk_create and
+# bulk_update, which do not send post_save for each instance.
+# providing_args=["created", "updated"]
+COURSE_ENROLLMENTS_BULK_SAVED = Signal()
+
 # providing_args=["course_enrollment"]
 REFUND_ORDER = Signal()
 
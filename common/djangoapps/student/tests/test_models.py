@@ -10,9 +10,11 @@ from crum import set_current_request
 from django.contrib.auth.models import AnonymousUser, User  # lint-amnesty, pylint: disable=imported-auth-user
 from django.core.cache import cache
 from django.conf import settings
+from django.db import connection
 from django.db.models.functions import Lower
 from django.test import TestCase, override_settings
-from edx_toggles.toggles.testutils import override_waffle_flag
+from django.test.utils import CaptureQueriesContext
+from edx_toggles.toggles.testutils import override_waffle_flag, override_waffle_switch
 from freezegun import freeze_time
 from opaque_keys.edx.keys import CourseKey
 from pytz import UTC
@@ -25,6 +27,7 @@ from common.djangoapps.student.models import (
     AccountRecovery,
     CourseEnrollment,
     CourseEnrollmentAllowed,
+    CourseEnrollmentCount,
     ManualEnrollmentAudit,
     PendingEmailChange,
     PendingNameChange,
@@ -32,8 +35,10 @@ from common.djangoapps.student.models import (
     UserCelebration,
     UserProfile
 )
+from common.djangoapps.student.roles import CourseStaffRole
 from common.djangoapps.student.models_api import confirm_name_change, do_name_change_request, get_name
 from common.djangoapps.student.tests.factories import AccountRecoveryFactory, CourseEnrollmentFactory, UserFactory
+from common.djangoapps.student.toggles import DASHBOARD_COURSE_OVERVIEW_PROJECTION
 from lms.djangoapps.courseware.models import DynamicUpgradeDeadlineConfiguration
 from lms.djangoapps.courseware.toggles import (
     COURSEWARE_MICROFRONTEND_PROGRESS_MILESTONES,
@@ -41,9 +46,10 @@ from lms.djangoapps.courseware.toggles import (
 )
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.djangoapps.content.course_overviews.tests.factories import CourseOverviewFactory
+from openedx.core.djangoapps.django_comment_common.models import FORUM_ROLE_STUDENT
 from openedx.core.djangoapps.schedules.models import Schedule
 from openedx.core.djangoapps.user_api.preferences.api import set_user_preference
-from openedx.core.djangolib.testing.utils import skip_unless_lms
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase, skip_unless_lms
 from xmodule.modulestore import ModuleStoreEnum  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase, SharedModuleStoreTestCase  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.tests.factories import CourseFactory  # lint-amnesty, pylint: disable=wrong-import-order
@@ -745,6 +751,209 @@ class TestAccountRecovery(TestCase):
         assert len(AccountRecovery.objects.filter(user_id=user.id)) == 0
 
 
+class TestEnrollmentsWithDashboardCourseOverviews(CacheIsolationTestCase):
+    """
+    Tests for loading the course overviews of enrollments with CourseOverview.get_dashboard_overviews.
+    """
+
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory()
+        self.enrollments = [CourseEnrollmentFactory(user=self.user) for __ in range(3)]
+        # The overview of the last course is missing.
+        CourseOverview.objects.filter(id=self.enrollments[-1].course_id).delete()
+
+    @mock.patch('openedx.core.djangoapps.content.course_overviews.tasks.enqueue_async_course_overview_update_tasks')
+    @override_waffle_switch(DASHBOARD_COURSE_OVERVIEW_PROJECTION, active=True)
+    def test_enrollments_for_user_with_overviews_preload(self, mock_enqueue):
+        enrollments = CourseEnrollment.enrollments_for_user_with_overviews_preload(self.user)
+        assert {enrollment.id for enrollment in enrollments} == {
+            enrollment.id for enrollment in self.enrollments[:-1]
+        }
+        mock_enqueue.assert_called_once_with([str(self.enrollments[-1].course_id)])
+
+        with self.assertNumQueries(0):
+            for enrollment in enrollments:
+                assert enrollment.course_overview.id == enrollment.course_id
+                assert enrollment.course.display_name == f"{enrollment.course_id} Course"
+
+
+@override_settings(MAINTAIN_COURSE_ENROLLMENT_COUNTS=True, USE_PRECOMPUTED_COURSE_ENROLLMENT_COUNTS=True)
+class TestCourseEnrollmentCounts(TestCase):
+    """
+    Tests for the enrollment counts precomputed in CourseEnrollmentCount.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.course = CourseOverviewFactory(max_student_enrollments_allowed=3)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.enrollments = [
+                CourseEnrollmentFactory(course=self.course, mode=mode)
+                for mode in (CourseMode.AUDIT, CourseMode.AUDIT, CourseMode.VERIFIED)
+            ]
+
+    def assert_counts(self, expected):
+        """
+        Asserts that the precomputed enrollment counts of the course are the expected ones, and the
+        ones counted from the enrollment table.
+        """
+        counts = CourseEnrollment.objects.enrollment_counts(self.course.id)
+        with override_settings(USE_PRECOMPUTED_COURSE_ENROLLMENT_COUNTS=False):
+            assert counts == CourseEnrollment.objects.enrollment_counts(self.course.id)
+        assert counts == dict(expected, total=sum(expected.values()))
+
+    def test_enrollment_changes(self):
+        self.assert_counts({CourseMode.AUDIT: 2, CourseMode.VERIFIED: 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.enrollments[0].update_enrollment(mode=CourseMode.VERIFIED)
+        self.assert_counts({CourseMode.AUDIT: 1, CourseMode.VERIFIED: 2})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.enrollments[1].update_enrollment(is_active=False)
+        self.assert_counts({CourseMode.VERIFIED: 2})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.enrollments[1].update_enrollment(is_active=True, mode=CourseMode.HONOR)
+        self.assert_counts({CourseMode.HONOR: 1, CourseMode.VERIFIED: 2})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.enrollments[2].delete()
+        self.assert_counts({CourseMode.HONOR: 1, CourseMode.VERIFIED: 1})
+
+    def test_counts_updated_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.enrollments[0].update_enrollment(is_active=False)
+        assert CourseEnrollmentCount.counts_for_course(self.course.id) == {
+            CourseMode.AUDIT: 2, CourseMode.VERIFIED: 1,
+        }
+
+        for callback in callbacks:
+            callback()
+        self.assert_counts({CourseMode.AUDIT: 1, CourseMode.VERIFIED: 1})
+
+    def test_concurrent_saves(self):
+        # Two requests load the enrollment and both make the same change to it.
+        first = CourseEnrollment.objects.get(id=self.enrollments[0].id)
+        second = CourseEnrollment.objects.get(id=self.enrollments[0].id)
+        with self.captureOnCommitCallbacks(execute=True):
+            first.is_active = False
+            first.save()
+            second.is_active = False
+            second.save()
+        self.assert_counts({CourseMode.AUDIT: 1, CourseMode.VERIFIED: 1})
+
+        # A request saves an enrollment loaded before it was changed by another one.
+        with self.captureOnCommitCallbacks(execute=True):
+            second.is_active = True
+            second.mode = CourseMode.VERIFIED
+            second.save()
+            first.mode = CourseMode.HONOR
+            first.save()
+        self.assert_counts({CourseMode.AUDIT: 1, CourseMode.VERIFIED: 1})
+
+    def test_enrollments_loaded_from_database(self):
+        enrollment = CourseEnrollment.objects.get(id=self.enrollments[0].id)
+        enrollment.mode = CourseMode.VERIFIED
+        with self.captureOnCommitCallbacks(execute=True):
+            enrollment.save()
+        self.assert_counts({CourseMode.AUDIT: 1, CourseMode.VERIFIED: 2})
+
+        # Saving an enrollment loaded without its mode doesn't change the counts.
+        with self.captureOnCommitCallbacks(execute=True):
+            CourseEnrollment.objects.only('id', 'user', 'course').get(id=self.enrollments[1].id).save()
+        self.assert_counts({CourseMode.AUDIT: 1, CourseMode.VERIFIED: 2})
+
+        enrollment = CourseEnrollment.objects.only('id', 'user', 'course').get(id=self.enrollments[1].id)
+        enrollment.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            enrollment.save()
+        self.assert_counts({CourseMode.VERIFIED: 2})
+
+    def test_counts_not_maintained(self):
+        with override_settings(MAINTAIN_COURSE_ENROLLMENT_COUNTS=False):
+            CourseEnrollmentFactory(course=self.course, mode=CourseMode.AUDIT)
+        assert CourseEnrollmentCount.reconcile(self.course.id) == {CourseMode.AUDIT: (2, 3)}
+        assert not CourseEnrollmentCount.reconcile(self.course.id)
+        self.assert_counts({CourseMode.AUDIT: 3, CourseMode.VERIFIED: 1})
+
+    def test_enrollments_updated_without_saving(self):
+        CourseEnrollment.objects.filter(id=self.enrollments[2].id).update(mode=CourseMode.AUDIT)
+        assert CourseEnrollmentCount.reconcile(self.course.id) == {
+            CourseMode.AUDIT: (2, 3),
+            CourseMode.VERIFIED: (1, 0),
+        }
+        self.assert_counts({CourseMode.AUDIT: 3})
+
+    def test_is_course_full(self):
+        assert CourseEnrollment.objects.is_course_full(self.course)
+
+        CourseStaffRole(self.course.id).add_users(self.enrollments[0].user)
+        with self.assertNumQueries(2):
+            assert CourseEnrollment.objects.num_enrolled_in_exclude_admins(self.course.id) == 2
+        assert not CourseEnrollment.objects.is_course_full(self.course)
+
+
+@override_settings(MAINTAIN_COURSE_ENROLLMENT_COUNTS=True)
+class TestBulkEnrollment(TestCase):
+    """
+    Tests for CourseEnrollment.bulk_enroll and bulk_unenroll.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.course = CourseOverviewFactory()
+        self.users = UserFactory.create_batch(4)
+        # The first user is enrolled, the second one was unenrolled.
+        with self.captureOnCommitCallbacks(execute=True):
+            CourseEnrollment.enroll(self.users[0], self.course.id, mode=CourseMode.VERIFIED)
+            CourseEnrollment.enroll(self.users[1], self.course.id)
+            CourseEnrollment.unenroll(self.users[1], self.course.id)
+        CourseEnrollmentAllowed.objects.create(email=self.users[3].email, course_id=self.course.id)
+
+    @mock.patch('common.djangoapps.student.models.course_enrollment.ENROLL_STATUS_CHANGE')
+    def test_bulk_enroll(self, mock_enroll_status_change):
+        with self.captureOnCommitCallbacks(execute=True):
+            enrollments = CourseEnrollment.bulk_enroll(self.users[1:], self.course.id, mode=CourseMode.AUDIT)
+
+        assert set(enrollments) == {user.id for user in self.users[1:]}
+        for user in self.users[1:]:
+            enrollment = CourseEnrollment.objects.get(user=user, course_id=self.course.id)
+            assert enrollment == enrollments[user.id]
+            assert (enrollment.mode, enrollment.is_active) == (CourseMode.AUDIT, True)
+            assert enrollment.history.exists()
+            assert user.roles.filter(course_id=self.course.id, name=FORUM_ROLE_STUDENT).exists()
+        assert CourseEnrollment.objects.get(user=self.users[0], course_id=self.course.id).mode == CourseMode.VERIFIED
+        assert CourseEnrollmentAllowed.objects.get(email=self.users[3].email).user == self.users[3]
+        assert mock_enroll_status_change.send.call_count == 3
+        assert CourseEnrollmentCount.counts_for_course(self.course.id) == {CourseMode.AUDIT: 3, CourseMode.VERIFIED: 1}
+
+    def test_bulk_enroll_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            CourseEnrollment.bulk_enroll(self.users, self.course.id)
+
+        # The enrollments are written together, whatever the number of users.
+        enrollment_writes = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith(('INSERT INTO "student_courseenrollment', 'UPDATE "student_courseenrollment"'))
+        ]
+        assert len(enrollment_writes) == 4
+
+    @mock.patch('common.djangoapps.student.models.course_enrollment.UNENROLL_DONE')
+    def test_bulk_unenroll(self, mock_unenroll_done):
+        with self.captureOnCommitCallbacks(execute=True):
+            CourseEnrollment.enroll(self.users[2], self.course.id)
+            enrollments = CourseEnrollment.bulk_unenroll(self.users, self.course.id)
+
+        assert set(enrollments) == {user.id for user in self.users[:3]}
+        assert not CourseEnrollment.objects.filter(course_id=self.course.id, is_active=True).exists()
+        assert mock_unenroll_done.send.call_count == 2
+        assert not CourseEnrollmentCount.counts_for_course(self.course.id)
+
+
 @ddt.ddt
 class TestUserPostSaveCallback(SharedModuleStoreTestCase):
     """
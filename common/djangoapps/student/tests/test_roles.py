@@ -5,7 +5,8 @@ Tests of student.roles
 
 import ddt
 from django.contrib.auth.models import Permission
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.keys import CourseKey
 from opaque_keys.edx.locator import LibraryLocator
 
@@ -16,6 +17,7 @@ from common.djangoapps.student.roles import (
     CourseBetaTesterRole,
     CourseInstructorRole,
     CourseRole,
+    CourseRoleIndex,
     CourseLimitedStaffRole,
     CourseStaffRole,
     CourseFinanceAdminRole,
@@ -32,6 +34,7 @@ from common.djangoapps.student.roles import (
 )
 from common.djangoapps.student.role_helpers import get_course_roles, has_staff_roles
 from common.djangoapps.student.tests.factories import AnonymousUserFactory, InstructorFactory, StaffFactory, UserFactory
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
 
 class RolesTestCase(TestCase):
@@ -314,6 +317,72 @@ class RoleCacheTestCase(TestCase):  # lint-amnesty, pylint: disable=missing-clas
         assert roles_dict.get('course-v1:edX+toy2+2013_Fall').pop().course_id.course == 'toy2'
 
 
+@override_settings(CACHE_COURSE_ROLE_INDEX=True)
+class CourseRoleIndexTestCase(CacheIsolationTestCase):
+    """
+    Tests of CourseRoleIndex.
+    """
+    ENABLED_CACHES = ['default']
+
+    COURSE_KEY = CourseKey.from_string('course-v1:edX+toy+2012_Fall')
+    OTHER_COURSE_KEY = CourseKey.from_string('course-v1:edX+toy+2013_Fall')
+
+    def setUp(self):
+        super().setUp()
+        self.users = UserFactory.create_batch(5)
+        CourseStaffRole(self.COURSE_KEY).add_users(self.users[0])
+        CourseInstructorRole(self.COURSE_KEY).add_users(self.users[1], self.users[0])
+        OrgStaffRole(self.COURSE_KEY.org).add_users(self.users[2])
+        CourseStaffRole(self.OTHER_COURSE_KEY).add_users(self.users[3])
+        OrgStaffRole('otherX').add_users(self.users[3])
+
+    def user_ids(self, *positions):
+        return [self.users[position].id for position in positions]
+
+    def test_users_with_role(self):
+        index = CourseRoleIndex.for_course(self.COURSE_KEY)
+
+        assert list(index.users_with_role('staff')) == self.user_ids(0)
+        assert list(index.users_with_role('instructor')) == sorted(self.user_ids(0, 1))
+        assert list(index.users_with_role('staff', org_wide=True)) == self.user_ids(2)
+        assert not index.users_with_role('beta_testers')
+        assert index.has_role(self.users[1].id, 'instructor')
+        assert not index.has_role(self.users[1].id, 'staff')
+        assert not index.has_role(self.users[2].id, 'staff')
+
+    def test_filter_users_with_roles(self):
+        index = CourseRoleIndex.for_course(self.COURSE_KEY)
+        user_ids = self.user_ids(0, 1, 2, 3, 4)
+
+        assert index.filter_users_with_roles(user_ids) == set(self.user_ids(0, 1))
+        assert index.filter_users_with_roles(user_ids, ['staff']) == set(self.user_ids(0))
+        assert index.filter_users_with_roles(user_ids, ['staff'], org_wide=True) == set(self.user_ids(2))
+        assert index.filter_users_with_roles(self.user_ids(1, 2), ['staff']) == set()
+
+    def test_cached_index(self):
+        CourseRoleIndex.for_course(self.COURSE_KEY)
+        RequestCache.clear_all_namespaces()
+        with self.assertNumQueries(0):
+            CourseRoleIndex.for_course(self.COURSE_KEY)
+
+    def test_index_is_rebuilt_on_role_changes(self):
+        assert CourseRoleIndex.for_course(self.COURSE_KEY).has_role(self.users[0].id, 'staff')
+
+        CourseStaffRole(self.COURSE_KEY).remove_users(self.users[0])
+        OrgStaffRole(self.COURSE_KEY.org).add_users(self.users[4])
+
+        index = CourseRoleIndex.for_course(self.COURSE_KEY)
+        assert not index.has_role(self.users[0].id, 'staff')
+        assert list(index.users_with_role('staff', org_wide=True)) == sorted(self.user_ids(2, 4))
+
+    def test_org_case_is_normalized(self):
+        CourseRoleIndex.for_course(self.COURSE_KEY)
+        OrgStaffRole(self.COURSE_KEY.org.upper()).add_users(self.users[4])
+
+        index = CourseRoleIndex.for_course(self.COURSE_KEY)
+        assert list(index.users_with_role('staff', org_wide=True)) == sorted(self.user_ids(2, 4))
+
+
 class CourseAccessRoleHistoryTest(TestCase):
     """
     Tests for the CourseAccessRoleHistory model and associated signals/admin actions.
@@ -1,7 +1,7 @@
 """
 Toggles for Dashboard page.
 """
-from edx_toggles.toggles import WaffleFlag, WaffleSwitch
+from edx_toggles.toggles import SettingToggle, WaffleFlag, WaffleSwitch
 
 # Namespace for student waffle flags.
 WAFFLE_FLAG_NAMESPACE = 'student'
@@ -42,3 +42,75 @@ REDIRECT_TO_COURSEWARE_AFTER_ENROLLMENT = WaffleSwitch(
 
 def should_redirect_to_courseware_after_enrollment():
     return REDIRECT_TO_COURSEWARE_AFTER_ENROLLMENT.is_enabled()
+
+
+# Waffle switch to load the course overviews of the learner dashboards from cached projections.
+# .. toggle_name: student.dashboard_course_overview_projection
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: Load the course overviews of the enrollments shown by the learner home and the mobile
+#   enrollments API with CourseOverview.get_dashboard_overviews, from cached projections of the fields they use,
+#   instead of joining the full course overview rows to the enrollments.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-17
+# .. toggle_target_removal_date: None
+# .. toggle_warning: The enrollments in courses whose overview is missing from the database are left out until the
+#   overview is generated by a background task, instead of loading the course from the modulestore.
+DASHBOARD_COURSE_OVERVIEW_PROJECTION = WaffleSwitch(
+    f'{WAFFLE_FLAG_NAMESPACE}.dashboard_course_overview_projection', __name__
+)
+
+
+def should_use_dashboard_course_overview_projection():
+    return DASHBOARD_COURSE_OVERVIEW_PROJECTION.is_enabled()
+
+
+# .. toggle_name: MAINTAIN_COURSE_ENROLLMENT_COUNTS
+# .. toggle_implementation: SettingToggle
+# .. toggle_default: False
+# .. toggle_description: Keep the number of active enrollments in each course and mode up to date in the
+#   CourseEnrollmentCount table whenever a course enrollment is saved or deleted.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-17
+# .. toggle_warning: Enrollments changed while this is disabled, or without saving the model (e.g. with
+#   QuerySet.update), are only counted after running the reconcile_enrollment_counts management command. The counts
+#   are updated after the enrollment is committed, so schedule that command to run periodically to correct the counts
+#   of processes that stopped in between.
+MAINTAIN_COURSE_ENROLLMENT_COUNTS = SettingToggle('MAINTAIN_COURSE_ENROLLMENT_COUNTS', default=False)
+
+
+def should_maintain_course_enrollment_counts():
+    return MAINTAIN_COURSE_ENROLLMENT_COUNTS.is_enabled()
+
+
+# .. toggle_name: USE_PRECOMPUTED_COURSE_ENROLLMENT_COUNTS
+# .. toggle_implementation: SettingToggle
+# .. toggle_default: False
+# .. toggle_description: Read the enrollment counts of a course, and whether it is full, from the CourseEnrollmentCount
+#   table instead of counting the rows of the enrollment table.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-17
+# .. toggle_warning: Only enable this once MAINTAIN_COURSE_ENROLLMENT_COUNTS is enabled and the
+#   reconcile_enrollment_counts management command has been run afterwards, otherwise the counts are too low and
+#   full courses accept new enrollments.
+USE_PRECOMPUTED_COURSE_ENROLLMENT_COUNTS = SettingToggle('USE_PRECOMPUTED_COURSE_ENROLLMENT_COUNTS', default=False)
+
+
+def should_use_precomputed_course_enrollment_counts():
+    return USE_PRECOMPUTED_COURSE_ENROLLMENT_COUNTS.is_enabled()
+
+
+# .. toggle_name: CACHE_COURSE_ROLE_INDEX
+# .. toggle_implementation: SettingToggle
+# .. toggle_default: False
+# .. toggle_description: Keep the CourseRoleIndex of each course, which answers which users have a course or org-wide
+#   role in it, in the django cache instead of building it from the CourseAccessRole table in each request.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-17
+# .. toggle_warning: The cached indexes are dropped when a CourseAccessRole is saved or deleted. Roles changed
+#   without sending these signals (e.g. with QuerySet.update) are only seen once the index expires after a day.
+CACHE_COURSE_ROLE_INDEX = SettingToggle('CACHE_COURSE_ROLE_INDEX', default=False)
+
+
+def should_cache_course_role_index():
+    return CACHE_COURSE_ROLE_INDEX.is_enabled()
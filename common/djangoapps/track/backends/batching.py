@@ -0,0 +1,204 @@
+"""
+Event tracker backend that queues events in memory and sends them in batches
+to another backend from a background thread.
+
+It can wrap any backend that has a `send` method, from this package or from
+eventtracking, e.g. in EVENT_TRACKING_BACKENDS::
+
+    'logger': {
+        'ENGINE': 'common.djangoapps.track.backends.batching.BatchingBackend',
+        'OPTIONS': {
+            'backend': {
+                'ENGINE': 'eventtracking.backends.logger.LoggerBackend',
+                'OPTIONS': {'name': 'tracking'},
+            },
+            'max_queue_size': 10000,
+            'batch_size': 100,
+            'flush_interval': 1,
+            'overflow_policy': 'drop_oldest',
+        }
+    }
+
+Backends that define a `send_batch(events)` method, such as MongoBackend, get
+each batch of events in a single call, the others get one `send` call per event.
+"""
+
+
+import atexit
+import copy
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+
+from django.utils.module_loading import import_string
+
+from common.djangoapps.track.backends import BaseBackend
+
+log = logging.getLogger(__name__)
+
+# What to do with a new event when the queue is full.
+DROP_NEWEST = 'drop_newest'
+DROP_OLDEST = 'drop_oldest'
+BLOCK = 'block'
+OVERFLOW_POLICIES = (DROP_NEWEST, DROP_OLDEST, BLOCK)
+
+
+class BatchingBackend(BaseBackend):
+    """
+    Event tracker backend that sends events to another backend in batches, from a background thread.
+
+    Events are kept in a bounded queue, and a daemon thread sends them whenever `batch_size` events are
+    queued, or `flush_interval` seconds after the previous batch otherwise. The events still queued when
+    the process exits are sent by an atexit handler, events are lost if the process is killed.
+
+    The number of queued, sent, dropped and failed events is kept in `stats`.
+    """
+
+    def __init__(
+        self, backend, max_queue_size=10000, batch_size=100, flush_interval=1.0, overflow_policy=DROP_NEWEST,
+        max_block_time=0.1, **kwargs
+    ):
+        """
+        :Parameters:
+          - `backend`: the configuration of the wrapped backend, a dict with its `ENGINE` and `OPTIONS`.
+          - `max_queue_size`: the number of events that can be queued before applying the overflow policy.
+          - `batch_size`: the maximum number of events sent to the wrapped backend together.
+          - `flush_interval`: the maximum number of seconds an event waits for a full batch.
+          - `overflow_policy`: what to do with a new event when the queue is full: `drop_newest` drops it,
+            `drop_oldest` drops the oldest queued event instead, and `block` waits for room in the queue
+            for up to `max_block_time` seconds before dropping it.
+          - `max_block_time`: see `overflow_policy`.
+        """
+        super().__init__(**kwargs)
+
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f'Invalid overflow policy {overflow_policy} for the batching event tracker backend')
+
+        self.backend = import_string(backend['ENGINE'])(**backend.get('OPTIONS', {}))
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.max_block_time = max_block_time
+        self.stats = Counter()
+
+        self._reset()
+        atexit.register(self.flush)
+
+    def _reset(self):
+        """
+        Sets up an empty queue and the locks of the current process.
+        """
+        self._events = deque()
+        self._condition = threading.Condition()
+        self._send_lock = threading.Lock()
+        self._flusher = None
+        self._pid = os.getpid()
+        self._reported_dropped = 0
+
+    def _ensure_flusher(self):
+        """
+        Starts the background thread that sends the queued events, unless it's running in this process.
+        """
+        if self._pid != os.getpid():
+            # The parent process was forked, e.g. by a pre-forking web server: its thread didn't follow, and its
+            # queued events are sent by the parent.
+            self._reset()
+
+        if self._flusher is None:
+            with self._condition:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(  # pylint: disable=attribute-defined-outside-init
+                        target=self._run, name='tracking-batching-backend', daemon=True
+                    )
+                    self._flusher.start()
+
+    def send(self, event):
+        """
+        Queue a copy of the event to be sent by the background thread.
+        """
+        # The caller, and the backends and processors after this one, may still modify the event once it is queued.
+        event = copy.deepcopy(event)
+        self._ensure_flusher()
+        with self._condition:
+            if len(self._events) >= self.max_queue_size:
+                if self.overflow_policy == BLOCK:
+                    deadline = time.monotonic() + self.max_block_time
+                    while len(self._events) >= self.max_queue_size and time.monotonic() < deadline:
+                        self._condition.wait(deadline - time.monotonic())
+                if len(self._events) >= self.max_queue_size:
+                    self.stats['dropped'] += 1
+                    if self.overflow_policy != DROP_OLDEST:
+                        return
+                    self._events.popleft()
+
+            self._events.append(event)
+            self.stats['queued'] += 1
+            if len(self._events) >= self.batch_size:
+                self._condition.notify_all()
+
+    def _take_batch(self):
+        """
+        Remove and return the next batch of queued events, the caller must hold the condition.
+        """
+        batch = [self._events.popleft() for _ in range(min(self.batch_size, len(self._events)))]
+        if batch:
+            # Wake up the senders blocked by a full queue.
+            self._condition.notify_all()
+        return batch
+
+    def _run(self):
+        """
+        Send the queued events in batches, until the process exits.
+        """
+        while True:
+            with self._condition:
+                if len(self._events) < self.batch_size:
+                    self._condition.wait(self.flush_interval)
+            self.flush(max_batches=1)
+            self._report_dropped()
+
+    def flush(self, max_batches=None):
+        """
+        Send the queued events to the wrapped backend, or only their first `max_batches` batches.
+        """
+        with self._send_lock:
+            sent_batches = 0
+            while max_batches is None or sent_batches < max_batches:
+                with self._condition:
+                    batch = self._take_batch()
+                if not batch:
+                    break
+                self._send_batch(batch)
+                sent_batches += 1
+
+    def _send_batch(self, events):
+        """
+        Send a batch of events to the wrapped backend.
+        """
+        try:
+            if hasattr(self.backend, 'send_batch'):
+                self.backend.send_batch(events)
+            else:
+                for event in events:
+                    self.backend.send(event)
+        except Exception:  # pylint: disable=broad-except
+            # Unlike the request thread, there is no caller to report the error to.
+            self.stats['failed'] += len(events)
+            log.exception('Error sending %d events from the batching event tracker backend', len(events))
+        else:
+            self.stats['sent'] += len(events)
+
+    def _report_dropped(self):
+        """
+        Log the number of events dropped since the last report, if any.
+        """
+        dropped = self.stats['dropped']
+        if dropped > self._reported_dropped:
+            log.warning(
+                'The batching event tracker backend dropped %d events because its queue was full (%d in total)',
+                dropped - self._reported_dropped, dropped,
+            )
+            self._reported_dropped = dropped  # pylint: disable=attribute-defined-outside-init
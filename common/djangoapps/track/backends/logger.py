@@ -33,6 +33,28 @@ class LoggerBackend(BaseBackend):
         self.event_logger = logging.getLogger(name)
 
     def send(self, event):
+        self.event_logger.info(self._serialize(event))
+
+    def send_batch(self, events):
+        """
+        Log a batch of events, serializing all of them before writing any.
+
+        Each event is still logged as its own record, since the tracking
+        handlers (e.g. syslog) expect one event per record.
+        """
+        event_strs = []
+        for event in events:
+            try:
+                event_strs.append(self._serialize(event))
+            except UnicodeDecodeError:
+                # Already logged by _serialize, don't lose the other events.
+                continue
+
+        for event_str in event_strs:
+            self.event_logger.info(event_str)
+
+    def _serialize(self, event):
+        """Serialize the event to a JSON string."""
         try:
             event_str = json.dumps(event, cls=DateTimeJSONEncoder)
         except UnicodeDecodeError:
@@ -44,6 +66,4 @@ class LoggerBackend(BaseBackend):
         # TODO: remove trucation of the serialized event, either at a
         # higher level during the emittion of the event, or by
         # providing warnings when the events exceed certain size.
-        event_str = event_str[:settings.TRACK_MAX_EVENT]
-
-        self.event_logger.info(event_str)
+        return event_str[:settings.TRACK_MAX_EVENT]
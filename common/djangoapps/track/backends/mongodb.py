@@ -98,3 +98,13 @@ class MongoBackend(BaseBackend):
             # during the next event.
             msg = 'Error inserting to MongoDB event tracker backend'
             log.exception(msg)
+
+    def send_batch(self, events):
+        """Insert the events in to the Mongo collection together"""
+        try:
+            self.collection.insert_many(events, ordered=False)
+        except (PyMongoError, BSONError):
+            # As in send, the events are lost, except the ones inserted
+            # before the error.
+            msg = 'Error inserting to MongoDB event tracker backend'
+            log.exception(msg)
@@ -0,0 +1,109 @@
+"""Tests for the batching event tracker backend."""
+
+
+import threading
+from unittest.mock import patch
+
+import ddt
+from django.test import TestCase
+
+from common.djangoapps.track.backends import BaseBackend
+from common.djangoapps.track.backends.batching import BatchingBackend
+
+
+class RecordingBackend(BaseBackend):
+    """Backend that records the batches of events it receives."""
+
+    def __init__(self, fail=False, **kwargs):
+        super().__init__(**kwargs)
+        self.fail = fail
+        self.batches = []
+        self.received = threading.Event()
+
+    def send(self, event):
+        self.send_batch([event])
+
+    def send_batch(self, events):
+        if self.fail:
+            raise ValueError('Cannot send the events')
+        self.batches.append(events)
+        self.received.set()
+
+
+@ddt.ddt
+class TestBatchingBackend(TestCase):
+    """Tests for BatchingBackend."""
+
+    def create_backend(self, **options):
+        """
+        Returns a batching backend wrapping a RecordingBackend, which only sends events when flushed by default.
+        """
+        options.setdefault('flush_interval', 60)
+        options.setdefault('batch_size', 100)
+        with patch('common.djangoapps.track.backends.batching.atexit'):
+            return BatchingBackend(
+                backend={
+                    'ENGINE': 'common.djangoapps.track.backends.tests.test_batching.RecordingBackend',
+                    'OPTIONS': options.pop('backend_options', {}),
+                },
+                **options
+            )
+
+    def test_flush(self):
+        backend = self.create_backend(batch_size=2)
+        with patch.object(backend, '_ensure_flusher'):
+            for index in range(5):
+                backend.send({'index': index})
+        backend.flush()
+
+        assert backend.backend.batches == [
+            [{'index': 0}, {'index': 1}], [{'index': 2}, {'index': 3}], [{'index': 4}],
+        ]
+        assert backend.stats == {'queued': 5, 'sent': 5}
+
+    def test_event_modified_after_send(self):
+        backend = self.create_backend()
+        event = {'index': 0, 'context': {'user_id': 1}}
+        with patch.object(backend, '_ensure_flusher'):
+            backend.send(event)
+        event['index'] = 1
+        event['context']['user_id'] = 2
+        backend.flush()
+
+        assert backend.backend.batches == [[{'index': 0, 'context': {'user_id': 1}}]]
+
+    def test_background_flush(self):
+        backend = self.create_backend(batch_size=2)
+        backend.send({'index': 0})
+        backend.send({'index': 1})
+
+        assert backend.backend.received.wait(5)
+        assert backend.backend.batches == [[{'index': 0}, {'index': 1}]]
+
+    @ddt.data(
+        ('drop_newest', [0, 1]),
+        ('drop_oldest', [1, 2]),
+        ('block', [0, 1]),
+    )
+    @ddt.unpack
+    def test_overflow_policy(self, overflow_policy, expected_indexes):
+        backend = self.create_backend(max_queue_size=2, overflow_policy=overflow_policy, max_block_time=0.01)
+        for index in range(3):
+            backend.send({'index': index})
+        backend.flush()
+
+        assert backend.backend.batches == [[{'index': index} for index in expected_indexes]]
+        assert backend.stats['dropped'] == 1
+
+    def test_invalid_overflow_policy(self):
+        with self.assertRaises(ValueError):
+            self.create_backend(overflow_policy='invalid')
+
+    def test_failed_batch(self):
+        backend = self.create_backend(backend_options={'fail': True})
+        backend.send({'index': 0})
+        with patch('common.djangoapps.track.backends.batching.log') as mock_log:
+            backend.flush()
+
+        assert backend.stats == {'queued': 1, 'failed': 1}
+        mock_log.exception.assert_called_once()
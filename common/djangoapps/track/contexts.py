@@ -2,6 +2,7 @@
 
 
 import logging
+from functools import lru_cache
 
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey, LearningContextKey
@@ -32,7 +33,7 @@ def course_context_from_url(url, course_id_string=None):
         )
     else:
         try:
-            course_id = CourseKey.from_string(course_id_string)
+            course_id = parse_course_id(course_id_string)
         except InvalidKeyError:
             log.warning(
                 'unable to parse course_id "{course_id}"'.format(
@@ -44,6 +45,23 @@ def course_context_from_url(url, course_id_string=None):
     return course_context_from_course_id(course_id)
 
 
+def parse_course_id(course_id_string):
+    """
+    Returns the CourseKey of the given course id string, or raises InvalidKeyError.
+
+    The keys are memoized, since the events of a process keep referencing the same courses.
+    """
+    if not isinstance(course_id_string, str):
+        # e.g. a value of the context of a segment event, which can't be memoized.
+        return CourseKey.from_string(course_id_string)
+    return _parse_course_id(course_id_string)
+
+
+@lru_cache(maxsize=1024)
+def _parse_course_id(course_id_string):
+    return CourseKey.from_string(course_id_string)
+
+
 def course_context_from_course_id(course_id):
     """
     Creates a course context from a `course_id`.
@@ -0,0 +1,100 @@
+"""
+Measure how many tracking events per second a worker can process, from the
+request to the tracking backends, without the I/O of the backends.
+
+The events are sent to a backend that only counts them, in place of the
+configured backends, using the configured event processors.
+
+Example:
+
+    ./manage.py lms benchmark_tracking_events --events 20000
+"""
+
+
+import time
+from textwrap import dedent
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.test.client import RequestFactory
+from eventtracking import tracker as eventtracker
+
+from common.djangoapps.track import views
+from common.djangoapps.track.middleware import TrackMiddleware
+
+COURSE_PAGE = '/courses/course-v1:edX+DemoX+Demo_Course/courseware/interactive_demonstrations/basic_questions/'
+
+
+class CountingBackend:
+    """Tracking backend that only counts the events it receives."""
+
+    def __init__(self):
+        self.count = 0
+
+    def send(self, event):  # pylint: disable=unused-argument
+        self.count += 1
+
+
+class Command(BaseCommand):  # lint-amnesty, pylint: disable=missing-class-docstring
+    help = dedent(__doc__).strip()
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--events',
+            type=int,
+            default=10000,
+            help='The number of events to emit in each benchmark.',
+        )
+
+    def handle(self, *args, **options):
+        default_tracker = eventtracker.get_tracker()
+        backend = CountingBackend()
+        eventtracker.register_tracker(eventtracker.Tracker(
+            backends={'benchmark': backend},
+            context_locator=default_tracker.context_locator,
+            processors=default_tracker.processors,
+        ))
+        try:
+            for name, build_request, emit_event in (
+                ('request', self._build_page_request, self._emit_request_event),
+                ('server', self._build_handler_request, self._emit_server_event),
+            ):
+                # The requests are built beforehand, since it costs as much as tracking them.
+                requests = [build_request() for _ in range(options['events'])]
+                backend.count = 0
+                start_time = time.perf_counter()
+                for request in requests:
+                    emit_event(request)
+                duration = time.perf_counter() - start_time
+                self.stdout.write(
+                    f'{name}: {backend.count} events in {duration:.3f} sec, '
+                    f'{backend.count / duration:.0f} events/second'
+                )
+        finally:
+            eventtracker.register_tracker(default_tracker)
+
+    def _build_page_request(self):
+        """Build the request of a course page."""
+        request = RequestFactory().get(COURSE_PAGE, {'position': 1, 'password': 'secret'})
+        request.user = AnonymousUser()
+        return request
+
+    def _build_handler_request(self):
+        """Build the request of an XBlock handler."""
+        request = RequestFactory().post(f'{COURSE_PAGE}xblock/handler')
+        request.user = AnonymousUser()
+        return request
+
+    def _emit_request_event(self, request):
+        """
+        Emit the event of a request through the TrackMiddleware.
+        """
+        middleware = TrackMiddleware(get_response=lambda request: None)
+        middleware.process_request(request)
+        middleware.process_response(request, None)
+
+    def _emit_server_event(self, request):
+        """
+        Emit a high-frequency server event, like the problem_check ones.
+        """
+        views.server_track(request, 'problem_check', {'answers': {'input_1': 'choice_1'}}, page='x_module')
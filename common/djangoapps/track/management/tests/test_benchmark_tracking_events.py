@@ -0,0 +1,23 @@
+"""Tests for the benchmark_tracking_events management command."""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from eventtracking import tracker
+
+
+class BenchmarkTrackingEventsTest(TestCase):
+    """
+    Tests for the benchmark_tracking_events management command.
+    """
+
+    def test_command(self):
+        default_tracker = tracker.get_tracker()
+        out = StringIO()
+        call_command('benchmark_tracking_events', events=10, stdout=out)
+
+        lines = out.getvalue().splitlines()
+        assert [line.split(':')[0] for line in lines] == ['request', 'server']
+        assert all(' 10 events in ' in line for line in lines)
+        assert tracker.get_tracker() is default_tracker
@@ -11,6 +11,7 @@ import json
 import logging
 import re
 import sys
+from functools import lru_cache
 
 import six  # lint-amnesty, pylint: disable=unused-import
 from django.conf import settings
@@ -34,6 +35,43 @@ META_KEY_TO_CONTEXT_KEY = {
 }
 
 
+# Removes passwords from the tracking logs
+# WARNING: This list needs to be changed whenever we change
+# password handling functionality.
+#
+# As of the time of this comment, only 'password' is used
+# The rest are there for future extension.
+#
+# We should manually confirm no passwords make it into log
+# files when we change this.
+CENSORED_FIELDS = frozenset([
+    'password', 'newpassword', 'new_password', 'oldpassword', 'old_password', 'new_password1', 'new_password2',
+])
+
+
+def censor_query_dict(query_dict):
+    """
+    Returns the lists of values of the given QueryDict as a dict, with the
+    values of the CENSORED_FIELDS replaced by asterisks.
+    """
+    return {
+        key: '*' * 8 if key in CENSORED_FIELDS else values
+        for key, values in query_dict.lists()
+    }
+
+
+@lru_cache(maxsize=16)
+def compile_ignored_url_patterns(patterns):
+    """
+    Returns the compiled regular expressions of the given
+    TRACKING_IGNORE_URL_PATTERNS.
+
+    Each pattern is compiled on its own, so that patterns may use global
+    inline flags such as (?i).
+    """
+    return tuple(re.compile(pattern) for pattern in patterns)
+
+
 class TrackMiddleware(MiddlewareMixin):
     """
     Tracks all requests made, as well as setting up context for other server
@@ -47,33 +85,12 @@ class TrackMiddleware(MiddlewareMixin):
             if not self.should_process_request(request):
                 return
 
-            # Removes passwords from the tracking logs
-            # WARNING: This list needs to be changed whenever we change
-            # password handling functionality.
-            #
-            # As of the time of this comment, only 'password' is used
-            # The rest are there for future extension.
-            #
             # Passwords should never be sent as GET requests, but
             # this can happen due to older browser bugs. We censor
             # this too.
-            #
-            # We should manually confirm no passwords make it into log
-            # files when we change this.
-
-            censored_strings = ['password', 'newpassword', 'new_password',
-                                'oldpassword', 'old_password', 'new_password1', 'new_password2']
-            post_dict = dict(request.POST)
-            get_dict = dict(request.GET)
-            for string in censored_strings:
-                if string in post_dict:
-                    post_dict[string] = '*' * 8
-                if string in get_dict:
-                    get_dict[string] = '*' * 8
-
             event = {
-                'GET': dict(get_dict),
-                'POST': dict(post_dict),
+                'GET': censor_query_dict(request.GET),
+                'POST': censor_query_dict(request.POST),
             }
 
             # TODO: Confirm no large file uploads
@@ -108,13 +125,10 @@ class TrackMiddleware(MiddlewareMixin):
         """Don't track requests to the specified URL patterns"""
         path = request.META['PATH_INFO']
 
-        ignored_url_patterns = getattr(settings, 'TRACKING_IGNORE_URL_PATTERNS', [])
-        for pattern in ignored_url_patterns:
-            # Note we are explicitly relying on python's internal caching of
-            # compiled regular expressions here.
-            if re.match(pattern, path):
-                return False
-        return True
+        ignored_url_patterns = compile_ignored_url_patterns(
+            tuple(getattr(settings, 'TRACKING_IGNORE_URL_PATTERNS', []))
+        )
+        return not any(pattern.match(path) for pattern in ignored_url_patterns)
 
     def enter_request_context(self, request):
         """
@@ -2,6 +2,7 @@
 from unittest import TestCase
 
 import ddt
+from opaque_keys import InvalidKeyError
 
 from common.djangoapps.track import contexts
 
@@ -72,3 +73,11 @@ class TestContexts(TestCase):  # lint-amnesty, pylint: disable=missing-class-doc
 
     def test_no_url(self):
         self.assert_empty_context_for_url(None)
+
+    def test_parse_course_id(self):
+        course_key = contexts.parse_course_id(self.SPLIT_COURSE_ID)
+        assert str(course_key) == self.SPLIT_COURSE_ID
+        assert contexts.parse_course_id(self.SPLIT_COURSE_ID) is course_key
+
+        with self.assertRaises(InvalidKeyError):
+            contexts.parse_course_id('not/a/course/id/')
@@ -1,5 +1,6 @@
 """Tests for tracking middleware."""
 
+import json
 from unittest.mock import patch, sentinel
 
 import ddt
@@ -72,6 +73,40 @@ class TrackMiddlewareTestCase(TestCase):
         self.track_middleware.process_request(request)
         assert not self.mock_server_track.called
 
+    @override_settings(TRACKING_IGNORE_URL_PATTERNS=[r'^/some/excluded.*', r'.*/ignored$'])
+    def test_any_pattern_excludes_url(self):
+        for url in ['/some/excluded/url', '/an/ignored']:
+            request = self.request_factory.get(url)
+            self.track_middleware.process_request(request)
+            assert not self.mock_server_track.called
+
+        request = self.request_factory.get('/an/ignored/url')
+        self.track_middleware.process_request(request)
+        assert self.mock_server_track.called
+
+    @override_settings(TRACKING_IGNORE_URL_PATTERNS=[r'^/some/excluded.*', r'(?i)^/CASE/insensitive$'])
+    def test_patterns_with_inline_flags(self):
+        for url in ['/case/insensitive', '/Case/Insensitive', '/some/excluded/url']:
+            request = self.request_factory.get(url)
+            self.track_middleware.process_request(request)
+            assert not self.mock_server_track.called
+
+        request = self.request_factory.get('/case/insensitive/url')
+        self.track_middleware.process_request(request)
+        assert self.mock_server_track.called
+
+    def test_censored_fields(self):
+        request = self.request_factory.post('/somewhere?password=secret&next=/courses', {
+            'new_password1': 'secret', 'new_password2': 'secret', 'email': 'learner@example.com',
+        })
+        self.track_middleware.process_request(request)
+
+        event = json.loads(self.mock_server_track.call_args[0][2])
+        assert event == {
+            'GET': {'password': '********', 'next': ['/courses']},
+            'POST': {'new_password1': '********', 'new_password2': '********', 'email': ['learner@example.com']},
+        }
+
     def test_default_request_context(self):
         context = self.get_context_for_path('/courses/')
         assert context == {
@@ -13,8 +13,8 @@ from django.views.decorators.http import require_POST
 from edx_django_utils.monitoring import set_custom_attribute
 from eventtracking import tracker
 from opaque_keys import InvalidKeyError
-from opaque_keys.edx.keys import CourseKey
 
+from common.djangoapps.track import contexts
 from common.djangoapps.util.json_request import expect_json
 
 log = logging.getLogger(__name__)
@@ -212,7 +212,7 @@ def track_segmentio_event(request):  # pylint: disable=too-many-statements
     course_id = context.get('course_id')
     if course_id:
         try:
-            course_key = CourseKey.from_string(course_id)
+            course_key = contexts.parse_course_id(course_id)
             context['org_id'] = course_key.org
         except InvalidKeyError:
             log.warning(
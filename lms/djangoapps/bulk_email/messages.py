@@ -31,14 +31,18 @@ class DjangoEmail(CourseEmailMessage):
     """
     Email message class to send email directly using django mail API.
     """
-    def __init__(self, connection, course_email, email_context):
+    def __init__(self, connection, course_email, email_context, course_email_template=None):
         """
         Construct message content using course_email model and context
+
+        `course_email_template` is the CourseEmailTemplate of the course_email, when it is fetched
+        beforehand for all the recipients.
         """
         self.connection = connection
         template_context = email_context.copy()
         # use the CourseEmailTemplate that was associated with the CourseEmail
-        course_email_template = course_email.get_template()
+        if course_email_template is None:
+            course_email_template = course_email.get_template()
 
         plaintext_msg = course_email_template.render_plaintext(course_email.text_message, template_context)
         html_msg = course_email_template.render_htmltext(course_email.html_message, template_context)
@@ -64,12 +68,14 @@ class ACEEmail(CourseEmailMessage):
     """
     Email message class to send email using edx-ace.
     """
-    def __init__(self, site, email_context):
+    def __init__(self, site, email_context, user=None):
         """
         Construct edx-ace message using email_context
+
+        `user` is the recipient, when it is fetched beforehand for all the recipients.
         """
         self.site = site
-        self.user = User.objects.get(email=email_context['email'])
+        self.user = user if user is not None else User.objects.get(email=email_context['email'])
         text_message = email_context['course_email'].text_message
         html_message = email_context['course_email'].html_message
         formatted_text_message = substitute_keywords_with_data(text_message, email_context)
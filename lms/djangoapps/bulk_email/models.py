@@ -5,6 +5,7 @@ Models for bulk email
 
 import logging
 from datetime import datetime
+from string import Formatter
 from dateutil.relativedelta import relativedelta
 
 import markupsafe
@@ -419,6 +420,48 @@ class CourseEmailTemplate(models.Model):
                 context[key] = markupsafe.escape(value)
         return CourseEmailTemplate._render(self.html_template, htmltext, context)
 
+    def render_shared(self, context, recipient_keys):
+        """
+        Return a copy of this template, which is not to be saved, with the fields of its plain and
+        HTML templates that are not in `recipient_keys` already formatted with the `context` dict.
+
+        The messages of the recipients of a course email, whose contexts only differ by the values of
+        `recipient_keys`, are rendered with the copy without formatting the parts they share again.
+        """
+        html_context = {
+            key: markupsafe.escape(value) if isinstance(value, str) else value
+            for key, value in context.items()
+        }
+        return CourseEmailTemplate(
+            name=self.name,
+            plain_template=CourseEmailTemplate._format_shared(self.plain_template, context, recipient_keys),
+            html_template=CourseEmailTemplate._format_shared(self.html_template, html_context, recipient_keys),
+        )
+
+    @staticmethod
+    def _format_shared(format_string, context, recipient_keys):
+        """
+        Format the fields of a template that are not in `recipient_keys` with the `context` dict,
+        and return the result as a template with the remaining fields.
+        """
+        parts = []
+        for literal_text, field_name, format_spec, conversion in Formatter().parse(format_string):
+            parts.append(literal_text.replace('{', '{{').replace('}', '}}'))
+            if field_name is None:
+                continue
+            field = '{' + field_name
+            if conversion:
+                field += '!' + conversion
+            if format_spec:
+                field += ':' + format_spec
+            field += '}'
+            key = field_name.partition('.')[0].partition('[')[0]
+            if key in recipient_keys or '{' in format_spec:
+                parts.append(field)
+            else:
+                parts.append(field.format(**context).replace('{', '{{').replace('}', '}}'))
+        return ''.join(parts)
+
 
 class CourseAuthorization(models.Model):
     """
@@ -18,6 +18,7 @@ from celery import current_task, shared_task
 from celery.exceptions import RetryTaskError
 from celery.states import FAILURE, RETRY, SUCCESS
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.contrib.sites.models import Site
 from django.core.mail import get_connection
 from django.core.mail.message import forbid_multi_line_headers
@@ -52,6 +53,10 @@ from openedx.core.djangoapps.site_configuration import helpers as configuration_
 from openedx.core.lib.courses import course_image_url
 
 log = logging.getLogger('edx.celery.task')
+User = get_user_model()
+
+# The keys of the email context whose values differ between the recipients of an email.
+RECIPIENT_CONTEXT_KEYS = ('email', 'name', 'user_id', 'unsubscribe_link')
 
 
 # Errors that an individual email is failing to be sent, and should just
@@ -330,39 +335,38 @@ def send_course_email(entry_id, email_id, to_list, global_email_context, subtask
     return new_subtask_status.to_dict()
 
 
-def _filter_optouts_from_recipients(to_list, course_id):
+def _filter_recipients(to_list, course_id):
     """
-    Filters a recipient list based on student opt-outs for a given course.
+    Filters a recipient list based on student opt-outs for a given course,
+    and on disabled accounts.
+
+    The opt-outs of the recipients are read with a single query, into a set
+    of user ids that the recipients are checked against in the same pass as
+    their accounts.
 
     Returns the filtered recipient list, as well as the number of optouts
-    removed from the list.
+    and of disabled accounts removed from the list.
     """
-    optouts = Optout.objects.filter(
+    # The ids of the users are read from the Optout table alone, without joining the user table.
+    optouts = set(Optout.objects.filter(
         course_id=course_id,
-        user__in=[i['pk'] for i in to_list]
-    ).values_list('user__email', flat=True)
-    optouts = set(optouts)
+        user_id__in=[i['pk'] for i in to_list]
+    ).values_list('user_id', flat=True))
     # Only count the num_optout for the first time the optouts are calculated.
     # We assume that the number will not change on retries, and so we don't need
     # to calculate it each time.
-    num_optout = len(optouts)
-    to_list = [recipient for recipient in to_list if recipient['email'] not in optouts]
-    return to_list, num_optout
-
-
-def _filter_disabled_users_from_recipients(to_list, course_key_str):
-    """
-    Filters a user if its account is disabled
-    """
+    num_optout = 0
+    num_disabled = 0
     user_list = []
-    disabled_count = 0
     for user in to_list:
-        if user['password'].startswith('!'):
-            log.info(f"Bulk Email User is disabled {user['email']} in course {course_key_str}")
-            disabled_count += 1
+        if user['pk'] in optouts:
+            num_optout += 1
+        elif user['password'].startswith('!'):
+            log.info(f"Bulk Email User is disabled {user['email']} in course {course_id}")
+            num_disabled += 1
         else:
             user_list.append(user)
-    return user_list, disabled_count
+    return user_list, num_optout, num_disabled
 
 
 def _get_source_address(course_id, course_title, course_language, truncate=True):
@@ -499,8 +503,7 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
     # that existed at that time, and we don't need to keep checking for changes
     # in the Optout list.
     if subtask_status.get_retry_count() == 0:
-        to_list, num_optout = _filter_optouts_from_recipients(to_list, course_email.course_id)
-        to_list, num_disabled = _filter_disabled_users_from_recipients(to_list, str(course_email.course_id))
+        to_list, num_optout, num_disabled = _filter_recipients(to_list, course_email.course_id)
         subtask_status.increment(skipped=num_optout + num_disabled)
 
     course_title = global_email_context['course_title']
@@ -524,6 +527,20 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         template_context = get_base_template_context(site)
         email_context.update(global_email_context)
         email_context.update(template_context)
+        email_context['course_id'] = str(course_email.course_id)
+        email_context['unsubscribe_text'] = 'Unsubscribe from course updates for this course'
+        email_context['disclaimer'] = (
+            "You are receiving this email because you are enrolled in the "
+            f"{email_context['platform_name']} course {email_context['course_title']}"
+        )
+
+        # Fetch what the messages of all the recipients have in common once, rather than for each message.
+        if is_bulk_email_edx_ace_enabled():
+            course_email_template = None
+            users_by_id = User.objects.in_bulk([recipient['pk'] for recipient in to_list])
+        else:
+            course_email_template = course_email.get_template().render_shared(email_context, RECIPIENT_CONTEXT_KEYS)
+            users_by_id = {}
 
         start_time = time.time()
         while to_list:
@@ -550,19 +567,13 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
             email_context['email'] = email
             email_context['name'] = profile_name
             email_context['user_id'] = user_id
-            email_context['course_id'] = str(course_email.course_id)
             email_context['unsubscribe_link'] = get_unsubscribed_link(current_recipient['username'],
                                                                       str(course_email.course_id))
-            email_context['unsubscribe_text'] = 'Unsubscribe from course updates for this course'
-            email_context['disclaimer'] = (
-                "You are receiving this email because you are enrolled in the "
-                f"{email_context['platform_name']} course {email_context['course_title']}"
-            )
 
             if is_bulk_email_edx_ace_enabled():
-                message = ACEEmail(site, email_context)
+                message = ACEEmail(site, email_context, user=users_by_id.get(user_id))
             else:
-                message = DjangoEmail(connection, course_email, email_context)
+                message = DjangoEmail(connection, course_email, email_context, course_email_template)
             # Throttle if we have gotten the rate limiter.  This is not very high-tech,
             # but if a task has been retried for rate-limiting reasons, then we sleep
             # for a period of time between all emails within this task.  Choice of
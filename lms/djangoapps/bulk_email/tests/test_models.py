@@ -178,6 +178,7 @@ class NoCourseEmailTemplateTest(TestCase):
             CourseEmailTemplate.get_template()
 
 
+@ddt.ddt
 class CourseEmailTemplateTest(TestCase):
     """Test the CourseEmailTemplate model."""
 
@@ -276,6 +277,20 @@ class CourseEmailTemplateTest(TestCase):
         assert context['course_title'] in message
         assert context['name'] in message
 
+    @ddt.data(None, "branded.template")
+    def test_render_shared(self, template_name):
+        template = CourseEmailTemplate.get_template(name=template_name)
+        context = self._add_xss_fields(self._get_sample_html_context())
+        shared_template = template.render_shared(context, ('email', 'name', 'user_id', 'unsubscribe_link'))
+        body = "Dear %%USER_FULLNAME%%, thanks for enrolling in %%COURSE_DISPLAY_NAME%%. {not a field}"
+
+        for email in ('first@example.com', '<b>second</b>@example.com'):
+            context = dict(context, email=email, unsubscribe_link=f'/bulk_email/email/optout/{email}')
+            assert shared_template.render_plaintext(body, dict(context)) == \
+                template.render_plaintext(body, dict(context))
+            assert shared_template.render_htmltext(body, dict(context)) == \
+                template.render_htmltext(body, dict(context))
+
 
 class CourseAuthorizationTest(TestCase):
     """Test the CourseAuthorization model."""
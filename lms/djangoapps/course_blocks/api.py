@@ -5,12 +5,17 @@ get_course_blocks function.
 
 
 from django.conf import settings
+from edx_when import api as when_api
 from edx_when import field_data
 
+from common.djangoapps.student.roles import CourseBetaTesterRole
 from lms.djangoapps.course_api.blocks.transformers.block_completion import BlockCompletionTransformer
+from lms.djangoapps.courseware.access import has_access
 from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 from openedx.features.content_type_gating.block_transformers import ContentTypeGateTransformer
+from openedx.features.content_type_gating.models import ContentTypeGatingConfig
+from xmodule.partitions.partitions_service import get_user_partition_groups  # lint-amnesty, pylint: disable=wrong-import-order
 
 from .transformers import library_content, load_override_data, start_date, user_partitions, visibility
 from .usage_info import CourseUsageInfo
@@ -54,6 +59,48 @@ def get_course_block_access_transformers(user):
     return course_block_access_transformers
 
 
+def get_course_block_access_signature(user, collected_block_structure):
+    """
+    Returns a hashable value that is equal for any two users for whom
+    get_course_blocks, with the default transformers and the given
+    collected block structure, returns the same blocks with the same
+    field values.  Returns None if such a value cannot be determined
+    for the user, in which case the user's blocks must be transformed
+    individually.
+
+    The signature consists of the inputs of the transformers in
+    get_course_block_access_transformers that are specific to the user.
+
+    Arguments:
+        user (django.contrib.auth.models.User) - User object for
+            which the block structure would be transformed.
+
+        collected_block_structure (BlockStructureBlockData) - A
+            block structure retrieved from a prior call to
+            BlockStructureManager.get_collected.
+    """
+    course_key = collected_block_structure.root_block_usage_key.course_key
+
+    # Blocks selected from libraries and individual field overrides are
+    # specific to each user.
+    if has_individual_student_override_provider():
+        return None
+    if any(block_key.block_type == 'library_content' for block_key in collected_block_structure):
+        return None
+
+    partitions = collected_block_structure.get_transformer_data(
+        user_partitions.UserPartitionTransformer, 'user_partitions',
+    ) or []
+    user_groups = get_user_partition_groups(course_key, partitions, user, 'id')
+    return (
+        bool(has_access(user, 'staff', course_key)),
+        CourseBetaTesterRole(course_key).has_user(user),
+        ContentTypeGatingConfig.enabled_for_enrollment(user=user, course_key=course_key),
+        frozenset((partition_id, group.id) for partition_id, group in user_groups.items()),
+        frozenset(when_api.get_dates_for_course(course_key, user).items()),
+    )
+
+
 def get_course_blocks(
         user,
         starting_block_usage_key,
@@ -0,0 +1,88 @@
+"""
+Tests for incrementally collecting course block structures with the
+registered transformers.
+"""
+
+from unittest.mock import patch
+
+from edx_toggles.toggles.testutils import override_waffle_switch
+
+from openedx.core.djangoapps.content.block_structure import incremental
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
+from openedx.core.djangoapps.content.block_structure.config import INCREMENTAL_COLLECT
+from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
+from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
+from xmodule.modulestore import ModuleStoreEnum  # lint-amnesty, pylint: disable=wrong-import-order
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase  # lint-amnesty, pylint: disable=wrong-import-order
+from xmodule.modulestore.tests.factories import CourseFactory, BlockFactory  # lint-amnesty, pylint: disable=wrong-import-order
+
+
+class TestIncrementalCollect(ModuleStoreTestCase):
+    """
+    Tests that incrementally collecting a course with the registered
+    transformers results in the same data as collecting it anew.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.course = CourseFactory.create()
+        self.chapter = BlockFactory.create(parent=self.course, category='chapter')
+        self.sequential = BlockFactory.create(
+            parent=self.chapter, category='sequential', graded=True, format='Homework',
+        )
+        self.vertical = BlockFactory.create(parent=self.sequential, category='vertical')
+        self.problem = BlockFactory.create(parent=self.vertical, category='problem', weight=1)
+        self.other_vertical = BlockFactory.create(parent=self.sequential, category='vertical')
+        BlockFactory.create(parent=self.other_vertical, category='problem')
+        BlockFactory.create(parent=self.other_vertical, category='html')
+        self.bs_manager = get_block_structure_manager(self.course.id)
+
+    def collect_anew(self):
+        """
+        Returns the block structure of the course collected anew.
+        """
+        with self.store.branch_setting(ModuleStoreEnum.Branch.published_only, self.course.id):
+            block_structure = BlockStructureFactory.create_from_modulestore(
+                self.store.make_course_usage_key(self.course.id),
+                self.store,
+            )
+            BlockStructureTransformers.collect(block_structure)
+        return block_structure
+
+    def assert_same_data(self, block_structure, expected_block_structure):
+        """
+        Verifies that the given block structures have the same blocks
+        and collected data.
+        """
+        assert set(block_structure) == set(expected_block_structure)
+        for transformer_name, transformer_data in expected_block_structure.transformer_data.items():
+            assert block_structure.transformer_data[transformer_name].fields == transformer_data.fields
+        for block_key in expected_block_structure:
+            assert block_structure.get_children(block_key) == expected_block_structure.get_children(block_key)
+            block_data = block_structure[block_key]
+            expected_block_data = expected_block_structure[block_key]
+            assert block_data.fields == expected_block_data.fields
+            assert {
+                name: transformer_data.fields for name, transformer_data in block_data.transformer_data.items()
+            } == {
+                name: transformer_data.fields
+                for name, transformer_data in expected_block_data.transformer_data.items()
+            }
+
+    def test_registered_transformers(self):
+        with override_waffle_switch(INCREMENTAL_COLLECT, active=True):
+            self.bs_manager.update_collected_if_needed()
+
+            self.problem.weight = 2
+            self.problem.display_name = 'Changed problem'
+            self.store.update_item(self.problem, self.user.id)
+            self.other_vertical.visible_to_staff_only = True
+            self.store.update_item(self.other_vertical, self.user.id)
+            self.store.publish(self.course.location, self.user.id)
+
+            with patch.object(incremental, 'update_collected', wraps=incremental.update_collected) as mock_update:
+                self.bs_manager.update_collected_if_needed()
+            assert mock_update.called
+            block_structure = self.bs_manager.get_collected()
+
+        self.assert_same_data(block_structure, self.collect_anew())
@@ -16,6 +16,8 @@ import logging
 
 from django.conf import settings  # pylint: disable=unused-import
 from django.contrib.auth.models import AnonymousUser
+from edx_django_utils import monitoring as monitoring_utils
+from edx_django_utils.cache import RequestCache
 from edx_django_utils.monitoring import function_trace
 from opaque_keys.edx.keys import CourseKey, UsageKey
 from xblock.core import XBlock
@@ -35,11 +37,16 @@ from lms.djangoapps.courseware.access_utils import (
     check_start_date,
     debug,
 )
-from lms.djangoapps.courseware.masquerade import get_masquerade_role, is_masquerading_as_student
+from lms.djangoapps.courseware.masquerade import (
+    get_course_masquerade,
+    get_masquerade_role,
+    is_masquerading_as_student
+)
 from lms.djangoapps.ccx.custom_exception import CCXLocatorValidationException
 from lms.djangoapps.ccx.models import CustomCourseForEdX
 from lms.djangoapps.mobile_api.models import IgnoreMobileAvailableFlagConfig
-from lms.djangoapps.courseware.toggles import course_is_invitation_only
+from lms.djangoapps.courseware.handlers import ACCESS_REQUEST_CACHE_NAMESPACE
+from lms.djangoapps.courseware.toggles import COURSEWARE_ACCESS_REQUEST_CACHE, course_is_invitation_only
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.features.course_duration_limits.access import check_course_expired
 from common.djangoapps.student import auth
@@ -170,13 +177,13 @@ def has_access(user, action, obj, course_key=None):
 
     # NOTE: any block access checkers need to go above this
     if isinstance(obj, XBlock):
-        return _has_access_to_block(user, action, obj, course_key)
+        return _request_cached_access(_has_access_to_block, user, action, obj, course_key)
 
     if isinstance(obj, CourseKey):
         return _has_access_course_key(user, action, obj)
 
     if isinstance(obj, UsageKey):
-        return _has_access_location(user, action, obj, course_key)
+        return _request_cached_access(_has_access_location, user, action, obj, course_key)
 
     if isinstance(obj, str):
         return _has_access_string(user, action, obj)
@@ -693,6 +700,48 @@ def _has_access_string(user, action, perm):
 
 #####  Internal helper methods below
 
+def _request_cached_access(has_access_fcn, user, action, obj, course_key):
+    """
+    Returns has_access_fcn(user, action, obj, course_key) for a block or usage key `obj`.
+
+    When COURSEWARE_ACCESS_REQUEST_CACHE is enabled, the decision is remembered for the rest of the
+    request, by user, action, usage key, course key and masquerade, and the numbers of decisions
+    found and not found in the cache are accumulated in the custom attributes
+    courseware_access_cache_hits and courseware_access_cache_misses.
+    """
+    if not COURSEWARE_ACCESS_REQUEST_CACHE.is_enabled():
+        return has_access_fcn(user, action, obj, course_key)
+
+    is_block = isinstance(obj, XBlock)
+    usage_key = obj.location if is_block else obj
+    course_masquerade = get_course_masquerade(user, course_key or usage_key.course_key)
+    real_user = getattr(user, 'real_user', user)
+    cache_key = (
+        is_block,
+        user.id,
+        real_user.id,
+        action,
+        str(usage_key),
+        str(course_key),
+        (
+            course_masquerade.role,
+            course_masquerade.user_partition_id,
+            course_masquerade.group_id,
+            course_masquerade.user_name,
+        ) if course_masquerade else None,
+    )
+    request_cache = RequestCache(ACCESS_REQUEST_CACHE_NAMESPACE)
+    cached_response = request_cache.get_cached_response(cache_key)
+    if cached_response.is_found:
+        monitoring_utils.accumulate('courseware_access_cache_hits', 1)
+        return cached_response.value
+
+    monitoring_utils.accumulate('courseware_access_cache_misses', 1)
+    response = has_access_fcn(user, action, obj, course_key)
+    request_cache.set(cache_key, response)
+    return response
+
+
 def _dispatch(table, action, user, obj):
     """
     Helper: call table[action], raising a nice pretty error if there is no such key.
@@ -0,0 +1,15 @@
+"""
+Courseware Application Configuration
+"""
+
+from django.apps import AppConfig
+
+
+class CoursewareConfig(AppConfig):
+    """
+    Application Configuration for Courseware.
+    """
+    name = 'lms.djangoapps.courseware'
+
+    def ready(self):
+        from . import handlers  # pylint: disable=unused-import,import-outside-toplevel
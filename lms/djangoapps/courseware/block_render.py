@@ -64,11 +64,13 @@ from lms.djangoapps.courseware.masquerade import (
 from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache
 from lms.djangoapps.courseware.field_overrides import OverrideFieldData
 from lms.djangoapps.courseware.services import UserStateService
+from lms.djangoapps.courseware.toggles import FIELD_DATA_CACHE_PREFETCH_FROM_BLOCK_STRUCTURE
 from lms.djangoapps.grades.api import GradesUtilService
 from lms.djangoapps.lms_xblock.field_data import LmsFieldData
 from lms.djangoapps.lms_xblock.runtime import UserTagsService, lms_wrappers_aside, lms_applicable_aside_types
 from lms.djangoapps.verify_student.services import XBlockVerificationService
 from openedx.core.djangoapps.bookmarks.api import BookmarksService
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from openedx.core.djangoapps.crawlers.models import CrawlersConfig
 from openedx.core.djangoapps.credit.services import CreditService
 from openedx.core.djangoapps.enrollments.services import EnrollmentsService
@@ -848,6 +850,24 @@ def _get_block_by_usage_key(usage_key):
     return block, tracking_context
 
 
+def _field_data_cache_for_block_descendents(course_key, user, block, read_only=False):
+    """
+    Returns a FieldDataCache for the given block and all of its descendants.
+
+    If enabled, the descendants are found in the collected block structure
+    of the course, provided it is of the same version as the given block.
+    """
+    if FIELD_DATA_CACHE_PREFETCH_FROM_BLOCK_STRUCTURE.is_enabled():
+        block_structure = get_block_structure_manager(course_key).get_collected_if_current(
+            getattr(block, 'course_version', None)
+        )
+        if block_structure is not None:
+            return FieldDataCache.cache_for_block_structure_descendents(
+                course_key, user, block, block_structure, read_only=read_only,
+            )
+    return FieldDataCache.cache_for_block_descendents(course_key, user, block, read_only=read_only)
+
+
 def get_block_by_usage_id(request, course_id, usage_id, disable_staff_debug_info=False, course=None,
                           will_recheck_access=False):
     """
@@ -860,7 +880,7 @@ def get_block_by_usage_id(request, course_id, usage_id, disable_staff_debug_info
     block, tracking_context = _get_block_by_usage_key(usage_key)
 
     _, user = setup_masquerade(request, course_key, has_access(request.user, 'staff', block, course_key))
-    field_data_cache = FieldDataCache.cache_for_block_descendents(
+    field_data_cache = _field_data_cache_for_block_descendents(
         course_key,
         user,
         block,
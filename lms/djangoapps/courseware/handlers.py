@@ -0,0 +1,28 @@
+"""
+Signal handlers for courseware.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from edx_django_utils.cache import RequestCache
+
+from common.djangoapps.student.models import CourseAccessRole, CourseEnrollment
+from common.djangoapps.student.signals import COURSE_ENROLLMENTS_BULK_SAVED
+
+ACCESS_REQUEST_CACHE_NAMESPACE = 'courseware.access'
+
+
+@receiver(post_save, sender=CourseAccessRole)
+@receiver(post_delete, sender=CourseAccessRole)
+@receiver(post_save, sender=CourseEnrollment)
+@receiver(post_delete, sender=CourseEnrollment)
+@receiver(COURSE_ENROLLMENTS_BULK_SAVED, sender=CourseEnrollment)
+def clear_access_request_cache(**kwargs):  # pylint: disable=unused-argument
+    """
+    Forgets the access decisions remembered for the current request, see
+    lms.djangoapps.courseware.access._request_cached_access.
+
+    This receives the signals of the models that access decisions depend on, and should be called
+    whenever other state that they depend on changes during a request.
+    """
+    RequestCache(ACCESS_REQUEST_CACHE_NAMESPACE).clear()
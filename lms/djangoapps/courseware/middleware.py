@@ -3,10 +3,12 @@ Middleware for the courseware app
 """
 
 
+from django.conf import settings
 from django.shortcuts import redirect
 from django.utils.deprecation import MiddlewareMixin
 
 from lms.djangoapps.courseware.exceptions import Redirect
+from lms.djangoapps.courseware.user_state_client import DjangoXBlockUserStateClient
 from openedx.core.lib.request_utils import COURSE_REGEX
 
 
@@ -37,3 +39,24 @@ class CacheCourseIdMiddleware(MiddlewareMixin):
 
             if course_id and course_id != request.session.get('course_id'):
                 request.session['course_id'] = course_id
+
+
+class UserStateWriteBehindMiddleware(MiddlewareMixin):
+    """
+    Defers the learner state writes of the block types in settings.STUDENT_MODULE_WRITE_BEHIND_BLOCK_TYPES
+    until the end of each request, and then writes them in bulk.
+    """
+
+    def process_request(self, request):  # pylint: disable=unused-argument
+        """
+        Start deferring learner state writes, if enabled.
+        """
+        if settings.STUDENT_MODULE_WRITE_BEHIND_BLOCK_TYPES:
+            DjangoXBlockUserStateClient.defer_writes()
+
+    def process_response(self, request, response):  # pylint: disable=unused-argument
+        """
+        Write the learner state deferred during the request.
+        """
+        DjangoXBlockUserStateClient.flush_deferred_writes()
+        return response
@@ -33,17 +33,24 @@ from opaque_keys.edx.block_types import BlockTypeKeyV1
 from opaque_keys.edx.keys import LearningContextKey
 from xblock.core import XBlockAside
 from xblock.exceptions import InvalidScopeError, KeyValueMultiSaveError
-from xblock.fields import Scope, UserScope
+from xblock.fields import Scope, ScopeIds, UserScope
 from xblock.runtime import KeyValueStore
 
 from lms.djangoapps.courseware.user_state_client import DjangoXBlockUserStateClient
+from openedx.core.lib.graph_traversals import traverse_pre_order
 from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
+from xmodule.x_module import XModuleMixin  # lint-amnesty, pylint: disable=wrong-import-order
 
 from .models import StudentModule, XModuleStudentInfoField, XModuleStudentPrefsField, XModuleUserStateSummaryField
 
 log = logging.getLogger(__name__)
 
 
+# The attributes of an XBlock that FieldDataCache needs in order to cache its
+# field data, for blocks that are known from a collected BlockStructure only.
+_UninstantiatedBlock = namedtuple('_UninstantiatedBlock', 'scope_ids entry_point fields has_score location')
+
+
 class InvalidWriteError(Exception):
     """
     Raised to indicate that writing to a particular key
@@ -759,6 +766,66 @@ class FieldDataCache:
 
         self.add_blocks_to_cache(blocks)
 
+    def add_block_structure_descendents(self, block, block_structure):
+        """
+        Add all descendants of `block` to this FieldDataCache, as found in
+        the given collected block structure, without instantiating them.
+
+        Blocks that require other blocks, as given by
+        get_required_block_descriptors, are instantiated to add those.
+
+        Arguments:
+            block: An XBlock
+            block_structure: A BlockStructure collected from the same
+                version of the course as `block`. If `block` is not in
+                it, the descendants of `block` are instantiated instead.
+        """
+        if block.location not in block_structure:
+            self.add_block_descendents(block)
+            return
+
+        blocks = []
+        for usage_key in traverse_pre_order(block.location, block_structure.get_children):
+            block_class = self._load_block_class(block.runtime, usage_key.block_type)
+            has_score = getattr(block_class, 'has_score', False)
+            blocks.append(_UninstantiatedBlock(
+                scope_ids=ScopeIds(self.user.id, usage_key.block_type, None, usage_key),
+                entry_point=block_class.entry_point,
+                fields=block_class.fields,
+                # Scorable blocks whose score depends on their field values
+                # declare has_score as a field rather than as a constant.
+                has_score=has_score if isinstance(has_score, bool) else True,
+                location=usage_key,
+            ))
+            required_block_descriptors = getattr(block_class, 'get_required_block_descriptors', None)
+            if required_block_descriptors not in (None, XModuleMixin.get_required_block_descriptors):
+                for required_block in modulestore().get_item(usage_key).get_required_block_descriptors():
+                    self.add_block_descendents(required_block)
+
+        self.add_blocks_to_cache(blocks)
+
+    @staticmethod
+    def _load_block_class(runtime, block_type):
+        """
+        Returns the class of the blocks of the given type, with the mixins
+        of the given runtime applied, as the runtime would construct them.
+        """
+        return runtime.mixologist.mix(runtime.load_block_type(block_type))
+
+    @classmethod
+    def cache_for_block_structure_descendents(cls, course_id, user, block, block_structure,
+                                              asides=None, read_only=False):
+        """
+        course_id: the course in the context of which we want StudentModules.
+        user: the django user for whom to load modules.
+        block: An XBlock
+        block_structure: A BlockStructure collected from the same version of the
+            course as `block`, from which to find its descendants
+        """
+        cache = FieldDataCache([], course_id, user, asides=asides, read_only=read_only)
+        cache.add_block_structure_descendents(block, block_structure)
+        return cache
+
     @classmethod
     def cache_for_block_descendents(cls, course_id, user, block, depth=None,
                                     block_filter=lambda block: True,
@@ -966,6 +1033,30 @@ class ScoresClient:
         client.fetch_scores(scorable_locations)
         return client
 
+    @classmethod
+    def create_for_users(cls, course_id, user_ids, scorable_locations):
+        """
+        Create a ScoresClient for each of the given users, with data for the
+        given locations pre-fetched in a single query. Returns a dict of user
+        id to ScoresClient.
+        """
+        clients = {user_id: cls(course_id, user_id) for user_id in user_ids}
+        scores_qset = StudentModule.objects.filter(
+            student_id__in=list(clients),
+            course_id=course_id,
+            module_state_key__in=set(scorable_locations),
+        )
+        for user_id, location, correct, total, created in scores_qset.values_list(
+            'student_id', 'module_state_key', 'grade', 'max_grade', 'created',
+        ):
+            # See fetch_scores for why the course run info is added back.
+            clients[user_id]._locations_to_scores[location.map_into_course(course_id)] = cls.Score(  # pylint: disable=protected-access
+                correct, total, created,
+            )
+        for client in clients.values():
+            client._has_fetched = True  # pylint: disable=protected-access
+        return clients
+
 
 def set_score(user_id, usage_key, score, max_score):
     """
@@ -23,6 +23,7 @@ from django.conf import settings
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
 from django.db import models
 from django.db.models.signals import post_save
+from django.dispatch import Signal
 
 from django.utils.translation import gettext_lazy as _
 from edx_django_utils.cache.utils import RequestCache
@@ -34,6 +35,11 @@ from openedx.core.djangolib.markup import HTML
 
 log = logging.getLogger("edx.courseware")
 
+# Sent with the StudentModule instances that were saved together with bulk_create or bulk_update,
+# which do not send post_save for each instance.
+# providing_args=['instances']
+student_modules_bulk_saved = Signal()
+
 
 def chunks(items, chunk_size):
     """
@@ -275,6 +281,47 @@ class BaseStudentModuleHistory(models.Model):
             request_cache.setdefault(request_cache_key, {})
             request_cache.data[request_cache_key][student_module.id] = history_entry.id
 
+    @staticmethod
+    def save_history_entries(student_modules, history_model_cls, request_cache_key):
+        """
+        When StudentModule instances are updated in bulk, save the changes in the corresponding activity history
+        table, with one query to create all history records that were not yet created during this request
+        """
+        student_modules = [
+            student_module for student_module in student_modules
+            if student_module.module_type in history_model_cls.HISTORY_SAVING_TYPES
+        ]
+        if not student_modules:
+            return
+
+        request_cache = RequestCache('studentmodulehistory')
+        request_smh_cache = request_cache.get_cached_response(request_cache_key).get_value_or_default({})
+        existing_entries = history_model_cls.objects.in_bulk([
+            request_smh_cache[student_module.id]
+            for student_module in student_modules
+            if student_module.id in request_smh_cache
+        ])
+
+        new_entries = []
+        updated_entries = []
+        for student_module in student_modules:
+            history_entry = existing_entries.get(request_smh_cache.get(student_module.id))
+            if history_entry:
+                updated_entries.append(history_entry)
+            else:
+                history_entry = history_model_cls(student_module=student_module, version=None)
+                new_entries.append(history_entry)
+
+            history_entry.created = student_module.modified
+            history_entry.state = student_module.state
+            history_entry.grade = student_module.grade
+            history_entry.max_grade = student_module.max_grade
+
+        history_model_cls.objects.bulk_update(updated_entries, ['created', 'state', 'grade', 'max_grade'])
+        # The ids of the new records are not set by every database backend, so later updates of the same
+        # StudentModules during this request create new records.
+        history_model_cls.objects.bulk_create(new_entries)
+
 
 class StudentModuleHistory(BaseStudentModuleHistory):
     """Keeps a complete history of state changes for a given XModule for a given
@@ -312,11 +359,23 @@ class StudentModuleHistory(BaseStudentModuleHistory):
             "lms.djangoapps.courseware.models.student_module_history_map"
         )
 
+    def save_history_in_bulk(sender, instances, **kwargs):  # pylint: disable=no-self-argument, unused-argument
+        """
+        Creates & saves StudentModuleHistory entries for the given
+        instances whose module_type is one that we save.
+        """
+        BaseStudentModuleHistory.save_history_entries(
+            instances,
+            StudentModuleHistory,
+            "lms.djangoapps.courseware.models.student_module_history_map"
+        )
+
     # When the extended studentmodulehistory table exists, don't save
     # duplicate history into courseware_studentmodulehistory, just retain
     # data for reading.
     if not settings.FEATURES.get('ENABLE_CSMH_EXTENDED'):
         post_save.connect(save_history, sender=StudentModule)
+        student_modules_bulk_saved.connect(save_history_in_bulk, sender=StudentModule)
 
 
 class XBlockFieldBase(models.Model):
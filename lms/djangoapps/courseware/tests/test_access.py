@@ -17,6 +17,7 @@ from django.test import TestCase
 from django.test.client import RequestFactory
 from django.test.utils import override_settings
 from django.urls import reverse
+from edx_django_utils.cache import RequestCache
 from milestones.tests.utils import MilestonesTestCaseMixin
 from opaque_keys.edx.locator import CourseLocator
 
@@ -723,6 +724,64 @@ class UserRoleTestCase(TestCase):
         assert 'student' == access.get_user_role(self.anonymous_user, self.course_key)
 
 
+@override_settings(COURSEWARE_ACCESS_REQUEST_CACHE=True)
+class AccessRequestCacheTestCase(TestCase):
+    """
+    Tests for the access decisions remembered for the request.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.course_key = CourseLocator('edX', 'toy', '2012_Fall')
+        self.usage_key = self.course_key.make_usage_key('vertical', 'unit')
+        self.course_staff = StaffFactory(course_key=self.course_key)
+        self.student = UserFactory()
+        RequestCache.clear_all_namespaces()
+        self.addCleanup(RequestCache.clear_all_namespaces)
+
+    def test_access_decisions_cached(self):
+        with patch.object(access, '_has_access_location', wraps=access._has_access_location) as mock_has_access:
+            with patch.object(access.monitoring_utils, 'accumulate') as mock_accumulate:
+                for __ in range(3):
+                    assert access.has_access(self.course_staff, 'staff', self.usage_key, self.course_key)
+                    assert not access.has_access(self.student, 'staff', self.usage_key, self.course_key)
+        assert mock_has_access.call_count == 2
+        assert [call.args for call in mock_accumulate.call_args_list].count(
+            ('courseware_access_cache_hits', 1)
+        ) == 4
+        assert [call.args for call in mock_accumulate.call_args_list].count(
+            ('courseware_access_cache_misses', 1)
+        ) == 2
+
+    @override_settings(COURSEWARE_ACCESS_REQUEST_CACHE=False)
+    def test_access_decisions_not_cached(self):
+        with patch.object(access, '_has_access_location', wraps=access._has_access_location) as mock_has_access:
+            for __ in range(3):
+                assert access.has_access(self.course_staff, 'staff', self.usage_key, self.course_key)
+        assert mock_has_access.call_count == 3
+
+    def test_access_decisions_keyed_by_masquerade(self):
+        assert access.has_access(self.course_staff, 'staff', self.usage_key, self.course_key)
+        self.course_staff.masquerade_settings = {
+            self.course_key: CourseMasquerade(self.course_key, role='student')
+        }
+        assert not access.has_access(self.course_staff, 'staff', self.usage_key, self.course_key)
+
+    def test_access_decisions_cleared_when_roles_change(self):
+        assert not access.has_access(self.student, 'staff', self.usage_key, self.course_key)
+        CourseStaffRole(self.course_key).add_users(self.student)
+        assert access.has_access(self.student, 'staff', self.usage_key, self.course_key)
+        CourseStaffRole(self.course_key).remove_users(self.student)
+        assert not access.has_access(self.student, 'staff', self.usage_key, self.course_key)
+
+    def test_access_decisions_cleared_when_enrollments_change(self):
+        access.has_access(self.student, 'staff', self.usage_key, self.course_key)
+        with patch.object(access, '_has_access_location', wraps=access._has_access_location) as mock_has_access:
+            CourseEnrollment.enroll(self.student, self.course_key)
+            access.has_access(self.student, 'staff', self.usage_key, self.course_key)
+        assert mock_has_access.call_count == 1
+
+
 @ddt.ddt
 class CourseOverviewAccessTestCase(ModuleStoreTestCase):
     """
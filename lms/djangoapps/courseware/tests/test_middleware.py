@@ -3,11 +3,14 @@ Tests for courseware middleware
 """
 
 
-from django.http import Http404
+from unittest.mock import patch
+
+from django.http import Http404, HttpResponse
+from django.test import override_settings
 from django.test.client import RequestFactory
 
 from lms.djangoapps.courseware.exceptions import Redirect
-from lms.djangoapps.courseware.middleware import RedirectMiddleware
+from lms.djangoapps.courseware.middleware import RedirectMiddleware, UserStateWriteBehindMiddleware
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.tests.factories import CourseFactory  # lint-amnesty, pylint: disable=wrong-import-order
 
@@ -55,3 +58,18 @@ class CoursewareMiddlewareTestCase(SharedModuleStoreTestCase):
         headers = self.get_headers(response)
         target_url = headers['location'][1]
         assert target_url.endswith(test_url)
+
+    @override_settings(STUDENT_MODULE_WRITE_BEHIND_BLOCK_TYPES=['video'])
+    @patch('lms.djangoapps.courseware.middleware.DjangoXBlockUserStateClient')
+    def test_user_state_write_behind(self, mock_client):
+        """
+        Learner state writes are deferred during the request, and written at its end.
+        """
+        def get_response(request):  # pylint: disable=unused-argument
+            mock_client.defer_writes.assert_called_once_with()
+            mock_client.flush_deferred_writes.assert_not_called()
+            return HttpResponse()
+
+        request = RequestFactory().get("dummy_url")
+        UserStateWriteBehindMiddleware(get_response=get_response)(request)
+        mock_client.flush_deferred_writes.assert_called_once_with()
@@ -3,17 +3,18 @@ Test for lms courseware app, module data (runtime data storage for XBlocks)
 """
 import json
 from functools import partial
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 import pytest
 
 from django.db import connections, DatabaseError
 from django.test import TestCase
 from xblock.core import XBlock
 from xblock.exceptions import KeyValueMultiSaveError
-from xblock.fields import BlockScope, Scope, ScopeIds
+from xblock.fields import BlockScope, Scope, ScopeIds, String
+from xblock.runtime import Mixologist
 
 from common.djangoapps.student.tests.factories import UserFactory
-from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError
+from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError, ScoresClient
 from lms.djangoapps.courseware.models import (
     StudentModule,
     XModuleStudentInfoField,
@@ -26,6 +27,7 @@ from lms.djangoapps.courseware.tests.factories import StudentInfoFactory
 from lms.djangoapps.courseware.tests.factories import StudentModuleFactory as cmfStudentModuleFactory
 from lms.djangoapps.courseware.tests.factories import StudentPrefsFactory
 from lms.djangoapps.courseware.tests.factories import UserStateSummaryFactory
+from openedx.core.djangoapps.content.block_structure.block_structure import BlockStructureBlockData
 
 
 def mock_field(scope, name):
@@ -444,3 +446,84 @@ class TestStudentInfoStorage(OtherUserFailureTestMixin, StorageTestBase, TestCas
     storage_class = XModuleStudentInfoField
     other_key_factory = partial(DjangoKeyValueStore.Key, Scope.user_info, 2, 'mock_problem')  # user_id=2, not 1
     existing_field_name = "existing_field"
+
+
+class TestScoresClient(TestCase):
+    """Tests for ScoresClient"""
+    # Tell Django to clean out all databases, not just default
+    databases = set(connections)
+
+    def setUp(self):
+        super().setUp()
+        self.users = [UserFactory.create() for __ in range(3)]
+        StudentModuleFactory.create(student=self.users[0], grade=1, max_grade=2)
+        StudentModuleFactory.create(student=self.users[1], grade=2, max_grade=2)
+        StudentModuleFactory.create(student=self.users[1], module_state_key=LOCATION('other_id'), grade=0, max_grade=1)
+
+    def test_create_for_users(self):
+        user_ids = [user.id for user in self.users]
+        with self.assertNumQueries(1):
+            clients = ScoresClient.create_for_users(COURSE_KEY, user_ids, [LOCATION('usage_id')])
+
+        assert set(clients) == set(user_ids)
+        for user_id, client in clients.items():
+            expected_score = ScoresClient.create_for_locations(
+                COURSE_KEY, user_id, [LOCATION('usage_id')],
+            ).get(LOCATION('usage_id'))
+            with self.assertNumQueries(0):
+                assert client.get(LOCATION('usage_id')) == expected_score
+                assert client.get(LOCATION('other_id')) is None
+        assert clients[self.users[0].id].get(LOCATION('usage_id')).correct == 1
+        assert clients[self.users[2].id].get(LOCATION('usage_id')) is None
+
+
+class PrefetchTestBlock(XBlock):
+    """XBlock with user state and preferences, to prefetch field data for"""
+    a_field = String(scope=Scope.user_state)
+    a_preference = String(scope=Scope.preferences)
+
+
+class TestBlockStructureDescendents(TestCase):  # pylint: disable=protected-access
+    """Tests for caching the descendants of a block found in a block structure"""
+    # Tell Django to clean out all databases, not just default
+    databases = set(connections)
+
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory.create()
+        self.block_structure = BlockStructureBlockData(LOCATION('root_id'))
+        self.block_structure._add_relation(LOCATION('root_id'), LOCATION('usage_id'))
+        for index in range(10):
+            child_key = LOCATION(f'child_{index}')
+            self.block_structure._add_relation(LOCATION('usage_id'), child_key)
+            StudentModuleFactory.create(
+                student=self.user, module_state_key=child_key, state=json.dumps({'a_field': str(index)}),
+            )
+        StudentModuleFactory.create(student=self.user, module_state_key=LOCATION('root_id'))
+
+        self.block = Mock(location=LOCATION('usage_id'))
+        self.block.runtime.load_block_type.return_value = PrefetchTestBlock
+        self.block.runtime.mixologist = Mixologist([])
+
+    def test_cache_for_block_structure_descendents(self):
+        with self.assertNumQueries(2):
+            field_data_cache = FieldDataCache.cache_for_block_structure_descendents(
+                COURSE_KEY, self.user, self.block, self.block_structure,
+            )
+
+        self.block.get_children.assert_not_called()
+        kvs = DjangoKeyValueStore(field_data_cache)
+        with self.assertNumQueries(0):
+            for index in range(10):
+                key = DjangoKeyValueStore.Key(Scope.user_state, self.user.id, LOCATION(f'child_{index}'), 'a_field')
+                assert kvs.get(key) == str(index)
+            assert not kvs.has(DjangoKeyValueStore.Key(Scope.user_state, self.user.id, LOCATION('root_id'), 'a_field'))
+
+    @patch('lms.djangoapps.courseware.model_data.modulestore', MagicMock())
+    def test_block_not_in_block_structure(self):
+        self.block.location = LOCATION('other_id')
+        self.block.get_children.return_value = []
+        self.block.get_required_block_descriptors.return_value = []
+        self.block.fields.values.return_value = []
+        FieldDataCache.cache_for_block_structure_descendents(COURSE_KEY, self.user, self.block, self.block_structure)
+        self.block.get_children.assert_called_once_with()
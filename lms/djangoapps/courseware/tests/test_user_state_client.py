@@ -9,14 +9,21 @@ from xblock.fields import Scope
 from datetime import datetime
 from unittest import TestCase
 from collections import defaultdict
+from unittest.mock import patch
+
+import pytest
 from django.db import connections
+from django.db.utils import DatabaseError
+from django.test import override_settings
 
 from common.djangoapps.student.tests.factories import UserFactory
+from lms.djangoapps.courseware.models import StudentModule
 from lms.djangoapps.courseware.user_state_client import (
     DjangoXBlockUserStateClient,
     XBlockUserStateClient,
     XBlockUserState
 )
+from openedx.core.lib.cache_utils import get_cache
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase  # lint-amnesty, pylint: disable=wrong-import-order
 
 
@@ -757,3 +764,103 @@ class TestDjangoUserStateClient(UserStateClientTestBase, ModuleStoreTestCase):
             2. Update the test in the other repo to align with the new functionality
             3. Remove this override to re-enable the working test
         """
+
+
+@override_settings(STUDENT_MODULE_WRITE_BEHIND_BLOCK_TYPES=['problem'])
+class TestDjangoUserStateClientWriteBehind(TestDjangoUserStateClient):
+    """
+    Tests of the DjangoUserStateClient backend while its writes are deferred.
+    The tests reused from :class:`~UserStateClientTestBase` verify that
+    reads see the deferred writes.
+    """
+    __test__ = True
+
+    def setUp(self):
+        super().setUp()
+        DjangoXBlockUserStateClient.defer_writes()
+        self.addCleanup(get_cache(DjangoXBlockUserStateClient.DEFERRED_WRITES_NAMESPACE).clear)
+
+    def test_get_mod_date(self):
+        # Deferred writes are stored when the state is read, with the time at which they are stored.
+        self.set_many(user=0, block_to_state={0: {'a': 'b'}, 1: {'b': 'c'}})
+        start_time = datetime.now(pytz.utc)
+        mod_dates = self.get(user=0, block=0)
+        end_time = datetime.now(pytz.utc)
+
+        self.assertCountEqual(list(mod_dates.state.keys()), ["a"])
+        self.assertGreater(mod_dates.updated, start_time)
+        self.assertLess(mod_dates.updated, end_time)
+
+    def test_get_many_mod_date(self):
+        # Deferred writes are stored when the state is read, with the time at which they are stored.
+        with override_settings(STUDENT_MODULE_WRITE_BEHIND_BLOCK_TYPES=[]):
+            self.set_many(user=0, block_to_state={1: {'a': 'd'}})
+        self.set_many(user=0, block_to_state={0: {'a': 'b'}, 1: {'a': 'c'}})
+        start_time = datetime.now(pytz.utc)
+        mod_dates = list(self.get_many(user=0, blocks=[0, 1], fields=["a"]))
+        end_time = datetime.now(pytz.utc)
+
+        self.assertCountEqual([result.block_key for result in mod_dates], [self._block(0), self._block(1)])
+        for result in mod_dates:
+            assert result.state == {'a': 'b' if result.block_key == self._block(0) else 'c'}
+            self.assertGreater(result.updated, start_time)
+            self.assertLess(result.updated, end_time)
+
+    def test_deferred_writes(self):
+        with override_settings(STUDENT_MODULE_WRITE_BEHIND_BLOCK_TYPES=[]):
+            self.set(user=0, block=0, state={'a': 'b'})
+        self.set_many(user=0, block_to_state={0: {'a': 'c'}, 1: {'b': 'c'}})
+        self.set(user=0, block=1, state={'b': 'd'})
+        self.set(user=1, block=0, state={'a': 'e'})
+        assert StudentModule.objects.count() == 1
+
+        # The writes of each user are flushed in a transaction, a savepoint within the transaction of the test,
+        # which reads the stored modules, updates them, creates the missing ones and reads the created ones.
+        transaction_queries = 2  # SAVEPOINT and RELEASE SAVEPOINT
+        user_0_queries = transaction_queries + 4  # read, update, create, read the created one
+        user_1_queries = transaction_queries + 3  # read, create, read the created one: there is nothing to update
+        with self.assertNumQueries(user_0_queries + user_1_queries, using='default'):
+            self.client.flush_deferred_writes()
+
+        assert self.get(user=0, block=0).state == {'a': 'c'}
+        assert self.get(user=0, block=1).state == {'b': 'd'}
+        assert self.get(user=1, block=0).state == {'a': 'e'}
+        # History entries are saved once per request.
+        assert [history.state for history in self.get_history(user=0, block=0)] == [{'a': 'c'}]
+        assert [history.state for history in self.get_history(user=0, block=1)] == [{'b': 'd'}]
+
+    def test_deferred_writes_bulk_error(self):
+        # When the bulk write fails, the deferred state is written one block at a time.
+        with override_settings(STUDENT_MODULE_WRITE_BEHIND_BLOCK_TYPES=[]):
+            self.set(user=0, block=0, state={'a': 'b'})
+        self.set_many(user=0, block_to_state={0: {'a': 'c'}, 1: {'b': 'c'}})
+        with patch.object(StudentModule.objects, 'bulk_create', side_effect=DatabaseError):
+            self.client.flush_deferred_writes()
+
+        assert self.get(user=0, block=0).state == {'a': 'c'}
+        assert self.get(user=0, block=1).state == {'b': 'c'}
+
+    def test_deferred_writes_error(self):
+        # When a block can't be written at all, the error is logged, and the other blocks are written.
+        self.set_many(user=0, block_to_state={0: {'a': 'b'}, 1: {'b': 'c'}})
+        set_many_one_by_one = DjangoXBlockUserStateClient._set_many_one_by_one  # pylint: disable=protected-access
+
+        def fail_block_0(client, user, block_keys_to_state):
+            if self._block(0) in block_keys_to_state:
+                raise DatabaseError
+            set_many_one_by_one(client, user, block_keys_to_state)
+
+        with patch.object(StudentModule.objects, 'bulk_create', side_effect=DatabaseError), \
+                patch.object(DjangoXBlockUserStateClient, '_set_many_one_by_one', fail_block_0), \
+                patch('lms.djangoapps.courseware.user_state_client.log') as mock_log:
+            self.client.flush_deferred_writes()
+
+        assert mock_log.exception.call_count == 2
+        with pytest.raises(self.client.DoesNotExist):
+            self.get(user=0, block=0)
+        assert self.get(user=0, block=1).state == {'b': 'c'}
+
+    @override_settings(STUDENT_MODULE_WRITE_BEHIND_BLOCK_TYPES=[])
+    def test_writes_not_deferred(self):
+        self.set(user=0, block=0, state={'a': 'b'})
+        assert StudentModule.objects.count() == 1
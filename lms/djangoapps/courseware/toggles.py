@@ -150,6 +150,30 @@ COURSEWARE_OPTIMIZED_RENDER_XBLOCK = CourseWaffleFlag(
 # .. toggle_tickets: https://github.com/mitodl/edx-platform/issues/123
 COURSES_INVITE_ONLY = SettingToggle('COURSES_INVITE_ONLY', default=False)
 
+# .. toggle_name: FIELD_DATA_CACHE_PREFETCH_FROM_BLOCK_STRUCTURE
+# .. toggle_implementation: SettingToggle
+# .. toggle_default: False
+# .. toggle_description: When rendering a block, find the descendants for which to prefetch learner state in the
+#   collected course block structure instead of instantiating every descendant from the modulestore. This only
+#   applies when the collected block structure is of the same version of the course as the rendered block.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-17
+FIELD_DATA_CACHE_PREFETCH_FROM_BLOCK_STRUCTURE = SettingToggle(
+    'FIELD_DATA_CACHE_PREFETCH_FROM_BLOCK_STRUCTURE', default=False
+)
+
+# .. toggle_name: COURSEWARE_ACCESS_REQUEST_CACHE
+# .. toggle_implementation: SettingToggle
+# .. toggle_default: False
+# .. toggle_description: Remember the access decisions of has_access for blocks and usage keys for the rest of the
+#   request, by user, action, usage key, course key and masquerade. The decisions are forgotten when course access
+#   roles or enrollments are saved or deleted during the request.
+# .. toggle_warning: Changes to a block that affect its access, such as its start date or group access, are not
+#   seen by later access checks in the same request.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-17
+COURSEWARE_ACCESS_REQUEST_CACHE = SettingToggle('COURSEWARE_ACCESS_REQUEST_CACHE', default=False)
+
 
 ENABLE_OPTIMIZELY_IN_COURSEWARE = WaffleSwitch(  # lint-amnesty, pylint: disable=toggle-missing-annotation
     'RET.enable_optimizely_in_courseware', __name__
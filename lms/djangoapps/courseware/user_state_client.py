@@ -16,11 +16,13 @@ from django.conf import settings
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
 from django.core.paginator import Paginator
 from django.db import transaction
-from django.db.utils import IntegrityError
+from django.db.utils import DatabaseError, IntegrityError
+from django.utils import timezone
 from edx_django_utils import monitoring as monitoring_utils
 from xblock.fields import Scope
 
-from lms.djangoapps.courseware.models import BaseStudentModuleHistory, StudentModule
+from lms.djangoapps.courseware.models import BaseStudentModuleHistory, StudentModule, student_modules_bulk_saved
+from openedx.core.lib.cache_utils import get_cache
 
 try:
     import simplejson as json
@@ -258,6 +260,9 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         """
         pass  # lint-amnesty, pylint: disable=unnecessary-pass
 
+    # Namespace of the request cache that holds the deferred writes of the current request.
+    DEFERRED_WRITES_NAMESPACE = 'courseware.user_state_client.deferred_writes'
+
     def __init__(self, user=None):
         """
         Arguments:
@@ -293,6 +298,131 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
                 usage_key = student_module.module_state_key.map_into_course(student_module.course_id)
                 yield (student_module, usage_key)
 
+    @classmethod
+    def defer_writes(cls):
+        """
+        For the rest of the current request, defer the writes of the state of the block types in
+        settings.STUDENT_MODULE_WRITE_BEHIND_BLOCK_TYPES, coalescing them per user and block, until
+        :meth:`flush_deferred_writes` is called.
+
+        Reading or deleting the state of a user, or writing the state of other block types for that user,
+        first writes the deferred state of that user, so that callers of this client read their own writes.
+        """
+        get_cache(cls.DEFERRED_WRITES_NAMESPACE)['users'] = {}
+
+    @classmethod
+    def flush_deferred_writes(cls, username=None):
+        """
+        Write the deferred state of the user with the given ``username``, or of all users if None.
+        """
+        deferred_writes = get_cache(cls.DEFERRED_WRITES_NAMESPACE).get('users')
+        if not deferred_writes:
+            return
+
+        usernames = list(deferred_writes) if username is None else [username]
+        for name in usernames:
+            if name in deferred_writes:
+                user, block_keys_to_state = deferred_writes.pop(name)
+                cls(user)._write_deferred_state(user, block_keys_to_state)  # pylint: disable=protected-access
+
+    def _write_deferred_state(self, user, block_keys_to_state):
+        """
+        Write the deferred state of ``user`` in bulk. If that fails, write it one block at a time, so that a
+        database error neither fails the request whose handlers already succeeded nor loses the state of the
+        other blocks. The state of the blocks that still can't be written is logged and dropped.
+        """
+        try:
+            with transaction.atomic():
+                self._set_many_in_bulk(user, block_keys_to_state)
+            return
+        except DatabaseError:
+            log.exception(
+                "Could not write the deferred state of %d blocks for user %s in bulk, writing it block by block",
+                len(block_keys_to_state), user.id,
+            )
+            self._nr_stat_increment('set_many', 'deferred_bulk_errors')
+
+        for usage_key, state in block_keys_to_state.items():
+            try:
+                with transaction.atomic():
+                    self._set_many_one_by_one(user, {usage_key: state})
+            except DatabaseError:
+                log.exception("Could not write the deferred state of block %s for user %s", usage_key, user.id)
+                self._nr_stat_increment('set_many', 'deferred_errors')
+
+    def _defer_set_many(self, user, block_keys_to_state):
+        """
+        Add the supplied state to the deferred writes of ``user``, if writes are deferred during the current
+        request and the writes of all the supplied blocks may be deferred. Returns whether it was added.
+        """
+        deferred_writes = get_cache(self.DEFERRED_WRITES_NAMESPACE).get('users')
+        if deferred_writes is None:
+            return False
+
+        block_types = settings.STUDENT_MODULE_WRITE_BEHIND_BLOCK_TYPES
+        if not all(usage_key.block_type in block_types for usage_key in block_keys_to_state):
+            return False
+
+        _, deferred_block_keys_to_state = deferred_writes.setdefault(user.username, (user, {}))
+        for usage_key, state in block_keys_to_state.items():
+            deferred_block_keys_to_state.setdefault(usage_key, {}).update(state)
+        self._nr_stat_increment('set_many', 'deferred_calls')
+        return True
+
+    def _set_many_in_bulk(self, user, block_keys_to_state):
+        """
+        Overlay the supplied state over the stored state of ``user``, with one query to read the stored
+        :class:`~StudentModule`s of each course, one to update them and one to create the missing ones.
+        The history entries of all the blocks are saved in bulk by the receivers of
+        ``student_modules_bulk_saved``. The caller runs it in a transaction.
+        """
+        evt_time = time()
+        stored_student_modules = {
+            usage_key: student_module
+            for student_module, usage_key in self._get_student_modules(user.username, list(block_keys_to_state))
+        }
+
+        modified = timezone.now()
+        updated_student_modules = []
+        created_student_modules = []
+        for usage_key, state in block_keys_to_state.items():
+            student_module = stored_student_modules.get(usage_key)
+            if student_module is None:
+                created_student_modules.append(StudentModule(
+                    student=user,
+                    course_id=usage_key.context_key,
+                    module_state_key=usage_key,
+                    module_type=usage_key.block_type,
+                    state=json.dumps(state),
+                ))
+                self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_created')
+            else:
+                current_state = {} if student_module.state is None else json.loads(student_module.state)
+                current_state.update(state)
+                student_module.state = json.dumps(current_state)
+                student_module.modified = modified
+                updated_student_modules.append(student_module)
+                self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_updated')
+
+        StudentModule.objects.bulk_update(updated_student_modules, ['state', 'modified'])
+        # As in set_many, rows created by another process since they were read are left as they are.
+        StudentModule.objects.bulk_create(created_student_modules, ignore_conflicts=True)
+
+        if created_student_modules:
+            # Not every database backend sets the ids of the created rows, which history entries refer to.
+            created_student_modules = [
+                student_module for student_module, _ in self._get_student_modules(
+                    user.username, [student_module.module_state_key for student_module in created_student_modules],
+                )
+            ]
+        student_modules_bulk_saved.send(
+            sender=StudentModule,
+            instances=updated_student_modules + created_student_modules,
+        )
+
+        duration = (time() - evt_time) * 1000  # milliseconds
+        self._nr_stat_accumulate('set_many', 'deferred_duration', duration)
+
     def _nr_attribute_name(self, function_name, stat_name, block_type=None):
         """
         Return an attribute name (string) representing the provided blocks.
@@ -355,6 +485,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError(f"Only Scope.user_state is supported, not {scope}")
 
+        self.flush_deferred_writes(username)
         total_block_count = 0
         evt_time = time()
 
@@ -428,6 +559,17 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
             # what we have.
             return
 
+        if self._defer_set_many(user, block_keys_to_state):
+            return
+        # Write deferred state first, so that it doesn't overwrite this state later.
+        self.flush_deferred_writes(username)
+
+        self._set_many_one_by_one(user, block_keys_to_state)
+
+    def _set_many_one_by_one(self, user, block_keys_to_state):
+        """
+        Overlay the supplied state over the stored state of ``user``, one :class:`~StudentModule` at a time.
+        """
         evt_time = time()
 
         for usage_key, state in block_keys_to_state.items():
@@ -511,6 +653,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
 
+        self.flush_deferred_writes(username)
         evt_time = time()  # lint-amnesty, pylint: disable=unused-variable
         student_modules = self._get_student_modules(username, block_keys)
         for student_module, _ in student_modules:
@@ -549,6 +692,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
+        self.flush_deferred_writes(username)
         student_modules = list(
             student_module
             for student_module, usage_id
@@ -600,6 +744,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
 
+        self.flush_deferred_writes()
         results = StudentModule.objects.order_by('id').filter(module_state_key=block_key).select_related('student')
         p = Paginator(results, settings.USER_STATE_BATCH_SIZE)
 
@@ -632,6 +777,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
 
+        self.flush_deferred_writes()
         results = StudentModule.objects.order_by('id').filter(course_id=course_key)
         if block_type:
             results = results.filter(module_type=block_type)
@@ -18,7 +18,7 @@ from django.db import models
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from lms.djangoapps.courseware.models import BaseStudentModuleHistory, StudentModule
+from lms.djangoapps.courseware.models import BaseStudentModuleHistory, StudentModule, student_modules_bulk_saved
 from lms.djangoapps.courseware.fields import UnsignedBigIntAutoField
 
 
@@ -57,6 +57,18 @@ class StudentModuleHistoryExtended(BaseStudentModuleHistory):
             "lms.djangoapps.coursewarehistoryextended.models.student_module_history_extended_map"
         )
 
+    @receiver(student_modules_bulk_saved, sender=StudentModule)
+    def save_history_in_bulk(sender, instances, **kwargs):  # pylint: disable=no-self-argument, unused-argument
+        """
+        Creates & saves StudentModuleHistoryExtended entries for the given
+        instances whose module_type is one that we save.
+        """
+        BaseStudentModuleHistory.save_history_entries(
+            instances,
+            StudentModuleHistoryExtended,
+            "lms.djangoapps.coursewarehistoryextended.models.student_module_history_extended_map"
+        )
+
     @receiver(post_delete, sender=StudentModule)
     def delete_history(sender, instance, **kwargs):  # pylint: disable=no-self-argument, unused-argument
         """
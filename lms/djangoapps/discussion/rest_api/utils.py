@@ -13,7 +13,7 @@ from django.core.paginator import Paginator
 from django.db.models.functions import Length
 from pytz import UTC
 
-from common.djangoapps.student.roles import CourseInstructorRole, CourseStaffRole
+from common.djangoapps.student.roles import CourseInstructorRole, CourseRoleIndex, CourseStaffRole
 from common.djangoapps.student.models import CourseAccessRole
 from openedx.core.djangoapps.django_comment_common.comment_client.thread import Thread
 
@@ -150,13 +150,10 @@ def get_course_staff_users_list(course_id):
     Gets user ids for Staff roles for course discussions.
     Roles Course Instructor and Course Staff.
     """
-    # TODO: cache course_staff_user_ids if we need to improve perf
-    course_staff_user_ids = []
-    staff = list(CourseStaffRole(course_id).users_with_role().values_list('id', flat=True))
-    admins = list(CourseInstructorRole(course_id).users_with_role().values_list('id', flat=True))
-    course_staff_user_ids.extend(staff)
-    course_staff_user_ids.extend(admins)
-    return list(set(course_staff_user_ids))
+    role_index = CourseRoleIndex.for_course(course_id)
+    course_staff_user_ids = set(role_index.users_with_role(CourseStaffRole.ROLE))
+    course_staff_user_ids.update(role_index.users_with_role(CourseInstructorRole.ROLE))
+    return list(course_staff_user_ids)
 
 
 def get_course_ta_users_list(course_id):
@@ -3,12 +3,32 @@ Code used to get and cache the requested course-data
 """
 
 
-from lms.djangoapps.course_blocks.api import get_course_blocks
+from lms.djangoapps.course_blocks.api import get_course_block_access_signature, get_course_blocks
 from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
+from openedx.core.lib.cache_utils import get_cache
 from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
 
 from .transformer import GradesTransformer
 
+_SHARED_STRUCTURES_CACHE_NAMESPACE = 'grades.course_data.shared_structures'
+
+
+def share_course_structures(course_key):
+    """
+    Enables sharing, within the current request, of the user-specific course
+    structures of users whose structures are identical.  See
+    get_course_block_access_signature.  Shared structures must not be
+    modified.
+    """
+    get_cache(_SHARED_STRUCTURES_CACHE_NAMESPACE)[str(course_key)] = {}
+
+
+def clear_shared_course_structures(course_key):
+    """
+    Disables and clears the sharing of course structures for the given course.
+    """
+    get_cache(_SHARED_STRUCTURES_CACHE_NAMESPACE).pop(str(course_key), None)
+
 
 class CourseData:
     """
@@ -56,13 +76,37 @@ class CourseData:
     @property
     def structure(self):  # lint-amnesty, pylint: disable=missing-function-docstring
         if self._structure is None:
-            self._structure = get_course_blocks(
-                self.user,
-                self.location,
-                collected_block_structure=self._collected_block_structure,
-            )
+            shared_structures = get_cache(_SHARED_STRUCTURES_CACHE_NAMESPACE).get(str(self.course_key))
+            if shared_structures is None:
+                self._structure = self._get_course_blocks()
+            else:
+                self._structure = self._get_shared_course_blocks(shared_structures)
         return self._structure
 
+    def _get_course_blocks(self):
+        """
+        Returns the course structure transformed for this user.
+        """
+        return get_course_blocks(
+            self.user,
+            self.location,
+            collected_block_structure=self._collected_block_structure,
+        )
+
+    def _get_shared_course_blocks(self, shared_structures):
+        """
+        Returns the course structure transformed for this user from the given
+        shared structures, transforming and adding it if not yet shared.
+        """
+        signature = get_course_block_access_signature(self.user, self.collected_structure)
+        if signature is None:
+            return self._get_course_blocks()
+
+        shared_structure_key = (self.location, signature)
+        if shared_structure_key not in shared_structures:
+            shared_structures[shared_structure_key] = self._get_course_blocks()
+        return shared_structures[shared_structure_key]
+
     @property
     def collected_structure(self):
         if self._collected_block_structure is None:
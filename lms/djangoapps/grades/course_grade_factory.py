@@ -2,17 +2,21 @@
 Course Grade Factory Class
 """
 from collections import namedtuple
+from itertools import islice
 from logging import getLogger
 
+from django.conf import settings
+
 from openedx.core.djangoapps.signals.signals import (
     COURSE_GRADE_CHANGED,
     COURSE_GRADE_NOW_FAILED,
     COURSE_GRADE_NOW_PASSED
 )
-from .course_data import CourseData
+from .course_data import CourseData, clear_shared_course_structures, share_course_structures
 from .course_grade import CourseGrade, ZeroCourseGrade
 from .models import PersistentCourseGrade
 from .models_api import prefetch_grade_overrides_and_visible_blocks
+from .subsection_grade_factory import clear_prefetched_scores, prefetch_scores
 
 log = getLogger(__name__)
 
@@ -93,8 +97,32 @@ class CourseGradeFactory:
         course_data = CourseData(
             user=None, course=course, collected_block_structure=collected_block_structure, course_key=course_key,
         )
-        for user in users:
-            yield self._iter_grade_result(user, course_data, force_update)
+        if settings.COURSE_GRADES_BATCH_SIZE:
+            yield from self._iter_batched_grade_results(users, course_data, force_update)
+        else:
+            for user in users:
+                yield self._iter_grade_result(user, course_data, force_update)
+
+    def _iter_batched_grade_results(self, users, course_data, force_update):
+        """
+        Yields a GradeResult for every given user, grading
+        settings.COURSE_GRADES_BATCH_SIZE users at a time.  Within a batch,
+        users with identical course structures share a single transformed
+        structure and all users' scores are loaded in bulk.
+
+        Persisted grades are not prefetched here; as for the unbatched mode,
+        callers that read grades should prefetch them for all users.
+        """
+        users = iter(users)
+        for batch in iter(lambda: list(islice(users, settings.COURSE_GRADES_BATCH_SIZE)), []):
+            share_course_structures(course_data.course_key)
+            prefetch_scores(course_data.course_key, batch, course_data.collected_structure)
+            try:
+                for user in batch:
+                    yield self._iter_grade_result(user, course_data, force_update)
+            finally:
+                clear_prefetched_scores(course_data.course_key)
+                clear_shared_course_structures(course_data.course_key)
 
     def _iter_grade_result(self, user, course_data, force_update):  # lint-amnesty, pylint: disable=missing-function-docstring
         try:
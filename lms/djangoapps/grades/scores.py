@@ -5,7 +5,7 @@ Functionality for problem scores.
 
 from logging import getLogger
 
-from numpy import around
+from numpy import around, asarray, divide, zeros
 from xblock.core import XBlock
 
 from openedx.core.lib.cache_utils import process_cached
@@ -157,6 +157,17 @@ def compute_percent(earned, possible):
         return 0.0
 
 
+def compute_percents(earned, possible):
+    """
+    Returns an array of the percentages of the given arrays of earned and
+    possible values, each computed as compute_percent does.
+    """
+    earned = asarray(earned, dtype=float)
+    possible = asarray(possible, dtype=float)
+    percents = divide(earned, possible, out=zeros(earned.shape), where=possible > 0)
+    return around(percents, decimals=4)
+
+
 def _get_score_from_submissions(submissions_scores, block):
     """
     Returns the score values from the submissions API if found.
@@ -8,3 +8,11 @@ def plugin_settings(settings):
 
     # Queue to use for individual learner course regrades
     settings.SINGLE_LEARNER_COURSE_REGRADE_ROUTING_KEY = settings.DEFAULT_PRIORITY_QUEUE
+
+    # .. setting_name: COURSE_GRADES_BATCH_SIZE
+    # .. setting_default: 0
+    # .. setting_description: Number of users that CourseGradeFactory.iter grades together. Within a batch, the
+    #   course structure is transformed once per distinct set of user-specific access inputs (staff access,
+    #   partition groups, dates, etc.) rather than once per user, and the users' StudentModule scores are loaded
+    #   with a single query. A value of 0 grades users one at a time.
+    settings.COURSE_GRADES_BATCH_SIZE = 0
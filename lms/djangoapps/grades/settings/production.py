@@ -17,3 +17,8 @@ def plugin_settings(settings):
     settings.SINGLE_LEARNER_COURSE_REGRADE_ROUTING_KEY = settings.ENV_TOKENS.get(
         'SINGLE_LEARNER_COURSE_REGRADE_ROUTING_KEY', settings.DEFAULT_PRIORITY_QUEUE,
     )
+
+    # Number of users graded together by CourseGradeFactory.iter
+    settings.COURSE_GRADES_BATCH_SIZE = settings.ENV_TOKENS.get(
+        'COURSE_GRADES_BATCH_SIZE', settings.COURSE_GRADES_BATCH_SIZE,
+    )
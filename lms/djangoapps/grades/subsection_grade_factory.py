@@ -15,6 +15,7 @@ from lms.djangoapps.courseware.model_data import ScoresClient
 from lms.djangoapps.grades.models import PersistentSubsectionGrade
 from lms.djangoapps.grades.scores import possibly_scored
 from openedx.core.djangoapps.signals.signals import COURSE_ASSESSMENT_GRADE_CHANGED
+from openedx.core.lib.cache_utils import get_cache
 from openedx.core.lib.grade_utils import is_score_higher_or_equal
 
 from .course_data import CourseData
@@ -22,6 +23,53 @@ from .subsection_grade import CreateSubsectionGrade, ReadSubsectionGrade, ZeroSu
 
 log = getLogger(__name__)
 
+_PREFETCHED_SCORES_CACHE_NAMESPACE = 'grades.subsection_grade_factory.prefetched_scores'
+
+
+def prefetch_scores(course_key, users, collected_block_structure):
+    """
+    Prepares the StudentModule scores of the given users in the given course
+    to be loaded in bulk, for all users at once, when first needed by a
+    SubsectionGradeFactory for any of them.
+
+    The Submissions API scores are still loaded for each user, with
+    submissions_api.get_scores, since the Submissions API has no public
+    entry point to load the scores of many students at once.
+    """
+    get_cache(_PREFETCHED_SCORES_CACHE_NAMESPACE)[str(course_key)] = _BulkScores(
+        course_key, users, collected_block_structure,
+    )
+
+
+def clear_prefetched_scores(course_key):
+    """
+    Clears prefetched scores for this course from the RequestCache.
+    """
+    get_cache(_PREFETCHED_SCORES_CACHE_NAMESPACE).pop(str(course_key), None)
+
+
+class _BulkScores:
+    """
+    Lazily loaded scores of a set of users in a course.
+    """
+    def __init__(self, course_key, users, collected_block_structure):
+        self.course_key = course_key
+        self.users = {user.id: user for user in users}
+        self.collected_block_structure = collected_block_structure
+
+    def __contains__(self, user_id):
+        return user_id in self.users
+
+    @lazy
+    def csm_scores(self):
+        """
+        Returns a dict of user id to ScoresClient, for all users.
+        """
+        scorable_locations = [
+            block_key for block_key in self.collected_block_structure if possibly_scored(block_key)
+        ]
+        return ScoresClient.create_for_users(self.course_key, list(self.users), scorable_locations)
+
 
 class SubsectionGradeFactory:
     """
@@ -121,6 +169,9 @@ class SubsectionGradeFactory:
         Lazily queries and returns all the scores stored in the user
         state (in CSM) for the course, while caching the result.
         """
+        bulk_scores = self._get_bulk_scores()
+        if bulk_scores is not None:
+            return bulk_scores.csm_scores[self.student.id]
         scorable_locations = [block_key for block_key in self.course_data.structure if possibly_scored(block_key)]
         return ScoresClient.create_for_locations(self.course_data.course_key, self.student.id, scorable_locations)
 
@@ -133,6 +184,16 @@ class SubsectionGradeFactory:
         anonymous_user_id = anonymous_id_for_user(self.student, self.course_data.course_key)
         return submissions_api.get_scores(str(self.course_data.course_key), anonymous_user_id)
 
+    def _get_bulk_scores(self):
+        """
+        Returns the prefetched scores that include this student, if any.
+        See prefetch_scores.
+        """
+        bulk_scores = get_cache(_PREFETCHED_SCORES_CACHE_NAMESPACE).get(str(self.course_data.course_key))
+        if bulk_scores is not None and self.student.id in bulk_scores:
+            return bulk_scores
+        return None
+
     def _get_bulk_cached_grade(self, subsection):
         """
         Returns the student's SubsectionGrade for the subsection,
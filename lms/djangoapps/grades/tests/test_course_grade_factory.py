@@ -4,8 +4,12 @@ Tests for the CourseGradeFactory class.
 from unittest.mock import patch
 
 import ddt
+from django.test.utils import override_settings
+from submissions import api as submissions_api
 
+from common.djangoapps.student.models import anonymous_id_for_user
 from common.djangoapps.student.tests.factories import UserFactory
+from lms.djangoapps.course_blocks.api import get_course_blocks
 from lms.djangoapps.courseware.access import has_access
 from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase  # lint-amnesty, pylint: disable=wrong-import-order
@@ -216,6 +220,42 @@ class TestCourseGradeFactory(GradeTestBase):
         }
         assert expected_summary == actual_summary
 
+    def test_iter_batched_submissions_scores(self):
+        """
+        Users graded in batches get the scores stored by the Submissions
+        API from submissions_api.get_scores, as when graded one by one.
+        """
+        users = [UserFactory.create() for __ in range(3)]
+        for user in users[:2]:
+            submission = submissions_api.create_submission({
+                'student_id': anonymous_id_for_user(user, self.course.id),
+                'course_id': str(self.course.id),
+                'item_id': str(self.problem.location),
+                'item_type': 'problem',
+            }, 'answer')
+            submissions_api.set_score(submission['uuid'], 1, 1)
+
+        def grade_percents():
+            return {
+                user: course_grade.percent
+                for user, course_grade, __ in CourseGradeFactory().iter(users, self.course, force_update=True)
+            }
+
+        with patch(
+            'lms.djangoapps.grades.subsection_grade_factory.submissions_api.get_scores',
+            wraps=submissions_api.get_scores,
+        ) as mock_get_scores:
+            with override_settings(COURSE_GRADES_BATCH_SIZE=2):
+                batched_percents = grade_percents()
+            batched_calls = {call.args for call in mock_get_scores.call_args_list}
+            mock_get_scores.reset_mock()
+            percents = grade_percents()
+
+        assert batched_calls == {call.args for call in mock_get_scores.call_args_list}
+        assert len(batched_calls) == len(users)
+        assert batched_percents == percents
+        assert percents[users[0]] == percents[users[1]] > percents[users[2]]
+
 
 class TestGradeIteration(SharedModuleStoreTestCase):
     """
@@ -271,6 +311,25 @@ class TestGradeIteration(SharedModuleStoreTestCase):
             assert course_grade.letter_grade is None
             assert course_grade.percent == 0.0
 
+    @override_settings(COURSE_GRADES_BATCH_SIZE=2)
+    def test_batched_grades(self):
+        """
+        Users graded in batches share the course structure transformed for
+        the first user of each batch with identical access.
+        """
+        with patch(
+            'lms.djangoapps.grades.course_data.get_course_blocks',
+            wraps=get_course_blocks,
+        ) as mock_get_course_blocks:
+            all_course_grades, all_errors = self._course_grades_and_errors_for(self.course, self.students)
+            assert mock_get_course_blocks.call_count == 3
+
+        assert len(all_errors) == 0
+        assert set(all_course_grades) == set(self.students)
+        for course_grade in all_course_grades.values():
+            assert course_grade.letter_grade is None
+            assert course_grade.percent == 0.0
+
     @patch('lms.djangoapps.grades.course_grade_factory.CourseGradeFactory.read')
     def test_grading_exception(self, mock_course_grade):
         """Test that we correctly capture exception messages that bubble up from
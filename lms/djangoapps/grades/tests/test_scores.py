@@ -259,6 +259,20 @@ class TestWeightedScore(TestCase):
             scores.weighted_score(raw_earned=1, raw_possible=None, weight=1)
 
 
+class TestComputePercents(TestCase):
+    """
+    Tests the helper method: compute_percents
+    """
+
+    def test_compute_percents(self):
+        earned = [[0, 1, 2], [1, 3, 0]]
+        possible = [[0, 3, 2], [7, 9, 0]]
+        assert scores.compute_percents(earned, possible).tolist() == [
+            [scores.compute_percent(*score) for score in zip(user_earned, user_possible)]
+            for user_earned, user_possible in zip(earned, possible)
+        ]
+
+
 @ddt.ddt
 class TestInternalGetGraded(TestCase):
     """
@@ -23,6 +23,7 @@ from submissions.models import score_set, score_reset
 
 from common.djangoapps.course_modes.models import CourseMode
 from common.djangoapps.student.models import (  # lint-amnesty, pylint: disable=line-too-long
+    BULK_ENROLLMENT_BATCH_SIZE,
     CourseEnrollment,
     CourseEnrollmentAllowed,
     anonymous_id_for_user,
@@ -70,17 +71,60 @@ class EmailEnrollmentState:
             user = None
         if user is not None:
             mode, is_active = CourseEnrollment.enrollment_mode_for_user(user, course_id)
-            # is_active is `None` if the user is not enrolled in the course
-            exists_ce = is_active is not None and is_active
-            full_name = user.profile.name
             ceas = CourseEnrollmentAllowed.for_user(user).filter(course_id=course_id).all()
         else:
-            mode = None
-            exists_ce = False
-            full_name = None
+            mode = is_active = None
             ceas = CourseEnrollmentAllowed.objects.filter(email=email, course_id=course_id).all()
-        exists_allowed = ceas.exists()
-        state_auto_enroll = exists_allowed and ceas[0].auto_enroll
+        self._set_state(user, mode, is_active, ceas.first())
+
+    @classmethod
+    def for_emails(cls, course_id, emails):
+        """
+        Returns a dict of the EmailEnrollmentState of each email, with a few queries for each
+        BULK_ENROLLMENT_BATCH_SIZE emails instead of several for each email.
+        """
+        states = {}
+        for start in range(0, len(emails), BULK_ENROLLMENT_BATCH_SIZE):
+            batch = emails[start:start + BULK_ENROLLMENT_BATCH_SIZE]
+            # Emails are compared like the database does, which ignores their case with the default collation.
+            users = {
+                user.email.lower(): user
+                for user in User.objects.filter(email__in=batch).select_related('profile')
+            }
+            enrollments = {
+                enrollment.user_id: enrollment
+                for enrollment in CourseEnrollment.objects.filter(course_id=course_id, user__in=users.values())
+            }
+            ceas = {
+                cea.email.lower(): cea
+                for cea in CourseEnrollmentAllowed.objects.filter(email__in=batch, course_id=course_id)
+            }
+            for email in batch:
+                user = users.get(email.lower())
+                cea = ceas.get(email.lower())
+                if user is not None:
+                    enrollment = enrollments.get(user.id)
+                    mode, is_active = (enrollment.mode, enrollment.is_active) if enrollment else (None, None)
+                    if cea is not None and cea.user_id not in (None, user.id):
+                        # Like CourseEnrollmentAllowed.for_user, leave out the ones consumed by other users.
+                        cea = None
+                else:
+                    mode = is_active = None
+                state = cls.__new__(cls)
+                state._set_state(user, mode, is_active, cea)  # pylint: disable=protected-access
+                states[email] = state
+        return states
+
+    def _set_state(self, user, mode, is_active, cea):
+        """
+        Sets the state from the user with the email, the mode and active status of their enrollment, and
+        the CourseEnrollmentAllowed of the email.
+        """
+        # is_active is `None` if the user is not enrolled in the course
+        exists_ce = is_active is not None and is_active
+        full_name = user.profile.name if user is not None else None
+        exists_allowed = cea is not None
+        state_auto_enroll = exists_allowed and cea.auto_enroll
 
         self.user = user
         self.enrollment = exists_ce
@@ -125,6 +169,20 @@ def get_user_email_language(user):
     return UserPreference.get_value(user, LANGUAGE_KEY)
 
 
+def get_users_email_languages(user_ids):
+    """
+    Return a dict of the language most appropriate for writing emails to each of the users
+    with the given ids that has set the preference, by user id.
+    """
+    user_ids = list(user_ids)
+    languages = {}
+    for start in range(0, len(user_ids), BULK_ENROLLMENT_BATCH_SIZE):
+        languages.update(UserPreference.objects.filter(
+            user_id__in=user_ids[start:start + BULK_ENROLLMENT_BATCH_SIZE], key=LANGUAGE_KEY,
+        ).values_list('user_id', 'value'))
+    return languages
+
+
 def enroll_email(
     course_id,
     student_email,
@@ -199,6 +257,94 @@ def enroll_email(
     return previous_state, after_state, enrollment_obj
 
 
+def enroll_emails(
+    course_id,
+    student_emails,
+    auto_enroll=False,
+    message_students=False,
+    message_params=None,
+    languages=None
+):
+    """
+    Enroll students by email, like enroll_email, but reading and writing the enrollments of all
+    the students with a few queries for each BULK_ENROLLMENT_BATCH_SIZE students.
+
+    `languages` is a dict of the language used to render the email of each student, by email.
+
+    returns a dict of the EmailEnrollmentState's before and after the action and the enrollment
+        of each email, like the values returned by enroll_email, and the exception raised while
+        messaging the student, if any.  A message that can't be sent doesn't prevent messaging
+        the other students.
+    """
+    student_emails = list(dict.fromkeys(student_emails))
+    languages = languages or {}
+    previous_states = EmailEnrollmentState.for_emails(course_id, student_emails)
+
+    # Group the users by the mode to enroll them in, as enroll_email does.
+    default_course_mode = CourseMode.HONOR if CourseMode.is_white_label(course_id) else None
+    users_by_mode = {}
+    allowed_emails = []
+    for student_email in student_emails:
+        previous_state = previous_states[student_email]
+        if previous_state.user and previous_state.user.is_active:
+            course_mode = previous_state.mode if previous_state.enrollment else default_course_mode
+            users_by_mode.setdefault(course_mode, []).append(previous_state.user)
+        elif not is_email_retired(student_email):
+            allowed_emails.append(student_email)
+
+    enrollments = {}
+    for course_mode, users in users_by_mode.items():
+        enrollments.update(CourseEnrollment.bulk_enroll(users, course_id, course_mode))
+
+    for student_email in allowed_emails:
+        cea, _ = CourseEnrollmentAllowed.objects.get_or_create(course_id=course_id, email=student_email)
+        if cea.auto_enroll != auto_enroll:
+            cea.auto_enroll = auto_enroll
+            cea.save()
+
+    message_errors = {}
+    if message_students:
+        for student_email in student_emails:
+            previous_state = previous_states[student_email]
+            if previous_state.user and previous_state.user.is_active:
+                message_type = 'enrolled_enroll'
+            elif student_email in allowed_emails:
+                message_type = 'allowed_enroll'
+            else:
+                continue
+            student_message_params = dict(message_params or {})
+            if message_params:
+                student_message_params.update({
+                    'app_label': 'instructor',
+                    'push_notification_extra_context': {
+                        'notification_type': 'enroll',
+                        'course_id': str(course_id),
+                    },
+                })
+            student_message_params['message_type'] = message_type
+            student_message_params['email_address'] = student_email
+            if previous_state.user:
+                student_message_params['user_id'] = previous_state.user.id
+            if message_type == 'enrolled_enroll':
+                student_message_params['full_name'] = previous_state.full_name
+            try:
+                send_mail_to_student(student_email, student_message_params, language=languages.get(student_email))
+            except Exception as exc:  # pylint: disable=broad-except
+                log.exception('Error while messaging student %s of their enrollment', student_email)
+                message_errors[student_email] = exc
+
+    after_states = EmailEnrollmentState.for_emails(course_id, student_emails)
+    return {
+        student_email: (
+            previous_states[student_email],
+            after_states[student_email],
+            enrollments.get(previous_states[student_email].user.id) if previous_states[student_email].user else None,
+            message_errors.get(student_email),
+        )
+        for student_email in student_emails
+    }
+
+
 def unenroll_email(course_id, student_email, message_students=False, message_params=None, language=None):
     """
     Unenroll a student by email.
@@ -246,6 +392,93 @@ def unenroll_email(course_id, student_email, message_students=False, message_par
     return previous_state, after_state
 
 
+def unenroll_emails(course_id, student_emails, message_students=False, message_params=None, languages=None):
+    """
+    Unenroll students by email, like unenroll_email, but reading and writing the enrollments of all
+    the students with a few queries for each BULK_ENROLLMENT_BATCH_SIZE students.
+
+    `languages` is a dict of the language used to render the email of each student, by email.
+
+    returns a dict of the EmailEnrollmentState's before and after the action and the enrollment
+        of each email, like the values returned by unenroll_email and the enrollment the
+        students_update_enrollment view reads afterwards, and the exception raised while messaging
+        the student, if any.  A message that can't be sent doesn't prevent messaging the other
+        students.
+    """
+    student_emails = list(dict.fromkeys(student_emails))
+    languages = languages or {}
+    previous_states = EmailEnrollmentState.for_emails(course_id, student_emails)
+
+    enrolled_users = [
+        previous_states[student_email].user for student_email in student_emails
+        if previous_states[student_email].enrollment
+    ]
+    enrollments = CourseEnrollment.bulk_unenroll(enrolled_users, course_id)
+    # The enrollments of the other students are returned too, like CourseEnrollment.get_enrollment would.
+    other_user_ids = [
+        previous_states[student_email].user.id for student_email in student_emails
+        if previous_states[student_email].user and not previous_states[student_email].enrollment
+    ]
+    for start in range(0, len(other_user_ids), BULK_ENROLLMENT_BATCH_SIZE):
+        enrollments.update({
+            enrollment.user_id: enrollment
+            for enrollment in CourseEnrollment.objects.filter(
+                course_id=course_id, user_id__in=other_user_ids[start:start + BULK_ENROLLMENT_BATCH_SIZE],
+            )
+        })
+
+    allowed_emails = [
+        student_email for student_email in student_emails if previous_states[student_email].allowed
+    ]
+    for start in range(0, len(allowed_emails), BULK_ENROLLMENT_BATCH_SIZE):
+        CourseEnrollmentAllowed.objects.filter(
+            course_id=course_id, email__in=allowed_emails[start:start + BULK_ENROLLMENT_BATCH_SIZE],
+        ).delete()
+
+    message_errors = {}
+    if message_students:
+        for student_email in student_emails:
+            previous_state = previous_states[student_email]
+            message_types = []
+            if previous_state.enrollment:
+                message_types.append('enrolled_unenroll')
+            if previous_state.allowed:
+                message_types.append('allowed_unenroll')
+            for message_type in message_types:
+                student_message_params = dict(message_params or {})
+                if message_params:
+                    student_message_params.update({
+                        'app_label': 'instructor',
+                        'push_notification_extra_context': {
+                            'notification_type': 'unenroll',
+                        },
+                    })
+                student_message_params['message_type'] = message_type
+                student_message_params['email_address'] = student_email
+                if previous_state.user:
+                    student_message_params['user_id'] = previous_state.user.id
+                if message_type == 'enrolled_unenroll':
+                    student_message_params['full_name'] = previous_state.full_name
+                try:
+                    send_mail_to_student(
+                        student_email, student_message_params, language=languages.get(student_email),
+                    )
+                except Exception as exc:  # pylint: disable=broad-except
+                    log.exception('Error while messaging student %s of their unenrollment', student_email)
+                    message_errors[student_email] = exc
+
+    after_states = EmailEnrollmentState.for_emails(course_id, student_emails)
+    return {
+        student_email: (
+            previous_states[student_email],
+            after_states[student_email],
+            enrollments.get(previous_states[student_email].user.id) if previous_states[student_email].user else None,
+            message_errors.get(student_email),
+        )
+        for student_email in student_emails
+    }
+
+
 def send_beta_role_email(action, user, message_params):
     """
     Send an email to a user added or removed as a beta tester.
@@ -71,7 +71,9 @@ from lms.djangoapps.certificates.data import CertificateStatuses
 from lms.djangoapps.certificates.tests.factories import GeneratedCertificateFactory
 from lms.djangoapps.courseware.models import StudentModule
 from lms.djangoapps.courseware.tests.helpers import LoginEnrollmentTestCase
+from lms.djangoapps.instructor.enrollment import send_mail_to_student
 from lms.djangoapps.instructor.tests.utils import FakeContentTask, FakeEmail, FakeEmailInfo
+from lms.djangoapps.instructor.toggles import BULK_ENROLLMENT
 from lms.djangoapps.instructor.views.api import (
     _get_certificate_for_user,
     _get_student_from_request_data,
@@ -1500,6 +1502,49 @@ class TestInstructorAPIEnrollment(SharedModuleStoreTestCase, LoginEnrollmentTest
             assert 'Your other courses have not been affected.' in body
             assert 'This email was automatically sent from edx.org to Enrolled Student' in body
 
+    @override_waffle_flag(BULK_ENROLLMENT, active=True)
+    def test_bulk_enroll_with_email_error(self):
+        """
+        Test that a student who can't be emailed is reported as an error, but is still enrolled and audited.
+        """
+        url = reverse('students_update_enrollment', kwargs={'course_id': str(self.course.id)})
+        identifiers = [self.notenrolled_student.email, self.allowed_email]
+
+        def _fail_for_notenrolled_student(student, param_dict, language=None):
+            if student == self.notenrolled_student.email:
+                raise Exception('Email failure')  # pylint: disable=broad-exception-raised
+            return send_mail_to_student(student, param_dict, language=language)
+
+        with patch('lms.djangoapps.instructor.enrollment.send_mail_to_student', _fail_for_notenrolled_student):
+            response = self.client.post(
+                url, {'identifiers': ','.join(identifiers), 'action': 'enroll', 'email_students': True},
+            )
+
+        assert response.status_code == 200
+        results = json.loads(response.content.decode('utf-8'))['results']
+        assert results[0] == {'identifier': self.notenrolled_student.email, 'error': True}
+        assert results[1]['after']['allowed']
+        assert len(mail.outbox) == 1
+        assert CourseEnrollment.is_enrolled(self.notenrolled_student, self.course.id)
+        assert set(ManualEnrollmentAudit.objects.values_list('enrolled_email', flat=True)) == set(identifiers)
+
+    @override_waffle_flag(BULK_ENROLLMENT, active=True)
+    @patch('lms.djangoapps.instructor.views.api.enroll_emails', Mock(side_effect=Exception('Bulk failure')))
+    def test_bulk_enroll_error(self):
+        """
+        Test that the students are enrolled one by one when they can't be enrolled in bulk.
+        """
+        url = reverse('students_update_enrollment', kwargs={'course_id': str(self.course.id)})
+        identifiers = [self.notenrolled_student.email, self.allowed_email]
+        response = self.client.post(url, {'identifiers': ','.join(identifiers), 'action': 'enroll'})
+
+        assert response.status_code == 200
+        results = json.loads(response.content.decode('utf-8'))['results']
+        assert [result['identifier'] for result in results] == identifiers
+        assert all(result['after']['enrollment'] or result['after']['allowed'] for result in results)
+        assert CourseEnrollment.is_enrolled(self.notenrolled_student, self.course.id)
+        assert set(ManualEnrollmentAudit.objects.values_list('enrolled_email', flat=True)) == set(identifiers)
+
     def test_unenroll_with_email_allowed_student(self):
         url = reverse('students_update_enrollment', kwargs={'course_id': str(self.course.id)})
         response = self.client.post(url,
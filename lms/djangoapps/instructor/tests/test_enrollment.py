@@ -32,11 +32,13 @@ from lms.djangoapps.grades.tests.utils import answer_problem
 from lms.djangoapps.instructor.enrollment import (
     EmailEnrollmentState,
     enroll_email,
+    enroll_emails,
     get_email_params,
     render_message_to_string,
     reset_student_attempts,
     send_beta_role_email,
-    unenroll_email
+    unenroll_email,
+    unenroll_emails
 )
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.teams.tests.factories import CourseTeamFactory
@@ -367,6 +369,93 @@ class TestInstructorUnenrollDB(TestEnrollmentChangeBase):
         return self._run_state_change_test(before_ideal, after_ideal, action)
 
 
+class TestInstructorBulkEnrollmentDB(TestEnrollmentChangeBase):
+    """ Test instructor.enrollment.enroll_emails and unenroll_emails """
+
+    def setUp(self):
+        super().setUp()
+        self.enrolled_user = UserFactory()
+        CourseEnrollment.enroll(self.enrolled_user, self.course_key)
+        self.unenrolled_user = UserFactory()
+        CourseEnrollment.enroll(self.unenrolled_user, self.course_key)
+        CourseEnrollment.unenroll(self.unenrolled_user, self.course_key)
+        self.inactive_user = UserFactory(is_active=False)
+        self.allowed_email = 'robot-allowed@robot.org'
+        CourseEnrollmentAllowed.objects.create(email=self.allowed_email, course_id=self.course_key, auto_enroll=True)
+        self.emails = [
+            self.enrolled_user.email,
+            self.unenrolled_user.email,
+            UserFactory().email,
+            self.inactive_user.email,
+            self.allowed_email,
+            'robot-not-an-email-yet@robot.org',
+        ]
+
+    def _states(self):
+        return {email: EmailEnrollmentState(self.course_key, email).to_dict() for email in self.emails}
+
+    def test_for_emails(self):
+        states = EmailEnrollmentState.for_emails(self.course_key, self.emails)
+        assert {email: state.to_dict() for email, state in states.items()} == self._states()
+
+    def test_enroll_emails(self):
+        before = self._states()
+        outcomes = enroll_emails(self.course_key, self.emails, auto_enroll=False)
+        after = self._states()
+
+        assert {email: outcome[0].to_dict() for email, outcome in outcomes.items()} == before
+        assert {email: outcome[1].to_dict() for email, outcome in outcomes.items()} == after
+        assert [email for email in self.emails if after[email]['enrollment']] == self.emails[:3]
+        assert [email for email in self.emails if after[email]['allowed']] == self.emails[3:]
+        assert not any(after[email]['auto_enroll'] for email in self.emails)
+        for email in self.emails[:3]:
+            assert outcomes[email][2] == CourseEnrollment.objects.get(user__email=email, course_id=self.course_key)
+        for email in self.emails[3:]:
+            assert outcomes[email][2] is None
+
+    def test_unenroll_emails(self):
+        before = self._states()
+        outcomes = unenroll_emails(self.course_key, self.emails)
+        after = self._states()
+
+        assert {email: outcome[0].to_dict() for email, outcome in outcomes.items()} == before
+        assert {email: outcome[1].to_dict() for email, outcome in outcomes.items()} == after
+        assert not any(after[email]['enrollment'] or after[email]['allowed'] for email in self.emails)
+        for email in self.emails[:2]:
+            assert outcomes[email][2] == CourseEnrollment.objects.get(user__email=email, course_id=self.course_key)
+        for email in self.emails[2:]:
+            assert outcomes[email][2] is None
+        assert all(outcome[3] is None for outcome in outcomes.values())
+
+    def _fail_first_message(self):
+        """
+        Patches send_mail_to_student to fail for the first email.
+        """
+        def _send_mail_to_student(student, param_dict, language=None):  # pylint: disable=unused-argument
+            if student == self.emails[0]:
+                raise ValueError('Message failure')
+        return patch('lms.djangoapps.instructor.enrollment.send_mail_to_student', side_effect=_send_mail_to_student)
+
+    def test_enroll_emails_message_error(self):
+        with self._fail_first_message() as mock_send_mail:
+            outcomes = enroll_emails(self.course_key, self.emails, message_students=True, message_params={})
+
+        assert isinstance(outcomes[self.emails[0]][3], ValueError)
+        assert all(outcomes[email][3] is None for email in self.emails[1:])
+        assert mock_send_mail.call_count == len(self.emails)
+        assert all(outcomes[email][1].enrollment for email in self.emails[:3])
+
+    def test_unenroll_emails_message_error(self):
+        with self._fail_first_message() as mock_send_mail:
+            outcomes = unenroll_emails(self.course_key, self.emails, message_students=True, message_params={})
+
+        assert isinstance(outcomes[self.emails[0]][3], ValueError)
+        assert all(outcomes[email][3] is None for email in self.emails[1:])
+        # Only the enrolled student and the allowed email are messaged.
+        assert mock_send_mail.call_count == 2
+        assert not any(outcomes[email][1].enrollment for email in self.emails)
+
+
 class TestInstructorEnrollmentStudentModule(SharedModuleStoreTestCase):
     """ Test student module manipulations. """
     MODULESTORE = TEST_DATA_SPLIT_MODULESTORE
@@ -39,3 +39,20 @@ def data_download_v2_is_enabled():
 
 def use_optimised_is_small_course():
     return OPTIMISED_IS_SMALL_COURSE.is_enabled()
+
+
+# .. toggle_name: instructor.bulk_enrollment
+# .. toggle_implementation: WaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Enroll and unenroll the learners listed in the students_update_enrollment API (and so in the
+#   bulk_enroll API) with a few queries for each batch of learners, with CourseEnrollment.bulk_enroll and
+#   bulk_unenroll, instead of several queries for each learner.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-17
+# .. toggle_warning: The enrollments are saved without sending post_save for each of them. Only the receivers of
+#   COURSE_ENROLLMENTS_BULK_SAVED are notified of them.
+BULK_ENROLLMENT = WaffleFlag(f'{WAFFLE_FLAG_NAMESPACE}.bulk_enrollment', __name__)
+
+
+def use_bulk_enrollment():
+    return BULK_ENROLLMENT.is_enabled()
@@ -84,13 +84,17 @@ from lms.djangoapps.courseware.models import StudentModule
 from lms.djangoapps.instructor import enrollment
 from lms.djangoapps.instructor.access import ROLES, allow_access, list_with_level, revoke_access, update_forum_role
 from lms.djangoapps.instructor.constants import INVOICE_KEY
+from lms.djangoapps.instructor.toggles import use_bulk_enrollment
 from lms.djangoapps.instructor.enrollment import (
     enroll_email,
+    enroll_emails,
     get_email_params,
     get_user_email_language,
+    get_users_email_languages,
     send_beta_role_email,
     send_mail_to_student,
     unenroll_email,
+    unenroll_emails,
 )
 from lms.djangoapps.instructor.views.instructor_task_helpers import extract_email_features, extract_task_features
 from lms.djangoapps.instructor_analytics import basic as instructor_analytics_basic, csvs as instructor_analytics_csvs
@@ -141,6 +145,7 @@ from .tools import (
     dump_student_extensions,
     find_unit,
     get_student_from_identifier,
+    get_students_from_identifiers,
     keep_field_private,
     parse_datetime,
     set_due_date_extension,
@@ -815,14 +820,31 @@ class StudentsUpdateEnrollmentView(APIView):
 
         course_key = CourseKey.from_string(course_id)
 
-        enrollment_obj = None
-        state_transition = DEFAULT_TRANSITION_STATE
-
         email_params = {}
         if email_students:
             course = get_course_by_id(course_key)
             email_params = get_email_params(course, auto_enroll, secure=secure)
 
+        if use_bulk_enrollment():
+            update_enrollments = self._update_enrollments_in_bulk
+        else:
+            update_enrollments = self._update_enrollments
+        return {
+            'action': action,
+            'auto_enroll': auto_enroll,
+            'results': update_enrollments(
+                course_key, action, identifiers, auto_enroll, email_students, email_params, reason,
+            ),
+        }
+
+    def _update_enrollments(  # pylint: disable=too-many-statements
+        self, course_key, action, identifiers, auto_enroll, email_students, email_params, reason
+    ):
+        """
+        Enrolls or unenrolls the students one by one, and returns the results for each identifier.
+        """
+        enrollment_obj = None
+        state_transition = DEFAULT_TRANSITION_STATE
         results = []
 
         for identifier in identifiers:  # pylint: disable=too-many-nested-blocks
@@ -902,11 +924,120 @@ class StudentsUpdateEnrollmentView(APIView):
                     'after': after.to_dict(),
                 })
 
-        return {
-            'action': action,
-            'auto_enroll': auto_enroll,
-            'results': results,
-        }
+        return results
+
+    def _update_enrollments_in_bulk(  # pylint: disable=too-many-statements
+        self, course_key, action, identifiers, auto_enroll, email_students, email_params, reason
+    ):
+        """
+        Enrolls or unenrolls the students like _update_enrollments, but with a few queries for each
+        batch of students, and returns the results for each identifier.
+
+        If the enrollments can't be updated in bulk, the students are enrolled or unenrolled one by one,
+        so that the enrollments that were committed are audited and the errors are reported per student.
+        """
+        students, ambiguous_identifiers = get_students_from_identifiers(identifiers)
+
+        emails = {}
+        for identifier in identifiers:
+            if identifier in ambiguous_identifiers:
+                continue
+            student = students.get(identifier)
+            emails[identifier] = student.email if student else identifier
+
+        languages = {}
+        students_by_id = {student.id: student for student in students.values()}
+        if email_students:
+            languages = {
+                students_by_id[user_id].email: language
+                for user_id, language in get_users_email_languages(students_by_id).items()
+            }
+
+        valid_emails = []
+        for email in emails.values():
+            try:
+                validate_email(email)  # Raises ValidationError if invalid
+            except ValidationError:
+                continue
+            valid_emails.append(email)
+
+        try:
+            if action == 'enroll':
+                outcomes = enroll_emails(
+                    course_key, valid_emails, auto_enroll, email_students, email_params, languages=languages
+                )
+            elif action == 'unenroll':
+                outcomes = unenroll_emails(
+                    course_key, valid_emails, email_students, email_params, languages=languages
+                )
+            else:
+                outcomes = {}
+        except Exception:  # pylint: disable=broad-except
+            log.exception("Error while processing students in bulk, processing them one by one")
+            return self._update_enrollments(
+                course_key, action, identifiers, auto_enroll, email_students, email_params, reason,
+            )
+
+        results = []
+        audits = []
+        for identifier in identifiers:
+            email = emails.get(identifier)
+            if email is None:
+                results.append({
+                    'identifier': identifier,
+                    'error': True,
+                })
+                continue
+            if email not in outcomes:
+                results.append({
+                    'identifier': identifier,
+                    'invalidIdentifier': True,
+                })
+                continue
+
+            before, after, enrollment_obj, message_error = outcomes[email]
+            before_state = before.to_dict()
+            after_state = after.to_dict()
+            state_transition = DEFAULT_TRANSITION_STATE
+            if action == 'enroll':
+                if before_state['user']:
+                    if after_state['enrollment']:
+                        if before_state['enrollment']:
+                            state_transition = ENROLLED_TO_ENROLLED
+                        elif before_state['allowed']:
+                            state_transition = ALLOWEDTOENROLL_TO_ENROLLED
+                        else:
+                            state_transition = UNENROLLED_TO_ENROLLED
+                elif after_state['allowed']:
+                    state_transition = UNENROLLED_TO_ALLOWEDTOENROLL
+            elif before_state['enrollment']:
+                state_transition = ENROLLED_TO_UNENROLLED
+            elif before_state['allowed']:
+                state_transition = ALLOWEDTOENROLL_TO_UNENROLLED
+            else:
+                state_transition = UNENROLLED_TO_UNENROLLED
+
+            audits.append(ManualEnrollmentAudit(
+                enrolled_by=students.get(identifier),
+                enrolled_email=email,
+                state_transition=state_transition,
+                reason=reason,
+                enrollment=enrollment_obj,
+            ))
+            if message_error is not None:
+                results.append({
+                    'identifier': identifier,
+                    'error': True,
+                })
+                continue
+            results.append({
+                'identifier': identifier,
+                'before': before_state,
+                'after': after_state,
+            })
+
+        ManualEnrollmentAudit.create_manual_enrollment_audits(audits)
+        return results
 
 
 @method_decorator(cache_control(no_cache=True, no_store=True, must_revalidate=True), name='dispatch')
@@ -7,13 +7,19 @@ import json
 import operator
 
 import dateutil
+from django.apps import apps
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
+from django.db.models import Q
 from django.http import HttpResponseBadRequest
 from django.utils.translation import gettext as _
 from edx_when import api
 from pytz import UTC
 
-from common.djangoapps.student.models import CourseEnrollment, get_user_by_username_or_email
+from common.djangoapps.student.models import (
+    BULK_ENROLLMENT_BATCH_SIZE,
+    CourseEnrollment,
+    get_user_by_username_or_email,
+)
 from openedx.core.djangoapps.schedules.models import Schedule
 
 
@@ -67,6 +73,38 @@ def get_student_from_identifier(unique_student_identifier):
     return get_user_by_username_or_email(unique_student_identifier)
 
 
+def get_students_from_identifiers(unique_student_identifiers):
+    """
+    Gets the student objects of email addresses or usernames, with a query for each
+    BULK_ENROLLMENT_BATCH_SIZE identifiers instead of one for each identifier.
+
+    Returns a dict of the student associated with each identifier, which leaves out the identifiers of
+    no student, or of a student who was retired or is in the process of being retired, as
+    get_student_from_identifier does. Also returns the set of identifiers matching several students.
+    """
+    UserRetirementRequest = apps.get_model('user_api', 'UserRetirementRequest')
+    identifiers = list(dict.fromkeys(strip_if_string(identifier) for identifier in unique_student_identifiers))
+    students = {}
+    ambiguous_identifiers = set()
+    for start in range(0, len(identifiers), BULK_ENROLLMENT_BATCH_SIZE):
+        batch = identifiers[start:start + BULK_ENROLLMENT_BATCH_SIZE]
+        # Identifiers are compared like the database does, which ignores their case with the default collation.
+        matches = {}
+        for user in User.objects.filter(Q(email__in=batch) | Q(username__in=batch)).select_related('profile'):
+            for value in {user.email.lower(), user.username.lower()}:
+                matches.setdefault(value, []).append(user)
+        retiring_user_ids = set(UserRetirementRequest.objects.filter(
+            user__username__in=batch,
+        ).values_list('user_id', flat=True))
+        for identifier in batch:
+            users = matches.get(identifier.lower(), [])
+            if len(users) > 1:
+                ambiguous_identifiers.add(identifier)
+            elif users and not (users[0].username == identifier and users[0].id in retiring_user_ids):
+                students[identifier] = users[0]
+    return students, ambiguous_identifiers
+
+
 def require_student_from_identifier(unique_student_identifier):
     """
     Same as get_student_from_identifier() but will raise a DashboardError if
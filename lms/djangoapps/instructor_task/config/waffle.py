@@ -36,6 +36,20 @@ USE_ON_DISK_GRADE_REPORTING = CourseWaffleFlag(
     f'{WAFFLE_NAMESPACE}.use_on_disk_grade_reporting', __name__
 )
 
+# .. toggle_name: instructor_task.bulk_rescoring
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When rescoring a capa problem whose response types are all deterministic (checkboxes,
+#   multiple choice, dropdown, text input and numerical input), build the problem once per seed and rescore the
+#   stored answers of all the learners with it, writing the results with bulk updates, instead of loading the
+#   problem for each learner. When rescoring any other capa problem, execute its scripts for all the learners in
+#   batches of sandboxed runs (see SAFE_EXEC_BATCH_SIZE) before rescoring each learner.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-17
+BULK_RESCORING = CourseWaffleFlag(
+    f'{WAFFLE_NAMESPACE}.bulk_rescoring', __name__
+)
+
 
 def optimize_get_learners_switch_enabled():
     """
@@ -69,3 +83,11 @@ def use_on_disk_grade_reporting(course_id):
     False otherwise.
     """
     return USE_ON_DISK_GRADE_REPORTING.is_enabled(course_id)
+
+
+def bulk_rescoring_enabled(course_id):
+    """
+    Returns True if the problems of the given course that support it
+    should be rescored in bulk, False otherwise.
+    """
+    return BULK_RESCORING.is_enabled(course_id)
@@ -16,3 +16,8 @@ class UpdateProblemModuleStateError(Exception):
 class DuplicateTaskException(Exception):
     """Exception indicating that a task already exists or has already completed."""
     pass  # lint-amnesty, pylint: disable=unnecessary-pass
+
+
+class GradeReportSubtaskError(Exception):
+    """Exception indicating that subtasks of a sharded grade report failed, so that it wasn't merged."""
+    pass  # lint-amnesty, pylint: disable=unnecessary-pass
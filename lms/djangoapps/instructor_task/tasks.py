@@ -35,7 +35,12 @@ from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
     upload_may_enroll_csv,
     upload_students_csv
 )
-from lms.djangoapps.instructor_task.tasks_helper.grades import CourseGradeReport, ProblemGradeReport, ProblemResponses
+from lms.djangoapps.instructor_task.tasks_helper.grades import (
+    CourseGradeReport,
+    ProblemGradeReport,
+    ProblemResponses,
+    generate_course_grade_report_shard
+)
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
     upload_course_survey_report,
@@ -50,6 +55,7 @@ from lms.djangoapps.instructor_task.tasks_helper.module_state import (
     delete_problem_module_state,
     override_score_module_state,
     perform_module_state_update,
+    prepare_rescore_problem_module_states,
     rescore_problem_module_state,
     reset_attempts_module_state
 )
@@ -81,8 +87,9 @@ def rescore_problem(entry_id, xblock_instance_args):
     # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
     action_name = gettext_noop('rescored')
     update_fcn = partial(rescore_problem_module_state, xblock_instance_args)
+    prepare_fcn = partial(prepare_rescore_problem_module_states, xblock_instance_args)
 
-    visit_fcn = partial(perform_module_state_update, update_fcn, None)
+    visit_fcn = partial(perform_module_state_update, update_fcn, None, prepare_fcn=prepare_fcn)
     return run_main_task(entry_id, visit_fcn, action_name)
 
 
@@ -201,6 +208,24 @@ def calculate_grades_csv(entry_id, xblock_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@shared_task
+@set_code_owner_attribute
+def calculate_grades_csv_shard(entry_id, xblock_instance_args, user_ids, subtask_status_dict):
+    """
+    Grade a shard of the learners of a course, as a subtask of a grade report
+    for which settings.COURSE_GRADE_REPORT_USERS_PER_SUBTASK is exceeded.
+
+    The subtask updates the status of the InstructorTask itself, and the last
+    subtask to complete merges the shards and pushes the results to an S3
+    bucket for download.
+    """
+    # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
+    action_name = gettext_noop('graded')
+    return generate_course_grade_report_shard(
+        entry_id, xblock_instance_args, user_ids, subtask_status_dict, action_name,
+    )
+
+
 @shared_task(base=BaseInstructorTask)
 @set_code_owner_attribute
 def calculate_problem_grade_report(entry_id, xblock_instance_args):
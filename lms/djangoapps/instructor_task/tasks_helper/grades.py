@@ -3,8 +3,11 @@ Functionality for generating grade reports.
 """
 
 import csv
+import json
 import logging
+import os
 import re
+import traceback
 from collections import OrderedDict, defaultdict
 from datetime import datetime
 from itertools import chain
@@ -12,8 +15,11 @@ from tempfile import TemporaryFile
 
 from time import time
 
+import numpy
+from celery.states import FAILURE, SUCCESS
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from lazy import lazy
 from opaque_keys.edx.keys import UsageKey
 from pytz import UTC
@@ -26,7 +32,7 @@ from lms.djangoapps.certificates import api as certs_api
 from lms.djangoapps.certificates.models import GeneratedCertificate
 from lms.djangoapps.course_blocks.api import get_course_blocks
 from lms.djangoapps.courseware.user_state_client import DjangoXBlockUserStateClient
-from lms.djangoapps.grades.api import CourseGradeFactory
+from lms.djangoapps.grades.api import CourseGradeFactory, ZeroSubsectionGrade, compute_percents
 from lms.djangoapps.grades.api import context as grades_context
 from lms.djangoapps.grades.api import prefetch_course_and_subsection_grades
 from lms.djangoapps.instructor_analytics.basic import list_problem_responses
@@ -36,6 +42,15 @@ from lms.djangoapps.instructor_task.config.waffle import (
     problem_grade_report_verified_only,
     use_on_disk_grade_reporting,
 )
+from lms.djangoapps.instructor_task.exceptions import GradeReportSubtaskError
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.subtasks import (
+    SUBTASK_LOCK_EXPIRE,
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_query,
+    update_subtask_status
+)
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.services import IDVerificationService
 from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
@@ -451,36 +466,38 @@ class GradeReportBase:
             args = [iter(iterable)] * chunk_size
             return zip_longest(*args, fillvalue=fillvalue)
 
-        def get_enrolled_learners_for_course(course_id, verified_only=False):
+        def get_enrolled_learners_for_course():
             """
             Get all the enrolled users in a course chunk by chunk.
             This generator method fetches & loads the enrolled user objects on demand which in chunk
             size defined. This method is a workaround to avoid out-of-memory errors.
             """
-            filter_kwargs = {
-                'courseenrollment__course_id': course_id,
-            }
-            if verified_only:
-                filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
-
-            user_ids_list = get_user_model().objects.filter(**filter_kwargs).values_list('id', flat=True).order_by('id')
+            user_ids_list = self._enrolled_learners().values_list('id', flat=True).order_by('id')
             user_chunks = grouper(user_ids_list)
             for user_ids in user_chunks:
                 user_ids = [user_id for user_id in user_ids if user_id is not None]
                 min_id = min(user_ids)
                 max_id = max(user_ids)
-                users = get_user_model().objects.filter(
+                users = self._enrolled_learners().filter(
                     id__gte=min_id,
                     id__lte=max_id,
-                    **filter_kwargs
                 ).select_related('profile')
 
                 yield users
 
-        return get_enrolled_learners_for_course(
-            course_id=self.context.course_id,
-            verified_only=self.context.report_for_verified_only
-        )
+        return get_enrolled_learners_for_course()
+
+    def _enrolled_learners(self):
+        """
+        Returns a queryset of the users enrolled in the course, that this
+        report is for.
+        """
+        filter_kwargs = {
+            'courseenrollment__course_id': self.context.course_id,
+        }
+        if self.context.report_for_verified_only:
+            filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
+        return get_user_model().objects.filter(**filter_kwargs)
 
     def log_additional_info_for_testing(self, message):
         """
@@ -519,6 +536,11 @@ class CourseGradeReport(GradeReportBase):
         """
         with modulestore().bulk_operations(course_id):
             context = _CourseGradeReportContext(_xblock_instance_args, _entry_id, course_id, _task_input, action_name)
+            if settings.COURSE_GRADE_REPORT_USERS_PER_SUBTASK:
+                entry = InstructorTask.objects.get(pk=_entry_id)
+                report = ShardedCourseGradeReport(context, entry.task_id)
+                if report.should_queue_shards():
+                    return report.queue_shards(entry, _xblock_instance_args)
             if use_on_disk_grade_reporting(course_id):  # AU-926
                 return TempFileCourseGradeReport(context)._generate()  # pylint: disable=protected-access
             else:
@@ -565,6 +587,7 @@ class CourseGradeReport(GradeReportBase):
             bulk_context = _CourseGradeBulkContext(self.context, users)
 
             success_rows, error_rows = [], []
+            graded_users, course_grades = [], []
             for user, course_grade, error in CourseGradeFactory().iter(
                 users,
                 course=self.context.course,
@@ -575,69 +598,78 @@ class CourseGradeReport(GradeReportBase):
                     # An empty gradeset means we failed to grade a student.
                     error_rows.append([user.id, user.username, str(error)])
                 else:
-                    success_rows.append(
-                        [user.id, user.email, user.username] +
-                        self._user_grades(course_grade) +
-                        self._user_cohort_group_names(user) +
-                        self._user_experiment_group_names(user) +
-                        self._user_team_names(user, bulk_context.teams) +
-                        self._user_verification_mode(user, bulk_context.enrollments) +
-                        self._user_certificate_info(user, course_grade, bulk_context.certs) +
-                        [_user_enrollment_status(user, self.context.course_id)]
-                    )
+                    graded_users.append(user)
+                    course_grades.append(course_grade)
+
+            for user, course_grade, user_grades in zip(graded_users, course_grades, self._users_grades(course_grades)):
+                success_rows.append(
+                    [user.id, user.email, user.username] +
+                    user_grades +
+                    self._user_cohort_group_names(user) +
+                    self._user_experiment_group_names(user) +
+                    self._user_team_names(user, bulk_context.teams) +
+                    self._user_verification_mode(user, bulk_context.enrollments) +
+                    self._user_certificate_info(user, course_grade, bulk_context.certs) +
+                    [_user_enrollment_status(user, self.context.course_id)]
+                )
             return success_rows, error_rows
 
-    def _user_grades(self, course_grade):
-        """
-        Returns a list of grade results for the given course_grade corresponding
-        to the headers for this report.
-        """
-        grade_results = []
-        for _, assignment_info in self.context.graded_assignments.items():
-            subsection_grades, subsection_grades_results = self._user_subsection_grades(
-                course_grade,
-                assignment_info['subsection_headers'],
-            )
-            grade_results.extend(subsection_grades_results)
-
-            assignment_average = self._user_assignment_average(course_grade, subsection_grades, assignment_info)
-            if assignment_average is not None:
-                grade_results.append([assignment_average])
-
-        return [course_grade.percent] + _flatten(grade_results)
-
-    def _user_subsection_grades(self, course_grade, subsection_headers):
-        """
-        Returns a list of grade results for the given course_grade corresponding
-        to the headers for this report.
-        """
-        subsection_grades = []
-        grade_results = []
-        for subsection_location in subsection_headers:
-            subsection_grade = course_grade.subsection_grade(subsection_location)
-            if subsection_grade.attempted_graded or subsection_grade.override:
-                grade_result = subsection_grade.percent_graded
-            else:
-                grade_result = 'Not Attempted'
-            grade_results.append([grade_result])
-            subsection_grades.append(subsection_grade)
-        return subsection_grades, grade_results
-
-    def _user_assignment_average(self, course_grade, subsection_grades, assignment_info):
-        """
-        Returns grade averages for assignment types
+    def _users_grades(self, course_grades):
+        """
+        Returns a list of grade results for each of the given course_grades
+        corresponding to the headers for this report.
+        """
+        users_grades = [[course_grade.percent] for course_grade in course_grades]
+        for assignment_info in self.context.graded_assignments.values():
+            assignment_grades = self._users_assignment_grades(course_grades, assignment_info)
+            for user_grades, user_assignment_grades in zip(users_grades, assignment_grades):
+                user_grades.extend(user_assignment_grades)
+        return users_grades
+
+    def _users_assignment_grades(self, course_grades, assignment_info):
+        """
+        Returns a list of the subsection grade results and assignment average
+        of the given assignment type for each of the given course_grades.
+
+        The subsection scores of all users are laid out in matrices, with a
+        row per user and a column per subsection, so that the percents and
+        averages are computed for all users at once.
+        """
+        shape = (len(course_grades), len(assignment_info['subsection_headers']))
+        earned, possible = numpy.zeros(shape), numpy.zeros(shape)
+        reported = numpy.zeros(shape, dtype=bool)
+        for row, course_grade in enumerate(course_grades):
+            for column, subsection_location in enumerate(assignment_info['subsection_headers']):
+                subsection_grade = course_grade.subsection_grade(subsection_location)
+                reported[row, column] = subsection_grade.attempted_graded or subsection_grade.override
+                if not isinstance(subsection_grade, ZeroSubsectionGrade):
+                    earned[row, column] = subsection_grade.graded_total.earned
+                    possible[row, column] = subsection_grade.graded_total.possible
+
+        percents = compute_percents(earned, possible)
+        assignment_averages = self._users_assignment_averages(course_grades, percents, assignment_info)
+
+        assignment_grades = []
+        for row, user_percents in enumerate(percents.tolist()):
+            user_assignment_grades = [
+                percent if is_reported else 'Not Attempted'
+                for percent, is_reported in zip(user_percents, reported[row])
+            ]
+            if assignment_averages is not None:
+                user_assignment_grades.append(assignment_averages[row])
+            assignment_grades.append(user_assignment_grades)
+        return assignment_grades
+
+    def _users_assignment_averages(self, course_grades, percents, assignment_info):
+        """
+        Returns the grade averages of the given assignment type for each of the
+        given course_grades, from the given matrix of their subsection percents.
         """
         if assignment_info['separate_subsection_avg_headers']:
             if assignment_info['grader']:
-                if course_grade.attempted:
-                    subsection_breakdown = [
-                        {'percent': subsection_grade.percent_graded}
-                        for subsection_grade in subsection_grades
-                    ]
-                    assignment_average, _ = assignment_info['grader'].total_with_drops(subsection_breakdown)
-                else:
-                    assignment_average = 0.0
-                return assignment_average
+                assignment_averages = assignment_info['grader'].totals_with_drops(percents)
+                attempted = numpy.array([bool(course_grade.attempted) for course_grade in course_grades])
+                return numpy.where(attempted, assignment_averages, 0.0).tolist()
 
     def _user_cohort_group_names(self, user):
         """
@@ -706,6 +738,236 @@ class TempFileCourseGradeReport(CourseGradeReport, TemporaryFileReportMixin):
     """ Course Grade Report that writes file iteratively to a TempFile to then be uploaded """
 
 
+class ShardedCourseGradeReport(CourseGradeReport, TemporaryFileReportMixin):
+    """
+    Course Grade Report whose enrolled learners are split into shards of
+    settings.COURSE_GRADE_REPORT_USERS_PER_SUBTASK learners, which are graded
+    in parallel by instructor task subtasks.
+
+    Each subtask writes the rows of its shard to separate files in the report
+    store.  The subtask that completes the last shard merges the files, in the
+    order of the shards, into the report.
+    """
+    def __init__(self, context, task_id):
+        super().__init__(context)
+        self.task_id = task_id
+        self.user_ids = []
+
+    def should_queue_shards(self):
+        """
+        Returns whether the course has enough enrolled learners to be graded
+        in more than one shard.
+        """
+        return self._enrolled_learners().count() > settings.COURSE_GRADE_REPORT_USERS_PER_SUBTASK
+
+    def queue_shards(self, entry, xblock_instance_args):
+        """
+        Queues a subtask for every shard of the enrolled learners of the given
+        InstructorTask, and returns its progress.
+        """
+        # Avoid a circular import, as the tasks module imports this one.
+        from lms.djangoapps.instructor_task.tasks import calculate_grades_csv_shard
+
+        # Subtasks may already have been queued if the task was requeued.  See
+        # perform_delegate_email_batches.
+        if len(entry.subtasks) > 0 and len(entry.task_output) > 0:
+            TASK_LOG.warning('Task %s has already queued its grade report subtasks', entry.task_id)
+            return json.loads(entry.task_output)
+
+        def _create_shard_subtask(to_list, initial_subtask_status):
+            """Creates a subtask to grade the given learners."""
+            return calculate_grades_csv_shard.subtask(
+                (
+                    entry.id,
+                    xblock_instance_args,
+                    [item['pk'] for item in to_list],
+                    initial_subtask_status.to_dict(),
+                ),
+                task_id=initial_subtask_status.task_id,
+            )
+
+        learners = self._enrolled_learners().order_by('id')
+        return queue_subtasks_for_query(
+            entry,
+            self.context.action_name,
+            _create_shard_subtask,
+            [learners],
+            [],
+            settings.COURSE_GRADE_REPORT_USERS_PER_SUBTASK,
+            learners.count(),
+        )
+
+    def generate_shard(self, subtask_id, user_ids):
+        """
+        Grades the given learners of the given subtask's shard and stores
+        their rows in the report store.  Returns the numbers of learners
+        that were and were not graded successfully.
+        """
+        self.user_ids = user_ids
+        succeeded, failed = 0, 0
+        with TemporaryFile('r+') as success_file, TemporaryFile('r+') as error_file:
+            success_writer = csv.writer(success_file)
+            error_writer = csv.writer(error_file)
+            for success_rows, error_rows in self._batched_rows():
+                success_writer.writerows(success_rows)
+                error_writer.writerows(error_rows)
+                succeeded += len(success_rows)
+                failed += len(error_rows)
+
+            report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+            for shard_file, filename in ((success_file, subtask_id), (error_file, subtask_id + '_err')):
+                shard_file.seek(0)
+                report_store.store(self.context.course_id, filename, shard_file, self._shard_dir)
+
+        self.context.update_status(
+            f'ShardedCourseGradeReport: Graded shard {subtask_id}, {succeeded} succeeded, {failed} failed'
+        )
+        return succeeded, failed
+
+    def merge_shards_if_complete(self, entry_id):
+        """
+        Merges the stored rows of all shards into the report, if all subtasks
+        of the given InstructorTask completed successfully.  Once all of them
+        completed, the stored rows are deleted, whether or not they could be
+        merged.
+
+        The InstructorTask is marked as succeeded as soon as its last subtask
+        completes, so it is marked as failed if any subtask or the merge fails.
+        """
+        subtask_dict = json.loads(InstructorTask.objects.get(pk=entry_id).subtasks)
+        if subtask_dict['succeeded'] + subtask_dict['failed'] < subtask_dict['total']:
+            return
+        # Subtasks that complete at the same time may both find all subtasks complete.
+        if not cache.add(f'{self._shard_dir}-merge', 'true', SUBTASK_LOCK_EXPIRE):
+            return
+
+        subtask_ids = list(subtask_dict['status'])
+        if subtask_dict['failed']:
+            TASK_LOG.error(
+                '%s, %d of %d grade report subtasks failed, not merging the report',
+                self.context.task_info_string, subtask_dict['failed'], subtask_dict['total'],
+            )
+            self._delete_shards(subtask_ids)
+            exception = GradeReportSubtaskError(
+                f"{subtask_dict['failed']} of {subtask_dict['total']} grade report subtasks failed"
+            )
+            self._mark_failed(entry_id, exception, None)
+            return
+
+        self.context.update_status('ShardedCourseGradeReport: Merging shards')
+        try:
+            self._merge_shards(subtask_ids)
+        except Exception as exception:  # pylint: disable=broad-except
+            TASK_LOG.exception('%s, failed to merge the grade report shards', self.context.task_info_string)
+            self._delete_shards(subtask_ids)
+            self._mark_failed(entry_id, exception, traceback.format_exc())
+            return
+        self._delete_shards(subtask_ids)
+        self.context.update_status('ShardedCourseGradeReport: Completed grades')
+
+    @staticmethod
+    def _mark_failed(entry_id, exception, traceback_string):
+        """
+        Marks the given InstructorTask as failed with the given exception.
+        """
+        entry = InstructorTask.objects.get(pk=entry_id)
+        entry.task_state = FAILURE
+        entry.task_output = InstructorTask.create_output_for_failure(exception, traceback_string)
+        entry.save_now()
+
+    def _merge_shards(self, subtask_ids):
+        """
+        Concatenates the stored rows of the given subtasks' shards, in order,
+        into the uploaded report.
+        """
+        report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        with TemporaryFile('r+') as success_file, TemporaryFile('r+') as error_file:
+            csv.writer(success_file).writerow(self._success_headers())
+            csv.writer(error_file).writerow(self._error_headers())
+            error_file_header_size = error_file.tell()
+
+            for subtask_id in subtask_ids:
+                for shard_file, filename in ((success_file, subtask_id), (error_file, subtask_id + '_err')):
+                    path = report_store.path_to(self.context.course_id, filename, self._shard_dir)
+                    with report_store.storage.open(path) as stored_file:
+                        shard_file.write(stored_file.read().decode('utf-8'))
+
+            self.upload_temp_files(success_file, error_file, error_file.tell() > error_file_header_size)
+
+    def _delete_shards(self, subtask_ids):
+        """
+        Deletes the stored rows of the given subtasks' shards.  The shards of
+        failed subtasks may not have been stored.
+        """
+        report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        for subtask_id in subtask_ids:
+            for filename in (subtask_id, subtask_id + '_err'):
+                path = report_store.path_to(self.context.course_id, filename, self._shard_dir)
+                try:
+                    report_store.storage.delete(path)
+                except Exception:  # pylint: disable=broad-except
+                    TASK_LOG.exception(
+                        '%s, failed to delete grade report shard %s', self.context.task_info_string, path,
+                    )
+
+    def _batch_users(self):
+        """
+        Returns a generator of batches of the users of the shard being graded.
+        """
+        for index in range(0, len(self.user_ids), self.USER_BATCH_SIZE):
+            yield self._enrolled_learners().filter(
+                id__in=self.user_ids[index:index + self.USER_BATCH_SIZE],
+            ).order_by('id').select_related('profile')
+
+    @property
+    def _shard_dir(self):
+        """
+        Returns the directory of the report store in which the rows of the
+        shards are stored.  It is outside of the course's directory so the
+        shards are not listed as reports.
+        """
+        return os.path.join('grade_report_shards', self.task_id)
+
+
+def generate_course_grade_report_shard(entry_id, xblock_instance_args, user_ids, subtask_status_dict, action_name):
+    """
+    Grades the given learners as a subtask of a course grade report, and
+    merges the report if it is the last subtask to complete.  Returns the
+    subtask's status.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    task_input = json.loads(entry.task_input)
+    report = None
+    try:
+        with modulestore().bulk_operations(entry.course_id):
+            context = _CourseGradeReportContext(
+                xblock_instance_args, entry_id, entry.course_id, task_input, action_name,
+            )
+            report = ShardedCourseGradeReport(context, entry.task_id)
+            succeeded, failed = report.generate_shard(current_task_id, user_ids)
+    except Exception:
+        TASK_LOG.exception(
+            'Grade report subtask %s of instructor task %d: failed unexpectedly!', current_task_id, entry_id,
+        )
+        subtask_status.increment(failed=len(user_ids), state=FAILURE)
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        if report is not None:
+            # Deletes the stored shards if this was the last subtask to complete.
+            report.merge_shards_if_complete(entry_id)
+        raise
+
+    subtask_status.increment(succeeded=succeeded, failed=failed, state=SUCCESS)
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+
+    with modulestore().bulk_operations(entry.course_id):
+        report.merge_shards_if_complete(entry_id)
+    return subtask_status.to_dict()
+
+
 class ProblemGradeReport(GradeReportBase):
     """
     Class to encapsulate functionality related to generating user/row had header data for Problem Grade Reports.
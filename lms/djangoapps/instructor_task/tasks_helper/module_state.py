@@ -3,27 +3,40 @@ Instructor Tasks related to module state.
 """
 
 
+import copy
 import json
 import logging
+from collections import defaultdict
 from time import time
 
+from django.db import transaction
+from django.utils import timezone
 from django.utils.translation import gettext_noop
 from opaque_keys.edx.keys import UsageKey
 from xblock.scorable import Score
 
+from xmodule.capa.capa_problem import LoncapaProblem
 from xmodule.capa.responsetypes import LoncapaProblemError, ResponseError, StudentInputError
-from common.djangoapps.student.models import get_user_by_username_or_email
-from common.djangoapps.track.event_transaction_utils import create_new_event_transaction_id, set_event_transaction_type
+from common.djangoapps.student.models import anonymous_id_for_user, get_user_by_username_or_email
+from common.djangoapps.track.event_transaction_utils import (
+    create_new_event_transaction_id,
+    set_event_transaction_id,
+    set_event_transaction_type
+)
 from common.djangoapps.track.views import task_track
 from common.djangoapps.util.db import outer_atomic
 from lms.djangoapps.courseware.courses import get_problems_in_section
 from lms.djangoapps.courseware.model_data import FieldDataCache
-from lms.djangoapps.courseware.models import StudentModule
+from lms.djangoapps.courseware.models import StudentModule, student_modules_bulk_saved
 from lms.djangoapps.courseware.block_render import get_block_for_descriptor
+from lms.djangoapps.grades.api import constants as grades_constants
 from lms.djangoapps.grades.api import events as grades_events
+from lms.djangoapps.grades.api import signals as grades_signals
 from openedx.core.lib.courses import get_course_by_id
+from openedx.core.lib.grade_utils import is_score_higher_or_equal
 from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
 
+from ..config.waffle import bulk_rescoring_enabled
 from ..exceptions import UpdateProblemModuleStateError
 from .runner import TaskProgress
 from .utils import UNKNOWN_TASK_ID, UPDATE_STATUS_FAILED, UPDATE_STATUS_SKIPPED, UPDATE_STATUS_SUCCEEDED
@@ -31,7 +44,9 @@ from .utils import UNKNOWN_TASK_ID, UPDATE_STATUS_FAILED, UPDATE_STATUS_SKIPPED,
 TASK_LOG = logging.getLogger('edx.celery.task')
 
 
-def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name):
+def perform_module_state_update(
+    update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name, prepare_fcn=None
+):
     """
     Performs generic update by visiting StudentModule instances with the update_fcn provided.
 
@@ -43,6 +58,11 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     on the particular student module failed.
     A raised exception indicates a fatal condition -- that no other student modules should be considered.
 
+    If `prepare_fcn` is not None, it is called once before the updates, with the dict of blocks by
+    usage key, the list of StudentModules to update and the task_input, so that work shared by the
+    updates can be done in bulk.  It may return the update statuses of the StudentModules it already
+    updated, by id, which are then not passed to `update_fcn`.
+
     The return value is a dict containing the task's results, with the following keys:
 
           'attempted': number of attempts made
@@ -88,12 +108,18 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     task_progress = TaskProgress(action_name, len(modules_to_update), start_time)
     task_progress.update_task_state()
 
+    update_statuses = {}
+    if prepare_fcn is not None:
+        update_statuses = prepare_fcn(problems, modules_to_update, task_input) or {}
+
     for module_to_update in modules_to_update:
         task_progress.attempted += 1
-        block = problems[str(module_to_update.module_state_key)]
-        # There is no try here:  if there's an error, we let it throw, and the task will
-        # be marked as FAILED, with a stack trace.
-        update_status = update_fcn(block, module_to_update, task_input)
+        update_status = update_statuses.get(module_to_update.id)
+        if update_status is None:
+            block = problems[str(module_to_update.module_state_key)]
+            # There is no try here:  if there's an error, we let it throw, and the task will
+            # be marked as FAILED, with a stack trace.
+            update_status = update_fcn(block, module_to_update, task_input)
         if update_status == UPDATE_STATUS_SUCCEEDED:
             # If the update_fcn returns true, then it performed some kind of work.
             # Logging of failures is left to the update_fcn itself.
@@ -108,6 +134,219 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     return task_progress.update_task_state()
 
 
+def prepare_rescore_problem_module_states(xblock_instance_args, problems, student_modules, task_input):
+    """
+    Prepares the rescoring of the given StudentModules of capa problems, before they are rescored one by one.
+
+    When bulk rescoring is enabled for the course, the StudentModules of the problems that support it are
+    rescored here in bulk, see _bulk_rescore_problem_module_states.  The scripts of the other problems are
+    executed for all the learners in as few sandboxes as possible, while rescoring each learner then reads
+    its script context from the safe_exec cache.  Nothing is prepared when bulk rescoring is disabled.
+
+    Returns the update statuses of the StudentModules that were rescored in bulk, by id.
+    """
+    update_statuses = {}
+    module_states_by_usage_key = defaultdict(lambda: defaultdict(list))
+    for student_module in student_modules:
+        state = json.loads(student_module.state or '{}')
+        if state.get('seed') is not None:
+            module_states_by_usage_key[str(student_module.module_state_key)][state['seed']].append(
+                (student_module, state)
+            )
+
+    for usage_key, module_states_by_seed in module_states_by_usage_key.items():
+        block = problems[usage_key]
+        if not hasattr(type(block), 'lcp'):
+            continue
+
+        student_module = next(iter(module_states_by_seed.values()))[0][0]
+        course_id = student_module.course_id
+        if not bulk_rescoring_enabled(course_id):
+            continue
+        with modulestore().bulk_operations(course_id):
+            course = get_course_by_id(course_id)
+            instance = _get_module_instance_for_task(
+                course_id,
+                student_module.student,
+                block,
+                xblock_instance_args,
+                grade_bucket_type='rescore',
+                course=course,
+            )
+            if instance is None:
+                continue
+            try:
+                problem = instance.lcp
+                if not isinstance(problem, LoncapaProblem):
+                    # The problem is implemented by an extracted XBlock.
+                    continue
+                if problem.supports_bulk_rescoring():
+                    update_statuses.update(_bulk_rescore_problem_module_states(
+                        xblock_instance_args, block, course, module_states_by_seed, task_input['only_if_higher'],
+                    ))
+                else:
+                    problem.prime_script_contexts([
+                        (seed, anonymous_id_for_user(student_module.student, None))
+                        for seed, module_states in module_states_by_seed.items()
+                        for student_module, __ in module_states
+                    ])
+            except LoncapaProblemError:
+                # The problem can't be loaded for this learner either, so rescoring reports the error.
+                TASK_LOG.warning("Could not prepare the rescoring of problem %s", usage_key, exc_info=True)
+
+    return update_statuses
+
+
+def _bulk_rescore_problem_module_states(xblock_instance_args, block, course, module_states_by_seed, only_if_higher):
+    """
+    Rescores the answers stored in the StudentModules of a capa problem with a single problem per seed,
+    and saves the results with bulk updates.
+
+    `module_states_by_seed` holds the (StudentModule, state) pairs to rescore by seed.  As when rescoring
+    a learner's problem on its own, the block is bound to each learner to check that they still have
+    access to it, the score is only updated if it is higher when `only_if_higher` is True, and grade and
+    tracking events are emitted for each learner.
+
+    Returns the update statuses of the rescored StudentModules, by id.  The StudentModules that can't
+    be rescored in bulk are left to be rescored one by one.
+    """
+    update_statuses = {}
+    rescored = []
+    course_id = course.id
+
+    for seed, module_states in module_states_by_seed.items():
+        problem = None
+        for student_module, state in module_states:
+            if not state.get('done'):
+                update_statuses[student_module.id] = UPDATE_STATUS_SKIPPED
+                continue
+
+            student = student_module.student
+            instance = _get_module_instance_for_task(
+                course_id,
+                student,
+                block,
+                xblock_instance_args,
+                grade_bucket_type='rescore',
+                course=course,
+            )
+            if instance is None:
+                TASK_LOG.warning(
+                    "No module %s for student %s--access denied?", student_module.module_state_key, student,
+                )
+                update_statuses[student_module.id] = UPDATE_STATUS_FAILED
+                continue
+
+            if problem is None:
+                try:
+                    problem = instance.new_lcp({'seed': seed})
+                except Exception:  # pylint: disable=broad-except
+                    TASK_LOG.warning("Could not load problem %s with seed %s", instance.location, seed, exc_info=True)
+                    break
+                if not problem.supports_bulk_rescoring():
+                    break
+
+            # The events are published for the learner the block is bound to.
+            publish_service = instance.runtime.service(instance, 'publish')
+            event_transaction_id = create_new_event_transaction_id()
+            set_event_transaction_type(grades_events.GRADES_RESCORE_EVENT_TYPE)
+            # Make sure that the attempt number is always at least 1 for grading purposes,
+            # even if the number of attempts have been reset and this problem is regraded.
+            problem.context['attempt'] = max(instance.attempts, 1)
+            try:
+                correct_map, score = problem.rescore_answers(
+                    state.get('student_answers', {}), state.get('correct_map', {}),
+                )
+                raw_earned, raw_possible = score['score'], score['total']
+                update_score = not only_if_higher or is_score_higher_or_equal(
+                    student_module.grade, student_module.max_grade, raw_earned, raw_possible,
+                )
+            except Exception:  # pylint: disable=broad-except
+                TASK_LOG.warning(
+                    "Could not rescore problem %s for student %s in bulk", instance.location, student, exc_info=True,
+                )
+                continue
+
+            orig_score = state.get('score') or {
+                'raw_earned': student_module.grade, 'raw_possible': student_module.max_grade,
+            }
+            event_info = {
+                'state': {
+                    'seed': seed,
+                    'student_answers': state.get('student_answers', {}),
+                    'has_saved_answers': state.get('has_saved_answers', False),
+                    'correct_map': state.get('correct_map', {}),
+                    'correct_map_history': state.get('correct_map_history', []),
+                    'input_state': state.get('input_state', {}),
+                    'done': True,
+                },
+                'problem_id': str(instance.location),
+                'orig_score': orig_score['raw_earned'],
+                'orig_total': orig_score['raw_possible'],
+                'new_score': raw_earned,
+                'new_total': raw_possible,
+                'correct_map': correct_map.get_dict(),
+                'success': 'correct' if all(
+                    correct_map.is_correct(answer_id) for answer_id in correct_map
+                ) else 'incorrect',
+                'attempts': instance.attempts,
+            }
+            # Events are unmasked with the problem of the learner's seed.
+            event_info = copy.deepcopy(event_info)
+            instance.unmask_event(event_info, lcp=problem)
+
+            state['correct_map'] = correct_map.get_dict()
+            if update_score:
+                state['score'] = {'raw_earned': raw_earned, 'raw_possible': raw_possible}
+                student_module.grade = raw_earned
+                student_module.max_grade = raw_possible
+            else:
+                TASK_LOG.warning(
+                    "Grades: Rescore is not higher than previous: user: %s, block: %s, previous: %s/%s, new: %s/%s",
+                    student, instance.location,
+                    student_module.grade, student_module.max_grade, raw_earned, raw_possible,
+                )
+            student_module.state = json.dumps(state)
+            rescored.append((
+                student_module, publish_service, instance.weight, update_score, event_transaction_id, event_info,
+            ))
+
+    if not rescored:
+        return update_statuses
+
+    modified = timezone.now()
+    rescored_student_modules = [rescored_module[0] for rescored_module in rescored]
+    for student_module in rescored_student_modules:
+        student_module.modified = modified
+    with transaction.atomic():
+        StudentModule.objects.bulk_update(rescored_student_modules, ['state', 'grade', 'max_grade', 'modified'])
+    student_modules_bulk_saved.send(sender=StudentModule, instances=rescored_student_modules)
+
+    for student_module, publish_service, weight, update_score, event_transaction_id, event_info in rescored:
+        set_event_transaction_id(str(event_transaction_id))
+        set_event_transaction_type(grades_events.GRADES_RESCORE_EVENT_TYPE)
+        if update_score:
+            # As the handler of the grade event of the problem does, once the score is saved.
+            grades_signals.PROBLEM_RAW_SCORE_CHANGED.send(
+                sender=None,
+                raw_earned=student_module.grade,
+                raw_possible=student_module.max_grade,
+                weight=weight,
+                user_id=student_module.student.id,
+                course_id=str(student_module.course_id),
+                usage_id=str(student_module.module_state_key),
+                only_if_higher=only_if_higher,
+                modified=modified,
+                score_db_table=grades_constants.ScoreDatabaseTableEnum.courseware_student_module,
+                score_deleted=False,
+                grader_response=False,
+            )
+        publish_service.publish(block, 'problem_rescore', event_info)
+        update_statuses[student_module.id] = UPDATE_STATUS_SUCCEEDED
+
+    return update_statuses
+
+
 @outer_atomic
 def rescore_problem_module_state(xblock_instance_args, block, student_module, task_input):
     '''
@@ -19,6 +19,7 @@ from celery.states import FAILURE, SUCCESS
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
 from django.test.utils import override_settings
 from django.urls import reverse
+from edx_toggles.toggles.testutils import override_waffle_flag
 
 from xmodule.capa.responsetypes import StudentInputError
 from xmodule.capa.tests.response_xml_factory import CodeResponseXMLFactory, CustomResponseXMLFactory
@@ -31,8 +32,10 @@ from lms.djangoapps.instructor_task.api import (
     submit_rescore_problem_for_student,
     submit_reset_problem_attempts_for_all_students
 )
+from lms.djangoapps.instructor_task.config.waffle import BULK_RESCORING
 from lms.djangoapps.instructor_task.data import InstructorTaskTypes
 from lms.djangoapps.instructor_task.models import InstructorTask
+from lms.djangoapps.instructor_task.tasks_helper import module_state
 from lms.djangoapps.instructor_task.tasks_helper.grades import CourseGradeReport
 from lms.djangoapps.instructor_task.tests.test_base import (
     OPTION_1,
@@ -231,6 +234,51 @@ class TestRescoringTask(TestIntegrationTask):
             problem_edit, new_expected_scores, new_expected_max, rescore_if_higher=True,
         )
 
+    @ddt.data(
+        (RescoreTestData(edit=dict(correct_answer=OPTION_2), new_expected_scores=(0, 1, 1, 2), new_expected_max=2),
+         False),
+        (RescoreTestData(edit=dict(num_inputs=2), new_expected_scores=(2, 1, 1, 0), new_expected_max=4), False),
+        (RescoreTestData(edit=dict(correct_answer=OPTION_2), new_expected_scores=(2, 1, 1, 2), new_expected_max=2),
+         True),
+    )
+    @ddt.unpack
+    def test_bulk_rescoring_option_problem(self, rescore_data, rescore_if_higher):
+        """
+        Run rescore scenario on option problem with bulk rescoring enabled.
+        Verify the grades are the same as when each learner is rescored separately.
+        """
+        with override_waffle_flag(BULK_RESCORING, active=True):
+            self.verify_rescore_results(
+                rescore_data.edit, rescore_data.new_expected_scores, rescore_data.new_expected_max, rescore_if_higher,
+            )
+
+    def test_bulk_rescoring_without_access(self):
+        """
+        Verify that bulk rescoring doesn't rescore the problem of a learner
+        who no longer has access to it.
+        """
+        problem_url_name = 'H1P1'
+        self.define_option_problem(problem_url_name)
+        location = InstructorTaskModuleTestCase.problem_location(problem_url_name)
+        block = self.module_store.get_item(location)
+        self.submit_student_answer('u1', problem_url_name, [OPTION_1, OPTION_1])
+        self.submit_student_answer('u2', problem_url_name, [OPTION_1, OPTION_1])
+        self.redefine_option_problem(problem_url_name, correct_answer=OPTION_2)
+
+        get_module_instance_for_task = module_state._get_module_instance_for_task  # pylint: disable=protected-access
+
+        def get_module_instance_without_access(course_id, student, *args, **kwargs):
+            if student.id == self.user2.id:
+                return None
+            return get_module_instance_for_task(course_id, student, *args, **kwargs)
+
+        with override_waffle_flag(BULK_RESCORING, active=True):
+            with patch.object(module_state, '_get_module_instance_for_task', get_module_instance_without_access):
+                self.submit_rescore_all_student_answers('instructor', problem_url_name)
+
+        self.check_state(self.user1, block, 0, 2)
+        self.check_state(self.user2, block, 2, 2)
+
     def test_rescoring_if_higher_scores_equal(self):
         """
         Specifically tests rescore when the previous and new raw scores are equal. In this case, the scores should
@@ -7,6 +7,7 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 """
 
 
+import json
 import os
 import shutil
 import tempfile
@@ -14,10 +15,12 @@ from collections import OrderedDict
 from contextlib import ExitStack, contextmanager
 from datetime import datetime, timedelta
 from unittest.mock import ANY, MagicMock, Mock, patch
+from uuid import uuid4
 
 import ddt
 import pytest
 import unicodecsv
+from celery.states import FAILURE, SUCCESS
 from django.conf import settings
 from django.test.utils import override_settings
 from edx_django_utils.cache import RequestCache
@@ -39,6 +42,7 @@ from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsec
 from lms.djangoapps.grades.subsection_grade import CreateSubsectionGrade
 from lms.djangoapps.grades.transformer import GradesTransformer
 from lms.djangoapps.instructor_analytics.basic import UNAVAILABLE, list_problem_responses
+from lms.djangoapps.instructor_task.data import InstructorTaskTypes
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import upload_may_enroll_csv, upload_students_csv
 from lms.djangoapps.instructor_task.tasks_helper.grades import (
@@ -47,6 +51,7 @@ from lms.djangoapps.instructor_task.tasks_helper.grades import (
     CourseGradeReport,
     ProblemGradeReport,
     ProblemResponses,
+    ShardedCourseGradeReport,
 )
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
@@ -55,6 +60,7 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
     upload_ora2_submission_files,
     upload_ora2_summary
 )
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     InstructorTaskModuleTestCase,
@@ -412,6 +418,100 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
                 with self.assertNumQueries(46):
                     CourseGradeReport.generate(None, None, course.id, {}, 'graded')
 
+    def _create_sharded_report_task(self, usernames):
+        """
+        Enrolls students with the given usernames, and returns the
+        InstructorTask of a grade report for them.
+        """
+        for username in usernames:
+            self.create_student(username, f'{username}@example.com')
+        return InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_type=InstructorTaskTypes.GRADE_COURSE,
+            task_key='dummy value',
+            task_id=str(uuid4()),
+        )
+
+    def _stored_shards(self, entry):
+        """
+        Returns the names of the stored shard files of the given grade report task.
+        """
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        shard_dir = os.path.join('grade_report_shards', entry.task_id)
+        if not report_store.storage.exists(shard_dir):
+            return []
+        return report_store.storage.listdir(shard_dir)[1]
+
+    @override_settings(COURSE_GRADE_REPORT_USERS_PER_SUBTASK=2)
+    def test_sharded_report(self):
+        """
+        Test that the rows of learners graded by subtasks are merged in order.
+        """
+        usernames = [f'student{i}' for i in range(5)]
+        entry = self._create_sharded_report_task(usernames)
+
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
+            CourseGradeReport.generate(None, entry.id, self.course.id, {}, 'graded')
+
+        entry.refresh_from_db()
+        assert entry.task_state == SUCCESS
+        assert json.loads(entry.subtasks)['succeeded'] == 3
+        self.assertDictContainsSubset({'attempted': 5, 'succeeded': 5, 'failed': 0}, json.loads(entry.task_output))
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        links = report_store.links_for(self.course.id)
+        assert len(links) == 1
+        with report_store.storage.open(report_store.path_to(self.course.id, links[0][0])) as csv_file:
+            assert [row['Username'] for row in unicodecsv.DictReader(csv_file)] == usernames
+        assert self._stored_shards(entry) == []
+
+    @override_settings(COURSE_GRADE_REPORT_USERS_PER_SUBTASK=2)
+    def test_sharded_report_subtask_failure(self):
+        """
+        Test that the task fails, the report is not merged, and the shards are deleted, when a subtask fails.
+        """
+        entry = self._create_sharded_report_task([f'student{i}' for i in range(5)])
+        generate_shard = ShardedCourseGradeReport.generate_shard
+
+        def _fail_second_shard(report, subtask_id, user_ids):
+            if user_ids[0] == report._enrolled_learners().order_by('id')[2].id:  # pylint: disable=protected-access
+                raise ValueError('Subtask failure')
+            return generate_shard(report, subtask_id, user_ids)
+
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
+            with patch.object(ShardedCourseGradeReport, 'generate_shard', _fail_second_shard):
+                CourseGradeReport.generate(None, entry.id, self.course.id, {}, 'graded')
+
+        entry.refresh_from_db()
+        subtask_dict = json.loads(entry.subtasks)
+        assert (subtask_dict['succeeded'], subtask_dict['failed']) == (2, 1)
+        assert entry.task_state == FAILURE
+        self.assertDictContainsSubset(
+            {'exception': 'GradeReportSubtaskError', 'message': '1 of 3 grade report subtasks failed'},
+            json.loads(entry.task_output),
+        )
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        assert report_store.links_for(self.course.id) == []
+        assert self._stored_shards(entry) == []
+
+    @override_settings(COURSE_GRADE_REPORT_USERS_PER_SUBTASK=2)
+    def test_sharded_report_merge_failure(self):
+        """
+        Test that the task fails, and the shards are deleted, when the shards can't be merged.
+        """
+        entry = self._create_sharded_report_task([f'student{i}' for i in range(5)])
+
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
+            with patch.object(ShardedCourseGradeReport, '_merge_shards', side_effect=OSError('Merge failure')):
+                CourseGradeReport.generate(None, entry.id, self.course.id, {}, 'graded')
+
+        entry.refresh_from_db()
+        assert entry.task_state == FAILURE
+        self.assertDictContainsSubset(
+            {'exception': 'OSError', 'message': 'Merge failure'}, json.loads(entry.task_output),
+        )
+        assert self._stored_shards(entry) == []
+
     def test_inactive_enrollments(self):
         """
         Test that students with inactive enrollments are included in report.
@@ -30,6 +30,7 @@ from xblock.runtime import KeyValueStore
 from edx_rest_framework_extensions.paginators import DefaultPagination
 
 from common.djangoapps.student.models import CourseEnrollment, User  # lint-amnesty, pylint: disable=reimported
+from common.djangoapps.student.toggles import should_use_dashboard_course_overview_projection
 from lms.djangoapps.courseware.access import is_mobile_available_for_user
 from lms.djangoapps.courseware.access_utils import ACCESS_GRANTED
 from lms.djangoapps.courseware.context_processor import get_user_timezone_or_last_seen_timezone_or_utc
@@ -383,10 +384,12 @@ class UserCourseEnrollmentsList(generics.ListAPIView):
         status = self.request.GET.get('status')
         username = self.kwargs['username']
 
-        queryset = CourseEnrollment.objects.all().select_related('course', 'user').filter(
+        queryset = CourseEnrollment.objects.all().select_related('user').filter(
             user__username=username,
             is_active=True
         ).order_by('-created')
+        if not should_use_dashboard_course_overview_projection():
+            queryset = queryset.select_related('course')
 
         if api_version == API_V4 and status in EnrollmentStatuses.values():
             if status == EnrollmentStatuses.IN_PROGRESS.value:
@@ -426,8 +429,12 @@ class UserCourseEnrollmentsList(generics.ListAPIView):
         """
         org = self.request.query_params.get('org', None)
 
+        enrollments = self.queryset_for_user
+        if should_use_dashboard_course_overview_projection():
+            enrollments = CourseEnrollment.preload_dashboard_course_overviews(enrollments)
+
         same_org = (
-            enrollment for enrollment in self.queryset_for_user
+            enrollment for enrollment in enrollments
             if enrollment.course_overview and self.is_org(org, enrollment.course_overview.org)
         )
         mobile_available = (
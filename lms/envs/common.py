@@ -1473,6 +1473,9 @@ MIDDLEWARE = [
     'lms.djangoapps.courseware.middleware.CacheCourseIdMiddleware',
     'lms.djangoapps.courseware.middleware.RedirectMiddleware',
 
+    # Writes the learner state deferred during each request
+    'lms.djangoapps.courseware.middleware.UserStateWriteBehindMiddleware',
+
     'lms.djangoapps.course_wiki.middleware.WikiAccessMiddleware',
 
     'openedx.core.djangoapps.theming.middleware.CurrentSiteThemeMiddleware',
@@ -2636,6 +2639,14 @@ CERT_NAME_LONG = "Certificate of Achievement"
 # the ones that contain information other than grades.
 GRADES_DOWNLOAD_ROUTING_KEY = Derived(lambda settings: settings.HIGH_MEM_QUEUE)
 
+# .. setting_name: COURSE_GRADE_REPORT_USERS_PER_SUBTASK
+# .. setting_default: 0
+# .. setting_description: Maximum number of learners graded by each subtask of a course grade report. Reports
+#   of courses with more enrolled learners are generated by subtasks running in parallel, whose rows are merged
+#   in order into the report by the last subtask to complete. A value of 0 generates every report in a single
+#   task.
+COURSE_GRADE_REPORT_USERS_PER_SUBTASK = 0
+
 RECALCULATE_GRADES_ROUTING_KEY = 'edx.lms.core.default'
 
 ############################ ORA 2 ############################################
@@ -2913,6 +2924,16 @@ FIELD_OVERRIDE_PROVIDERS = ()
 MODULESTORE_FIELD_OVERRIDE_PROVIDERS = ('openedx.features.content_type_gating.'
                                         'field_override.ContentTypeGatingFieldOverride',)
 
+# .. setting_name: STUDENT_MODULE_WRITE_BEHIND_BLOCK_TYPES
+# .. setting_default: []
+# .. setting_description: Block types, such as "video", whose learner state writes are deferred until the end of
+#   each request. Deferred writes are coalesced per learner and block, and written in bulk along with their history
+#   entries. Reading a learner's state through the user state client first writes that learner's deferred state.
+# .. setting_warnings: Leave out block types whose handlers, or receivers of the events they publish, read the
+#   StudentModule rows of the learner directly, such as "problem", since those rows are only written at the end of
+#   the request.
+STUDENT_MODULE_WRITE_BEHIND_BLOCK_TYPES = []
+
 # Sets the maximum number of courses listed on the homepage
 # If set to None, all courses will be listed on the homepage
 HOMEPAGE_COURSE_MAX = None
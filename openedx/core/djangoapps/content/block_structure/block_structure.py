@@ -42,6 +42,16 @@ class _BlockRelations:
         # list [UsageKey]
         self.children = []
 
+    def copy(self):
+        """
+        Returns a copy of these relations.  Usage keys are immutable, so
+        only the lists need to be copied.
+        """
+        relations = _BlockRelations()
+        relations.parents = list(self.parents)
+        relations.children = list(self.children)
+        return relations
+
 
 class BlockStructure:
     """
@@ -416,6 +426,22 @@ class BlockStructureBlockData(BlockStructure):
         # Map of a transformer's name to its non-block-specific data.
         self.transformer_data = TransformerDataMap()
 
+        # Map of a field namespace to the block fields of that namespace
+        # that have not been loaded into _block_data_map yet.  The
+        # namespace is None for xBlock fields and the transformer's name
+        # for transformer block data.  Each loader is a callable that
+        # returns a new {UsageKey: value} map on every call.  This is
+        # only populated for block structures that are lazily
+        # deserialized from storage.
+        # dict {string: dict {string: callable}}
+        self._unloaded_fields = {}
+
+        # Usage keys of the blocks whose BlockData is shared with the
+        # block structure that this one is a copy_on_write of, and is
+        # therefore copied before it is modified.
+        # set {UsageKey}
+        self._shared_block_keys = set()
+
     def copy(self):
         """
         Returns a new instance of BlockStructureBlockData with a
@@ -424,16 +450,44 @@ class BlockStructureBlockData(BlockStructure):
         from .factory import BlockStructureFactory
         return BlockStructureFactory.create_new(
             self.root_block_usage_key,
-            deepcopy(self._block_relations),
+            {usage_key: relations.copy() for usage_key, relations in self._block_relations.items()},
             deepcopy(self.transformer_data),
             deepcopy(self._block_data_map),
+            unloaded_fields={
+                namespace: dict(field_loaders)
+                for namespace, field_loaders in self._unloaded_fields.items()
+            },
+        )
+
+    def copy_on_write(self):
+        """
+        Returns a new instance of BlockStructureBlockData that shares
+        the BlockData of this instance's blocks, and copies the BlockData
+        of a block only when it modifies it.  This makes copies of a
+        block structure that is cached in memory cheap, since transformers
+        modify the data of few blocks.
+
+        This instance must no longer be modified once it is shared.
+        """
+        from .factory import BlockStructureFactory
+        # The copy must not load the lazily deserialized fields into the
+        # shared BlockData.
+        self._load_all_fields()
+        block_structure = BlockStructureFactory.create_new(
+            self.root_block_usage_key,
+            {usage_key: relations.copy() for usage_key, relations in self._block_relations.items()},
+            deepcopy(self.transformer_data),
+            dict(self._block_data_map),
         )
+        block_structure._shared_block_keys = set(self._block_data_map)  # pylint: disable=protected-access
+        return block_structure
 
     def iteritems(self):
         """
         Returns iterator of (UsageKey, BlockData) pairs for all
         blocks in the BlockStructure.
         """
+        self._load_all_fields()
         return iter(self._block_data_map.items())
 
     def itervalues(self):
@@ -441,12 +495,15 @@ class BlockStructureBlockData(BlockStructure):
         Returns iterator of BlockData for all blocks in the
         BlockStructure.
         """
+        self._load_all_fields()
         return iter(self._block_data_map.values())
 
     def __getitem__(self, usage_key):
         """
-        Returns the BlockData associated with the given key.
+        Returns the BlockData associated with the given key.  It may be
+        shared with other block structures, so it must not be modified.
         """
+        self._load_all_fields()
         return self._block_data_map[usage_key]
 
     def get_xblock_field(self, usage_key, field_name, default=None):
@@ -465,6 +522,7 @@ class BlockStructureBlockData(BlockStructure):
             default (any type) - The value to return if a field value is
                 not found.
         """
+        self._load_fields(None, field_name)
         block_data = self._block_data_map.get(usage_key)
         return get_datetime_field(block_data, field_name, default) if block_data else default
 
@@ -481,6 +539,7 @@ class BlockStructureBlockData(BlockStructure):
 
             override_data (object) - The data you want to set
         """
+        self._load_fields(None, field_name)
         block_data = self._get_or_create_block(usage_key)
         setattr(block_data, field_name, override_data)
 
@@ -521,6 +580,8 @@ class BlockStructureBlockData(BlockStructure):
         """
         Returns the TransformerData for the given
         transformer for the block identified by the given usage_key.
+        It may be shared with other block structures, so it must not be
+        modified.
 
         Raises KeyError if not found.
 
@@ -531,6 +592,7 @@ class BlockStructureBlockData(BlockStructure):
             transformer (BlockStructureTransformer) - The transformer
                 whose dictionary data is requested.
         """
+        self._load_transformer_fields(transformer)
         return self._block_data_map[usage_key].transformer_data[transformer]
 
     def get_transformer_block_field(self, usage_key, transformer, key, default=None):
@@ -576,6 +638,7 @@ class BlockStructureBlockData(BlockStructure):
                 given key for the given transformer's data for the
                 requested block.
         """
+        self._load_transformer_fields(transformer)
         setattr(
             self._get_or_create_block(usage_key).transformer_data.get_or_create(transformer),
             key,
@@ -594,8 +657,11 @@ class BlockStructureBlockData(BlockStructure):
             transformer (BlockStructureTransformer) - The transformer
                 whose data entry is to be deleted.
         """
+        self._load_transformer_fields(transformer)
+        if usage_key not in self._block_data_map:
+            return
         try:
-            transformer_block_data = self.get_transformer_block_data(usage_key, transformer)
+            transformer_block_data = self._get_or_create_block(usage_key).transformer_data[transformer]
             delattr(transformer_block_data, key)
         except (AttributeError, KeyError):
             pass
@@ -752,19 +818,83 @@ class BlockStructureBlockData(BlockStructure):
             raise TransformerException('Version attributes are not set on transformer {0}.', transformer.name())  # lint-amnesty, pylint: disable=raising-format-tuple
         self.set_transformer_data(transformer, TRANSFORMER_VERSION_KEY, transformer.WRITE_VERSION)
 
+    def _load_transformer_fields(self, transformer):
+        """
+        Loads all not yet loaded block data of the given transformer.
+
+        Arguments:
+            transformer (BlockStructureTransformer or string) - The
+                transformer, or the name of the transformer, whose
+                block data is to be loaded.
+        """
+        if self._unloaded_fields:
+            self._load_fields(self.transformer_data._translate_key(transformer))  # pylint: disable=protected-access
+
+    def _load_all_fields(self):
+        """
+        Loads all not yet loaded block fields of all namespaces.
+        """
+        for namespace in list(self._unloaded_fields):
+            self._load_fields(namespace)
+
+    def _load_fields(self, namespace, field_name=None):
+        """
+        Loads the not yet loaded block fields of the given namespace
+        into the block data map.
+
+        Values of blocks that are no longer in the block structure are
+        discarded.
+
+        Arguments:
+            namespace (string) - None for xBlock fields, or the name of
+                the transformer for transformer block data.
+
+            field_name (string) - The name of the field to load.  If
+                None, all fields of the namespace are loaded.
+        """
+        field_loaders = self._unloaded_fields.get(namespace)
+        if not field_loaders:
+            return
+
+        field_names = list(field_loaders) if field_name is None else [field_name]
+        for name in field_names:
+            loader = field_loaders.pop(name, None)
+            if loader is None:
+                continue
+            for usage_key, value in loader().items():
+                if usage_key not in self._block_relations:
+                    continue
+                # A None field name only marks the presence of
+                # (possibly empty) data for the block.
+                field_data = self._get_or_create_block(usage_key)
+                if namespace is not None:
+                    field_data = field_data.transformer_data.get_or_create(namespace)
+                if name is not None:
+                    field_data.fields[name] = value
+
+        if not field_loaders:
+            del self._unloaded_fields[namespace]
+
     def _get_or_create_block(self, usage_key):
         """
-        Returns the BlockData associated with the given usage_key.
-        If not found, creates and returns a new BlockData and
-        maps it to the given key.
+        Returns the BlockData associated with the given usage_key, to be
+        modified.  If not found, creates and returns a new BlockData and
+        maps it to the given key.  If shared with another block
+        structure, replaces it with a copy first.
         """
         try:
-            return self._block_data_map[usage_key]
+            block_data = self._block_data_map[usage_key]
         except KeyError:
             block_data = BlockData(usage_key)
             self._block_data_map[usage_key] = block_data
             return block_data
 
+        if usage_key in self._shared_block_keys:
+            block_data = deepcopy(block_data)
+            self._block_data_map[usage_key] = block_data
+            self._shared_block_keys.discard(usage_key)
+        return block_data
+
 
 class BlockStructureModulestoreData(BlockStructureBlockData):
     """
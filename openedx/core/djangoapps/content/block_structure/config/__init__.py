@@ -9,6 +9,30 @@ from openedx.core.lib.cache_utils import request_cached
 
 from .models import BlockStructureConfiguration
 
+# .. toggle_name: block_structure.columnar_serialization
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: When enabled, collected block structures are stored in a columnar format whose block
+#   fields are deserialized lazily, one field at a time, instead of as a single pickle. Data stored in either
+#   format can always be read, so the switch can be toggled at any time.
+# .. toggle_use_cases: temporary
+# .. toggle_creation_date: 2026-10-17
+# .. toggle_target_removal_date: 2027-04-17
+COLUMNAR_SERIALIZATION = WaffleSwitch('block_structure.columnar_serialization', __name__)
+
+# .. toggle_name: block_structure.incremental_collect
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: When enabled, an outdated block structure is updated by re-collecting only the blocks that
+#   changed since the stored version of the course, along with their descendants, instead of re-collecting the whole
+#   course. The data of the registered transformers that are not INCREMENTAL_COLLECT_SAFE is still re-collected for
+#   the whole course. This is only done when at least one registered transformer is INCREMENTAL_COLLECT_SAFE and the
+#   modulestore can report the changed blocks (split courses only); otherwise, the whole course is collected as before.
+# .. toggle_use_cases: temporary
+# .. toggle_creation_date: 2026-10-17
+# .. toggle_target_removal_date: 2027-04-17
+INCREMENTAL_COLLECT = WaffleSwitch('block_structure.incremental_collect', __name__)
+
 
 @request_cached()
 def num_versions_to_keep():
@@ -86,12 +86,18 @@ class BlockStructureFactory:
         return block_structure_store.get(root_block_usage_key)
 
     @classmethod
-    def create_new(cls, root_block_usage_key, block_relations, transformer_data, block_data_map):
+    def create_new(cls, root_block_usage_key, block_relations, transformer_data, block_data_map, unloaded_fields=None):
         """
         Returns a new block structure for given the arguments.
+
+        The optional unloaded_fields map contains block fields that are
+        to be loaded lazily on first access.  See
+        BlockStructureBlockData._unloaded_fields.
         """
         block_structure = BlockStructureBlockData(root_block_usage_key)
         block_structure._block_relations = block_relations  # pylint: disable=protected-access
         block_structure.transformer_data = transformer_data
         block_structure._block_data_map = block_data_map  # pylint: disable=protected-access
+        if unloaded_fields:
+            block_structure._unloaded_fields = unloaded_fields  # pylint: disable=protected-access
         return block_structure
@@ -0,0 +1,230 @@
+"""
+Module for incrementally updating the collected data of BlockStructure
+objects.
+
+Instead of instantiating all xBlocks of a course and re-collecting the
+data of all transformers for all blocks, only the following blocks are
+re-collected:
+
+    * Dirty blocks - the blocks that changed in the modulestore, along
+      with all of their descendants, since the descendants' field values
+      may be inherited from the changed blocks.
+
+    * The ancestors of the dirty blocks - since the data collected for a
+      block may depend on that of its ancestors.
+
+The collected data of all other blocks is reused as is.  This is only
+correct for transformers that are INCREMENTAL_COLLECT_SAFE, so the data
+of all other registered transformers is re-collected for the whole
+structure.  See BlockStructureTransformer.INCREMENTAL_COLLECT_SAFE.
+"""
+# pylint: disable=protected-access
+
+
+from .block_structure import BlockStructure, BlockStructureModulestoreData
+from .factory import BlockStructureFactory
+from .transformer_registry import TransformerRegistry
+from .transformers import BlockStructureTransformers
+
+# Names of xBlock fields whose value is the version of the course's
+# structure, and which therefore change for all blocks whenever any
+# block changes.
+STRUCTURE_VERSION_FIELDS = ('course_version',)
+
+
+def update_collected(collected_block_structure, modulestore, changed_block_keys):
+    """
+    Updates the given collected block structure in place by
+    re-collecting only the given changed blocks, their descendants and
+    their ancestors from the modulestore.  The data of the registered
+    transformers that are not INCREMENTAL_COLLECT_SAFE is re-collected
+    for all blocks.
+
+    Arguments:
+        collected_block_structure (BlockStructureBlockData) - A block
+            structure with collected data of a previous version of the
+            course, for the current versions of all transformers.
+
+        modulestore (ModuleStoreRead) - The modulestore that contains
+            the current version of the course.
+
+        changed_block_keys (set(UsageKey)) - Usage keys of the blocks
+            that changed between the version of the course in the
+            collected block structure and the current one.
+
+    Returns:
+        bool - Whether the block structure was updated.  False if
+            updating it incrementally is not cheaper than collecting the
+            whole structure anew, in which case it is left unchanged.
+    """
+    root_block_usage_key = collected_block_structure.root_block_usage_key
+    if root_block_usage_key in changed_block_keys:
+        return False
+
+    children_map = {
+        usage_key: collected_block_structure.get_children(usage_key)
+        for usage_key in collected_block_structure
+    }
+    dirty_xblocks = _get_dirty_xblocks(modulestore, changed_block_keys, children_map)
+
+    reachable_block_keys = set(_traverse(root_block_usage_key, children_map))
+    dirty_block_keys = reachable_block_keys.intersection(dirty_xblocks)
+    ancestor_block_keys = _get_ancestors(dirty_block_keys, children_map, reachable_block_keys)
+
+    block_relations = {}
+    BlockStructure._add_block(block_relations, root_block_usage_key)
+    for usage_key in reachable_block_keys:
+        for child_key in children_map[usage_key]:
+            BlockStructure._add_to_relations(block_relations, usage_key, child_key)
+
+    collected_block_structure._load_all_fields()
+    block_data_map = {
+        usage_key: block_data
+        for usage_key, block_data in collected_block_structure._block_data_map.items()
+        if usage_key in reachable_block_keys
+    }
+
+    safe_transformers, unsafe_transformers = [], []
+    for transformer in TransformerRegistry.get_registered_transformers():
+        if transformer.INCREMENTAL_COLLECT_SAFE:
+            safe_transformers.append(transformer)
+        else:
+            unsafe_transformers.append(transformer)
+
+    requested_xblock_fields = set()
+    if dirty_block_keys:
+        xblocks = {usage_key: modulestore.get_item(usage_key) for usage_key in ancestor_block_keys}
+        xblocks.update((usage_key, dirty_xblocks[usage_key]) for usage_key in dirty_block_keys)
+        recollected_block_structure = _collect(root_block_usage_key, xblocks, children_map, safe_transformers)
+        block_data_map.update(recollected_block_structure._block_data_map)
+        collected_block_structure._shared_block_keys.difference_update(xblocks)
+        requested_xblock_fields = recollected_block_structure._requested_xblock_fields
+
+    collected_block_structure._block_relations = block_relations
+    collected_block_structure._block_data_map = block_data_map
+
+    if unsafe_transformers:
+        _recollect(collected_block_structure, modulestore, unsafe_transformers, requested_xblock_fields)
+
+    root_xblock = modulestore.get_item(root_block_usage_key)
+    for usage_key, block_data in block_data_map.items():
+        for field_name in STRUCTURE_VERSION_FIELDS:
+            if field_name in block_data.fields:
+                collected_block_structure.override_xblock_field(
+                    usage_key, field_name, getattr(root_xblock, field_name, None),
+                )
+    return True
+
+
+def _recollect(collected_block_structure, modulestore, transformers, requested_xblock_fields):
+    """
+    Replaces the data of the given transformers in the given block
+    structure with data collected for the whole structure anew.
+
+    The given xBlock fields, requested by the other transformers, are
+    collected again as well, since the given transformers may modify
+    their values while collecting.
+    """
+    block_structure = BlockStructureFactory.create_from_modulestore(
+        collected_block_structure.root_block_usage_key,
+        modulestore,
+    )
+    block_structure.request_xblock_fields(*requested_xblock_fields)
+    BlockStructureTransformers.collect(block_structure, transformers)
+
+    for transformer in transformers:
+        collected_block_structure.transformer_data[transformer] = block_structure.transformer_data[transformer]
+
+    for usage_key in list(collected_block_structure._block_data_map):
+        recollected_block_data = block_structure._block_data_map.get(usage_key)
+        if recollected_block_data is None:
+            continue
+        block_data = collected_block_structure._get_or_create_block(usage_key)
+        block_data.fields.update(recollected_block_data.fields)
+        for transformer in transformers:
+            name = transformer.name()
+            if name in recollected_block_data.transformer_data:
+                block_data.transformer_data[name] = recollected_block_data.transformer_data[name]
+            else:
+                block_data.transformer_data.pop(name, None)
+
+
+def _get_dirty_xblocks(modulestore, changed_block_keys, children_map):
+    """
+    Returns a map of usage key to xBlock of all changed blocks and their
+    descendants, and updates the given children_map with their current
+    children.
+    """
+    dirty_xblocks = {}
+
+    def add_subtree(xblock):
+        """
+        Recursively adds the given xBlock and its descendants.
+        """
+        if xblock.location in dirty_xblocks:
+            return
+        dirty_xblocks[xblock.location] = xblock
+        children_map[xblock.location] = []
+        for child in xblock.get_children():
+            children_map[xblock.location].append(child.location)
+            add_subtree(child)
+
+    for usage_key in changed_block_keys:
+        if usage_key not in dirty_xblocks:
+            add_subtree(modulestore.get_item(usage_key, depth=None, lazy=False))
+    return dirty_xblocks
+
+
+def _get_ancestors(block_keys, children_map, reachable_block_keys):
+    """
+    Returns the usage keys of all reachable ancestors of the given blocks
+    that are not themselves in block_keys.
+    """
+    parents_map = {}
+    for usage_key in reachable_block_keys:
+        for child_key in children_map[usage_key]:
+            parents_map.setdefault(child_key, []).append(usage_key)
+
+    ancestor_block_keys = set()
+    stack = list(block_keys)
+    while stack:
+        for parent_key in parents_map.get(stack.pop(), []):
+            if parent_key not in block_keys and parent_key not in ancestor_block_keys:
+                ancestor_block_keys.add(parent_key)
+                stack.append(parent_key)
+    return ancestor_block_keys
+
+
+def _traverse(root_block_usage_key, children_map):
+    """
+    Yields the usage keys of all blocks reachable from the given root in
+    the given children_map.
+    """
+    visited = set()
+    stack = [root_block_usage_key]
+    while stack:
+        usage_key = stack.pop()
+        if usage_key in visited:
+            continue
+        visited.add(usage_key)
+        yield usage_key
+        stack.extend(children_map.get(usage_key, []))
+
+
+def _collect(root_block_usage_key, xblocks, children_map, transformers):
+    """
+    Returns a block structure, with data collected by the given
+    transformers, of the given xBlocks only.
+
+    Since every parent of a dirty block is either dirty or one of its
+    ancestors, all parents of every block are included.
+    """
+    block_structure = BlockStructureModulestoreData(root_block_usage_key)
+    for usage_key, xblock in xblocks.items():
+        block_structure._add_xblock(usage_key, xblock)
+        for child_key in children_map[usage_key]:
+            if child_key in xblocks:
+                block_structure._add_relation(usage_key, child_key)
+
+    BlockStructureTransformers.collect(block_structure, transformers)
+    return block_structure
@@ -8,6 +8,7 @@ from contextlib import contextmanager
 
 from xmodule.modulestore import ModuleStoreEnum
 
+from . import config, incremental
 from .exceptions import BlockStructureNotFound, TransformerDataIncompatible, UsageKeyNotInBlockStructure
 from .factory import BlockStructureFactory
 from .store import BlockStructureStore
@@ -119,6 +120,36 @@ class BlockStructureManager:
 
         return block_structure
 
+    def get_collected_if_current(self, version):
+        """
+        Returns the collected Block Structure for the root_block_usage_key,
+        only if the data in the store was collected from the given version
+        of the modulestore.  Otherwise, returns None, without accessing
+        the modulestore or collecting any data.
+
+        Arguments:
+            version - The version of the course in the modulestore,
+                as given by the course_version field of its xBlocks.
+
+        Returns:
+            BlockStructureBlockData - A collected block structure,
+                starting at root_block_usage_key, or None.
+        """
+        if version is None:
+            return None
+        if self.store.get_collected_version(self.root_block_usage_key) != str(version):
+            return None
+
+        try:
+            block_structure = BlockStructureFactory.create_from_store(
+                self.root_block_usage_key,
+                self.store,
+            )
+            BlockStructureTransformers.verify_versions(block_structure)
+        except (BlockStructureNotFound, TransformerDataIncompatible):
+            return None
+        return block_structure
+
     def update_collected_if_needed(self):
         """
         The store is updated with newly collected transformers data from
@@ -139,15 +170,58 @@ class BlockStructureManager:
                 ModuleStoreEnum.Branch.published_only,
                 self.root_block_usage_key.course_key
             ):
-                block_structure = BlockStructureFactory.create_from_modulestore(
-                    self.root_block_usage_key,
-                    self.modulestore,
-                )
-
-            BlockStructureTransformers.collect(block_structure)
+                block_structure = self._get_incrementally_collected()
+                needs_full_collect = block_structure is None
+                if needs_full_collect:
+                    block_structure = BlockStructureFactory.create_from_modulestore(
+                        self.root_block_usage_key,
+                        self.modulestore,
+                    )
+
+            if needs_full_collect:
+                BlockStructureTransformers.collect(block_structure)
             self.store.add(block_structure)
             return block_structure
 
+    def _get_incrementally_collected(self):
+        """
+        Returns the block structure from the store, updated with newly
+        collected transformers data for only the blocks that changed in
+        the modulestore since it was collected.  Returns None if it
+        cannot be updated incrementally.
+        """
+        if not config.INCREMENTAL_COLLECT.is_enabled():
+            return None
+        if not BlockStructureTransformers.supports_incremental_collect():
+            return None
+
+        collected_version = self.store.get_collected_version(self.root_block_usage_key)
+        get_changed_blocks = getattr(self.modulestore, 'get_changed_blocks', None)
+        if collected_version is None or get_changed_blocks is None:
+            return None
+
+        root_block = self.modulestore.get_item(self.root_block_usage_key)
+        current_version = getattr(root_block, 'course_version', None)
+        if current_version is None:
+            return None
+
+        changed_block_keys = get_changed_blocks(
+            self.root_block_usage_key.course_key,
+            collected_version,
+            current_version,
+        )
+        if changed_block_keys is None:
+            return None
+
+        try:
+            block_structure = self.store.get(self.root_block_usage_key)
+        except BlockStructureNotFound:
+            return None
+
+        if not incremental.update_collected(block_structure, self.modulestore, changed_block_keys):
+            return None
+        return block_structure
+
     def clear(self):
         """
         Removes data for the block structure associated with the given
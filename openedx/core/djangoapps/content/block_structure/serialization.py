@@ -0,0 +1,279 @@
+"""
+Module for the columnar serialization format of BlockStructure objects.
+
+Unlike pickling the whole (block relations, transformer data, block
+data) tuple, this format allows a block structure to be loaded without
+instantiating a BlockData and TransformerData object per block and per
+transformer up-front.  Block fields are only deserialized, one column
+at a time, when they are first accessed.  See
+BlockStructureBlockData._unloaded_fields.
+
+A serialized block structure is laid out as:
+
+    MAGIC | FORMAT_VERSION | zlib compressed body
+
+The body starts with a length-prefixed JSON manifest, followed by the
+binary sections that the manifest references by (offset, length):
+
+    * Usage key table - stored in the manifest, in the order of the
+      structure's block relations.  Keys within the root
+      block's course are interned as [block_type, block_id] pairs, all
+      other keys as [None, serialized usage key].  All other sections
+      refer to blocks by their integer index in this table.
+
+    * Adjacency arrays - the children and the parents of each block in
+      compressed sparse row form, that is an array of offsets followed
+      by a flat array of block indices.
+
+    * Transformer data - the pickled non-block-specific data of all
+      transformers.
+
+    * Field columns - one pickled {block index: value} map per
+      (namespace, field name), where the namespace is None for xBlock
+      fields and the transformer's name for transformer block data.
+      A None field name marks blocks whose data in the namespace is
+      empty.
+"""
+# pylint: disable=protected-access
+
+
+import json
+import pickle
+import struct
+import sys
+import zlib
+from array import array
+from collections import defaultdict
+from functools import partial
+
+from opaque_keys.edx.keys import CourseKey, UsageKey
+
+from .block_structure import _BlockRelations, TransformerData, TransformerDataMap
+from .factory import BlockStructureFactory
+
+# Prefix of all serialized data in this format.  The first byte can
+# never start a zlib stream, so legacy zpickled data is distinguishable.
+MAGIC = b'\x93BSC'
+
+# The version of the format.  Increment this value whenever the layout
+# changes.
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('>4sH')
+_MANIFEST_LENGTH = struct.Struct('>I')
+_INDEX_ARRAY_TYPE = 'I'
+
+
+def is_columnar(serialized_data):
+    """
+    Returns whether the given serialized data is in the columnar format.
+    """
+    return bytes(serialized_data[:len(MAGIC)]) == MAGIC
+
+
+def serialize(block_structure):
+    """
+    Serializes the given block_structure into the columnar format.
+
+    Arguments:
+        block_structure (BlockStructureBlockData) - The block structure
+            that is to be serialized.
+
+    Returns:
+        bytes - The serialized block structure.
+    """
+    block_structure._load_all_fields()
+    course_key = block_structure.root_block_usage_key.course_key
+
+    key_indices = {usage_key: index for index, usage_key in enumerate(block_structure._block_relations)}
+
+    sections = []
+    manifest = {
+        'course_key': str(course_key),
+        'keys': [_encode_key(usage_key, course_key) for usage_key in key_indices],
+    }
+    for relation_name in ('children', 'parents'):
+        offsets, indices = _encode_relations(block_structure._block_relations, relation_name, key_indices)
+        manifest[relation_name] = [
+            _add_section(sections, _array_to_bytes(offsets)),
+            _add_section(sections, _array_to_bytes(indices)),
+        ]
+
+    manifest['transformer_data'] = _add_section(sections, pickle.dumps(
+        {name: data.fields for name, data in block_structure.transformer_data.items()},
+        pickle.HIGHEST_PROTOCOL,
+    ))
+
+    manifest['columns'] = [
+        [namespace, field_name, _add_section(sections, pickle.dumps(values, pickle.HIGHEST_PROTOCOL))]
+        for (namespace, field_name), values in _encode_columns(block_structure, key_indices).items()
+    ]
+
+    body = _assemble_body(manifest, sections)
+    return _HEADER.pack(MAGIC, FORMAT_VERSION) + zlib.compress(body)
+
+
+def deserialize(serialized_data, root_block_usage_key):
+    """
+    Deserializes the given columnar data and returns a block structure
+    whose block fields are loaded lazily on first access.
+
+    Arguments:
+        serialized_data (bytes) - Data previously returned by serialize.
+
+        root_block_usage_key (UsageKey) - The usage key of the root of
+            the block structure.
+
+    Returns:
+        BlockStructureBlockData - The deserialized block structure.
+
+    Raises:
+        ValueError - If the data is not in a supported version of the
+            columnar format.
+    """
+    magic, format_version = _HEADER.unpack_from(serialized_data)
+    if magic != MAGIC or format_version != FORMAT_VERSION:
+        raise ValueError(f'Unsupported block structure serialization format: {magic!r} v{format_version}.')
+
+    body = zlib.decompress(serialized_data[_HEADER.size:])
+    manifest_length, = _MANIFEST_LENGTH.unpack_from(body)
+    manifest_end = _MANIFEST_LENGTH.size + manifest_length
+    manifest = json.loads(body[_MANIFEST_LENGTH.size:manifest_end])
+
+    def section(offset_and_length):
+        offset, length = offset_and_length
+        return body[manifest_end + offset:manifest_end + offset + length]
+
+    course_key = CourseKey.from_string(manifest['course_key'])
+    keys = [_decode_key(encoded_key, course_key) for encoded_key in manifest['keys']]
+
+    block_relations = {usage_key: _BlockRelations() for usage_key in keys}
+    for relation_name in ('children', 'parents'):
+        offsets_section, indices_section = manifest[relation_name]
+        offsets = _array_from_bytes(section(offsets_section))
+        indices = _array_from_bytes(section(indices_section))
+        for index, usage_key in enumerate(keys):
+            setattr(
+                block_relations[usage_key],
+                relation_name,
+                [keys[related_index] for related_index in indices[offsets[index]:offsets[index + 1]]],
+            )
+
+    transformer_data = TransformerDataMap()
+    for transformer_name, fields in pickle.loads(section(manifest['transformer_data'])).items():
+        transformer_data[transformer_name] = TransformerData()
+        transformer_data[transformer_name].fields = fields
+
+    unloaded_fields = defaultdict(dict)
+    for namespace, field_name, column_section in manifest['columns']:
+        unloaded_fields[namespace][field_name] = partial(_load_column, section(column_section), keys)
+
+    return BlockStructureFactory.create_new(
+        root_block_usage_key,
+        block_relations,
+        transformer_data,
+        {},
+        unloaded_fields=dict(unloaded_fields),
+    )
+
+
+def _load_column(column_data, keys):
+    """
+    Returns a new {UsageKey: value} map for the given serialized column.
+    """
+    return {keys[index]: value for index, value in pickle.loads(column_data).items()}
+
+
+def _encode_key(usage_key, course_key):
+    """
+    Returns the interned representation of the given usage key.
+    """
+    if usage_key.course_key == course_key and course_key.make_usage_key(
+        usage_key.block_type, usage_key.block_id,
+    ) == usage_key:
+        return [usage_key.block_type, usage_key.block_id]
+    return [None, str(usage_key)]
+
+
+def _decode_key(encoded_key, course_key):
+    """
+    Returns the usage key for the given interned representation.
+    """
+    block_type, block_id = encoded_key
+    if block_type is None:
+        return UsageKey.from_string(block_id)
+    return course_key.make_usage_key(block_type, block_id)
+
+
+def _encode_relations(block_relations, relation_name, key_indices):
+    """
+    Returns the given relation of all blocks in compressed sparse row
+    form, as an (offsets, indices) pair of arrays.
+    """
+    offsets = array(_INDEX_ARRAY_TYPE, [0])
+    indices = array(_INDEX_ARRAY_TYPE)
+    for relations in block_relations.values():
+        indices.extend(key_indices[usage_key] for usage_key in getattr(relations, relation_name))
+        offsets.append(len(indices))
+    return offsets, indices
+
+
+def _encode_columns(block_structure, key_indices):
+    """
+    Returns a map of (namespace, field name) to the {block index: value}
+    map of the given block structure's block data.
+    """
+    columns = defaultdict(dict)
+    for usage_key, block_data in block_structure._block_data_map.items():
+        # Data of blocks that are no longer in the structure is dropped.
+        index = key_indices.get(usage_key)
+        if index is None:
+            continue
+        if not block_data.fields:
+            columns[(None, None)][index] = None
+        for field_name, value in block_data.fields.items():
+            columns[(None, field_name)][index] = value
+        for transformer_name, transformer_block_data in block_data.transformer_data.items():
+            if not transformer_block_data.fields:
+                columns[(transformer_name, None)][index] = None
+            for field_name, value in transformer_block_data.fields.items():
+                columns[(transformer_name, field_name)][index] = value
+    return columns
+
+
+def _add_section(sections, data):
+    """
+    Appends the given data to sections and returns its [offset, length].
+    """
+    offset = sum(len(section) for section in sections)
+    sections.append(data)
+    return [offset, len(data)]
+
+
+def _assemble_body(manifest, sections):
+    """
+    Returns the uncompressed body for the given manifest and sections.
+    """
+    encoded_manifest = json.dumps(manifest, separators=(',', ':')).encode('utf-8')
+    return b''.join([_MANIFEST_LENGTH.pack(len(encoded_manifest)), encoded_manifest] + sections)
+
+
+def _array_to_bytes(values):
+    """
+    Returns the little-endian byte representation of the given array.
+    """
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _array_from_bytes(data):
+    """
+    Returns the index array for the given little-endian bytes.
+    """
+    values = array(_INDEX_ARRAY_TYPE)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
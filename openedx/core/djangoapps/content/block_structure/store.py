@@ -6,10 +6,11 @@ Module for the Storage of BlockStructure objects.
 
 from logging import getLogger
 
+from django.conf import settings
 
-from openedx.core.lib.cache_utils import zpickle, zunpickle
+from openedx.core.lib.cache_utils import ProcessLRUCache, process_cached, zpickle, zunpickle
 
-from . import config
+from . import config, serialization
 from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound
 from .factory import BlockStructureFactory
@@ -21,6 +22,26 @@ from edx_django_utils import monitoring
 logger = getLogger(__name__)  # pylint: disable=C0103
 
 
+@process_cached
+def _process_cache():
+    """
+    Returns the process-local cache of deserialized block structures.
+    """
+    # .. setting_name: BLOCK_STRUCTURES_SETTINGS['PROCESS_CACHE_MAX_SIZE_IN_BYTES']
+    # .. setting_default: 0
+    # .. setting_description: Maximum total size, measured as the size of their serialized data, of the
+    #   deserialized block structures that each worker process keeps in memory, in front of the django
+    #   cache. Entries are keyed by the version of the collected data, so they never need invalidation.
+    #   A value of 0 disables this process-local tier.
+    # .. setting_warnings: Entries are shared with their readers copy-on-write, so a request that overrides
+    #   fields of many blocks, as the transformers of large courses do, copies their data on top of the
+    #   cached entry. See ProcessLRUCache.
+    return ProcessLRUCache(
+        'block_structure.process_cache',
+        settings.BLOCK_STRUCTURES_SETTINGS.get('PROCESS_CACHE_MAX_SIZE_IN_BYTES', 0),
+    )
+
+
 class BlockStructureStore:
     """
     Storage for BlockStructure objects.
@@ -75,13 +96,22 @@ class BlockStructureStore:
         """
         bs_model = self._get_model(root_block_usage_key)
 
+        cached_block_structure = self._get_from_process_cache(bs_model)
+        if cached_block_structure is not None:
+            return cached_block_structure.copy_on_write()
+
         try:
             serialized_data = self._get_from_cache(bs_model)
         except BlockStructureNotFound:
             serialized_data = self._get_from_store(bs_model)
             self._add_to_cache(serialized_data, bs_model)
 
-        return self._deserialize(serialized_data, root_block_usage_key)
+        block_structure = self._deserialize(serialized_data, root_block_usage_key)
+        if self._add_to_process_cache(block_structure, serialized_data, bs_model):
+            # The cached instance is shared by all requests of this
+            # process, so return a copy that can be transformed in place.
+            return block_structure.copy_on_write()
+        return block_structure
 
     def delete(self, root_block_usage_key):
         """
@@ -94,6 +124,7 @@ class BlockStructureStore:
         """
         bs_model = self._get_model(root_block_usage_key)
         self._cache.delete(self._encode_root_cache_key(bs_model))
+        _process_cache().delete(self._encode_root_cache_key(bs_model))
         bs_model.delete()
         logger.info("BlockStructure: Deleted from cache and store; %s.", bs_model)
 
@@ -111,6 +142,24 @@ class BlockStructureStore:
 
         return False
 
+    def get_collected_version(self, root_block_usage_key):
+        """
+        Returns the modulestore version of the data in storage for the
+        given key, if it was collected with the current schema state of
+        the Transformers and BlockStructure classes.  Otherwise, returns
+        None.
+        """
+        try:
+            bs_model = self._get_model(root_block_usage_key)
+        except BlockStructureNotFound:
+            return None
+
+        current_version_data = self._version_data_of_block(None)
+        for field_name in ('transformers_schema_version', 'block_structure_schema_version'):
+            if getattr(bs_model, field_name, None) != current_version_data[field_name]:
+                return None
+        return bs_model.data_version
+
     def _get_model(self, root_block_usage_key):
         """
         Returns the model associated with the given key.
@@ -148,6 +197,29 @@ class BlockStructureStore:
             #   the memcached client failed to store value in cache.
             monitoring.set_custom_attribute('blockstorestructure_size_in_mbs', data_size_in_mbs)
 
+    def _add_to_process_cache(self, block_structure, serialized_data, bs_model):
+        """
+        Adds the given deserialized block_structure for the given
+        BlockStructureModel to the process-local cache. Returns whether
+        it was added.
+        """
+        process_cache = _process_cache()
+        if not process_cache.max_size_in_bytes or not self._is_process_cacheable(bs_model):
+            return False
+        cache_key = self._encode_root_cache_key(bs_model)
+        process_cache.set(cache_key, block_structure, len(serialized_data))
+        return cache_key in process_cache
+
+    def _get_from_process_cache(self, bs_model):
+        """
+        Returns the deserialized block structure for the given
+        BlockStructureModel from the process-local cache, or None if
+        not found.  The returned instance must not be modified.
+        """
+        if not self._is_process_cacheable(bs_model):
+            return None
+        return _process_cache().get(self._encode_root_cache_key(bs_model))
+
     def _get_from_cache(self, bs_model):
         """
         Returns the serialized data for the given BlockStructureModel
@@ -176,6 +248,9 @@ class BlockStructureStore:
         """
         Serializes the data for the given block_structure.
         """
+        if config.COLUMNAR_SERIALIZATION.is_enabled():
+            return serialization.serialize(block_structure)
+
         data_to_cache = (
             block_structure._block_relations,
             block_structure.transformer_data,
@@ -186,9 +261,14 @@ class BlockStructureStore:
     def _deserialize(self, serialized_data, root_block_usage_key):
         """
         Deserializes the given data and returns the parsed block_structure.
+
+        Data in the columnar format is loaded lazily, so the block fields
+        are only deserialized as they are accessed by transformers.
         """
 
         try:
+            if serialization.is_columnar(serialized_data):
+                return serialization.deserialize(serialized_data, root_block_usage_key)
             block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
         except Exception:
             # Somehow failed to de-serialized the data, assume it's corrupt.
@@ -211,6 +291,15 @@ class BlockStructureStore:
         """
         return str(bs_model)
 
+    @staticmethod
+    def _is_process_cacheable(bs_model):
+        """
+        Returns whether the data of the given BlockStructureModel is
+        identified by an immutable version, and can therefore be cached
+        without invalidation.
+        """
+        return bs_model.data_version is not None
+
     @staticmethod
     def _version_data_of_block(root_block):
         """
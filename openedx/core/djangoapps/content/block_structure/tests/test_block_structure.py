@@ -292,3 +292,29 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
         _set_value(new_copy, 'edit2')
         assert _get_value(block_structure) == 'edit1'
         assert _get_value(new_copy) == 'edit2'
+
+    def test_copy_on_write(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.LINEAR_CHILDREN_MAP)
+        block_structure.override_xblock_field(1, 'field', 'original_value')
+        block_structure.set_transformer_block_field(1, 'transformer', 'test_key', 'original_value')
+        block_structure.set_transformer_block_field(2, 'transformer', 'test_key', 'original_value')
+
+        new_copy = block_structure.copy_on_write()
+        self.assert_block_structure(new_copy, [[1], [2], [3], []])
+        # Unmodified blocks share their data with the original.
+        assert new_copy[1] is block_structure[1]
+
+        # Edits to the copy do not affect the original.
+        new_copy.override_xblock_field(1, 'field', 'edit')
+        new_copy.set_transformer_block_field(1, 'transformer', 'test_key', 'edit')
+        new_copy.remove_transformer_block_field(2, 'transformer', 'test_key')
+        new_copy.remove_block(3, keep_descendants=True)
+        assert new_copy.get_xblock_field(1, 'field') == 'edit'
+        assert new_copy.get_transformer_block_field(1, 'transformer', 'test_key') == 'edit'
+        assert new_copy.get_transformer_block_field(2, 'transformer', 'test_key') is None
+        self.assert_block_structure(new_copy, [[1], [2], [], []], missing_blocks=[3])
+
+        assert block_structure.get_xblock_field(1, 'field') == 'original_value'
+        assert block_structure.get_transformer_block_field(1, 'transformer', 'test_key') == 'original_value'
+        assert block_structure.get_transformer_block_field(2, 'transformer', 'test_key') == 'original_value'
+        self.assert_block_structure(block_structure, [[1], [2], [3], []])
@@ -0,0 +1,179 @@
+# pylint: disable=attribute-defined-outside-init
+"""
+Tests for incremental.py
+"""
+
+
+from unittest import TestCase
+
+import ddt
+
+from ..factory import BlockStructureFactory
+from ..incremental import update_collected
+from ..transformers import BlockStructureTransformers
+from .helpers import ChildrenMapTestMixin, MockModulestoreFactory, MockTransformer, mock_registered_transformers
+
+
+class MergedHiddenTransformer(MockTransformer):
+    """
+    Test transformer that percolates a boolean xBlock field down the
+    hierarchy, and records the blocks it collected.
+    """
+    INCREMENTAL_COLLECT_SAFE = True
+    MERGED_HIDDEN = 'merged_hidden'
+    collected_block_keys = []
+
+    @classmethod
+    def collect(cls, block_structure):
+        block_structure.request_xblock_fields('course_version')
+        for block_key in block_structure.topological_traversal():
+            cls.collected_block_keys.append(block_key)
+            merged_hidden = getattr(block_structure.get_xblock(block_key), 'hidden', False) or any(
+                block_structure.get_transformer_block_field(parent_key, cls, cls.MERGED_HIDDEN)
+                for parent_key in block_structure.get_parents(block_key)
+            )
+            block_structure.set_transformer_block_field(block_key, cls, cls.MERGED_HIDDEN, merged_hidden)
+
+
+class HiddenCountTransformer(MockTransformer):
+    """
+    Test transformer, that is not safe to collect incrementally, that
+    records the number of hidden blocks in the structure.
+    """
+    HIDDEN_COUNT = 'hidden_count'
+    collected_block_keys = []
+
+    @classmethod
+    def name(cls):
+        return 'hidden_count'
+
+    @classmethod
+    def collect(cls, block_structure):
+        hidden_count = 0
+        for block_key in block_structure.topological_traversal():
+            cls.collected_block_keys.append(block_key)
+            if getattr(block_structure.get_xblock(block_key), 'hidden', False):
+                hidden_count += 1
+        block_structure.set_transformer_data(cls, cls.HIDDEN_COUNT, hidden_count)
+
+
+@ddt.ddt
+class TestIncrementalCollect(ChildrenMapTestMixin, TestCase):
+    """
+    Tests for incrementally updating collected block structures.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.modulestore = MockModulestoreFactory.create(self.SIMPLE_CHILDREN_MAP, self.block_key_factory)
+        self.set_course_version('v1')
+        self.collect_and_reset([MergedHiddenTransformer])
+
+    def collect_and_reset(self, transformers):
+        """
+        Fully collects the block structure with the given transformers.
+        """
+        self.transformers = transformers
+        with mock_registered_transformers(transformers):
+            self.collected_block_structure = self.collect()
+        MergedHiddenTransformer.collected_block_keys = []
+        HiddenCountTransformer.collected_block_keys = []
+
+    def set_course_version(self, course_version):
+        """
+        Sets the course version of all blocks in the modulestore.
+        """
+        for xblock in self.modulestore.blocks.values():
+            xblock.field_map['course_version'] = course_version
+
+    def collect(self):
+        """
+        Returns a block structure fully collected from the modulestore.
+        """
+        block_structure = BlockStructureFactory.create_from_modulestore(0, self.modulestore)
+        BlockStructureTransformers.collect(block_structure)
+        return block_structure
+
+    def update_collected(self, changed_block_keys):
+        """
+        Incrementally updates the collected block structure and verifies
+        it matches a fully collected one.
+        """
+        self.set_course_version('v2')
+        with mock_registered_transformers(self.transformers):
+            assert update_collected(self.collected_block_structure, self.modulestore, changed_block_keys)
+            recollected_block_keys = set(MergedHiddenTransformer.collected_block_keys)
+            expected_block_structure = self.collect()
+
+        for transformer in self.transformers:
+            assert self.collected_block_structure.transformer_data[transformer].__dict__ == \
+                expected_block_structure.transformer_data[transformer].__dict__
+
+        assert set(self.collected_block_structure) == set(expected_block_structure)
+        for block_key in expected_block_structure:
+            assert self.collected_block_structure.get_children(block_key) == \
+                expected_block_structure.get_children(block_key)
+            assert set(self.collected_block_structure.get_parents(block_key)) == \
+                set(expected_block_structure.get_parents(block_key))
+            assert self.collected_block_structure.get_xblock_field(block_key, 'course_version') == 'v2'
+            assert self.collected_block_structure.get_transformer_block_field(
+                block_key, MergedHiddenTransformer, MergedHiddenTransformer.MERGED_HIDDEN,
+            ) == expected_block_structure.get_transformer_block_field(
+                block_key, MergedHiddenTransformer, MergedHiddenTransformer.MERGED_HIDDEN,
+            )
+        return recollected_block_keys
+
+    @ddt.data(
+        (1, {0, 1, 3, 4}),
+        (2, {0, 2}),
+        (4, {0, 1, 4}),
+    )
+    @ddt.unpack
+    def test_changed_field(self, changed_block_key, expected_recollected_block_keys):
+        self.modulestore.blocks[changed_block_key].field_map['hidden'] = True
+        assert self.update_collected({changed_block_key}) == expected_recollected_block_keys
+
+    def test_changed_children(self):
+        # Move block 4 from block 1 to block 2, under which it is hidden.
+        self.modulestore.blocks[1].children = [3]
+        self.modulestore.blocks[2].children = [4]
+        self.modulestore.blocks[2].field_map['hidden'] = True
+        assert self.update_collected({1, 2}) == {0, 1, 2, 3, 4}
+        assert self.collected_block_structure.get_transformer_block_field(
+            4, MergedHiddenTransformer, MergedHiddenTransformer.MERGED_HIDDEN,
+        )
+
+    def test_removed_block(self):
+        self.modulestore.blocks[1].children = [3]
+        self.update_collected({1})
+        assert 4 not in self.collected_block_structure
+
+    def test_no_changes(self):
+        assert self.update_collected(set()) == set()
+
+    def test_changed_root(self):
+        self.set_course_version('v2')
+        assert not update_collected(self.collected_block_structure, self.modulestore, {0})
+        assert self.collected_block_structure.get_xblock_field(0, 'course_version') == 'v1'
+
+    def test_unsafe_transformer(self):
+        self.collect_and_reset([MergedHiddenTransformer, HiddenCountTransformer])
+        cached_block_structure = self.collected_block_structure
+        self.collected_block_structure = cached_block_structure.copy_on_write()
+
+        self.modulestore.blocks[4].field_map['hidden'] = True
+        assert self.update_collected({4}) == {0, 1, 4}
+        assert set(HiddenCountTransformer.collected_block_keys) == set(self.collected_block_structure)
+        assert self.collected_block_structure.get_transformer_data(
+            HiddenCountTransformer, HiddenCountTransformer.HIDDEN_COUNT,
+        ) == 1
+
+        # The shared data of the cached block structure is left unchanged.
+        assert cached_block_structure.get_transformer_data(
+            HiddenCountTransformer, HiddenCountTransformer.HIDDEN_COUNT,
+        ) == 0
+        for block_key in cached_block_structure:
+            assert cached_block_structure.get_xblock_field(block_key, 'course_version') == 'v1'
+        assert not cached_block_structure.get_transformer_block_field(
+            4, MergedHiddenTransformer, MergedHiddenTransformer.MERGED_HIDDEN,
+        )
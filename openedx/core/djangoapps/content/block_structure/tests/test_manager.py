@@ -4,12 +4,14 @@ Tests for manager.py
 
 import pytest
 import ddt
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from django.test import TestCase
+from edx_toggles.toggles.testutils import override_waffle_switch
 
 from xmodule.modulestore import ModuleStoreEnum
 
 from ..block_structure import BlockStructureBlockData
+from ..config import INCREMENTAL_COLLECT
 from ..exceptions import UsageKeyNotInBlockStructure
 from ..manager import BlockStructureManager
 from ..transformers import BlockStructureTransformers
@@ -95,6 +97,21 @@ class TestTransformer1(MockTransformer):
         return data_key + 't1.val1.' + str(block_key)
 
 
+class TestIncrementalTransformer(TestTransformer1):
+    """
+    Test Transformer class that supports incremental collection and
+    records the blocks it collected.
+    """
+    INCREMENTAL_COLLECT_SAFE = True
+    collected_block_keys = []
+
+    @classmethod
+    def collect(cls, block_structure):
+        block_structure.request_xblock_fields('course_version')
+        cls.collected_block_keys.extend(block_structure.topological_traversal())
+        super().collect(block_structure)
+
+
 @ddt.ddt
 class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
     """
@@ -253,3 +270,61 @@ class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, Test
                 setattr(self.modulestore, attr_name, original_branch_setting)
             elif hasattr(self.modulestore, attr_name):
                 delattr(self.modulestore, attr_name)
+
+    def set_course_version(self, course_version):
+        """
+        Sets the course version of all blocks in the mock modulestore.
+        """
+        for xblock in self.modulestore.blocks.values():
+            xblock.field_map['course_version'] = course_version
+
+    def test_get_collected_if_current(self):
+        self.registered_transformers = [TestIncrementalTransformer()]
+        self.set_course_version('v1')
+        with mock_registered_transformers(self.registered_transformers):
+            assert self.bs_manager.get_collected_if_current('v1') is None
+            self.bs_manager.update_collected_if_needed()
+
+            self.modulestore.get_items_call_count = 0
+            block_structure = self.bs_manager.get_collected_if_current('v1')
+            self.assert_block_structure(block_structure, self.children_map)
+            assert self.bs_manager.get_collected_if_current('v2') is None
+            assert self.bs_manager.get_collected_if_current(None) is None
+
+            with patch.object(
+                TestIncrementalTransformer, 'READ_VERSION', TestIncrementalTransformer.WRITE_VERSION + 1,
+            ):
+                assert self.bs_manager.get_collected_if_current('v1') is None
+        assert self.modulestore.get_items_call_count == 0
+
+    @ddt.data(True, False)
+    def test_update_collected_incrementally(self, transformer_is_safe):
+        self.registered_transformers = [TestIncrementalTransformer()]
+        self.modulestore.get_changed_blocks = MagicMock(return_value={self.block_key_factory(2)})
+        TestIncrementalTransformer.collected_block_keys = []
+        self.set_course_version('v1')
+
+        with override_waffle_switch(INCREMENTAL_COLLECT, active=True), \
+                patch.object(TestIncrementalTransformer, 'INCREMENTAL_COLLECT_SAFE', transformer_is_safe), \
+                mock_registered_transformers(self.registered_transformers):
+            self.bs_manager.update_collected_if_needed()
+            assert len(TestIncrementalTransformer.collected_block_keys) == len(self.children_map)
+
+            TestIncrementalTransformer.collected_block_keys = []
+            self.set_course_version('v2')
+            self.bs_manager.update_collected_if_needed()
+            block_structure = self.bs_manager.get_collected()
+
+        self.assert_block_structure(block_structure, self.children_map)
+        TestIncrementalTransformer.assert_collected(block_structure)
+        assert block_structure.get_xblock_field(self.block_key_factory(0), 'course_version') == 'v2'
+        if transformer_is_safe:
+            self.modulestore.get_changed_blocks.assert_called_once_with(
+                self.block_key_factory(0).course_key, 'v1', 'v2',
+            )
+            assert set(TestIncrementalTransformer.collected_block_keys) == {
+                self.block_key_factory(0), self.block_key_factory(2),
+            }
+        else:
+            self.modulestore.get_changed_blocks.assert_not_called()
+            assert len(TestIncrementalTransformer.collected_block_keys) == len(self.children_map)
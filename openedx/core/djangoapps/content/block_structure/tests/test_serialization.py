@@ -0,0 +1,126 @@
+"""
+Tests for block_structure/serialization.py
+"""
+# pylint: disable=protected-access
+
+
+from datetime import datetime
+from unittest import TestCase
+
+import ddt
+from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
+
+from openedx.core.lib.cache_utils import zpickle
+
+from ..serialization import deserialize, is_columnar, serialize
+from .helpers import ChildrenMapTestMixin, MockTransformer, UsageKeyFactoryMixin
+
+
+@ddt.ddt
+class TestColumnarSerialization(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
+    """
+    Tests for the columnar serialization of block structures.
+    """
+
+    def create_collected_block_structure(self, children_map):
+        """
+        Returns a block structure for the given children_map with mock
+        collected xBlock fields and transformer data.
+        """
+        block_structure = self.create_block_structure(children_map)
+        block_structure._add_transformer(MockTransformer)
+        for block_id in range(len(children_map)):
+            block_key = self.block_key_factory(block_id)
+            block_structure.override_xblock_field(block_key, 'display_name', f'Block {block_id}')
+            block_structure.override_xblock_field(block_key, 'start', datetime(2020, 1, block_id + 1))
+            block_structure.set_transformer_block_field(block_key, MockTransformer, 'test', {block_id})
+        return block_structure
+
+    def assert_block_data(self, block_structure, children_map):
+        """
+        Verifies the mock collected data of the given block structure.
+        """
+        for block_id in range(len(children_map)):
+            block_key = self.block_key_factory(block_id)
+            assert block_structure.get_xblock_field(block_key, 'display_name') == f'Block {block_id}'
+            assert block_structure.get_xblock_field(block_key, 'start') == datetime(2020, 1, block_id + 1)
+            assert block_structure.get_transformer_block_field(block_key, MockTransformer, 'test') == {block_id}
+        assert block_structure._get_transformer_data_version(MockTransformer) == MockTransformer.WRITE_VERSION
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_round_trip(self, children_map):
+        block_structure = self.create_collected_block_structure(children_map)
+        serialized_data = serialize(block_structure)
+        assert is_columnar(serialized_data)
+
+        deserialized = deserialize(serialized_data, block_structure.root_block_usage_key)
+        self.assert_block_structure(deserialized, children_map)
+        for block_key in block_structure:
+            assert deserialized.get_children(block_key) == block_structure.get_children(block_key)
+            assert deserialized.get_parents(block_key) == block_structure.get_parents(block_key)
+        self.assert_block_data(deserialized, children_map)
+
+    def test_fields_loaded_lazily(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        deserialized = deserialize(serialize(block_structure), block_structure.root_block_usage_key)
+        assert deserialized._block_data_map == {}
+        assert set(deserialized._unloaded_fields[None]) == {'display_name', 'start'}
+
+        deserialized.get_xblock_field(self.block_key_factory(0), 'display_name')
+        assert set(deserialized._unloaded_fields[None]) == {'start'}
+        assert MockTransformer.name() in deserialized._unloaded_fields
+
+        deserialized.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test')
+        assert MockTransformer.name() not in deserialized._unloaded_fields
+
+        list(deserialized.iteritems())
+        assert deserialized._unloaded_fields == {}
+
+    def test_override_before_load(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        deserialized = deserialize(serialize(block_structure), block_structure.root_block_usage_key)
+        block_key = self.block_key_factory(1)
+
+        deserialized.override_xblock_field(block_key, 'display_name', 'Overridden')
+        assert deserialized.get_xblock_field(block_key, 'display_name') == 'Overridden'
+        assert deserialized.get_xblock_field(self.block_key_factory(2), 'display_name') == 'Block 2'
+
+    def test_removed_blocks_not_loaded(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        deserialized = deserialize(serialize(block_structure), block_structure.root_block_usage_key)
+        removed_key = self.block_key_factory(2)
+
+        deserialized.remove_block(removed_key, keep_descendants=False)
+        assert deserialized.get_xblock_field(removed_key, 'display_name') is None
+        assert removed_key not in deserialized._block_data_map
+
+    def test_copy_is_independent(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        deserialized = deserialize(serialize(block_structure), block_structure.root_block_usage_key)
+        block_key = self.block_key_factory(0)
+
+        copied = deserialized.copy()
+        copied.get_transformer_block_field(block_key, MockTransformer, 'test').add('mutated')
+        assert deserialized.get_transformer_block_field(block_key, MockTransformer, 'test') == {0}
+        assert copied.get_transformer_block_field(block_key, MockTransformer, 'test') == {0, 'mutated'}
+
+    def test_keys_outside_course(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        other_key = BlockUsageLocator(CourseLocator('org', 'other', 'run'), 'html', 'external')
+        block_structure._add_relation(self.block_key_factory(0), other_key)
+
+        deserialized = deserialize(serialize(block_structure), block_structure.root_block_usage_key)
+        assert other_key in deserialized.get_children(self.block_key_factory(0))
+        assert deserialized.get_parents(other_key) == [self.block_key_factory(0)]
+
+    def test_legacy_data_not_columnar(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        assert not is_columnar(zpickle((
+            block_structure._block_relations,
+            block_structure.transformer_data,
+            block_structure._block_data_map,
+        )))
@@ -4,12 +4,16 @@ Tests for block_structure/cache.py
 
 import pytest
 import ddt
+from django.test.utils import override_settings
+from edx_toggles.toggles.testutils import override_waffle_switch
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
+from ..config import COLUMNAR_SERIALIZATION
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
-from ..store import BlockStructureStore
+from ..serialization import is_columnar
+from ..store import BlockStructureStore, _process_cache
 from .helpers import ChildrenMapTestMixin, MockCache, MockTransformer, UsageKeyFactoryMixin
 
 
@@ -30,6 +34,9 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
         self.mock_cache = MockCache()
         self.store = BlockStructureStore(self.mock_cache)
 
+        _process_cache.cache.clear()
+        self.addCleanup(_process_cache.cache.clear)
+
     def add_transformers(self):
         """
         Add each registered transformer to the block structure.
@@ -54,6 +61,46 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
         assert stored_value is not None
         self.assert_block_structure(stored_value, self.children_map)
 
+    @ddt.data(True, False)
+    def test_serialization_format(self, columnar):
+        with override_waffle_switch(COLUMNAR_SERIALIZATION, active=columnar):
+            self.store.add(self.block_structure)
+        assert [is_columnar(data) for data in self.mock_cache.map.values()] == [columnar]
+
+        # Data in either format remains readable regardless of the switch.
+        with override_waffle_switch(COLUMNAR_SERIALIZATION, active=not columnar):
+            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+        self.assert_block_structure(stored_value, self.children_map)
+        assert stored_value.get_transformer_block_field(
+            self.block_key_factory(0), MockTransformer, 'test',
+        ) == f'{MockTransformer.name()} val'
+
+    @override_settings(BLOCK_STRUCTURES_SETTINGS={'PROCESS_CACHE_MAX_SIZE_IN_BYTES': 10 * 1024 * 1024})
+    def test_process_cache(self):
+        # Only versioned data is cached in the process.
+        self.block_structure.override_xblock_field(
+            self.block_structure.root_block_usage_key, 'course_version', 'test_version',
+        )
+        self.store.add(self.block_structure)
+        first_value = self.store.get(self.block_structure.root_block_usage_key)
+
+        # Served from the process-local cache, without touching the django cache.
+        self.mock_cache.map.clear()
+        second_value = self.store.get(self.block_structure.root_block_usage_key)
+        self.assert_block_structure(second_value, self.children_map)
+
+        # Each caller gets its own copy to transform.
+        assert first_value is not second_value
+        second_value.remove_block(self.block_key_factory(1), keep_descendants=False)
+        second_value.override_xblock_field(self.block_key_factory(0), 'course_version', 'other_version')
+        third_value = self.store.get(self.block_structure.root_block_usage_key)
+        self.assert_block_structure(third_value, self.children_map)
+        assert third_value.get_xblock_field(self.block_key_factory(0), 'course_version') == 'test_version'
+
+        self.store.add(self.block_structure)
+        self.store.delete(self.block_structure.root_block_usage_key)
+        assert len(_process_cache()) == 0
+
     def test_delete(self):
         self.store.add(self.block_structure)
         self.store.delete(self.block_structure.root_block_usage_key)
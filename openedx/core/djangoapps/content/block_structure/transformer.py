@@ -58,6 +58,23 @@ class BlockStructureTransformer:
     WRITE_VERSION = 0
     READ_VERSION = 0
 
+    # Whether the transformer's collected data can be updated by
+    # re-collecting only the blocks that changed in the modulestore
+    # (along with their descendants) rather than the whole structure.
+    #
+    # A transformer may only set this to True when:
+    # 1. the data it collects for a block depends only on the xBlocks
+    #    of that block and of its ancestors - as is the case for data
+    #    that is percolated down the hierarchy - and never on those of
+    #    its descendants or siblings, and
+    # 2. it does not collect any non-block-specific data with
+    #    set_transformer_data.
+    #
+    # The data of the transformers that don't set this to True is
+    # re-collected for the whole structure during an incremental
+    # collection.
+    INCREMENTAL_COLLECT_SAFE = False
+
     @classmethod
     def name(cls):
         """
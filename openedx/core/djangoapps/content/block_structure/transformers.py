@@ -69,17 +69,32 @@ class BlockStructureTransformers:
         return self
 
     @classmethod
-    def collect(cls, block_structure):
+    def collect(cls, block_structure, transformers=None):
         """
-        Collects data for each registered transformer.
+        Collects data for each registered transformer, or only for the
+        given transformers.
         """
-        for transformer in TransformerRegistry.get_registered_transformers():
+        if transformers is None:
+            transformers = TransformerRegistry.get_registered_transformers()
+        for transformer in transformers:
             block_structure._add_transformer(transformer)  # pylint: disable=protected-access
             transformer.collect(block_structure)
 
         # Collect all fields that were requested by the transformers.
         block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
 
+    @classmethod
+    def supports_incremental_collect(cls):
+        """
+        Returns whether any registered transformer supports incremental
+        collection, and so whether collecting incrementally saves any
+        work.  See BlockStructureTransformer.INCREMENTAL_COLLECT_SAFE.
+        """
+        return any(
+            transformer.INCREMENTAL_COLLECT_SAFE
+            for transformer in TransformerRegistry.get_registered_transformers()
+        )
+
     @classmethod
     def verify_versions(cls, block_structure):
         """
@@ -12,6 +12,7 @@ import pytz
 from ccx_keys.locator import CCXLocator
 from config_models.models import ConfigurationModel
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models, transaction
 from django.db.models import Q
 from django.db.models.signals import post_save, post_delete
@@ -66,6 +67,44 @@ class CourseOverview(TimeStampedModel):
     # IMPORTANT: Bump this whenever you modify this model and/or add a migration.
     VERSION = 19
 
+    # The fields used by the learner dashboards, such as the learner home and the mobile
+    # enrollments API, which are the only ones loaded by get_dashboard_overviews.
+    DASHBOARD_FIELDS = (
+        'id',
+        'version',
+        '_location',
+        'org',
+        'display_name',
+        'display_number_with_default',
+        'display_org_with_default',
+        'start',
+        'end',
+        'advertised_start',
+        'announcement',
+        'banner_image_url',
+        'course_image_url',
+        'social_sharing_url',
+        'certificates_display_behavior',
+        'certificates_show_before_end',
+        'cert_html_view_enabled',
+        'has_any_active_web_certificate',
+        'cert_name_short',
+        'cert_name_long',
+        'certificate_available_date',
+        'lowest_passing_grade',
+        'days_early_for_beta',
+        'mobile_available',
+        'visible_to_staff_only',
+        '_pre_requisite_courses_json',
+        'enrollment_start',
+        'enrollment_end',
+        'invitation_only',
+        'catalog_visibility',
+        'self_paced',
+        'marketing_url',
+        'language',
+    )
+
     # Cache entry versioning.
     version = models.IntegerField()
 
@@ -451,6 +490,125 @@ class CourseOverview(TimeStampedModel):
                     overviews[course_id] = None
         return overviews
 
+    @classmethod
+    def get_dashboard_overviews(cls, course_ids):
+        """
+        Return a dict mapping course_ids to CourseOverviews for the learner dashboards.
+
+        Only the DASHBOARD_FIELDS and the thumbnail URLs of the overviews are loaded, with a
+        single cache lookup for all the courses, and a single query for the courses that are
+        not cached.  The other fields are loaded from the database when first accessed.
+
+        Unlike get_from_ids, this never loads courses from the modulestore: the overviews of
+        the courses that are missing from the database are regenerated by a background task,
+        and those courses map to None in the meantime.  Outdated overviews are returned as
+        they are while they are regenerated.
+
+        Arguments:
+            course_ids (iterable[CourseKey])
+
+        Returns: dict[CourseKey, CourseOverview|None]
+        """
+        course_ids = list(course_ids)
+        cache_keys = {course_id: cls._get_dashboard_cache_key(course_id) for course_id in course_ids}
+        cached_projections = cache.get_many(list(cache_keys.values()))
+        projections = {
+            course_id: cached_projections[cache_key]
+            for course_id, cache_key in cache_keys.items()
+            if cache_key in cached_projections
+        }
+
+        uncached_ids = [course_id for course_id in course_ids if course_id not in projections]
+        if uncached_ids:
+            outdated_ids = []
+            projections_to_cache = {}
+            for overview in cls.objects.select_related('image_set').filter(id__in=uncached_ids).only(
+                *cls.DASHBOARD_FIELDS, 'image_set__small_url', 'image_set__large_url',
+            ):
+                projection = overview._get_dashboard_projection()  # pylint: disable=protected-access
+                projections[overview.id] = projection
+                if overview.version < cls.VERSION:
+                    outdated_ids.append(overview.id)
+                else:
+                    projections_to_cache[cache_keys[overview.id]] = projection
+            missing_ids = [course_id for course_id in uncached_ids if course_id not in projections]
+            for course_id in missing_ids:
+                # Missing overviews are cached as empty projections, until they are saved.
+                projections_to_cache[cache_keys[course_id]] = {}
+            cache.set_many(projections_to_cache, settings.COURSE_OVERVIEW_DASHBOARD_CACHE_TIMEOUT)
+
+            if outdated_ids or missing_ids:
+                cls._enqueue_dashboard_overview_updates(outdated_ids + missing_ids)
+
+        return {
+            course_id: cls._from_dashboard_projection(projections[course_id]) if projections.get(course_id) else None
+            for course_id in course_ids
+        }
+
+    @classmethod
+    def _get_dashboard_cache_key(cls, course_id):
+        """
+        Returns the cache key of the dashboard projection of the given course.
+        """
+        return f'course_overview.dashboard.v{cls.VERSION}.{course_id}'
+
+    def _get_dashboard_projection(self):
+        """
+        Returns the values of the DASHBOARD_FIELDS and of the thumbnail URLs of this overview.
+        """
+        projection = {field_name: getattr(self, field_name) for field_name in self.DASHBOARD_FIELDS}
+        image_set = getattr(self, 'image_set', None)
+        projection['image_set'] = (image_set.small_url, image_set.large_url) if image_set else None
+        return projection
+
+    @classmethod
+    def _from_dashboard_projection(cls, projection):
+        """
+        Returns a CourseOverview with the values of the given dashboard projection, whose other
+        fields are deferred.
+        """
+        # from_db expects the values in the order of the concrete fields.
+        field_names = [field.attname for field in cls._meta.concrete_fields if field.attname in cls.DASHBOARD_FIELDS]
+        course_overview = cls.from_db(None, field_names, [projection[field_name] for field_name in field_names])
+        image_set = None
+        if projection['image_set'] is not None:
+            small_url, large_url = projection['image_set']
+            image_set = CourseOverviewImageSet(
+                course_overview=course_overview, small_url=small_url, large_url=large_url,
+            )
+        cls.image_set.related.set_cached_value(course_overview, image_set)
+        return course_overview
+
+    @classmethod
+    def _enqueue_dashboard_overview_updates(cls, course_ids):
+        """
+        Regenerates the overviews of the given courses in a background task, unless
+        that was already done for a course within the dashboard cache timeout.
+        """
+        # Avoid circular import here
+        from openedx.core.djangoapps.content.course_overviews.tasks import enqueue_async_course_overview_update_tasks
+        course_ids = [
+            course_id for course_id in course_ids
+            if cache.add(
+                f'{cls._get_dashboard_cache_key(course_id)}.update_enqueued',
+                True,
+                settings.COURSE_OVERVIEW_DASHBOARD_CACHE_TIMEOUT,
+            )
+        ]
+        if course_ids:
+            log.info("Enqueuing the generation of %d missing or outdated course overviews.", len(course_ids))
+            enqueue_async_course_overview_update_tasks([str(course_id) for course_id in course_ids])
+
+    def refresh_from_db(self, using=None, fields=None):
+        """
+        Loads all the deferred fields at once when one of them is accessed, rather than
+        with one query per field, see get_dashboard_overviews.
+        """
+        deferred_fields = self.get_deferred_fields()
+        if fields is not None and deferred_fields and set(fields) <= deferred_fields:
+            fields = deferred_fields
+        super().refresh_from_db(using=using, fields=fields)
+
     @classmethod
     def _get_course_has_highlights(cls, course):
         # Avoid circular import here
@@ -1205,7 +1363,19 @@ def _invalidate_overview_cache(**kwargs):  # pylint: disable=unused-argument
     RequestCache('course_overview').clear()
 
 
+def _invalidate_dashboard_projection_cache(instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the cached dashboard projection of a course overview.
+    """
+    course_id = instance.id if isinstance(instance, CourseOverview) else instance.course_overview_id
+    cache.delete(CourseOverview._get_dashboard_cache_key(course_id))  # pylint: disable=protected-access
+
+
 post_save.connect(_invalidate_overview_cache, sender=CourseOverview)
 post_save.connect(_invalidate_overview_cache, sender=CourseOverviewImageConfig)
 post_delete.connect(_invalidate_overview_cache, sender=CourseOverview)
 post_delete.connect(_invalidate_overview_cache, sender=CourseOverviewImageConfig)
+post_save.connect(_invalidate_dashboard_projection_cache, sender=CourseOverview)
+post_save.connect(_invalidate_dashboard_projection_cache, sender=CourseOverviewImageSet)
+post_delete.connect(_invalidate_dashboard_projection_cache, sender=CourseOverview)
+post_delete.connect(_invalidate_dashboard_projection_cache, sender=CourseOverviewImageSet)
@@ -1084,6 +1084,79 @@ class CourseOverviewImageSetTestCase(ModuleStoreTestCase):
             return course_overview
 
 
+class CourseOverviewDashboardProjectionTestCase(CacheIsolationTestCase):
+    """
+    Tests for CourseOverview.get_dashboard_overviews.
+    """
+
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super().setUp()
+        self.course_overview = CourseOverviewFactory.create(short_description='A course')
+        CourseOverviewImageSet.objects.create(
+            course_overview=self.course_overview, small_url='/small.png', large_url='/large.png',
+        )
+        self.other_course_overview = CourseOverviewFactory.create()
+        self.missing_course_id = CourseKey.from_string('course-v1:edX+missing+2012_Fall')
+
+    def get_dashboard_overviews(self):
+        """
+        Returns the dashboard overviews of the courses, checking that regenerations are enqueued
+        for the missing course.
+        """
+        with mock.patch(
+            'openedx.core.djangoapps.content.course_overviews.tasks.enqueue_async_course_overview_update_tasks'
+        ) as mock_enqueue:
+            course_overviews = CourseOverview.get_dashboard_overviews(
+                [self.course_overview.id, self.other_course_overview.id, self.missing_course_id]
+            )
+        return course_overviews, mock_enqueue
+
+    def test_dashboard_overviews(self):
+        with self.assertNumQueries(1):
+            course_overviews, mock_enqueue = self.get_dashboard_overviews()
+        mock_enqueue.assert_called_once_with([str(self.missing_course_id)])
+        assert course_overviews[self.missing_course_id] is None
+
+        course_overview = course_overviews[self.course_overview.id]
+        with self.assertNumQueries(0):
+            assert course_overview.id == self.course_overview.id
+            assert course_overview.display_name == self.course_overview.display_name
+            assert course_overview.start == self.course_overview.start
+            assert course_overview.image_set.small_url == '/small.png'
+            assert not hasattr(course_overviews[self.other_course_overview.id], 'image_set')
+
+        # The fields left out of the projection are all loaded at once when first accessed.
+        with self.assertNumQueries(1):
+            assert course_overview.short_description == 'A course'
+            assert course_overview.effort == self.course_overview.effort
+
+    def test_dashboard_overviews_cached(self):
+        self.get_dashboard_overviews()
+        with self.assertNumQueries(0):
+            course_overviews, mock_enqueue = self.get_dashboard_overviews()
+        assert course_overviews[self.course_overview.id].display_name == self.course_overview.display_name
+        # The regeneration of the missing course was already enqueued.
+        mock_enqueue.assert_not_called()
+
+    def test_dashboard_overviews_invalidated(self):
+        self.get_dashboard_overviews()
+        self.course_overview.display_name = 'Updated display name'
+        self.course_overview.save()
+        course_overviews, __ = self.get_dashboard_overviews()
+        assert course_overviews[self.course_overview.id].display_name == 'Updated display name'
+
+    def test_outdated_dashboard_overviews(self):
+        CourseOverview.objects.filter(id=self.course_overview.id).update(version=CourseOverview.VERSION - 1)
+        for __ in range(2):
+            course_overviews, mock_enqueue = self.get_dashboard_overviews()
+            assert course_overviews[self.course_overview.id].display_name == self.course_overview.display_name
+        # Outdated overviews are returned but not cached, while they are regenerated.
+        mock_enqueue.assert_not_called()
+        assert not CourseOverview.objects.filter(id=self.course_overview.id, version=CourseOverview.VERSION).exists()
+
+
 @ddt.ddt
 class CourseOverviewTabTestCase(ModuleStoreTestCase):
     """
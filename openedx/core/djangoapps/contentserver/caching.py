@@ -1,10 +1,15 @@
 """
 Helper functions for caching course assets.
 """
+from collections import namedtuple
+from uuid import uuid4
+
+from django.conf import settings
 from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
 
+from openedx.core.lib.cache_utils import request_cached
 from xmodule.contentstore.content import STATIC_CONTENT_VERSION
 
 # See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
@@ -14,6 +19,22 @@ try:
 except InvalidCacheBackendError:
     pass
 
+# The metadata of a piece of content, which is cached apart from its data, so that the contentserver can
+# check access to the content and whether it changed without loading its data.
+ContentMetadata = namedtuple(
+    'ContentMetadata', ['content_digest', 'length', 'content_type', 'locked', 'last_modified_at']
+)
+
+# Cached in place of the metadata of content that doesn't exist.
+MISSING_CONTENT = 'missing'
+
+
+def _metadata_key(location):
+    """
+    Returns the cache key of the metadata of the content at the given location.
+    """
+    return f'metadata.{location}'.encode("utf-8")
+
 
 def set_cached_content(content):
     """
@@ -29,6 +50,65 @@ def get_cached_content(location):
     return CONTENT_CACHE.get(str(location).encode("utf-8"), version=STATIC_CONTENT_VERSION)
 
 
+def set_cached_content_metadata(content):
+    """
+    Stores the metadata of the given piece of content in the cache, using its location as the key.
+    """
+    metadata = ContentMetadata(
+        content_digest=getattr(content, 'content_digest', None),
+        length=content.length,
+        content_type=content.content_type,
+        locked=getattr(content, 'locked', False),
+        last_modified_at=content.last_modified_at,
+    )
+    CONTENT_CACHE.set(_metadata_key(content.location), metadata, version=STATIC_CONTENT_VERSION)
+    return metadata
+
+
+def set_cached_content_missing(location):
+    """
+    Stores in the cache, for a short time, that there is no content at the given location.
+    """
+    CONTENT_CACHE.set(
+        _metadata_key(location),
+        MISSING_CONTENT,
+        timeout=settings.COURSE_ASSETS_MISSING_CONTENT_CACHE_TIMEOUT,
+        version=STATIC_CONTENT_VERSION,
+    )
+
+
+def get_cached_content_metadata(location):
+    """
+    Retrieves the metadata of the content at the given location if cached, as a
+    ContentMetadata, or MISSING_CONTENT if the content is cached as missing.
+    """
+    return CONTENT_CACHE.get(_metadata_key(location), version=STATIC_CONTENT_VERSION)
+
+
+def _course_assets_version_key(course_key):
+    """
+    Returns the cache key of the assets version of the given course.
+    """
+    return f'course_assets_version.{course_key}'.encode("utf-8")
+
+
+@request_cached()
+def get_course_assets_version(course_key):
+    """
+    Returns an opaque version of the assets of the given course, which changes
+    whenever the cached content of any of them is deleted, i.e. when an asset is
+    uploaded, locked, unlocked or deleted.
+
+    Use it to key data derived from the course's assets, such as their URLs.
+    Assets saved without deleting their cached content, such as those of an
+    imported course, only change the version once it expires from the
+    course_assets cache.
+    """
+    key = _course_assets_version_key(course_key)
+    CONTENT_CACHE.add(key, uuid4().hex, version=STATIC_CONTENT_VERSION)
+    return CONTENT_CACHE.get(key, version=STATIC_CONTENT_VERSION)
+
+
 def del_cached_content(location):
     """
     Delete content for the given location, as well versions of the content without a run.
@@ -40,11 +120,16 @@ def del_cached_content(location):
         """Force the location to a Unicode string."""
         return str(loc).encode("utf-8")
 
-    locations = [location_str(location)]
+    locations = [location_str(location), _metadata_key(location)]
     try:
-        locations.append(location_str(location.replace(run=None)))
+        location_without_run = location.replace(run=None)
+        locations.extend([location_str(location_without_run), _metadata_key(location_without_run)])
     except InvalidKeyError:
         # although deprecated keys allowed run=None, new keys don't if there is no version.
         pass
 
+    course_key = getattr(location, 'course_key', None)
+    if course_key is not None:
+        locations.append(_course_assets_version_key(course_key))
+
     CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
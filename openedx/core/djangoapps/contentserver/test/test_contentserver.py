@@ -7,11 +7,13 @@ import copy
 import datetime
 import logging
 import unittest
-from unittest.mock import patch
+from io import BytesIO
+from unittest.mock import Mock, patch
 from uuid import uuid4
 
 import ddt
 from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
 from django.test import RequestFactory
 from django.test.client import Client
 from django.test.utils import override_settings
@@ -20,14 +22,15 @@ from opaque_keys import InvalidKeyError
 from common.djangoapps.student.models import CourseEnrollment
 from common.djangoapps.student.tests.factories import AdminFactory, UserFactory
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import VERSIONED_ASSETS_PREFIX, StaticContent
+from xmodule.contentstore.content import VERSIONED_ASSETS_PREFIX, StaticContent, StaticContentStream
 from xmodule.contentstore.django import contentstore
+from xmodule.exceptions import NotFoundError
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.tests.django_utils import TEST_DATA_SPLIT_MODULESTORE, SharedModuleStoreTestCase
 from xmodule.modulestore.xml_importer import import_course_from_xml
 
-from .. import views
+from .. import caching, views
 
 log = logging.getLogger(__name__)
 
@@ -324,13 +327,31 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
 
     def test_range_request_multiple_ranges(self):
         """
-        Test that multiple ranges in request outputs the full content.
+        Test that multiple ranges in request outputs a multipart message of the ranges.
         """
-        first_byte = self.length_unlocked / 4
-        last_byte = self.length_unlocked / 2
-        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}, -100'.format(
+        first_byte = self.length_unlocked // 4
+        last_byte = self.length_unlocked // 2
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}, -10'.format(
             first=first_byte, last=last_byte))
 
+        assert resp.status_code == 206
+        assert 'Content-Range' not in resp
+        assert resp['Content-Type'].startswith('multipart/byteranges; boundary=')
+        assert resp['Content-Length'] == str(len(resp.content))
+        assert 'Content-Range: bytes {first}-{last}/{length}'.format(
+            first=first_byte, last=last_byte, length=self.length_unlocked
+        ).encode() in resp.content
+        assert 'Content-Range: bytes {first}-{last}/{length}'.format(
+            first=self.length_unlocked - 10, last=self.length_unlocked - 1, length=self.length_unlocked
+        ).encode() in resp.content
+
+    def test_range_request_too_many_ranges(self):
+        """
+        Test that a request for more than MAX_BYTE_RANGES ranges outputs the full content.
+        """
+        header_value = 'bytes=' + ', '.join(['0-0'] * (views.MAX_BYTE_RANGES + 1))
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE=header_value)
+
         assert resp.status_code == 200
         assert 'Content-Range' not in resp
         assert resp['Content-Length'] == str(self.length_unlocked)
@@ -529,3 +550,104 @@ class ParseRangeHeaderTestCase(unittest.TestCase):
         self.assertRaisesRegex(
             exception_class, exception_message_regex, views.parse_range_header, header_value, self.content_length
         )
+
+
+class ContentResponseTestCase(unittest.TestCase):
+    """
+    Tests for the get_content_response and get_multipart_byteranges functions.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.data = bytes(range(256)) * 20
+        self.location = Mock()
+
+    def get_content_stream(self):
+        """
+        Returns a StaticContentStream of the test data, whose stream can be checked for being closed.
+        """
+        return StaticContentStream(
+            self.location, 'test.mp4', 'video/mp4', BytesIO(self.data), length=len(self.data)
+        )
+
+    def test_in_memory_content(self):
+        content = StaticContent(self.location, 'test.mp4', 'video/mp4', self.data, length=len(self.data))
+        response = views.get_content_response(content, content.stream_data_in_range(10, 2000))
+        assert not response.streaming
+        assert response.content == self.data[10:2001]
+        assert response['Content-Type'] == 'video/mp4'
+
+    def test_streamed_content(self):
+        content = self.get_content_stream()
+        response = views.get_content_response(content, content.stream_data_in_range(10, 2000))
+        assert response.streaming
+        assert not content._stream.closed  # pylint: disable=protected-access
+        assert b''.join(response.streaming_content) == self.data[10:2001]
+        assert content._stream.closed  # pylint: disable=protected-access
+
+    def test_multipart_byteranges(self):
+        content = self.get_content_stream()
+        ranges = [(0, 9), (4000, 5119)]
+        parts = views.get_multipart_byteranges(content, ranges, 'BOUNDARY')
+        response = views.get_content_response(
+            content, (chunk for _, chunks in parts for chunk in chunks), 'multipart/byteranges; boundary=BOUNDARY',
+        )
+
+        body = b''.join(response.streaming_content)
+        assert len(body) == sum(length for length, _ in parts)
+        assert body == (
+            b'--BOUNDARY\r\nContent-Type: video/mp4\r\nContent-Range: bytes 0-9/5120\r\n\r\n' +
+            self.data[0:10] + b'\r\n' +
+            b'--BOUNDARY\r\nContent-Type: video/mp4\r\nContent-Range: bytes 4000-5119/5120\r\n\r\n' +
+            self.data[4000:5120] + b'\r\n' +
+            b'--BOUNDARY--\r\n'
+        )
+
+
+class LoadAssetMetadataTestCase(unittest.TestCase):
+    """
+    Tests for the load_asset_metadata_from_location function.
+    """
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(caching, 'CONTENT_CACHE', LocMemCache(uuid4().hex, {}))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.location = StaticContent.get_location_from_path('/asset-v1:org+course+run+type@asset+block@test.mp4')
+        self.content = StaticContent(
+            self.location, 'test.mp4', 'video/mp4', b'data', length=4, locked=True,
+            last_modified_at=datetime.datetime(2020, 1, 1), content_digest=FAKE_MD5_HASH,
+        )
+
+    @patch('openedx.core.djangoapps.contentserver.views.load_asset_from_location')
+    def test_metadata_cached(self, mock_load_asset):
+        mock_load_asset.return_value = self.content
+        metadata, content = views.load_asset_metadata_from_location(self.location)
+        assert content is self.content
+
+        cached_metadata, content = views.load_asset_metadata_from_location(self.location)
+        assert content is None
+        assert cached_metadata == metadata == caching.ContentMetadata(
+            FAKE_MD5_HASH, 4, 'video/mp4', True, datetime.datetime(2020, 1, 1),
+        )
+        assert mock_load_asset.call_count == 1
+
+        caching.del_cached_content(self.location)
+        views.load_asset_metadata_from_location(self.location)
+        assert mock_load_asset.call_count == 2
+
+    @patch('openedx.core.djangoapps.contentserver.views.load_asset_from_location')
+    def test_missing_content_cached(self, mock_load_asset):
+        mock_load_asset.side_effect = NotFoundError
+        for _ in range(2):
+            with self.assertRaises(NotFoundError):
+                views.load_asset_metadata_from_location(self.location)
+        assert mock_load_asset.call_count == 1
+
+        # Uploading the asset clears its cached metadata.
+        caching.del_cached_content(self.location)
+        mock_load_asset.side_effect = None
+        mock_load_asset.return_value = self.content
+        metadata, __ = views.load_asset_metadata_from_location(self.location)
+        assert metadata.length == 4
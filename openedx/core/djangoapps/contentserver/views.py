@@ -7,6 +7,7 @@ have 3 views as entry points.
 """
 import datetime
 import logging
+from uuid import uuid4
 
 from django.http import (
     HttpResponse,
@@ -14,7 +15,8 @@ from django.http import (
     HttpResponseForbidden,
     HttpResponseNotFound,
     HttpResponseNotModified,
-    HttpResponsePermanentRedirect
+    HttpResponsePermanentRedirect,
+    StreamingHttpResponse
 )
 from django.views.decorators.http import require_safe
 from edx_django_utils.monitoring import set_custom_attribute
@@ -26,13 +28,20 @@ from common.djangoapps.student.models import CourseEnrollment
 from openedx.core.djangoapps.header_control import force_header_for_response
 from openedx.core.djangoapps.waffle_utils import CourseWaffleFlag
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import XASSET_LOCATION_TAG, StaticContent
+from xmodule.contentstore.content import XASSET_LOCATION_TAG, StaticContent, StaticContentStream
 from xmodule.exceptions import NotFoundError
 from xmodule.modulestore import InvalidLocationError
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.util.sandboxing import course_code_library_asset_name
 
-from .caching import get_cached_content, set_cached_content
+from .caching import (
+    MISSING_CONTENT,
+    get_cached_content,
+    get_cached_content_metadata,
+    set_cached_content,
+    set_cached_content_metadata,
+    set_cached_content_missing
+)
 from .models import CdnUserAgentsConfig, CourseAssetCacheTtlConfig
 
 
@@ -51,6 +60,10 @@ log = logging.getLogger(__name__)
 
 HTTP_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
 
+# The maximum number of ranges served in a multipart/byteranges response.  Requests for more ranges
+# get the full content instead, so that many small or overlapping ranges can't multiply the work.
+MAX_BYTE_RANGES = 10
+
 
 def is_asset_request(request):
     """Determines whether the given request is an asset request"""
@@ -85,14 +98,13 @@ def process_request(request):
         except (InvalidLocationError, InvalidKeyError):
             return HttpResponseBadRequest()
 
-        # Attempt to load the asset to make sure it exists, and grab the asset digest
+        # Attempt to load the metadata of the asset to make sure it exists, and grab the asset digest
         # if we're able to load it.
-        actual_digest = None
         try:
-            content = load_asset_from_location(loc)
-            actual_digest = getattr(content, "content_digest", None)
+            metadata, content = load_asset_metadata_from_location(loc)
         except (ItemNotFoundError, NotFoundError):
             return HttpResponseNotFound()
+        actual_digest = metadata.content_digest
 
         # If this was a versioned asset, and the digest doesn't match, redirect
         # them to the actual version.
@@ -116,21 +128,29 @@ def process_request(request):
         set_custom_attribute('contentserver.from_cdn', is_from_cdn)
 
         # Check if this content is locked or not.
-        locked = is_content_locked(content)
+        locked = is_content_locked(metadata)
         set_custom_attribute('contentserver.locked', locked)
 
         # Check that user has access to the content.
-        if not is_user_authorized(request, content, loc):
+        if not is_user_authorized(request, metadata, loc):
             return HttpResponseForbidden('Unauthorized')
 
         # Figure out if the client sent us a conditional request, and let them know
         # if this asset has changed since then.
-        last_modified_at_str = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
+        last_modified_at_str = metadata.last_modified_at.strftime(HTTP_DATE_FORMAT)
         if 'HTTP_IF_MODIFIED_SINCE' in request.META:
             if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
             if if_modified_since == last_modified_at_str:
                 return HttpResponseNotModified()
 
+        # Only load the asset itself now that we know it has to be sent.
+        set_custom_attribute('contentserver.metadata_cached', content is None)
+        if content is None:
+            try:
+                content = load_asset_from_location(loc)
+            except (ItemNotFoundError, NotFoundError):
+                return HttpResponseNotFound()
+
         # *** File streaming within a byte range ***
         # If a Range is provided, parse Range attribute of the request
         # Add Content-Range in the response if Range is structurally correct
@@ -139,10 +159,6 @@ def process_request(request):
         # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
         response = None
         if request.META.get('HTTP_RANGE'):
-            # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-            if isinstance(content, StaticContent):
-                content = AssetManager.find(loc, as_stream=True)
-
             header_value = request.META['HTTP_RANGE']
             try:
                 unit, ranges = parse_range_header(header_value, content.length)
@@ -156,36 +172,45 @@ def process_request(request):
                 if unit != 'bytes':
                     # Only accept ranges in bytes
                     log.warning("Unknown unit in Range header: %s for content: %s", header_value, str(loc))
-                elif len(ranges) > 1:
-                    # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                    # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                    # But we send back the full content.
+                elif len(ranges) > MAX_BYTE_RANGES:
                     log.warning(
-                        "More than 1 ranges in Range header: %s for content: %s", header_value, str(loc)
+                        "More than %d ranges in Range header: %s for content: %s",
+                        MAX_BYTE_RANGES, header_value, str(loc)
                     )
                 else:
-                    first, last = ranges[0]
+                    # Unsatisfiable ranges are ignored, unless none of them is satisfiable.
+                    ranges = [(first, last) for first, last in ranges if 0 <= first <= last < content.length]
+                    if not ranges:
+                        log.warning(
+                            "Cannot satisfy ranges in Range header: %s for content: %s",
+                            header_value, str(loc)
+                        )
+                        return HttpResponse(status=416)  # Requested Range Not Satisfiable
 
-                    if 0 <= first <= last < content.length:
-                        # If the byte range is satisfiable
-                        response = HttpResponse(content.stream_data_in_range(first, last))
+                    if len(ranges) == 1:
+                        first, last = ranges[0]
+                        response = get_content_response(content, content.stream_data_in_range(first, last))
                         response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
                             first=first, last=last, length=content.length
                         )
                         response['Content-Length'] = str(last - first + 1)
-                        response.status_code = 206  # Partial Content
-
-                        set_custom_attribute('contentserver.ranged', True)
                     else:
-                        log.warning(
-                            "Cannot satisfy ranges in Range header: %s for content: %s",
-                            header_value, str(loc)
+                        # According to the HTTP spec, content for multiple ranges is sent as a multipart message.
+                        boundary = uuid4().hex
+                        parts = get_multipart_byteranges(content, ranges, boundary)
+                        response = get_content_response(
+                            content,
+                            (chunk for _, chunks in parts for chunk in chunks),
+                            content_type=f'multipart/byteranges; boundary={boundary}',
                         )
-                        return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                        response['Content-Length'] = str(sum(length for length, _ in parts))
+                    response.status_code = 206  # Partial Content
+
+                    set_custom_attribute('contentserver.ranged', True)
 
         # If Range header is absent or syntactically invalid return a full content response.
         if response is None:
-            response = HttpResponse(content.stream_data())
+            response = get_content_response(content, content.stream_data())
             response['Content-Length'] = content.length
 
         set_custom_attribute('contentserver.content_len', content.length)
@@ -193,7 +218,6 @@ def process_request(request):
 
         # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
         response['Accept-Ranges'] = 'bytes'
-        response['Content-Type'] = content.content_type
         response['X-Frame-Options'] = 'ALLOW'
 
         # Set any caching headers, and do any response cleanup needed.  Based on how much
@@ -205,6 +229,56 @@ def process_request(request):
         return response
 
 
+def get_content_response(content, chunks, content_type=None):
+    """
+    Returns a response with the given chunks of the given content as its body, and
+    the given content type, which defaults to that of the content.
+
+    The chunks of an asset streamed from the contentstore are read on demand, as the
+    response is sent, so that the whole asset is never held in memory.  The stream is
+    closed once the response has been sent.
+    """
+    content_type = content_type or content.content_type
+    if not isinstance(content, StaticContentStream):
+        return HttpResponse(chunks, content_type=content_type)
+
+    def stream_and_close():
+        try:
+            yield from chunks
+        finally:
+            content.close()
+
+    return StreamingHttpResponse(stream_and_close(), content_type=content_type)
+
+
+def get_multipart_byteranges(content, ranges, boundary):
+    """
+    Returns the parts of a multipart/byteranges body for the given ranges of the given
+    content, as a list of (length, chunks) tuples, where chunks is an iterable of the
+    bytes of the part, read on demand.
+
+    See https://www.rfc-editor.org/rfc/rfc9110#name-media-type-multipart-byteran
+    """
+    def part_chunks(header, first, last):
+        yield header
+        yield from content.stream_data_in_range(first, last)
+        yield b'\r\n'
+
+    parts = []
+    for first, last in ranges:
+        header = (
+            f'--{boundary}\r\n'
+            f'Content-Type: {content.content_type}\r\n'
+            f'Content-Range: bytes {first}-{last}/{content.length}\r\n'
+            '\r\n'
+        ).encode('utf-8')
+        parts.append((len(header) + last - first + 1 + 2, part_chunks(header, first, last)))
+
+    closing_delimiter = f'--{boundary}--\r\n'.encode('utf-8')
+    parts.append((len(closing_delimiter), [closing_delimiter]))
+    return parts
+
+
 def set_caching_headers(content, location, response):
     """
     Sets caching headers based on whether or not the asset is restricted.
@@ -346,6 +420,30 @@ def load_asset_from_location(location):
     return content
 
 
+def load_asset_metadata_from_location(location):
+    """
+    Loads the metadata of an asset based on its location, either retrieving it from
+    a cache or loading the asset itself.
+
+    Returns a tuple of the metadata, as a ContentMetadata, and the asset if it had to
+    be loaded, or None otherwise.
+
+    Raises NotFoundError if the asset doesn't exist, which is also cached for a short time.
+    """
+    metadata = get_cached_content_metadata(location)
+    if metadata == MISSING_CONTENT:
+        raise NotFoundError(location)
+    if metadata is not None:
+        return metadata, None
+
+    try:
+        content = load_asset_from_location(location)
+    except (ItemNotFoundError, NotFoundError):
+        set_cached_content_missing(location)
+        raise
+    return set_cached_content_metadata(content), content
+
+
 def parse_range_header(header_value, content_length):
     """
     Returns the unit and a list of (start, end) tuples of ranges.
@@ -18,6 +18,7 @@ from opaque_keys.edx.django.models import CourseKeyField
 from openedx.core.djangoapps.xmodule_django.models import NoneToEmptyManager
 from openedx.core.lib.cache_utils import request_cached
 from common.djangoapps.student.models import CourseEnrollment
+from common.djangoapps.student.signals import COURSE_ENROLLMENTS_BULK_SAVED
 from common.djangoapps.student.roles import GlobalStaff
 from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.exceptions import ItemNotFoundError  # lint-amnesty, pylint: disable=wrong-import-order
@@ -51,6 +52,22 @@ def assign_default_role_on_enrollment(sender, instance, **kwargs):
     assign_default_role(instance.course_id, instance.user)
 
 
+@receiver(COURSE_ENROLLMENTS_BULK_SAVED, sender=CourseEnrollment)
+def assign_default_role_on_enrollments_in_bulk(sender, created, updated, **kwargs):
+    """
+    Assign forum default role 'Student' to the users of the enrollments saved in bulk,
+    with a few queries for each course.
+    """
+    user_ids_by_course = {}
+    for enrollment in created + updated:
+        user_ids_by_course.setdefault(enrollment.course_id, set()).add(enrollment.user_id)
+    for course_id, user_ids in user_ids_by_course.items():
+        role, created_role = Role.objects.get_or_create(course_id=course_id, name=FORUM_ROLE_STUDENT)
+        if created_role:
+            logging.info(f"EDUCATOR-1635: Created role {role} for course {course_id}")
+        role.users.add(*user_ids)
+
+
 def assign_default_role(course_id, user):
     """
     Assign forum default role 'Student' to user
@@ -7,14 +7,14 @@ from abc import abstractmethod
 from opaque_keys.edx.keys import CourseKey
 
 import logging
-from typing import List
+from typing import List, Set
 
 from django.utils import timezone
 
 from common.djangoapps.course_modes.models import CourseMode
-from common.djangoapps.student.models import CourseAccessRole, CourseEnrollment
+from common.djangoapps.student.models import CourseEnrollment
 from openedx.core.djangoapps.course_date_signals.utils import get_expected_duration
-from common.djangoapps.student.roles import CourseStaffRole, CourseInstructorRole
+from common.djangoapps.student.roles import CourseRoleIndex, CourseStaffRole, CourseInstructorRole
 from lms.djangoapps.discussion.django_comment_client.utils import get_users_with_roles
 from lms.djangoapps.teams.models import CourseTeam
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
@@ -90,13 +90,12 @@ class CourseRoleAudienceFilter(NotificationAudienceFilterBase):
         if not isinstance(course_key, CourseKey):
             course_key = CourseKey.from_string(course_key)
 
+        role_index = CourseRoleIndex.for_course(course_key)
         if 'staff' in course_roles:
-            staff_users = CourseStaffRole(course_key).users_with_role().values_list('id', flat=True)
-            user_ids.extend(staff_users)
+            user_ids.extend(role_index.users_with_role(CourseStaffRole.ROLE))
 
         if 'instructor' in course_roles:
-            instructor_users = CourseInstructorRole(course_key).users_with_role().values_list('id', flat=True)
-            user_ids.extend(instructor_users)
+            user_ids.extend(role_index.users_with_role(CourseInstructorRole.ROLE))
 
         return user_ids
 
@@ -161,15 +160,17 @@ class NotificationFilter:
     Filter notifications based on their type
     """
 
+    def __init__(self):
+        self._courses = {}
+
     @staticmethod
-    def get_users_with_course_role(user_ids: List[int], course_id: str) -> List[int]:
+    def get_users_with_course_role(user_ids: List[int], course_id: str) -> Set[int]:
         """
         Get users with a course role for the given course.
         """
-        return CourseAccessRole.objects.filter(
-            user_id__in=user_ids,
-            course_id=course_id,
-        ).values_list('user_id', flat=True)
+        if not isinstance(course_id, CourseKey):
+            course_id = CourseKey.from_string(course_id)
+        return CourseRoleIndex.for_course(course_id).filter_users_with_roles(user_ids)
 
     @staticmethod
     def get_users_with_forum_roles(user_ids: List[int], course_id: str) -> List[int]:
@@ -242,7 +243,13 @@ class NotificationFilter:
         """
         notification_config = COURSE_NOTIFICATION_TYPES.get(notification_type, {})
         applicable_filters = notification_config.get('filters', [])
-        course = modulestore().get_course(course_key)
+        if not applicable_filters:
+            return user_ids
+
+        # The filters are applied to each batch of users of a notification with the same instance.
+        course = self._courses.get(course_key)
+        if course is None:
+            course = self._courses[course_key] = modulestore().get_course(course_key)
         for filter_name in applicable_filters:
             logger.debug(
                 "NotificationFilter: Applying filter %s for notification type %s",
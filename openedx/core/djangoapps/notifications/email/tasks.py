@@ -1,9 +1,12 @@
 """
 Celery tasks for sending email notifications
 """
+from collections import defaultdict
+
 from bs4 import BeautifulSoup
 from celery import shared_task
 from celery.utils.log import get_task_logger
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext as _, override as translation_override
 from edx_ace import ace
@@ -15,6 +18,7 @@ from openedx.core.djangoapps.notifications.models import (
     Notification,
     NotificationPreference,
 )
+from openedx.core.djangoapps.notifications.utils import get_list_in_batches
 from .events import send_immediate_email_digest_sent_event, send_user_email_digest_sent_event
 from .message_type import EmailNotificationMessageType
 from .utils import (
@@ -27,6 +31,7 @@ from .utils import (
     get_language_preference_for_users,
     get_start_end_date,
     get_text_for_notification_type,
+    get_users_with_email_notification_flag_enabled,
     is_email_notification_flag_enabled,
 )
 
@@ -51,12 +56,16 @@ def get_audience_for_cadence_email(cadence_type):
     return users
 
 
-def send_digest_email_to_user(user, cadence_type, start_date, end_date, user_language='en', courses_data=None):
+def send_digest_email_to_user(user, cadence_type, start_date, end_date, user_language='en', courses_data=None,
+                              email_flag_enabled=None, notifications=None, preferences=None):
     """
     Send [cadence_type] email to user.
     Cadence Type can be EmailCadence.DAILY or EmailCadence.WEEKLY
     start_date: Datetime object
     end_date: Datetime object
+    email_flag_enabled, notifications, preferences: (optional) whether the email notifications flag is enabled
+        for the user, the user's email notifications between the dates and the user's account level preferences,
+        when they are fetched beforehand for many users
     """
     if cadence_type not in [EmailCadence.DAILY, EmailCadence.WEEKLY]:
         raise ValueError('Invalid cadence_type')
@@ -64,17 +73,21 @@ def send_digest_email_to_user(user, cadence_type, start_date, end_date, user_lan
     if not user.has_usable_password():
         logger.info(f'<Email Cadence> User is disabled {user.username} ==Temp Log==')
         return
-    if not is_email_notification_flag_enabled(user):
+    if email_flag_enabled is None:
+        email_flag_enabled = is_email_notification_flag_enabled(user)
+    if not email_flag_enabled:
         logger.info(f'<Email Cadence> Flag disabled for {user.username} ==Temp Log==')
         return
-    notifications = Notification.objects.filter(user=user, email=True,
-                                                created__gte=start_date, created__lte=end_date)
+    if notifications is None:
+        notifications = Notification.objects.filter(user=user, email=True,
+                                                    created__gte=start_date, created__lte=end_date)
     if not notifications:
         logger.info(f'<Email Cadence> No notification for {user.username} ==Temp Log==')
         return
 
     with translation_override(user_language):
-        preferences = NotificationPreference.objects.filter(user=user)
+        if preferences is None:
+            preferences = NotificationPreference.objects.filter(user=user)
         notifications = filter_email_enabled_notifications(notifications, preferences, user,
                                                            cadence_type=cadence_type)
 
@@ -100,17 +113,39 @@ def send_digest_email_to_user(user, cadence_type, start_date, end_date, user_lan
 def send_digest_email_to_all_users(cadence_type):
     """
     Send email digest to all eligible users
+
+    The notifications, preferences and language of the users are fetched for batches of
+    NOTIFICATION_DIGEST_EMAIL_BATCH_SIZE users, instead of one user at a time.
     """
     logger.info(f'<Email Cadence> Sending cadence email of type {cadence_type}')
-    users = get_audience_for_cadence_email(cadence_type)
-    language_prefs = get_language_preference_for_users([user.id for user in users])
+    users = list(get_audience_for_cadence_email(cadence_type))
     courses_data = {}
     start_date, end_date = get_start_end_date(cadence_type)
     logger.info(f'<Email Cadence> Email Cadence Audience {len(users)}')
-    for user in users:
-        user_language = language_prefs.get(user.id, 'en')
-        send_digest_email_to_user(user, cadence_type, start_date, end_date, user_language=user_language,
-                                  courses_data=courses_data)
+    for batch_users in get_list_in_batches(users, settings.NOTIFICATION_DIGEST_EMAIL_BATCH_SIZE):
+        user_ids = [user.id for user in batch_users]
+        language_prefs = get_language_preference_for_users(user_ids)
+        email_flag_enabled_user_ids = get_users_with_email_notification_flag_enabled(batch_users)
+
+        notifications_by_user_id = defaultdict(list)
+        for notification in Notification.objects.filter(
+            user_id__in=email_flag_enabled_user_ids, email=True, created__gte=start_date, created__lte=end_date
+        ):
+            notifications_by_user_id[notification.user_id].append(notification)
+
+        preferences_by_user_id = defaultdict(list)
+        for preference in NotificationPreference.objects.filter(user_id__in=list(notifications_by_user_id)):
+            preferences_by_user_id[preference.user_id].append(preference)
+
+        for user in batch_users:
+            send_digest_email_to_user(
+                user, cadence_type, start_date, end_date,
+                user_language=language_prefs.get(user.id, 'en'),
+                courses_data=courses_data,
+                email_flag_enabled=user.id in email_flag_enabled_user_ids,
+                notifications=notifications_by_user_id[user.id],
+                preferences=preferences_by_user_id[user.id],
+            )
 
 
 def send_immediate_cadence_email(email_notification_mapping, course_key):
@@ -123,40 +158,73 @@ def send_immediate_cadence_email(email_notification_mapping, course_key):
     if not email_notification_mapping:
         return
     user_list = email_notification_mapping.keys()
-    users = User.objects.filter(id__in=user_list)
     language_prefs = get_language_preference_for_users(user_list)
     course_name = get_course_info(course_key).get("name", course_key)
-    for user in users.iterator(chunk_size=100):
-        if not user.has_usable_password():
-            logger.info(f'<Immediate Email> User is disabled {user.username}')
-            continue
-        if not is_email_notification_flag_enabled(user):
-            logger.info(f'<Immediate Email> Flag disabled for {user.username}')
-            continue
-        notification = email_notification_mapping.get(user.id, None)
-        if not notification:
-            logger.info(f'<Immediate Email> No notification for {user.username}')
-            continue
-
-        language = language_prefs.get(user.id, 'en')
-        with translation_override(language):
-            soup = BeautifulSoup(notification.content, "html.parser")
-            title = _("New Course Update") if notification.notification_type == "course_updates" else soup.get_text()
-            message_context = create_email_template_context(user.username)
-            message_context.update({
-                "course_id": course_key,
-                "course_name": course_name,
-                "content_url": notification.content_url,
-                "content_title": title,
-                "footer_email_reason": _(
-                    "You are receiving this email because you are enrolled in the edX course "
-                ) + str(course_name),
-                "content": notification.content_context.get("email_content", notification.content),
-                "view_text": get_text_for_notification_type(notification.notification_type),
-            })
-            message = EmailNotificationMessageType(
-                app_label="notifications", name="immediate_email"
-            ).personalize(Recipient(user.id, user.email), language, message_context)
-            message = add_headers_to_email_message(message, message_context)
-            ace.send(message)
-            send_immediate_email_digest_sent_event(user, EmailCadence.IMMEDIATELY, notification)
+    # The parts of the email that only depend on the notification content and the language, which are the same
+    # for most of the users.
+    shared_contexts = {}
+    for batch_user_ids in get_list_in_batches(list(user_list), 100):
+        users = list(User.objects.filter(id__in=batch_user_ids))
+        email_flag_enabled_user_ids = get_users_with_email_notification_flag_enabled(users)
+        for user in users:
+            _send_immediate_email_to_user(
+                user, email_notification_mapping.get(user.id, None), course_key,
+                language_prefs.get(user.id, 'en'), user.id in email_flag_enabled_user_ids,
+                course_name, shared_contexts,
+            )
+
+
+def _send_immediate_email_to_user(
+    user, notification, course_key, language, email_flag_enabled, course_name, shared_contexts
+):
+    """
+    Send the immediate email of the notification to the user, with the context shared by the users
+    from shared_contexts.
+    """
+    if not user.has_usable_password():
+        logger.info(f'<Immediate Email> User is disabled {user.username}')
+        return
+    if not email_flag_enabled:
+        logger.info(f'<Immediate Email> Flag disabled for {user.username}')
+        return
+    if not notification:
+        logger.info(f'<Immediate Email> No notification for {user.username}')
+        return
+
+    with translation_override(language):
+        shared_context_key = (notification.notification_type, notification.content, language)
+        shared_context = shared_contexts.get(shared_context_key)
+        if shared_context is None:
+            shared_context = shared_contexts[shared_context_key] = _create_immediate_email_shared_context(
+                notification, course_key, course_name
+            )
+        message_context = create_email_template_context(user.username)
+        message_context.update(shared_context)
+        message_context["content_url"] = notification.content_url
+        message = EmailNotificationMessageType(
+            app_label="notifications", name="immediate_email"
+        ).personalize(Recipient(user.id, user.email), language, message_context)
+        message = add_headers_to_email_message(message, message_context)
+        ace.send(message)
+        send_immediate_email_digest_sent_event(user, EmailCadence.IMMEDIATELY, notification)
+
+
+def _create_immediate_email_shared_context(notification, course_key, course_name):
+    """
+    Returns the context of the immediate email of the notification that doesn't depend on its user,
+    in the active language.
+    """
+    if notification.notification_type == "course_updates":
+        title = _("New Course Update")
+    else:
+        title = BeautifulSoup(notification.content, "html.parser").get_text()
+    return {
+        "course_id": course_key,
+        "course_name": course_name,
+        "content_title": title,
+        "footer_email_reason": _(
+            "You are receiving this email because you are enrolled in the edX course "
+        ) + str(course_name),
+        "content": notification.content_context.get("email_content", notification.content),
+        "view_text": get_text_for_notification_type(notification.notification_type),
+    }
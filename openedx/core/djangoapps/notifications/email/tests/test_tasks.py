@@ -6,6 +6,7 @@ import ddt
 
 from unittest.mock import patch
 
+from django.test import override_settings
 from edx_toggles.toggles.testutils import override_waffle_flag
 
 from common.djangoapps.student.tests.factories import UserFactory
@@ -282,6 +283,23 @@ class TestEmailDigestAudience(ModuleStoreTestCase):
         assert mock_func.called
         assert mock_func.call_count == 1
 
+    @override_settings(NOTIFICATION_DIGEST_EMAIL_BATCH_SIZE=1)
+    @patch('edx_ace.ace.send')
+    def test_email_is_sent_to_users_in_batches(self, mock_func):
+        """
+        Tests the digest email is sent to each user when the users are fetched in several batches
+        """
+        created_date = datetime.datetime.now() - datetime.timedelta(days=1)
+        other_user = UserFactory()
+        create_notification(self.user, self.course.id, created=created_date)
+        create_notification(other_user, self.course.id, created=created_date)
+        with override_waffle_flag(ENABLE_EMAIL_NOTIFICATIONS, True):
+            send_digest_email_to_all_users(EmailCadence.DAILY)
+        assert mock_func.call_count == 2
+        assert {call.args[0].recipient.lms_user_id for call in mock_func.call_args_list} == {
+            self.user.id, other_user.id
+        }
+
     def test_audience_query_count(self):
         with self.assertNumQueries(1):
             audience = get_audience_for_cadence_email(EmailCadence.DAILY)
@@ -27,6 +27,7 @@ from openedx.core.djangoapps.notifications.email.utils import (
     encrypt_string,
     get_course_info,
     get_time_ago,
+    get_users_with_email_notification_flag_enabled,
     is_email_notification_flag_enabled,
     update_user_preferences_from_patch,
 )
@@ -223,6 +224,24 @@ class TestWaffleFlag(ModuleStoreTestCase):
         assert is_email_notification_flag_enabled(self.user_1) is False
         assert is_email_notification_flag_enabled(self.user_2) is False
 
+    def test_waffle_flag_for_users(self):
+        """
+        Tests the users with the waffle flag enabled are the same as with is_email_notification_flag_enabled
+        """
+        users = [self.user_1, self.user_2]
+        assert get_users_with_email_notification_flag_enabled(users) == set()
+        waffle_model = get_waffle_flag_model()
+        flag, _ = waffle_model.objects.get_or_create(name=ENABLE_EMAIL_NOTIFICATIONS.name)
+        flag.users.add(self.user_1)
+        flag.save()
+        assert get_users_with_email_notification_flag_enabled(users) == {self.user_1.id}
+        flag.everyone = True
+        flag.save()
+        assert get_users_with_email_notification_flag_enabled(users) == {self.user_1.id, self.user_2.id}
+        flag.everyone = False
+        flag.save()
+        assert get_users_with_email_notification_flag_enabled(users) == set()
+
 
 class TestEncryption(ModuleStoreTestCase):
     """
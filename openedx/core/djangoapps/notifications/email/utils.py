@@ -2,6 +2,7 @@
 Email Notifications Utils
 """
 import datetime
+from functools import lru_cache
 
 from bs4 import BeautifulSoup
 from django.conf import settings
@@ -52,6 +53,28 @@ def is_email_notification_flag_enabled(user=None):
     return False
 
 
+def get_users_with_email_notification_flag_enabled(users):
+    """
+    Returns the set of ids of the given users for whom the email notifications waffle flag is enabled,
+    like is_email_notification_flag_enabled but with a single query for the users of the flag.
+    """
+    flag_model = get_waffle_flag_model()
+    try:
+        flag = flag_model.objects.get(name=ENABLE_EMAIL_NOTIFICATIONS.name)
+    except flag_model.DoesNotExist:
+        return set()
+    if flag.everyone is not None:
+        return {user.id for user in users} if flag.everyone else set()
+
+    flag_user_ids = set(flag.users.filter(id__in=[user.id for user in users]).values_list('id', flat=True))
+    enabled_user_ids = set()
+    for user in users:
+        role_value = flag.is_active_for_user(user)
+        if role_value if role_value is not None else user.id in flag_user_ids:
+            enabled_user_ids.add(user.id)
+    return enabled_user_ids
+
+
 def create_datetime_string(datetime_instance):
     """
     Returns string for datetime object
@@ -215,9 +238,12 @@ def get_time_ago(datetime_obj):
     return f"{days_diff}d"
 
 
+@lru_cache(maxsize=1024)
 def add_zero_margin_to_root(html_string):
     """
     Adds to zero margin to root element of html string
+
+    The result is cached, since the same content is in the notifications of many users.
     """
     soup = BeautifulSoup(html_string, 'html.parser')
     element = soup.find()
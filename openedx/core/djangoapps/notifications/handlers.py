@@ -80,18 +80,18 @@ def calculate_course_wide_notification_audience(course_key, audience_filters):
         ).values_list('user_id', flat=True)
         return list(active_enrollments)
 
-    audience_user_ids = []
+    audience_user_ids = set()
     for filter_type, filter_values in audience_filters.items():
         if filter_type in AUDIENCE_FILTER_CLASSES.keys():  # lint-amnesty, pylint: disable=consider-iterating-dictionary
             filter_class = AUDIENCE_FILTER_CLASSES.get(filter_type)
             if filter_class:
                 filter_instance = filter_class(course_key)
                 filtered_users = filter_instance.filter(filter_values)
-                audience_user_ids.extend(filtered_users)
+                audience_user_ids.update(filtered_users)
         else:
             raise ValueError(f"Invalid audience filter type: {filter_type}")
 
-    return list(set(audience_user_ids))
+    return list(audience_user_ids)
 
 
 @receiver(COURSE_NOTIFICATION_REQUESTED)
@@ -177,6 +177,11 @@ class NotificationPreference(TimeStampedModel):
         # Ensures user do not have duplicate preferences.
         unique_together = ('user', 'app', 'type',)
 
+    # The bits of the channels in the channel bitmaps.
+    WEB_CHANNEL = 1
+    PUSH_CHANNEL = 2
+    EMAIL_CHANNEL = 4
+
     user = models.ForeignKey(User, related_name="notification_preference", on_delete=models.CASCADE)
     type = models.CharField(max_length=128, db_index=True)
     app = models.CharField(max_length=128, null=False, blank=False, db_index=True)
@@ -210,6 +215,37 @@ class NotificationPreference(TimeStampedModel):
             preferences = preferences + list(new_preferences)
         return preferences
 
+    @classmethod
+    def get_channel_bitmaps(cls, user_ids, app_name, notification_type) -> tuple:
+        """
+        Returns the channels enabled by the users with the given ids for the given notification type, as a dict of
+        channel bitmaps (see get_channel_bitmap) by user id, and the dict of the email cadences of the users who
+        enabled the email channel. The users without a preference for the notification type are left out.
+        """
+        channel_bitmaps = {}
+        email_cadences = {}
+        preferences = cls.objects.filter(
+            user_id__in=user_ids,
+            app=app_name,
+            type=notification_type,
+        ).values_list('user_id', 'web', 'push', 'email', 'email_cadence')
+        for user_id, web, push, email, email_cadence in preferences:
+            channel_bitmaps[user_id] = cls.get_channel_bitmap(web, push, email)
+            if email:
+                email_cadences[user_id] = email_cadence
+        return channel_bitmaps, email_cadences
+
+    @classmethod
+    def get_channel_bitmap(cls, web, push, email) -> int:
+        """
+        Returns the bitmap of the given enabled channels, made of WEB_CHANNEL, PUSH_CHANNEL and EMAIL_CHANNEL.
+        """
+        return (
+            (cls.WEB_CHANNEL if web else 0) |
+            (cls.PUSH_CHANNEL if push else 0) |
+            (cls.EMAIL_CHANNEL if email else 0)
+        )
+
     def is_enabled_for_any_channel(self, *args, **kwargs) -> bool:
         """
         Returns True if the notification preference is enabled for any channel.
@@ -111,6 +111,16 @@ def send_notifications(user_ids, course_key: str, app_name, notification_type, c
         raise ValidationError(f"Notification is not valid {app_name} {notification_type} {context}")
 
     user_ids = list(set(user_ids))
+    subtask_size = settings.NOTIFICATION_FANOUT_SUBTASK_SIZE
+    if subtask_size and len(user_ids) > subtask_size:
+        # Fan the notification out to subtasks that the workers run in parallel, each of them for fewer users.
+        logger.info(f'Splitting the notification to {len(user_ids)} users in {course_key} into subtasks')
+        for subtask_user_ids in get_list_in_batches(user_ids, subtask_size):
+            send_notifications.delay(
+                subtask_user_ids, str(course_key), app_name, notification_type, context, content_url
+            )
+        return
+
     batch_size = settings.NOTIFICATION_CREATION_BATCH_SIZE
     group_by_id = context.pop('group_by_id', '')
     grouping_function = NotificationRegistry.get_grouper(notification_type)
@@ -122,10 +132,11 @@ def send_notifications(user_ids, course_key: str, app_name, notification_type, c
     email_notification_mapping = {}
     push_notification_audience = []
     is_push_notification_enabled = ENABLE_PUSH_NOTIFICATIONS.is_enabled(course_key)
+    notification_filter = NotificationFilter()
 
     for batch_user_ids in get_list_in_batches(user_ids, batch_size):
         logger.debug(f'Sending notifications to {len(batch_user_ids)} users in {course_key}')
-        batch_user_ids = NotificationFilter().apply_filters(batch_user_ids, course_key, notification_type)
+        batch_user_ids = notification_filter.apply_filters(batch_user_ids, course_key, notification_type)
         logger.info(f'After applying filters, sending notifications to {len(batch_user_ids)} users in {course_key}')
 
         existing_notifications = (
@@ -133,62 +144,57 @@ def send_notifications(user_ids, course_key: str, app_name, notification_type, c
             if grouping_enabled else {}
 
         # check if what is preferences of user and make decision to send notification or not
-
-        preferences = NotificationPreference.objects.filter(
-            user_id__in=batch_user_ids,
-            app=app_name,
-            type=notification_type
-
+        channel_bitmaps, email_cadences = NotificationPreference.get_channel_bitmaps(
+            batch_user_ids, app_name, notification_type
         )
-
-        preferences = list(preferences)
         if default_web_config:
-            preferences = create_account_notification_pref_if_not_exists(
-                batch_user_ids, preferences, notification_type
+            new_preferences = create_missing_account_notification_prefs(
+                batch_user_ids, channel_bitmaps.keys(), notification_type
             )
+            for preference in new_preferences:
+                channel_bitmaps[preference.user_id] = NotificationPreference.get_channel_bitmap(
+                    preference.web, preference.push, preference.email
+                )
+                if preference.email:
+                    email_cadences[preference.user_id] = preference.email_cadence
 
-        if not preferences:
+        if not channel_bitmaps:
             continue
 
         notifications = []
-        for preference in preferences:
-            user_id = preference.user_id
-
-            if (
-                preference and
-                preference.is_enabled_for_any_channel(app_name, notification_type)
-            ):
-                notification_preferences = preference.get_channels_for_notification_type(app_name, notification_type)
-                email_enabled = 'email' in notification_preferences
-                email_cadence = preference.get_email_cadence_for_notification_type(app_name, notification_type)
-                push_notification = is_push_notification_enabled and 'push' in notification_preferences
-                new_notification = Notification(
-                    user_id=user_id,
-                    app_name=app_name,
-                    notification_type=notification_type,
-                    content_context=context,
-                    content_url=content_url,
-                    course_id=course_key,
-                    web='web' in notification_preferences,
-                    email=email_enabled,
-                    push=push_notification,
-                    group_by_id=group_by_id,
-                )
-                if email_enabled and (email_cadence == EmailCadence.IMMEDIATELY):
-                    email_notification_mapping[user_id] = new_notification
+        for user_id, channels in channel_bitmaps.items():
+            if not channels:
+                continue
+
+            email_enabled = bool(channels & NotificationPreference.EMAIL_CHANNEL)
+            push_notification = is_push_notification_enabled and bool(channels & NotificationPreference.PUSH_CHANNEL)
+            new_notification = Notification(
+                user_id=user_id,
+                app_name=app_name,
+                notification_type=notification_type,
+                content_context=context,
+                content_url=content_url,
+                course_id=course_key,
+                web=bool(channels & NotificationPreference.WEB_CHANNEL),
+                email=email_enabled,
+                push=push_notification,
+                group_by_id=group_by_id,
+            )
+            if email_enabled and (email_cadences[user_id] == EmailCadence.IMMEDIATELY):
+                email_notification_mapping[user_id] = new_notification
 
-                if push_notification:
-                    push_notification_audience.append(user_id)
+            if push_notification:
+                push_notification_audience.append(user_id)
 
-                if grouping_enabled and existing_notifications.get(user_id, None):
-                    group_user_notifications(new_notification, existing_notifications[user_id])
-                else:
-                    notifications.append(new_notification)
+            if grouping_enabled and existing_notifications.get(user_id, None):
+                group_user_notifications(new_notification, existing_notifications[user_id])
+            else:
+                notifications.append(new_notification)
 
-                if not generated_notification:
-                    generated_notification = new_notification
+            if not generated_notification:
+                generated_notification = new_notification
 
-                generated_notification_audience.append(user_id)
+            generated_notification_audience.append(user_id)
 
         # send notification to users but use bulk_create
         Notification.objects.bulk_create(notifications)
@@ -294,22 +300,19 @@ def _get_channel_default(is_core: bool, notification_type: str, channel: str) ->
     return COURSE_NOTIFICATION_TYPES[notification_type][channel]
 
 
-def create_account_notification_pref_if_not_exists(user_ids: List, preferences: List, notification_type: str):
+def create_missing_account_notification_prefs(user_ids: List, existing_user_ids, notification_type: str) -> List:
     """
-    Create account level notification preference if not exist.
+    Create the account level notification preferences of the given users who are not in existing_user_ids,
+    and return them.
     """
-    new_preferences = []
-
-    for user_id in user_ids:
-        if not any(preference.user_id == int(user_id) for preference in preferences):
-            new_preferences.append(create_notification_preference(
-                user_id=int(user_id),
-                notification_type=notification_type,
-
-            ))
+    existing_user_ids = set(existing_user_ids)
+    new_preferences = [
+        create_notification_preference(user_id=int(user_id), notification_type=notification_type)
+        for user_id in user_ids
+        if int(user_id) not in existing_user_ids
+    ]
     if new_preferences:
         # ignoring conflicts because it is possible that preference is already created by another process
         # conflicts may arise because of constraint on user_id and course_id fields in model
         NotificationPreference.objects.bulk_create(new_preferences, ignore_conflicts=True)
-        preferences = preferences + new_preferences
-    return preferences
+    return new_preferences
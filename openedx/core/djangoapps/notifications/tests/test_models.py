@@ -8,7 +8,8 @@ import pytest
 
 from common.djangoapps.student.tests.factories import UserFactory
 from openedx.core.djangoapps.notifications.base_notification import NotificationAppManager
-from openedx.core.djangoapps.notifications.models import CourseNotificationPreference, \
+from openedx.core.djangoapps.notifications.email_notifications import EmailCadence
+from openedx.core.djangoapps.notifications.models import CourseNotificationPreference, NotificationPreference, \
     COURSE_NOTIFICATION_CONFIG_VERSION
 
 
@@ -42,3 +43,41 @@ class TestPreferenceModel(unittest.TestCase):
             updated_preferences = preference.get_user_notification_preferences(user)
             for updated_preference in updated_preferences:
                 assert updated_preference.config_version == COURSE_NOTIFICATION_CONFIG_VERSION + 1
+
+
+@pytest.mark.django_db
+class TestNotificationPreferenceModel(unittest.TestCase):
+    """
+    Test the NotificationPreference model.
+    """
+
+    def test_get_channel_bitmaps(self):
+        """
+        Test that get_channel_bitmaps returns the enabled channels and email cadences of the users with a preference.
+        """
+        web_user, email_user, disabled_user, user_without_preference = UserFactory.create_batch(4)
+        # Replace the default preferences created with the users.
+        NotificationPreference.objects.all().delete()
+        NotificationPreference.objects.create(
+            user=web_user, app='discussion', type='new_comment', web=True, push=True, email=False,
+        )
+        NotificationPreference.objects.create(
+            user=email_user, app='discussion', type='new_comment', web=False, push=False, email=True,
+            email_cadence=EmailCadence.DAILY,
+        )
+        NotificationPreference.objects.create(
+            user=disabled_user, app='discussion', type='new_comment', web=False, push=False, email=False,
+        )
+        NotificationPreference.objects.create(
+            user=user_without_preference, app='discussion', type='new_response', web=True,
+        )
+
+        channel_bitmaps, email_cadences = NotificationPreference.get_channel_bitmaps(
+            [web_user.id, email_user.id, disabled_user.id, user_without_preference.id], 'discussion', 'new_comment'
+        )
+        assert channel_bitmaps == {
+            web_user.id: NotificationPreference.WEB_CHANNEL | NotificationPreference.PUSH_CHANNEL,
+            email_user.id: NotificationPreference.EMAIL_CHANNEL,
+            disabled_user.id: 0,
+        }
+        assert email_cadences == {email_user.id: EmailCadence.DAILY}
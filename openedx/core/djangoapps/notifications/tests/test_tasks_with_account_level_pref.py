@@ -8,6 +8,7 @@ from unittest.mock import patch
 import ddt
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.test import override_settings
 from edx_toggles.toggles.testutils import override_waffle_flag
 
 from common.djangoapps.student.models import CourseEnrollment
@@ -254,6 +255,31 @@ class SendBatchNotificationsTest(ModuleStoreTestCase):
             send_notifications(user_ids, str(self.course.id), notification_app, notification_type,
                                context, "http://test.url")
 
+    @override_waffle_flag(ENABLE_NOTIFICATIONS, active=True)
+    @override_settings(NOTIFICATION_FANOUT_SUBTASK_SIZE=2)
+    @patch('openedx.core.djangoapps.notifications.tasks.send_notifications.delay')
+    def test_notification_fanout_to_subtasks(self, mock_delay):
+        """
+        Tests the notifications to more users than NOTIFICATION_FANOUT_SUBTASK_SIZE are sent by subtasks
+        """
+        users = self._create_users(5)
+        user_ids = [user.id for user in users]
+        context = {
+            "post_title": "Test Post",
+            "username": "Test Author",
+            "group_by_id": "group",
+        }
+        send_notifications(user_ids, str(self.course.id), "discussion", "new_discussion_post",
+                           context, "http://test.url")
+
+        assert [len(call.args[0]) for call in mock_delay.call_args_list] == [2, 2, 1]
+        assert sorted(user_id for call in mock_delay.call_args_list for user_id in call.args[0]) == sorted(user_ids)
+        for call in mock_delay.call_args_list:
+            assert call.args[1:] == (
+                str(self.course.id), "discussion", "new_discussion_post", context, "http://test.url"
+            )
+        assert not Notification.objects.exists()
+
     def test_preference_not_created_for_default_off_preference(self):
         """
         Tests if new preferences are NOT created when default preference for
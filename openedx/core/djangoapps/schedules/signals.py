@@ -20,6 +20,7 @@ from openedx.core.djangoapps.schedules.content_highlights import course_has_high
 from openedx.core.djangoapps.schedules.models import ScheduleExperience
 from openedx.core.djangoapps.schedules.utils import reset_self_paced_schedule
 from common.djangoapps.student.models import CourseEnrollment
+from common.djangoapps.student.signals import COURSE_ENROLLMENTS_BULK_SAVED
 from common.djangoapps.student.signals import ENROLLMENT_TRACK_UPDATED  # lint-amnesty, pylint: disable=unused-import
 from .models import Schedule
 from .tasks import update_course_schedules
@@ -55,6 +56,15 @@ def create_schedule(sender, **kwargs):  # pylint: disable=unused-argument
         ))
 
 
+@receiver(COURSE_ENROLLMENTS_BULK_SAVED, sender=CourseEnrollment)
+def create_schedules_in_bulk(sender, created, **kwargs):  # pylint: disable=unused-argument
+    """
+    When CourseEnrollments are created in bulk, create their Schedules if configured.
+    """
+    for enrollment in created:
+        create_schedule(sender, instance=enrollment, created=True)
+
+
 @receiver(COURSE_START_DATE_CHANGED)
 def update_schedules_on_course_start_changed(sender, updated_course_overview, previous_start_date, **kwargs):   # pylint: disable=unused-argument
     """
@@ -6,6 +6,7 @@ Utilities related to caching.
 import collections
 import functools
 import itertools
+import threading
 import zlib
 import pickle
 
@@ -13,6 +14,7 @@ import wrapt
 from django.db.models.signals import post_save, post_delete
 from django.utils.encoding import force_str
 
+from edx_django_utils import monitoring
 from edx_django_utils.cache import RequestCache, TieredCache
 
 
@@ -153,6 +155,115 @@ class process_cached:  # pylint: disable=invalid-name
         return partial
 
 
+class ProcessLRUCache:
+    """
+    A thread-safe cache, local to the process, which evicts its least
+    recently used entries once the total size of its entries exceeds
+    max_size_in_bytes.
+
+    The size of an entry is provided by the caller, since the in-memory
+    size of an arbitrary object is not cheaply computable.  The size of
+    its serialized representation is usually a good enough proxy.
+
+    Entries are stored and returned by reference, so only use this cache
+    for values that are not mutated once cached, with keys that identify
+    an immutable version of the data (such as a content hash or a
+    version id), which makes invalidation unnecessary.
+
+    Hits, misses and evictions are counted in custom monitoring
+    attributes prefixed with the given name.
+
+    WARNING: As with process_cached, every gunicorn worker holds its own
+    copy of the cached data, so keep max_size_in_bytes small enough for
+    the worker's memory budget.  The settings that size these caches
+    apply to each worker process, and their warnings only describe what
+    is specific to the cached data.
+    """
+
+    def __init__(self, name, max_size_in_bytes):
+        """
+        Arguments:
+            name (str): Prefix of the names of the monitoring attributes.
+            max_size_in_bytes (int): The maximum total size of the cached
+                entries. A value of 0 disables the cache.
+        """
+        self.name = name
+        self.max_size_in_bytes = max_size_in_bytes
+        self.size_in_bytes = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """
+        Returns the value cached for the given key, marking it as the
+        most recently used entry; returns default if not found.
+        """
+        if not self.max_size_in_bytes:
+            return default
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None:
+            monitoring.increment(f'{self.name}.misses')
+            return default
+        monitoring.increment(f'{self.name}.hits')
+        return entry[0]
+
+    def set(self, key, value, size_in_bytes):
+        """
+        Caches the given value for the given key, evicting the least
+        recently used entries as needed. Values larger than the whole
+        cache are not cached, nor is anything when the cache is disabled.
+        """
+        if not self.max_size_in_bytes or size_in_bytes > self.max_size_in_bytes:
+            return
+
+        evictions = 0
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (value, size_in_bytes)
+            self.size_in_bytes += size_in_bytes
+            while self.size_in_bytes > self.max_size_in_bytes:
+                self._remove(next(iter(self._entries)))
+                evictions += 1
+
+        if evictions:
+            monitoring.accumulate(f'{self.name}.evictions', evictions)
+
+    def delete(self, key):
+        """
+        Removes the entry for the given key, if any.
+        """
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size_in_bytes = 0
+
+    def _remove(self, key):
+        """
+        Removes the entry for the given key, if any. The caller must
+        hold the lock.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_in_bytes -= entry[1]
+
+
 class CacheInvalidationManager:
     """
     This class provides a decorator for simple functions, which can handle invalidation.
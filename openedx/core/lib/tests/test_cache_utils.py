@@ -3,14 +3,14 @@ Tests for cache_utils.py
 """
 from time import sleep
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import Mock, call, patch
 
 import ddt
 from edx_django_utils.cache import RequestCache
 from django.core.cache import cache
 from django.test.utils import override_settings
 
-from openedx.core.lib.cache_utils import CacheService, request_cached
+from openedx.core.lib.cache_utils import CacheService, ProcessLRUCache, request_cached
 
 
 @ddt.ddt
@@ -299,6 +299,72 @@ class TestRequestCachedDecorator(TestCase):
         assert to_be_wrapped.call_count == 2
 
 
+class ProcessLRUCacheTest(TestCase):
+    """
+    Test the ProcessLRUCache class.
+    """
+    def setUp(self):
+        super().setUp()
+        self.cache = ProcessLRUCache('test_cache', max_size_in_bytes=10)
+
+    def test_miss_and_then_hit(self):
+        value = object()
+        assert self.cache.get('key') is None
+        self.cache.set('key', value, 4)
+        assert self.cache.get('key') is value
+        assert self.cache.size_in_bytes == 4
+
+    def test_replace(self):
+        self.cache.set('key', 'old', 4)
+        self.cache.set('key', 'new', 6)
+        assert self.cache.get('key') == 'new'
+        assert len(self.cache) == 1
+        assert self.cache.size_in_bytes == 6
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set('a', 'a', 4)
+        self.cache.set('b', 'b', 4)
+        # Using 'a' makes 'b' the least recently used entry.
+        assert self.cache.get('a') == 'a'
+        self.cache.set('c', 'c', 4)
+        assert 'a' in self.cache
+        assert 'b' not in self.cache
+        assert 'c' in self.cache
+        assert self.cache.size_in_bytes == 8
+
+    def test_too_large_not_cached(self):
+        self.cache.set('a', 'a', 4)
+        self.cache.set('large', 'large', 11)
+        assert 'large' not in self.cache
+        assert 'a' in self.cache
+
+    def test_disabled(self):
+        cache = ProcessLRUCache('test_cache', max_size_in_bytes=0)
+        cache.set('key', 'value', 0)
+        assert cache.get('key') is None
+        assert 'key' not in cache
+        assert len(cache) == 0
+
+    def test_delete_and_clear(self):
+        self.cache.set('a', 'a', 4)
+        self.cache.set('b', 'b', 4)
+        self.cache.delete('a')
+        assert 'a' not in self.cache
+        assert self.cache.size_in_bytes == 4
+        self.cache.clear()
+        assert len(self.cache) == 0
+        assert self.cache.size_in_bytes == 0
+
+    @patch('openedx.core.lib.cache_utils.monitoring')
+    def test_metrics(self, mock_monitoring):
+        self.cache.get('a')
+        self.cache.set('a', 'a', 6)
+        self.cache.get('a')
+        self.cache.set('b', 'b', 6)
+        assert mock_monitoring.increment.call_args_list == [call('test_cache.misses'), call('test_cache.hits')]
+        mock_monitoring.accumulate.assert_called_once_with('test_cache.evictions', 1)
+
+
 class CacheServiceTest(TestCase):
     """
     Test CacheService methods.
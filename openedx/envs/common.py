@@ -1152,6 +1152,13 @@ CACHES = {
     },
 }
 
+# .. setting_name: COURSE_ASSETS_MISSING_CONTENT_CACHE_TIMEOUT
+# .. setting_default: 60
+# .. setting_description: Number of seconds for which the contentserver caches, in the course_assets cache, that
+#   a requested course asset doesn't exist, so that broken asset references don't query the contentstore on every
+#   request. Uploading the asset in Studio clears this entry right away.
+COURSE_ASSETS_MISSING_CONTENT_CACHE_TIMEOUT = 60
+
 ################################### CSRF ###################################
 
 CSRF_COOKIE_AGE = 60 * 60 * 24 * 7 * 52
@@ -1259,6 +1266,15 @@ BLOCK_STRUCTURES_SETTINGS = dict(
     TASK_MAX_RETRIES=5,
 )
 
+############################# Course Overviews #############################
+
+# .. setting_name: COURSE_OVERVIEW_DASHBOARD_CACHE_TIMEOUT
+# .. setting_default: 60 * 60
+# .. setting_description: Timeout, in seconds, of the cached projections of course overviews loaded for the
+#   learner dashboards by CourseOverview.get_dashboard_overviews. This is also the minimum delay between two
+#   background regenerations of the same missing or outdated course overview.
+COURSE_OVERVIEW_DASHBOARD_CACHE_TIMEOUT = 60 * 60
+
 ################################ Bulk Email ################################
 
 # Suffix used to construct 'from' email address for bulk emails.
@@ -1478,6 +1494,17 @@ ENTERPRISE_BACKEND_SERVICE_EDX_OAUTH2_PROVIDER_URL = "http://127.0.0.1:8000/oaut
 
 ASSET_IGNORE_REGEX = r"(^\._.*$)|(^\.DS_Store$)|(^.*~$)"
 
+# .. setting_name: STATIC_REPLACE_ASSET_URL_CACHE_SIZE_IN_BYTES
+# .. setting_default: 0
+# .. setting_description: Maximum total size, measured as the length of the paths and urls, of the
+#   canonicalized course asset urls that static_replace keeps in a ProcessLRUCache, so that rendering
+#   HTML content doesn't look up the contentstore for every asset it references. Entries are keyed by
+#   the assets version of their course and the asset url settings. A value of 0 disables this cache.
+# .. setting_warnings: A cached url is only replaced when its course's assets version changes, see
+#   get_course_assets_version. The urls aren't cached when the course_assets cache is a dummy cache, since
+#   the assets versions can't be tracked then.
+STATIC_REPLACE_ASSET_URL_CACHE_SIZE_IN_BYTES = 0
+
 DATABASES = {
     # edxapp's edxapp-migrate scripts and the edxapp_migrate play
     # will ensure that any DB not named read_replica will be migrated
@@ -1799,6 +1826,36 @@ ZENDESK_GROUP_ID_MAPPING = {}
 
 ############################## Python sandbox ##############################
 
+# .. setting_name: CAPA_PROBLEM_TEMPLATE_CACHE_SIZE_IN_BYTES
+# .. setting_default: 0
+# .. setting_description: Maximum total size, measured as the length of the problem text and of the repr of
+#   the script context without the course's python_lib.zip, of the parsed problem trees and script contexts that
+#   capa keeps in a ProcessLRUCache, so that problems are not parsed, nor their scripts executed, again for every
+#   learner with the same seed. Entries are keyed by the problem text, the seed and the version of the course's
+#   assets. A value of 0 disables this cache.
+# .. setting_warnings: Problems with included files, and all problems when unsafe code execution is allowed,
+#   aren't cached. A changed python_lib.zip is only used once the course's assets version changes, see
+#   get_course_assets_version.
+CAPA_PROBLEM_TEMPLATE_CACHE_SIZE_IN_BYTES = 0
+
+# .. setting_name: SAFE_EXEC_RESULT_CACHE_SIZE_IN_BYTES
+# .. setting_default: 0
+# .. setting_description: Maximum total size, measured as the length of the repr of the results, of the results
+#   of sandboxed python code that are kept in a ProcessLRUCache in front of the shared cache that capa passes to
+#   safe_exec. Results are keyed by the code, its globals, the random seed, the python path and the contents of the
+#   extra files, such as a course's python_lib.zip. A value of 0 disables this cache.
+# .. setting_warnings: Results are deep-copied out of the cache on each hit, since callers update their globals
+#   with them, so the cache saves little over the shared cache for very large results.
+SAFE_EXEC_RESULT_CACHE_SIZE_IN_BYTES = 0
+
+# .. setting_name: SAFE_EXEC_BATCH_SIZE
+# .. setting_default: 10
+# .. setting_description: Maximum number of jobs that safe_exec_many runs in a single sandbox, such as the scripts
+#   of a python problem for the learners being rescored. Modules are imported once per batch instead of once per job.
+# .. setting_warnings: The CODE_JAIL limits apply to each batch as a whole, so a larger batch size may need larger
+#   limit overrides for the courses that use it. Jobs of a batch that exceeds the limits are run again one by one.
+SAFE_EXEC_BATCH_SIZE = 10
+
 # Some courses are allowed to run unsafe code. This is a list of regexes, one
 # of them must match the course id for that course to run unsafe code.
 #
@@ -2232,6 +2289,17 @@ API_ACCESS_MANAGER_EMAIL = 'api-access@example.com'
 NOTIFICATIONS_EXPIRY = 60
 EXPIRED_NOTIFICATIONS_DELETE_BATCH_SIZE = 10000
 NOTIFICATION_CREATION_BATCH_SIZE = 76
+# .. setting_name: NOTIFICATION_FANOUT_SUBTASK_SIZE
+# .. setting_default: None
+# .. setting_description: When set, the send_notifications task splits the audiences of more than this number of
+#    users into send_notifications subtasks of at most this number of users, which the celery workers run in
+#    parallel. Each subtask emits the edx.notifications.generated event of its own users.
+NOTIFICATION_FANOUT_SUBTASK_SIZE = None
+# .. setting_name: NOTIFICATION_DIGEST_EMAIL_BATCH_SIZE
+# .. setting_default: 500
+# .. setting_description: The number of users whose notifications, preferences and language are fetched together
+#    by the send_digest_email_to_all_users task.
+NOTIFICATION_DIGEST_EMAIL_BATCH_SIZE = 500
 NOTIFICATIONS_DEFAULT_FROM_EMAIL = "no-reply@example.com"
 NOTIFICATION_DIGEST_LOGO = DEFAULT_EMAIL_LOGO_URL
 
@@ -14,6 +14,7 @@ This is used by capa_block.
 """
 
 
+import hashlib
 import logging
 import os.path
 import re
@@ -33,9 +34,10 @@ import xmodule.capa.inputtypes as inputtypes
 import xmodule.capa.responsetypes as responsetypes
 import xmodule.capa.xqueue_interface as xqueue_interface
 from xmodule.capa.correctmap import CorrectMap
-from xmodule.capa.safe_exec import safe_exec
+from xmodule.capa.safe_exec import safe_exec, safe_exec_many
 from xmodule.capa.util import contextualize_text, convert_files_to_filenames, get_course_id_from_capa_block
 from openedx.core.djangolib.markup import HTML, Text
+from openedx.core.lib.cache_utils import ProcessLRUCache, process_cached
 from openedx.core.lib.safe_lxml.xmlparser import XML
 from xmodule.stringify import stringify_children
 
@@ -75,12 +77,33 @@ html_problem_semantics = [
     "openendedrubric",
 ]
 
+# Response types whose grading only depends on the problem, its seed and the answers, so that
+# a single problem can grade the answers of all the learners with the same seed
+BULK_RESCORING_RESPONSE_TYPES = (
+    responsetypes.ChoiceResponse,
+    responsetypes.MultipleChoiceResponse,
+    responsetypes.OptionResponse,
+    responsetypes.StringResponse,
+    responsetypes.NumericalResponse,
+)
+
+# Matches the code that may read the learner's anonymous id, by its name or through the script's globals.
+ANONYMOUS_STUDENT_ID_USE_RE = re.compile(r'anonymous_student_id|\bglobals\b|\bvars\b|\blocals\b|_getframe')
+
 log = logging.getLogger(__name__)
 
 #-----------------------------------------------------------------------------
 # main class for this module
 
 
+@process_cached
+def _problem_template_cache():
+    """
+    Returns the process-local cache of the parsed trees and script contexts of problems.
+    """
+    return ProcessLRUCache('capa.problem_template_cache', settings.CAPA_PROBLEM_TEMPLATE_CACHE_SIZE_IN_BYTES)
+
+
 class LoncapaSystem(object):
     """
     An encapsulation of resources needed from the outside.
@@ -189,32 +212,52 @@ class LoncapaProblem(object):
         problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
         self.problem_text = problem_text
 
-        # parse problem XML file into an element tree
-        if isinstance(problem_text, str):
-            # etree chokes on Unicode XML with an encoding declaration
-            problem_text = problem_text.encode('utf-8')
-        self.tree = XML(problem_text)
+        # The parsed tree and the script context only depend on the problem text and seed, so they
+        # are reused from the template cache when possible, and only learner state is applied to them.
+        template_key = None if minimal_init else self._get_template_cache_key()
+        template = _problem_template_cache().get(template_key) if template_key else None
+        if template is not None:
+            # Clone the template, since the tree and the context are modified in place below.
+            tree, context = template
+            self.tree = deepcopy(tree)
+            self.context = deepcopy(context)
+            self.context['anonymous_student_id'] = self.capa_system.anonymous_student_id
+        else:
+            # parse problem XML file into an element tree
+            if isinstance(problem_text, str):
+                # etree chokes on Unicode XML with an encoding declaration
+                problem_text = problem_text.encode('utf-8')
+            self.tree = XML(problem_text)
 
-        try:
-            self.make_xml_compatible(self.tree)
-        except Exception:
-            capa_block = self.capa_block
-            log.exception(
-                "CAPAProblemError: %s, id:%s, data: %s",
-                capa_block.display_name,
-                self.problem_id,
-                capa_block.data
-            )
-            raise
+            try:
+                self.make_xml_compatible(self.tree)
+            except Exception:
+                capa_block = self.capa_block
+                log.exception(
+                    "CAPAProblemError: %s, id:%s, data: %s",
+                    capa_block.display_name,
+                    self.problem_id,
+                    capa_block.data
+                )
+                raise
 
-        # handle any <include file="foo"> tags
-        self._process_includes()
+            # handle any <include file="foo"> tags
+            self._process_includes()
 
-        # construct script processor context (eg for customresponse problems)
-        if minimal_init:
-            self.context = {}
-        else:
-            self.context = self._extract_context(self.tree)
+            # construct script processor context (eg for customresponse problems)
+            if minimal_init:
+                self.context = {}
+            else:
+                self.context = self._extract_context(self.tree)
+
+            if template_key:
+                # The course's python_lib.zip is left out of the size, since it's shared by its problems.
+                script_results = {name: value for name, value in self.context.items() if name != 'extra_files'}
+                _problem_template_cache().set(
+                    template_key,
+                    (deepcopy(self.tree), deepcopy(self.context)),
+                    len(self.problem_text) + len(repr(script_results)),
+                )
 
         # Pre-parse the XML tree: modifies it to add ID's and perform some in-place
         # transformations.  This also creates the dict (self.responders) of Response
@@ -241,6 +284,44 @@ class LoncapaProblem(object):
             if extract_tree:
                 self.extracted_tree = self._extract_html(self.tree)
 
+    def _get_template_cache_key(self):
+        """
+        Returns the key of this problem's parsed tree and script context in the template
+        cache, or None if they can't be cached.
+
+        Besides the problem text and seed, the context depends on the course's python_lib.zip,
+        so the key includes the version of the course's assets, and on the learner's anonymous
+        id only if the problem refers to it.
+        """
+        if not _problem_template_cache().max_size_in_bytes:
+            return None
+
+        # Included files may change independently of the problem text, and code executed
+        # unsafely may leave values that can't be copied in the context.
+        if '<include' in self.problem_text or self.capa_system.can_execute_unsafe_code():
+            return None
+
+        course_id = get_course_id_from_capa_block(self.capa_block)
+        if course_id is None:
+            return None
+        # Import is placed here to avoid cache configuration access at import time.
+        from openedx.core.djangoapps.contentserver.caching import get_course_assets_version
+        assets_version = get_course_assets_version(course_id)
+        if assets_version is None:
+            return None
+
+        anonymous_student_id = None
+        if ANONYMOUS_STUDENT_ID_USE_RE.search(self.problem_text):
+            anonymous_student_id = self.capa_system.anonymous_student_id
+
+        return (
+            self.problem_id,
+            hashlib.sha1(self.problem_text.encode('utf-8')).hexdigest(),
+            self.seed,
+            assets_version,
+            anonymous_student_id,
+        )
+
     @property
     def is_grading_method_enabled(self) -> bool:
         """
@@ -477,6 +558,39 @@ class LoncapaProblem(object):
         """
         return all('filesubmission' not in responder.allowed_inputfields for responder in self.responders.values())
 
+    def supports_bulk_rescoring(self):
+        """
+        Checks that the answers of other learners whose problem has the same seed can
+        be rescored with this problem, see rescore_answers.
+
+        This is the case when all the response types of the problem are deterministic,
+        when the problem's scripts don't depend on the learner, and when the score
+        doesn't depend on the history of the learner's answers.
+        """
+        return (
+            bool(self.responders)
+            and not self.is_grading_method_enabled
+            and not ANONYMOUS_STUDENT_ID_USE_RE.search(self.context.get('script_code', ''))
+            and all(type(responder) in BULK_RESCORING_RESPONSE_TYPES for responder in self.responders.values())
+        )
+
+    def rescore_answers(self, student_answers, correct_map):
+        """
+        Grades the given answers of a learner whose problem has the same seed as this one,
+        as rescoring their problem would, without changing the state of this problem.
+
+        `correct_map` is the dict of the learner's current CorrectMap.
+
+        Returns the learner's new CorrectMap, and their score as returned by calculate_score.
+        """
+        old_cmap = CorrectMap()
+        old_cmap.set_dict(correct_map)
+        new_cmap = CorrectMap()
+        new_cmap.set_dict(correct_map)
+        for responder in self.responders.values():
+            new_cmap.update(responder.evaluate_answers(student_answers, old_cmap))
+        return new_cmap, self.calculate_score(new_cmap)
+
     def get_grade_from_current_answers(self, student_answers, correct_map: Optional[CorrectMap] = None):
         """
         Gets the grade for the currently-saved problem state, but does not save it
@@ -958,10 +1072,11 @@ class LoncapaProblem(object):
                 extra_files.append(("python_lib.zip", zip_lib))
                 python_path.append("python_lib.zip")
 
+            script_globals = {'seed': self.seed, 'anonymous_student_id': self.capa_system.anonymous_student_id}
             try:
                 safe_exec(
                     all_code,
-                    context,
+                    script_globals,
                     random_seed=self.seed,
                     python_path=python_path,
                     extra_files=extra_files,
@@ -971,11 +1086,13 @@ class LoncapaProblem(object):
                     ),
                     slug=self.problem_id,
                     unsafely=self.capa_system.can_execute_unsafe_code(),
+                    uncached_globals=self._get_uncached_script_globals(all_code),
                 )
             except Exception as err:
                 log.exception("Error while execing script code: " + all_code)  # lint-amnesty, pylint: disable=logging-not-lazy
                 msg = Text("Error while executing script code: %s" % str(err))
                 raise responsetypes.LoncapaProblemError(msg)
+            context.update(script_globals)
 
         # Store code source in context, along with the Python path needed to run it correctly.
         context['script_code'] = all_code
@@ -983,6 +1100,48 @@ class LoncapaProblem(object):
         context['extra_files'] = extra_files or None
         return context
 
+    @staticmethod
+    def _get_uncached_script_globals(all_code):
+        """
+        Returns the names of the script globals that the results of the problem's scripts don't depend on.
+
+        The scripts always get the learner's anonymous id, but unless they may read it, their results
+        are cached once for all the learners with the same seed.
+        """
+        if ANONYMOUS_STUDENT_ID_USE_RE.search(all_code):
+            return ()
+        return ('anonymous_student_id',)
+
+    def prime_script_contexts(self, learners):
+        """
+        Execute the scripts of this problem for the given (seed, anonymous_student_id) pairs, in as
+        few sandboxes as possible, so that the script contexts of the problems of these learners are
+        then read from the safe_exec cache instead of being executed one learner at a time, such as
+        when the problem is rescored for all of them.
+        """
+        all_code = self.context.get('script_code')
+        if not all_code or not self.capa_system.cache:
+            return
+
+        uncached_globals = self._get_uncached_script_globals(all_code)
+        jobs = {}
+        for seed, anonymous_student_id in learners:
+            # The learners whose scripts have the same cached result only need one execution.
+            job_key = (seed, None if 'anonymous_student_id' in uncached_globals else anonymous_student_id)
+            script_globals = {'seed': seed, 'anonymous_student_id': anonymous_student_id}
+            jobs.setdefault(job_key, (all_code, script_globals, seed))
+
+        safe_exec_many(
+            list(jobs.values()),
+            python_path=self.context['python_path'],
+            extra_files=self.context['extra_files'],
+            cache=self.capa_system.cache,
+            limit_overrides_context=get_course_id_from_capa_block(self.capa_block),
+            slug=self.problem_id,
+            unsafely=self.capa_system.can_execute_unsafe_code(),
+            uncached_globals=uncached_globals,
+        )
+
     def _extract_html(self, problemtree):  # private
         """
         Main (private) function which converts Problem XML tree to HTML.
@@ -14,6 +14,8 @@ from django.dispatch import receiver
 from django.test.signals import setting_changed
 from edx_django_utils.monitoring import function_trace, record_exception, set_custom_attribute
 
+from openedx.core.lib.cache_utils import ProcessLRUCache, process_cached
+
 from . import lazymod
 from .remote_exec import get_remote_exec, is_codejail_in_darklaunch, is_codejail_rest_service_enabled
 
@@ -81,6 +83,58 @@ for name, modname in ASSUMED_IMPORTS:
 
 LAZY_IMPORTS = "".join(LAZY_IMPORTS)
 
+# The program that safe_exec_many runs in a single sandbox to execute a batch of jobs.  Each job
+# is a pair of the complete code to run and its globals, and is run in globals of its own.  Its
+# result is a pair of the traceback of the exception it raised, if any, else None; and the
+# JSON-safe part of its resulting globals, which is selected as codejail's json_safe does.
+BATCH_CODE = """\
+import json
+import traceback
+
+
+def decode_bytes(obj):
+    if isinstance(obj, bytes):
+        return obj.decode('utf-8')
+    if isinstance(obj, (list, tuple)):
+        return [decode_bytes(item) for item in obj]
+    if isinstance(obj, dict):
+        return {decode_bytes(key): decode_bytes(value) for key, value in obj.items()}
+    return obj
+
+
+def json_safe_globals(job_globals):
+    safe_globals = {}
+    for name, value in job_globals.items():
+        if name == '__builtins__':
+            continue
+        if not isinstance(value, (type(None), int, float, bytes, str, list, tuple, dict)):
+            continue
+        try:
+            safe_globals[name] = json.loads(json.dumps(decode_bytes(value)))
+        except Exception:
+            continue
+    return safe_globals
+
+
+safe_exec_results = []
+for job_code, job_globals in safe_exec_jobs:
+    try:
+        exec(job_code, job_globals)
+    except BaseException:
+        safe_exec_results.append([traceback.format_exc(), None])
+    else:
+        safe_exec_results.append([None, json_safe_globals(job_globals)])
+del safe_exec_jobs
+"""
+
+
+@process_cached
+def _result_cache():
+    """
+    Returns the process-local cache of the results of safe_exec.
+    """
+    return ProcessLRUCache('capa.safe_exec_result_cache', settings.SAFE_EXEC_RESULT_CACHE_SIZE_IN_BYTES)
+
 
 def update_hash(hasher, obj):
     """
@@ -105,6 +159,69 @@ def update_hash(hasher, obj):
         hasher.update(repr(obj).encode())
 
 
+def _get_cache_key(code, globals_dict, random_seed, python_path=None, extra_files=None, unsafely=False):
+    """
+    Returns the cache key of the result of executing `code` with the given arguments.
+
+    The key covers everything the result depends on: the code, the values of the globals,
+    the random seed, and, when given, the python path, the contents of the extra files and
+    whether the code is run unsafely.
+    """
+    md5er = hashlib.md5()
+    md5er.update(repr(code).encode('utf-8'))
+    update_hash(md5er, json_safe(globals_dict))
+    if python_path or extra_files or unsafely:
+        update_hash(md5er, python_path or [])
+        for filename, contents in extra_files or []:
+            update_hash(md5er, filename)
+            md5er.update(contents)
+        update_hash(md5er, unsafely)
+    return "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
+
+
+def _without_globals(globals_dict, names):
+    """
+    Returns `globals_dict` without the globals with the given names.
+    """
+    if not names:
+        return globals_dict
+    return {name: value for name, value in globals_dict.items() if name not in names}
+
+
+def _get_cached_result(cache, key):
+    """
+    Returns the result cached under `key` in the process-local cache, or else in `cache`,
+    or None if there is none.
+    """
+    # Entries of the process-local cache are shared by reference, so they are copied
+    # in and out of it, since callers update their globals with the cached results.
+    cached = _result_cache().get(key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
+    cached = cache.get(key)
+    if cached is not None:
+        _set_process_cached_result(key, copy.deepcopy(cached))
+    return cached
+
+
+def _set_cached_result(cache, key, result):
+    """
+    Caches `result` under `key`, both in `cache` and in the process-local cache.
+    """
+    cache.set(key, result)
+    _set_process_cached_result(key, result)
+
+
+def _set_process_cached_result(key, result):
+    """
+    Caches `result` under `key` in the process-local cache, if it is enabled.
+    """
+    result_cache = _result_cache()
+    if result_cache.max_size_in_bytes:
+        result_cache.set(key, result, len(key) + len(repr(result)))
+
+
 @function_trace('safe_exec')
 def safe_exec(
     code,
@@ -116,6 +233,7 @@ def safe_exec(
     limit_overrides_context=None,
     slug=None,
     unsafely=False,
+    uncached_globals=(),
 ):  # pylint: disable=too-many-statements
     """
     Execute python code safely.
@@ -135,7 +253,8 @@ def safe_exec(
 
     `cache` is an object with .get(key) and .set(key, value) methods.  It will be used
     to cache the execution, taking into account the code, the values of the globals,
-    and the random seed.
+    the random seed, the python path, and the contents of the extra files.  Results are
+    also kept in a process-local cache in front of it, see SAFE_EXEC_RESULT_CACHE_SIZE_IN_BYTES.
 
     `limit_overrides_context` is an optional string to be used as a key on
     the `settings.CODE_JAIL['limit_overrides']` dictionary in order to apply
@@ -147,15 +266,17 @@ def safe_exec(
     caller, that will be used in log messages.
 
     If `unsafely` is true, then the code will actually be executed without sandboxing.
+
+    `uncached_globals` are the names of globals that the code doesn't depend on.  They are
+    left out of the cache key and of the cached results, so that executions that only differ
+    in their values share the same cached result.
     """
     # Check the cache for a previous result.
     if cache:
-        safe_globals = json_safe(globals_dict)
-        md5er = hashlib.md5()
-        md5er.update(repr(code).encode('utf-8'))
-        update_hash(md5er, safe_globals)
-        key = "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
-        cached = cache.get(key)
+        key = _get_cache_key(
+            code, _without_globals(globals_dict, uncached_globals), random_seed, python_path, extra_files, unsafely,
+        )
+        cached = _get_cached_result(cache, key)
         if cached is not None:
             # We have a cached result.  The result is a pair: the exception
             # message, if any, else None; and the resulting globals dictionary.
@@ -165,14 +286,41 @@ def safe_exec(
                 raise SafeExecException(emsg)
             return
 
-    cacheable = True  # unless we get an unexpected error
+    # Run the complete code.  Results are side effects in globals_dict.
+    emsg, exception, cacheable = _exec_code(
+        CODE_PROLOG % random_seed + LAZY_IMPORTS + code,
+        globals_dict,
+        python_path=python_path,
+        extra_files=extra_files,
+        limit_overrides_context=limit_overrides_context,
+        slug=slug,
+        unsafely=unsafely,
+    )
+
+    # Put the result back in the cache.  This is complicated by the fact that
+    # the globals dict might not be entirely serializable.
+    if cache and cacheable:
+        cleaned_results = _without_globals(json_safe(globals_dict), uncached_globals)
+        _set_cached_result(cache, key, (emsg, cleaned_results))
+
+    # If an exception happened, raise it now.
+    if exception:
+        raise exception
+
+
+def _exec_code(code, globals_dict, python_path, extra_files, limit_overrides_context, slug, unsafely):
+    """
+    Execute the complete `code`, with the local codejail or the remote codejail service, as
+    configured.  Results are side effects in `globals_dict`.
 
-    # Create the complete code we'll run.
-    code_prolog = CODE_PROLOG % random_seed
+    Returns a triple: the exception message, if any, else None; the exception, if any, else
+    None; and whether the result can be cached.
+    """
+    cacheable = True  # unless we get an unexpected error
 
     if is_codejail_rest_service_enabled():
         data = {
-            "code": code_prolog + LAZY_IMPORTS + code,
+            "code": code,
             "globals_dict": globals_dict,
             "python_path": python_path,
             "limit_overrides_context": limit_overrides_context,
@@ -188,8 +336,8 @@ def safe_exec(
 
         # Create a copy so the originals are not modified as part of this call.
         # This has to happen before local exec is run, since globals are modified
-        # as a side effect.
-        darklaunch_globals = copy.deepcopy(globals_dict)
+        # as a side effect.  It's only needed to compare results in darklaunch mode.
+        darklaunch_globals = copy.deepcopy(globals_dict) if is_codejail_in_darklaunch() else None
 
         # Decide which code executor to use.
         if unsafely:
@@ -202,7 +350,7 @@ def safe_exec(
             trace_name = 'safe_exec.local_exec_darklaunch' if is_codejail_in_darklaunch() else 'safe_exec.local_exec'
             with function_trace(trace_name):
                 exec_fn(
-                    code_prolog + LAZY_IMPORTS + code,
+                    code,
                     globals_dict,
                     python_path=python_path,
                     extra_files=extra_files,
@@ -249,7 +397,7 @@ def safe_exec(
 
             try:
                 data = {
-                    "code": code_prolog + LAZY_IMPORTS + code,
+                    "code": code,
                     "globals_dict": darklaunch_globals,
                     "python_path": python_path,
                     "limit_overrides_context": limit_overrides_context,
@@ -280,15 +428,129 @@ def safe_exec(
                 log.exception("Error occurred while trying to report codejail darklaunch data.")
                 record_exception()
 
-    # Put the result back in the cache.  This is complicated by the fact that
-    # the globals dict might not be entirely serializable.
-    if cache and cacheable:
-        cleaned_results = json_safe(globals_dict)
-        cache.set(key, (emsg, cleaned_results))
+    return emsg, exception, cacheable
 
-    # If an exception happened, raise it now.
-    if exception:
-        raise exception
+
+@function_trace('safe_exec_many')
+def safe_exec_many(
+    jobs,
+    python_path=None,
+    extra_files=None,
+    cache=None,
+    limit_overrides_context=None,
+    slug=None,
+    unsafely=False,
+    uncached_globals=(),
+):
+    """
+    Execute many pieces of python code safely, in as few sandboxes as possible.
+
+    `jobs` is a list of (code, globals_dict, random_seed) triples.  Each job gives the same
+    result as `safe_exec(code, globals_dict, random_seed, ...)` with the other arguments, which
+    are shared by all the jobs and are documented in `safe_exec`: changes it makes to its globals
+    are visible in its `globals_dict` when this function returns, and its result is cached.
+
+    The jobs whose results aren't cached are run in batches of SAFE_EXEC_BATCH_SIZE jobs, each
+    batch in a single local sandbox or remote codejail service call.  The jobs of a batch are run
+    one after the other in the same interpreter, so that modules are only imported once per batch,
+    which makes this only suitable for code that doesn't depend on the state that earlier runs of
+    it leave in imported modules, such as the scripts of a problem for many seeds.  A job that
+    raises an exception, and the jobs of a batch that fails as a whole, are run again on their own
+    with `safe_exec`, so that their errors are the same as those of `safe_exec`.
+
+    Returns a list with the exception raised by each job, if any, else None.
+    """
+    exceptions = [None] * len(jobs)
+    pending_jobs = []
+    for index, (code, globals_dict, random_seed) in enumerate(jobs):
+        key = _get_cache_key(
+            code, _without_globals(globals_dict, uncached_globals), random_seed, python_path, extra_files, unsafely,
+        ) if cache else None
+        cached = _get_cached_result(cache, key) if cache else None
+        if cached is None:
+            pending_jobs.append((index, key))
+            continue
+        emsg, cleaned_results = cached
+        globals_dict.update(cleaned_results)
+        if emsg:
+            exceptions[index] = SafeExecException(emsg)
+
+    batch_size = max(settings.SAFE_EXEC_BATCH_SIZE, 1)
+    for start in range(0, len(pending_jobs), batch_size):
+        batch = pending_jobs[start:start + batch_size]
+        if len(batch) > 1:
+            batch_results = _exec_batch(
+                [jobs[index] for index, __ in batch],
+                python_path=python_path,
+                extra_files=extra_files,
+                limit_overrides_context=limit_overrides_context,
+                slug=slug,
+                unsafely=unsafely,
+            )
+        else:
+            batch_results = [None]
+
+        for (index, key), result in zip(batch, batch_results):
+            code, globals_dict, random_seed = jobs[index]
+            if result is not None and result[0] is None:
+                globals_dict.update(result[1])
+                if cache:
+                    _set_cached_result(
+                        cache, key, (None, _without_globals(json_safe(globals_dict), uncached_globals)),
+                    )
+                continue
+
+            try:
+                safe_exec(
+                    code,
+                    globals_dict,
+                    random_seed=random_seed,
+                    python_path=python_path,
+                    extra_files=extra_files,
+                    cache=cache,
+                    limit_overrides_context=limit_overrides_context,
+                    slug=slug,
+                    unsafely=unsafely,
+                    uncached_globals=uncached_globals,
+                )
+            except Exception as e:  # pylint: disable=broad-except
+                exceptions[index] = e
+
+    return exceptions
+
+
+def _exec_batch(jobs, python_path, extra_files, limit_overrides_context, slug, unsafely):
+    """
+    Run the given (code, globals_dict, random_seed) jobs with BATCH_CODE in a single sandbox.
+
+    Returns a list with the (traceback, cleaned_results) pair of each job, or a list of None
+    if the batch failed as a whole.
+    """
+    batch_globals = {
+        'safe_exec_jobs': [
+            [CODE_PROLOG % random_seed + LAZY_IMPORTS + code, json_safe(globals_dict)]
+            for code, globals_dict, random_seed in jobs
+        ],
+    }
+    try:
+        with function_trace('safe_exec.batch'):
+            emsg, __, __ = _exec_code(
+                BATCH_CODE,
+                batch_globals,
+                python_path=python_path,
+                extra_files=extra_files,
+                limit_overrides_context=limit_overrides_context,
+                slug=slug,
+                unsafely=unsafely,
+            )
+    except Exception as e:  # pylint: disable=broad-except
+        emsg = str(e)
+
+    results = batch_globals.get('safe_exec_results')
+    if emsg or not isinstance(results, list) or len(results) != len(jobs):
+        log.warning("Batch of %d safe_exec jobs for %s failed, running them one by one: %s", len(jobs), slug, emsg)
+        return [None] * len(jobs)
+    return results
 
 
 def _compile_normalizers(normalizer_setting):
@@ -7,7 +7,7 @@ import os
 import os.path
 import textwrap
 import unittest
-from unittest.mock import call, patch
+from unittest.mock import Mock, call, patch
 
 import pytest
 import random2 as random
@@ -21,9 +21,10 @@ from six import unichr
 from six.moves import range
 
 from openedx.core.djangolib.testing.utils import skip_unless_lms
-from xmodule.capa.safe_exec import safe_exec, update_hash
+from openedx.core.lib.cache_utils import ProcessLRUCache
+from xmodule.capa.safe_exec import safe_exec, safe_exec_many, update_hash
 from xmodule.capa.safe_exec.remote_exec import is_codejail_in_darklaunch, is_codejail_rest_service_enabled
-from xmodule.capa.safe_exec.safe_exec import emsg_normalizers, normalize_error_message
+from xmodule.capa.safe_exec.safe_exec import _exec_code, emsg_normalizers, normalize_error_message
 from xmodule.capa.tests.test_util import use_unsafe_codejail
 
 
@@ -602,6 +603,117 @@ class TestSafeExecCaching(unittest.TestCase):
             except UnicodeEncodeError:
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
+    def test_cache_keyed_by_extra_files(self):
+        code = "a = 1"
+        cache = {}
+        safe_exec(code, {}, extra_files=[("data.txt", b"1")], cache=DictCache(cache))
+        safe_exec(code, {}, extra_files=[("data.txt", b"1")], cache=DictCache(cache))
+        assert len(cache) == 1
+
+        safe_exec(code, {}, extra_files=[("data.txt", b"2")], cache=DictCache(cache))
+        assert len(cache) == 2
+
+    def test_process_cache(self):
+        cache = {}
+        with patch(
+            'xmodule.capa.safe_exec.safe_exec._result_cache', Mock(return_value=ProcessLRUCache('test', 100000)),
+        ):
+            g = {}
+            safe_exec("a = [int(math.pi)]", g, cache=DictCache(cache))
+            assert g['a'] == [3]
+
+            # Later results are read from the process-local cache, as copies.
+            cache.clear()
+            g['a'].append(4)
+            g = {}
+            safe_exec("a = [int(math.pi)]", g, cache=DictCache(cache))
+            assert g['a'] == [3]
+            assert not cache
+
+    def test_no_deepcopy_out_of_darklaunch(self):
+        with patch('xmodule.capa.safe_exec.safe_exec.copy.deepcopy') as mock_deepcopy:
+            safe_exec("a = 1", {}, cache=DictCache({}))
+        mock_deepcopy.assert_not_called()
+
+
+@use_unsafe_codejail()
+class TestSafeExecMany(unittest.TestCase):
+    """Test that safe_exec_many runs jobs in batches with the same results as safe_exec."""
+
+    code = "a = random.randint(0, 1000)\nb = seed * 2"
+
+    def jobs(self, seeds):
+        """Return jobs running self.code for each of the given seeds."""
+        return [(self.code, {'seed': seed}, seed) for seed in seeds]
+
+    @override_settings(SAFE_EXEC_BATCH_SIZE=2)
+    def test_results_like_safe_exec(self):
+        jobs = self.jobs([1, 2, 3, 4, 5])
+        with patch('xmodule.capa.safe_exec.safe_exec._exec_code', wraps=_exec_code) as mock_exec:
+            assert safe_exec_many(jobs) == [None] * 5
+        # Two batches of two jobs, and the last job on its own.
+        assert mock_exec.call_count == 3
+
+        for code, globals_dict, random_seed in jobs:
+            expected_globals = {'seed': random_seed}
+            safe_exec(code, expected_globals, random_seed)
+            assert globals_dict == expected_globals
+
+    @override_settings(SAFE_EXEC_BATCH_SIZE=2)
+    def test_json_safe_results(self):
+        code = (
+            "a = b'bytes'\nb = (1, [b'x'], {'k': None})\nc = {1, 2}\nd = b'\\xff'\n"
+            "def e():\n    pass\n"
+        )
+        jobs = [(code, {}, seed) for seed in (1, 2)]
+        with patch('xmodule.capa.safe_exec.safe_exec._exec_code', wraps=_exec_code) as mock_exec:
+            assert safe_exec_many(jobs) == [None, None]
+        # The jobs were run in a single batch.
+        assert mock_exec.call_count == 1
+
+        expected_globals = {}
+        safe_exec(code, expected_globals, 1)
+        assert jobs[0][1] == expected_globals
+        assert jobs[0][1] == {'a': 'bytes', 'b': [1, ['x'], {'k': None}]}
+
+    def test_cache(self):
+        cache = {}
+        safe_exec_many(self.jobs([1, 2]), cache=DictCache(cache))
+        assert len(cache) == 2
+
+        # Results are cached under the same keys as those of safe_exec.
+        for key, (emsg, cleaned_results) in cache.items():
+            cache[key] = (emsg, dict(cleaned_results, a=-1))
+        globals_dict = {'seed': 1}
+        safe_exec(self.code, globals_dict, 1, cache=DictCache(cache))
+        assert globals_dict['a'] == -1
+
+        jobs = self.jobs([1, 2])
+        with patch('xmodule.capa.safe_exec.safe_exec._exec_code') as mock_exec:
+            safe_exec_many(jobs, cache=DictCache(cache))
+        mock_exec.assert_not_called()
+        assert [globals_dict['a'] for __, globals_dict, __ in jobs] == [-1, -1]
+
+    def test_exceptions(self):
+        jobs = self.jobs([1, 2]) + [("1/0", {}, 3)]
+        cache = {}
+        exceptions = safe_exec_many(jobs, cache=DictCache(cache))
+        assert exceptions[:2] == [None, None]
+        assert isinstance(exceptions[2], SafeExecException)
+        assert 'ZeroDivisionError' in str(exceptions[2])
+        assert len(cache) == 3
+
+        # The error is the same as that of safe_exec.
+        with pytest.raises(SafeExecException) as cm:
+            safe_exec("1/0", {}, 3, cache=DictCache(cache))
+        assert str(cm.value) == str(exceptions[2])
+
+    def test_failed_batch(self):
+        jobs = self.jobs([1, 2])
+        with patch('xmodule.capa.safe_exec.safe_exec._exec_batch', return_value=[None, None]):
+            assert safe_exec_many(jobs) == [None, None]
+        assert [globals_dict['b'] for __, globals_dict, __ in jobs] == [2, 4]
+
 
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
@@ -3,7 +3,7 @@ Test capa problem.
 """
 import textwrap
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock
 
 from django.conf import settings
 from django.test import override_settings
@@ -12,11 +12,16 @@ import ddt
 from lxml import etree
 from markupsafe import Markup
 
+from xmodule.capa import capa_problem
+from xmodule.capa.capa_problem import LoncapaProblem
 from xmodule.capa.correctmap import CorrectMap
+from xmodule.capa.safe_exec.tests.test_safe_exec import DictCache
 from xmodule.capa.responsetypes import LoncapaProblemError
-from xmodule.capa.tests.helpers import new_loncapa_problem
+from xmodule.capa.tests.helpers import mock_capa_block, mock_capa_system, new_loncapa_problem
+from xmodule.capa.tests.response_xml_factory import CustomResponseXMLFactory
 from xmodule.capa.tests.test_util import use_unsafe_codejail
 from openedx.core.djangolib.markup import HTML
+from openedx.core.lib.cache_utils import ProcessLRUCache
 
 
 FEATURES_WITH_GRADING_METHOD_IN_PROBLEMS = settings.FEATURES.copy()
@@ -843,3 +848,204 @@ class CAPAProblemReportHelpersTest(unittest.TestCase):
             with self.assertRaises(Exception):
                 problem.get_grade_from_current_answers(None, correct_map)
             responder_mock.evaluate_answers.assert_not_called()
+
+
+@use_unsafe_codejail()
+class CAPAProblemTemplateCacheTest(unittest.TestCase):
+    """ Tests for the cache of parsed problem trees and script contexts """
+
+    xml = textwrap.dedent("""
+        <problem>
+            <script type="loncapa/python">
+    number = random.randint(0, 1000)
+            </script>
+            <p>What is $number?</p>
+            <stringresponse answer="$number">
+                <textline/>
+            </stringresponse>
+        </problem>
+    """)
+
+    def setUp(self):
+        super().setUp()
+        for patcher in (
+            patch.object(capa_problem, '_problem_template_cache', Mock(return_value=ProcessLRUCache('test', 100000))),
+            patch(
+                'openedx.core.djangoapps.contentserver.caching.get_course_assets_version',
+                Mock(return_value='v1'),
+            ),
+            patch.object(capa_problem, 'safe_exec', Mock(wraps=capa_problem.safe_exec)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_template_reused(self):
+        first_problem = new_loncapa_problem(self.xml, seed=1)
+        second_problem = new_loncapa_problem(self.xml, seed=1)
+        assert capa_problem.safe_exec.call_count == 1
+        assert second_problem.context['number'] == first_problem.context['number']
+        assert second_problem.get_html() == first_problem.get_html()
+
+        # The tree and context of each problem are independent copies.
+        second_problem.context['number'] = None
+        third_problem = new_loncapa_problem(self.xml, seed=1)
+        assert third_problem.context['number'] == first_problem.context['number']
+        assert third_problem.get_html() == first_problem.get_html()
+
+        new_loncapa_problem(self.xml, seed=2)
+        assert capa_problem.safe_exec.call_count == 2
+
+    def test_template_keyed_by_assets_version(self):
+        new_loncapa_problem(self.xml, seed=1)
+        with patch(
+            'openedx.core.djangoapps.contentserver.caching.get_course_assets_version', return_value='v2',
+        ):
+            new_loncapa_problem(self.xml, seed=1)
+        assert capa_problem.safe_exec.call_count == 2
+
+    def test_template_keyed_by_anonymous_student_id_if_used(self):
+        xml = self.xml.replace('random.randint(0, 1000)', 'anonymous_student_id')
+        for anonymous_student_id in ('student1', 'student2', 'student2'):
+            capa_system = mock_capa_system()
+            capa_system.anonymous_student_id = anonymous_student_id
+            problem = new_loncapa_problem(xml, seed=1, capa_system=capa_system)
+            assert problem.context['number'] == anonymous_student_id
+        assert capa_problem.safe_exec.call_count == 2
+
+    def test_anonymous_student_id_applied_to_template(self):
+        for anonymous_student_id in ('student1', 'student2'):
+            capa_system = mock_capa_system()
+            capa_system.anonymous_student_id = anonymous_student_id
+            problem = new_loncapa_problem(self.xml, seed=1, capa_system=capa_system)
+            assert problem.context['anonymous_student_id'] == anonymous_student_id
+        assert capa_problem.safe_exec.call_count == 1
+
+    def test_template_size_excludes_python_lib(self):
+        capa_system = mock_capa_system()
+        capa_system.get_python_lib_zip = lambda: b'0' * 100000
+        new_loncapa_problem(self.xml, seed=1, capa_system=capa_system)
+        template_cache = capa_problem._problem_template_cache()  # pylint: disable=protected-access
+        assert len(template_cache) == 1
+        assert template_cache.size_in_bytes < 10000
+
+    def test_template_not_cached_for_unsafe_code(self):
+        capa_system = mock_capa_system()
+        capa_system.can_execute_unsafe_code = lambda: True
+        new_loncapa_problem(self.xml, seed=1, capa_system=capa_system)
+        new_loncapa_problem(self.xml, seed=1, capa_system=capa_system)
+        assert capa_problem.safe_exec.call_count == 2
+
+
+@use_unsafe_codejail()
+class CAPAProblemScriptContextTest(unittest.TestCase):
+    """ Tests for the execution of the scripts of problems for many learners """
+
+    xml = CAPAProblemTemplateCacheTest.xml
+
+    def new_problem(self, xml, seed, anonymous_student_id, cache):
+        """
+        Returns a new LoncapaProblem for a learner with the given anonymous id, with the given safe_exec cache.
+        """
+        capa_system = mock_capa_system()
+        capa_system.anonymous_student_id = anonymous_student_id
+        capa_system.cache = cache
+        return new_loncapa_problem(xml, seed=seed, capa_system=capa_system)
+
+    def test_script_results_shared_by_learners(self):
+        cache = DictCache({})
+        first_problem = self.new_problem(self.xml, 1, 'student1', cache)
+        second_problem = self.new_problem(self.xml, 1, 'student2', cache)
+        assert len(cache.cache) == 1
+        assert second_problem.context['number'] == first_problem.context['number']
+        assert second_problem.context['anonymous_student_id'] == 'student2'
+
+    def test_script_results_keyed_by_anonymous_student_id_if_used(self):
+        xml = self.xml.replace('random.randint(0, 1000)', 'anonymous_student_id')
+        cache = DictCache({})
+        for anonymous_student_id in ('student1', 'student2'):
+            problem = self.new_problem(xml, 1, anonymous_student_id, cache)
+            assert problem.context['number'] == anonymous_student_id
+        assert len(cache.cache) == 2
+
+    def test_script_results_keyed_by_anonymous_student_id_if_read_through_globals(self):
+        xml = self.xml.replace('random.randint(0, 1000)', "globals()['anonymous_student_id']")
+        cache = DictCache({})
+        for anonymous_student_id in ('student1', 'student2'):
+            problem = self.new_problem(xml, 1, anonymous_student_id, cache)
+            assert problem.context['number'] == anonymous_student_id
+        assert len(cache.cache) == 2
+
+    def test_prime_script_contexts(self):
+        cache = DictCache({})
+        problem = self.new_problem(self.xml, 1, 'student1', cache)
+        with patch.object(capa_problem, 'safe_exec_many', Mock(wraps=capa_problem.safe_exec_many)):
+            problem.prime_script_contexts([(1, 'student1'), (2, 'student2'), (2, 'student3'), (3, 'student4')])
+            jobs = capa_problem.safe_exec_many.call_args[0][0]
+        assert sorted(job[2] for job in jobs) == [1, 2, 3]
+        assert len(cache.cache) == 3
+
+        # The contexts of the learners are read from the cache, and are the same as when executed on their own.
+        problem = self.new_problem(self.xml, 2, 'student3', cache)
+        assert len(cache.cache) == 3
+        assert problem.context['number'] == self.new_problem(self.xml, 2, 'student3', None).context['number']
+
+    def test_prime_script_contexts_without_cache(self):
+        problem = self.new_problem(self.xml, 1, 'student1', None)
+        with patch.object(capa_problem, 'safe_exec_many') as mock_safe_exec_many:
+            problem.prime_script_contexts([(2, 'student2')])
+        mock_safe_exec_many.assert_not_called()
+
+
+@ddt.ddt
+@use_unsafe_codejail()
+class CAPAProblemBulkRescoringTest(unittest.TestCase):
+    """ Tests for the rescoring of the answers of many learners with one problem """
+
+    xml = CAPAProblemTemplateCacheTest.xml
+
+    def new_problem(self, xml, seed, state=None):
+        """
+        Returns a new LoncapaProblem with the given seed and state.
+        """
+        return LoncapaProblem(
+            xml, id='1', state=state, seed=seed, capa_system=mock_capa_system(), capa_block=mock_capa_block(),
+        )
+
+    def test_supports_bulk_rescoring(self):
+        assert self.new_problem(self.xml, 1).supports_bulk_rescoring()
+
+    def test_supports_bulk_rescoring_learner_scripts(self):
+        xml = self.xml.replace('random.randint(0, 1000)', 'anonymous_student_id')
+        assert not self.new_problem(xml, 1).supports_bulk_rescoring()
+
+    def test_supports_bulk_rescoring_custom_response(self):
+        xml = CustomResponseXMLFactory().build_xml(answer='correct = ["correct"]')
+        assert not self.new_problem(xml, 1).supports_bulk_rescoring()
+
+    @override_settings(FEATURES=FEATURES_WITH_GRADING_METHOD_IN_PROBLEMS)
+    def test_supports_bulk_rescoring_grading_method(self):
+        assert not self.new_problem(self.xml, 1).supports_bulk_rescoring()
+
+    @ddt.data(True, False)
+    def test_rescore_answers(self, correct):
+        seed = 1
+        number = self.new_problem(self.xml, seed).context['number']
+        answer_id = '1_2_1'
+        student_answers = {answer_id: str(number if correct else number + 1)}
+        correct_map = {answer_id: {'correctness': 'incorrect' if correct else 'correct'}}
+
+        problem = self.new_problem(self.xml, seed)
+        new_correct_map, score = problem.rescore_answers(student_answers, correct_map)
+
+        # The learner's answers are graded as rescoring their own problem would.
+        learner_problem = self.new_problem(
+            self.xml, seed, state={'student_answers': student_answers, 'correct_map': correct_map, 'done': True},
+        )
+        learner_problem.correct_map.update(learner_problem.get_grade_from_current_answers(None))
+        assert new_correct_map.get_dict() == learner_problem.correct_map.get_dict()
+        assert score == learner_problem.calculate_score()
+        assert score == {'score': 1 if correct else 0, 'total': 1}
+
+        # The problem itself is unchanged.
+        assert problem.student_answers == {}
+        assert problem.correct_map.get_dict() == {}
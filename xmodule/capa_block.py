@@ -1954,14 +1954,18 @@ class _BuiltInProblemBlock(
         self.unmask_event(event_unmasked)
         self.runtime.publish(self, title, event_unmasked)
 
-    def unmask_event(self, event_info):
+    def unmask_event(self, event_info, lcp=None):
         """
         Translates in-place the event_info to account for masking
         and adds information about permutation options in force.
+
+        The choices are unmasked with `lcp` if given, or else with the problem of the block.
         """
+        if lcp is None:
+            lcp = self.lcp
         # answers is like: {u'i4x-Stanford-CS99-problem-dada976e76f34c24bc8415039dee1300_2_1': u'mask_0'}
         # Each response values has an answer_id which matches the key in answers.
-        for response in self.lcp.responders.values():
+        for response in lcp.responders.values():
             # Un-mask choice names in event_info for masked responses.
             if response.has_mask():
                 # We don't assume much about the structure of event_info,
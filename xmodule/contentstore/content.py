@@ -294,6 +294,12 @@ class StaticContent:  # lint-amnesty, pylint: disable=missing-class-docstring
     def stream_data(self):
         yield self._data
 
+    def stream_data_in_range(self, first_byte, last_byte):
+        """
+        Stream the data between first_byte and last_byte (included)
+        """
+        yield self._data[first_byte:last_byte + 1]
+
     @staticmethod
     def serialize_asset_key_with_slash(asset_key):
         """
@@ -333,6 +339,8 @@ class StaticContentStream(StaticContent):  # lint-amnesty, pylint: disable=missi
                 yield chunk
                 break
             chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
+            if len(chunk) == 0:
+                break
             position += STREAM_DATA_CHUNK_SIZE
             yield chunk
 
@@ -11,6 +11,7 @@ import sys
 from collections import OrderedDict
 from datetime import datetime
 
+import numpy
 from pytz import UTC
 from django.utils.translation import gettext_lazy as _
 
@@ -370,6 +371,31 @@ class AssignmentFormatGrader(CourseGrader):
 
         return aggregate_score, dropped_indices
 
+    def totals_with_drops(self, percents):
+        """
+        Calculates the total_with_drops of many learners at once.  Takes a
+        matrix of section percents, with a row per learner and a column per
+        section, and returns an array of the learners' total scores.
+        """
+        percents = numpy.asarray(percents, dtype=float)
+        num_learners, num_sections = percents.shape
+
+        kept = numpy.ones(percents.shape, dtype=bool)
+        if self.drop_count > 0:
+            # A stable sort drops the same sections as total_with_drops among equal percents.
+            sorted_indices = numpy.argsort(-percents, axis=1, kind='stable')
+            numpy.put_along_axis(kept, sorted_indices[:, -self.drop_count:], False, axis=1)
+
+        # Sum the sections in order, as total_with_drops does, so the totals are rounded identically.
+        totals = numpy.zeros(num_learners)
+        for section_index in range(num_sections):
+            totals += numpy.where(kept[:, section_index], percents[:, section_index], 0.0)
+
+        if num_sections - self.drop_count > 0:
+            totals /= num_sections - self.drop_count
+
+        return totals
+
     def grade(self, grade_sheet, generate_random_scores=False):
         scores = list(grade_sheet.get(self.type, {}).values())
         breakdown = []
@@ -616,6 +616,17 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         except NotImplementedError:
             return None, None
 
+    def get_changed_blocks(self, course_key, old_version_guid, new_version_guid):
+        """
+        Returns the usage keys of the blocks that changed between the given
+        versions of the course, or None if the course's store cannot tell.
+        """
+        try:
+            store = self._verify_modulestore_support(course_key, 'get_changed_blocks')
+            return store.get_changed_blocks(course_key, old_version_guid, new_version_guid)
+        except NotImplementedError:
+            return None
+
     def get_modulestore_type(self, course_id):
         """
         Returns a type which identifies which modulestore is servicing the given course_id.
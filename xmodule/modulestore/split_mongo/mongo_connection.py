@@ -4,6 +4,7 @@ Segregation of pymongo functions from the data modeling mechanisms for split mod
 
 
 import datetime
+import hashlib
 import logging
 import math
 import pickle
@@ -13,6 +14,7 @@ from contextlib import contextmanager
 from time import time
 
 from ccx_keys.locator import CCXLocator
+from django.conf import settings
 from django.core.cache import caches, InvalidCacheBackendError
 from django.db.transaction import TransactionManagementError
 import pymongo
@@ -27,7 +29,7 @@ from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore import BlockData
 from xmodule.modulestore.split_mongo import BlockKey
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
-from openedx.core.lib.cache_utils import request_cached
+from openedx.core.lib.cache_utils import ProcessLRUCache, process_cached, request_cached
 
 log = logging.getLogger(__name__)
 
@@ -191,14 +193,51 @@ def structure_to_mongo(structure, course_context=None):
         return new_structure
 
 
+@process_cached
+def _structure_process_cache():
+    """
+    Returns the process-local cache of deserialized course structures.
+    """
+    # .. setting_name: COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE_IN_BYTES
+    # .. setting_default: 0
+    # .. setting_description: Maximum total size, measured as the size of their compressed pickled data,
+    #   of the deserialized split modulestore course structures that each worker process keeps in memory,
+    #   in front of the 'course_structure_cache' django cache. Structures are keyed by their immutable
+    #   version id, so they never need invalidation. A value of 0 disables this process-local tier.
+    # .. setting_warnings: Structures are measured by their zlib-compressed pickle, and a deserialized
+    #   structure of a large course takes several times as much memory. See ProcessLRUCache.
+    return ProcessLRUCache(
+        'split_mongo.course_structure_process_cache',
+        getattr(settings, 'COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE_IN_BYTES', 0),
+    )
+
+
 class CourseStructureCache:
     """
     Wrapper around django cache object to cache course structure objects.
     The course structures are pickled and compressed when cached.
 
+    Deserialized structures are also kept in a process-local LRU cache, so
+    a worker only deserializes a given structure version once. Cached
+    structures are shared across requests and must not be modified;
+    the split modulestore always copies a structure before versioning it.
+
+    Compressed structures that exceed the maximum size of a single cache
+    entry are split into content-addressed chunks, which are cached next
+    to a small manifest stored under the structure's key. A structure
+    with any missing chunk is treated as a cache miss.
+
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
     """
+    # Compressed structures of this size or larger are cached in chunks.
+    MAX_ENTRY_SIZE_IN_BYTES = 2 * 1024 * 1024
+
+    # The size of each chunk of a chunked structure.
+    CHUNK_SIZE_IN_BYTES = 1024 * 1024
+
+    # The version of the format of the manifests of chunked structures.
+    CHUNK_MANIFEST_VERSION = 1
 
     def __init__(self):
         self.cache = None
@@ -212,11 +251,20 @@ class CourseStructureCache:
         if self.cache is None:
             return None
 
+        structure = _structure_process_cache().get(key)
+        if structure is not None:
+            return structure
+
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
             try:
                 compressed_pickled_data = self.cache.get(key)
                 tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
 
+                if isinstance(compressed_pickled_data, dict):
+                    tagger.measure('chunks', len(compressed_pickled_data['chunk_keys']))
+                    compressed_pickled_data = self._get_chunked(compressed_pickled_data)
+                    tagger.tag(chunks_found=str(compressed_pickled_data is not None).lower())
+
                 if compressed_pickled_data is None:
                     # Always log cache misses, because they are unexpected
                     tagger.sample_rate = 1
@@ -227,7 +275,9 @@ class CourseStructureCache:
                 pickled_data = zlib.decompress(compressed_pickled_data)
                 tagger.measure('uncompressed_size', len(pickled_data))
 
-                return pickle.loads(pickled_data, encoding='latin-1')
+                structure = pickle.loads(pickled_data, encoding='latin-1')
+                _structure_process_cache().set(key, structure, len(compressed_pickled_data))
+                return structure
             except Exception:  # lint-amnesty, pylint: disable=broad-except
                 # The cached data is corrupt in some way, get rid of it.
                 log.warning("CourseStructureCache: Bad data in cache for %s", course_context)
@@ -247,19 +297,66 @@ class CourseStructureCache:
             compressed_pickled_data = zlib.compress(pickled_data, 1)
             data_size = len(compressed_pickled_data)
             tagger.measure('compressed_size', data_size)
+            _structure_process_cache().set(key, structure, data_size)
 
             # We rely on the course structure cache default timeout, which should be
             # high by default (~ a few days).
-            total_bytes_in_one_mb = 1024 * 1024
-            if data_size < total_bytes_in_one_mb * 2:  # Only data with a size smaller than 2MB will be cached
+            if data_size < self.MAX_ENTRY_SIZE_IN_BYTES:
                 self.cache.set(key, compressed_pickled_data)
             else:
+                total_bytes_in_one_mb = 1024 * 1024
                 chunk_size_in_mbs = round(data_size / total_bytes_in_one_mb, 2)
 
                 # .. custom_attribute_name: split_mongo_compressed_size_in_mbs
-                # .. custom_attribute_description: contains the data chunk size in MBs. The size on which
-                #   the memcached client failed to store value in course structure cache.
+                # .. custom_attribute_description: contains the size in MBs of a compressed structure
+                #   that is too large for a single entry, and is therefore cached in chunks.
                 monitoring.set_custom_attribute('split_mongo_compressed_size_in_mbs', chunk_size_in_mbs)
+                tagger.measure('chunks', self._set_chunked(key, compressed_pickled_data))
+
+    def _get_chunked(self, manifest):
+        """
+        Returns the reassembled data of a chunked structure for the given
+        manifest, or None if any chunk is missing.
+        """
+        if manifest.get('version') != self.CHUNK_MANIFEST_VERSION:
+            return None
+
+        chunk_keys = manifest['chunk_keys']
+        chunks = self.cache.get_many(chunk_keys)
+        if any(chunk_key not in chunks for chunk_key in chunk_keys):
+            log.info("CourseStructureCache: Missing chunks of a chunked structure.")
+            return None
+
+        data = b''.join(chunks[chunk_key] for chunk_key in chunk_keys)
+        if len(data) != manifest['size']:
+            return None
+        return data
+
+    def _set_chunked(self, key, data):
+        """
+        Caches the given data in content-addressed chunks, followed by
+        their manifest under the given key. Returns the number of chunks
+        cached.
+        """
+        chunks = {}
+        chunk_keys = []
+        for offset in range(0, len(data), self.CHUNK_SIZE_IN_BYTES):
+            chunk = data[offset:offset + self.CHUNK_SIZE_IN_BYTES]
+            chunk_key = 'chunk.{}'.format(hashlib.sha1(chunk).hexdigest())
+            chunks[chunk_key] = chunk
+            chunk_keys.append(chunk_key)
+
+        # Write the chunks first, so the manifest never refers to chunks
+        # that were not written.
+        if self.cache.set_many(chunks):
+            log.warning("CourseStructureCache: Failed to cache the chunks of a chunked structure.")
+            return 0
+        self.cache.set(key, {
+            'version': self.CHUNK_MANIFEST_VERSION,
+            'chunk_keys': chunk_keys,
+            'size': len(data),
+        })
+        return len(chunk_keys)
 
 
 class MongoPersistenceBackend:
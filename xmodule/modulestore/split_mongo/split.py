@@ -1484,6 +1484,38 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             return usage_key, block.edit_info.original_usage_version
         return None, None
 
+    def get_changed_blocks(self, course_key, old_version_guid, new_version_guid):
+        """
+        Returns the usage keys of the blocks whose stored data (fields, definition,
+        defaults or asides) differs between the structures old_version_guid and
+        new_version_guid of the given course, including blocks that were added.
+
+        Removed blocks are not returned, but since their former parents' children
+        changed, those parents are.
+
+        Returns None if either structure is not found.
+        """
+        old_structure = self.get_structure(course_key, old_version_guid)
+        new_structure = self.get_structure(course_key, new_version_guid)
+        if old_structure is None or new_structure is None:
+            return None
+
+        def block_content(block_data):
+            """
+            Returns the version-independent content of the given block.
+            """
+            storable = block_data.to_storable()
+            del storable['edit_info']
+            return storable
+
+        changed_blocks = set()
+        old_blocks = old_structure['blocks']
+        for block_key, block_data in new_structure['blocks'].items():
+            old_block_data = old_blocks.get(block_key)
+            if old_block_data is None or block_content(old_block_data) != block_content(block_data):
+                changed_blocks.add(course_key.make_usage_key(block_key.type, block_key.id))
+        return changed_blocks
+
     def create_definition_from_data(self, course_key, new_def_data, category, user_id):
         """
         Pull the definition fields out of block and save to the db as a new definition
@@ -15,6 +15,7 @@ import pytest
 import ddt
 from ccx_keys.locator import CCXBlockUsageLocator
 from django.core.cache import InvalidCacheBackendError, caches
+from django.test.utils import override_settings
 from opaque_keys.edx.locator import BlockUsageLocator, CourseKey, CourseLocator, LocalId
 from xblock.fields import Reference, ReferenceList, ReferenceValueDict
 
@@ -34,7 +35,7 @@ from xmodule.modulestore.exceptions import (
 )
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.modulestore.split_mongo import BlockKey
-from xmodule.modulestore.split_mongo.mongo_connection import CourseStructureCache
+from xmodule.modulestore.split_mongo.mongo_connection import CourseStructureCache, _structure_process_cache
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.factories import check_mongo_calls
 from xmodule.modulestore.tests.mongo_connection import MONGO_HOST, MONGO_PORT_NUM
@@ -814,6 +815,24 @@ class TestCourseStructureCache(CacheIsolationMixin, SplitModuleTest):
         # now make sure that you get the same structure
         assert not_corrupt_structure == not_cached_structure
 
+    @override_settings(COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE_IN_BYTES=10 * 1024 * 1024)
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_process_cache(self, mock_get_cache):
+        enabled_cache = caches['default']
+        mock_get_cache.return_value = enabled_cache
+        _structure_process_cache.cache.clear()
+        self.addCleanup(_structure_process_cache.cache.clear)
+
+        with check_mongo_calls(1):
+            not_cached_structure = self._get_structure(self.new_course)
+
+        # The deserialized structure is served from the process-local
+        # cache, even once it is no longer in the django cache.
+        enabled_cache.clear()
+        with check_mongo_calls(0):
+            cached_structure = self._get_structure(self.new_course)
+        assert cached_structure is not_cached_structure
+
     @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
     def test_course_structure_cache_no_cache_configured(self, mock_get_cache):
         mock_get_cache.side_effect = InvalidCacheBackendError
@@ -856,9 +875,29 @@ class TestCourseStructureCache(CacheIsolationMixin, SplitModuleTest):
         data_chunk = b'\x00' * size
 
         course_cache.set('my_data_chunk', data_chunk)
-        mock_set_cache.assert_not_called()
+        # Only the manifest of the chunked data is set under the key.
+        mock_set_cache.assert_called_once()
+        assert mock_set_cache.call_args[0][0] == 'my_data_chunk'
+        assert len(mock_set_cache.call_args[0][1]['chunk_keys']) > 1
         mock_set_custom_attribute.assert_called()
 
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_cache_chunked(self, mock_get_cache):
+        enabled_cache = caches['default']
+        mock_get_cache.return_value = enabled_cache
+        course_cache = CourseStructureCache()
+
+        # Random data does not compress, so it is cached in chunks.
+        data_chunk = os.urandom(CourseStructureCache.MAX_ENTRY_SIZE_IN_BYTES + 1)
+        course_cache.set('my_data_chunk', data_chunk)
+        manifest = enabled_cache.get('my_data_chunk')
+        assert len(manifest['chunk_keys']) == 3
+        assert course_cache.get('my_data_chunk') == data_chunk
+
+        # A missing chunk is a cache miss.
+        enabled_cache.delete(manifest['chunk_keys'][1])
+        assert course_cache.get('my_data_chunk') is None
+
     @patch('xmodule.modulestore.split_mongo.mongo_connection.monitoring.set_custom_attribute')
     @patch('django.core.cache.cache.set')
     @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
@@ -1448,6 +1487,27 @@ class TestItemCrud(SplitModuleTest):
         other_updated = modulestore().update_item(other_block, self.user_id)
         assert moved_child.version_agnostic() in version_agnostic(other_updated.children)
 
+    def test_get_changed_blocks(self):
+        """
+        test that only the blocks whose fields changed between two versions of a course are reported
+        """
+        locator = BlockUsageLocator(
+            CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT), 'chapter', 'chapter3'
+        )
+        block = modulestore().get_item(locator)
+        pre_version_guid = block.location.version_guid
+
+        block.children.pop()
+        block.save()  # decache model changes
+        updated_block = modulestore().update_item(block, self.user_id)
+        post_version_guid = updated_block.location.version_guid
+
+        course_key = locator.course_key
+        assert modulestore().get_changed_blocks(course_key, pre_version_guid, post_version_guid) == {
+            course_key.make_usage_key('chapter', 'chapter3'),
+        }
+        assert modulestore().get_changed_blocks(course_key, post_version_guid, post_version_guid) == set()
+
     def test_update_definition(self):
         """
         test updating an item's definition: ensure it gets versioned as well as the course getting versioned
@@ -198,6 +198,24 @@ class GraderTest(unittest.TestCase):
         assert round(graded['percent'] - 0.5, 7) >= 0
         assert len(graded['section_breakdown']) == (0 + 1)
 
+    @ddt.data(0, 1, 3, 7)
+    def test_totals_with_drops(self, drop_count):
+        grader = graders.AssignmentFormatGrader("Lab", 7, drop_count)
+        percents = [
+            [mock_grade.percent_graded for mock_grade in self.test_gradesheet['Lab'].values()],
+            [0.0, 0.5, 0.5, 1.0, 0.25, 0.5, 0.0],
+            [0.0] * 7,
+        ]
+        totals = grader.totals_with_drops(percents)
+        assert totals.tolist() == [
+            grader.total_with_drops([{'percent': percent} for percent in user_percents])[0]
+            for user_percents in percents
+        ]
+
+    def test_totals_with_drops_without_sections(self):
+        grader = graders.AssignmentFormatGrader("Lab", 7, 3)
+        assert grader.totals_with_drops([[], []]).tolist() == [0.0, 0.0]
+
     def test_weighted_subsections_grader(self):
         # First, a few sub graders
         homework_grader = graders.AssignmentFormatGrader("Homework", 12, 2)